@@ -0,0 +1,335 @@
+"""
+analytics/best_efforts.py
+
+Best efforts: mean-maximal power, pace and heart rate over standard
+durations (DURATIONS, 5 s … 2 h) — the highest average any continuous
+stretch of that length reached.
+
+Per workout, each series is laid on a regular time grid (short recording
+gaps are held at the last value, longer ones are pauses), and the best
+mean for every duration is one pass over a prefix sum:
+
+    mean_max(d) = max_i (c[i + d] - c[i]) / d,   c = cumsum(values)
+
+so a curve costs O(n) per duration. Curves are stored per workout in
+workout_mean_max at ingest (replace_mean_max) with CURVE_VERSION;
+recompute_derived.py rebuilds stale rows and metrics_retention.py stores
+the curve from the full series before compacting it.
+
+The envelope for a window (all-time, a season, the last N days) is an
+element-wise max over the stored curves — one range query, no series
+scan — and the critical power / critical speed models are fitted to the
+envelope:
+
+    work     = W' + CP · t        (power, J)
+    distance = D' + CS · t        (speed, m)
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from db import get_connection
+from analytics.workout_series import iter_workout_series
+
+# Bump whenever the curve computation or DURATIONS change; rows with an
+# older version are recomputed by recompute_derived.py (and on read).
+CURVE_VERSION = 1
+
+DURATIONS = (5, 10, 15, 30, 60, 120, 180, 300, 600, 1200, 1800, 3600, 5400, 7200)
+
+# Series columns a curve is computed from
+CURVE_COLUMNS = ("metric_epoch", "power", "pace", "heart_rate")
+
+CURVE_METRICS = ("power", "speed", "heart_rate")
+
+# Recording gaps up to this long are held at the last value (smart
+# recording, GPS dropouts); longer gaps are pauses.
+MAX_GAP_S = 10
+
+# Durations the critical power / speed models are fitted on (2–20 min)
+CRITICAL_DURATIONS = (120, 180, 300, 600, 1200)
+
+
+# ---------------------------------------------------------------------------
+# Per-workout curves
+# ---------------------------------------------------------------------------
+
+def _epoch(series) -> np.ndarray:
+    """Point times in seconds, from metric_epoch or a batch's metric_timestamp."""
+    if "metric_epoch" in series:
+        return np.asarray(series["metric_epoch"], dtype=np.float64)
+    return series["metric_timestamp"].astype("datetime64[ms]").astype(np.int64) / 1000.0
+
+
+def _resample(epoch: np.ndarray, values: np.ndarray, resolution_s: int) -> np.ndarray:
+    """
+    Values on a regular resolution_s grid from the first point. Empty
+    slots take the last point's value for up to MAX_GAP_S, NaN after that.
+    """
+    slot = np.round((epoch - epoch[0]) / resolution_s).astype(np.int64)
+    last = np.full(slot[-1] + 1, -1, dtype=np.int64)
+    last[slot] = np.arange(len(slot))
+    last = np.maximum.accumulate(last)
+    grid = values[last]
+    grid[(np.arange(len(last)) - slot[last]) * resolution_s > MAX_GAP_S] = np.nan
+    return grid
+
+
+def _mean_max(grid: np.ndarray, windows: list[Optional[int]], require_full: bool) -> list[Optional[float]]:
+    """
+    Highest mean over `window` consecutive slots, for each window (None
+    for a window that does not fit). Missing slots count as zero, or
+    disqualify the window with require_full.
+    """
+    valid = ~np.isnan(grid)
+    if not valid.any():
+        return [None] * len(windows)
+    sums = np.concatenate(([0.0], np.cumsum(np.where(valid, grid, 0.0))))
+    counts = np.concatenate(([0], np.cumsum(valid))) if require_full else None
+
+    result = []
+    for w in windows:
+        if w is None or w > len(grid):
+            result.append(None)
+            continue
+        totals = sums[w:] - sums[:-w]
+        if require_full:
+            totals = totals[(counts[w:] - counts[:-w]) == w]
+            if not len(totals):
+                result.append(None)
+                continue
+        result.append(float(totals.max() / w))
+    return result
+
+
+def mean_max_curves(series, resolution_s: int = 1) -> dict[str, list[Optional[float]]]:
+    """
+    {metric: [best mean per DURATIONS entry]} for one workout's full,
+    time-ordered series (CURVE_COLUMNS, or a metrics_parser batch) stored
+    at resolution_s seconds per point. None where the workout is shorter
+    than the duration, the duration is finer than the series, or the
+    metric was not recorded.
+
+      power       W, pauses and dropouts count as zero
+      speed       m/s from pace; pauses and non-moving points count as zero
+      heart_rate  bpm, only windows fully covered by readings
+    """
+    curves = dict.fromkeys(CURVE_METRICS, [None] * len(DURATIONS))
+    if not series or len(series["pace"]) == 0:
+        return curves
+
+    epoch = _epoch(series)
+    windows = [d // resolution_s if d % resolution_s == 0 else None for d in DURATIONS]
+
+    pace = np.asarray(series["pace"], dtype=np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        moving = (pace > 0) & (pace < 20)
+        speed = np.where(moving, 1000.0 / (pace * 60.0), np.where(np.isnan(pace), np.nan, 0.0))
+        hr = np.asarray(series["heart_rate"], dtype=np.float64)
+        hr = np.where(hr > 0, hr, np.nan)
+    power = np.asarray(series["power"], dtype=np.float64)
+
+    for metric, values, require_full, digits in (
+        ("power", power, False, 1),
+        ("speed", speed, False, 3),
+        ("heart_rate", hr, True, 1),
+    ):
+        best = _mean_max(_resample(epoch, values, resolution_s), windows, require_full)
+        curves[metric] = [None if v is None else round(v, digits) for v in best]
+    return curves
+
+
+def _array_literal(values: list[Optional[float]]) -> Optional[str]:
+    """Postgres float8[] literal, or None (NULL) when no duration has a value."""
+    if all(v is None for v in values):
+        return None
+    return "{" + ",".join("NULL" if v is None else repr(v) for v in values) + "}"
+
+
+_UPSERT_SQL = f"""
+    INSERT INTO workout_mean_max (workout_id, curve_version, computed_at, resolution_s, {", ".join(CURVE_METRICS)})
+    SELECT v.workout_id, %s, NOW(), v.resolution_s, {", ".join(f"v.{m}::float8[]" for m in CURVE_METRICS)}
+    FROM unnest(%s::int[], %s::smallint[], {", ".join("%s::text[]" for _ in CURVE_METRICS)})
+        AS v(workout_id, resolution_s, {", ".join(CURVE_METRICS)})
+    ON CONFLICT (workout_id) DO UPDATE SET
+        curve_version = EXCLUDED.curve_version,
+        computed_at   = EXCLUDED.computed_at,
+        resolution_s  = EXCLUDED.resolution_s,
+        {", ".join(f"{m} = EXCLUDED.{m}" for m in CURVE_METRICS)}
+"""
+
+
+def upsert_mean_max_rows(cursor, rows: list[tuple[int, int, dict]]) -> None:
+    """
+    Write (workout_id, resolution_s, mean_max_curves dict) rows in one
+    statement; each curve travels as a float8[] literal. Does not commit.
+    """
+    if not rows:
+        return
+    cursor.execute(
+        _UPSERT_SQL,
+        (
+            CURVE_VERSION,
+            [wid for wid, _, _ in rows],
+            [res for _, res, _ in rows],
+            *([_array_literal(curves[m]) for _, _, curves in rows] for m in CURVE_METRICS),
+        ),
+    )
+
+
+def replace_mean_max(cursor, workout_id: int, series, resolution_s: int = 1) -> dict:
+    """Compute and store one workout's curves (series=None: no series). Does not commit."""
+    curves = mean_max_curves(series, resolution_s)
+    upsert_mean_max_rows(cursor, [(workout_id, resolution_s, curves)])
+    return curves
+
+
+# ---------------------------------------------------------------------------
+# Envelope over a window
+# ---------------------------------------------------------------------------
+
+def load_mean_max(days: Optional[int] = 365, sport: str = "running", conn=None) -> list[tuple]:
+    """
+    (workout_id, workout_date, curves) for the sport's workouts in the
+    last `days` days (all time for None). Stale or missing rows are
+    computed from the stored series (not written back).
+    """
+    close = conn is None
+    if conn is None:
+        conn = get_connection()
+
+    try:
+        cur = conn.cursor()
+        cur.execute(f"""
+            SELECT w.workout_id, w.workout_date, COALESCE(w.metrics_resolution_s, 1), c.curve_version,
+                   {", ".join(f"c.{m}" for m in CURVE_METRICS)}
+            FROM workouts w
+            LEFT JOIN workout_mean_max c ON c.workout_id = w.workout_id
+            WHERE w.user_id = 1
+              AND w.sport = %s
+              AND w.metrics_row_count > 0
+              AND (%s::int IS NULL OR w.workout_date >= CURRENT_DATE - (%s * INTERVAL '1 day'))
+            ORDER BY w.workout_date
+        """, (sport, days, days))
+        rows = cur.fetchall()
+        cur.close()
+
+        result, stale = {}, {}
+        for wid, workout_date, resolution_s, version, *arrays in rows:
+            if version == CURVE_VERSION:
+                result[wid] = (wid, workout_date, {
+                    m: [None] * len(DURATIONS) if a is None else a for m, a in zip(CURVE_METRICS, arrays)
+                })
+            else:
+                stale[wid] = (workout_date, resolution_s)
+                result[wid] = (wid, workout_date, mean_max_curves(None))
+
+        for wid, series in iter_workout_series(list(stale), CURVE_COLUMNS, conn, moving_only=False):
+            workout_date, resolution_s = stale[wid]
+            result[wid] = (wid, workout_date, mean_max_curves(series, resolution_s))
+        return list(result.values())
+    finally:
+        if close:
+            conn.close()
+
+
+def envelope(workouts: list[tuple]) -> dict[str, list[Optional[dict]]]:
+    """
+    {metric: [best effort per DURATIONS entry]} over (workout_id,
+    workout_date, curves) rows — an element-wise max. Each effort is
+    {value, workout_id, workout_date}, or None if no workout reached
+    that duration.
+    """
+    result = {}
+    for metric in CURVE_METRICS:
+        if not workouts:
+            result[metric] = [None] * len(DURATIONS)
+            continue
+        values = np.array([[np.nan if v is None else v for v in curves[metric]] for _, _, curves in workouts],
+                          dtype=np.float64)
+        best = np.where(np.isnan(values), -np.inf, values).argmax(axis=0)
+        result[metric] = [
+            None if np.isnan(values[i, j]) else {
+                "value":        float(values[i, j]),
+                "workout_id":   workouts[i][0],
+                "workout_date": workouts[i][1],
+            }
+            for j, i in enumerate(best)
+        ]
+    return result
+
+
+def _fit_critical(values: list[Optional[float]]) -> Optional[tuple[float, float, float, int]]:
+    """
+    Least-squares fit of value·t = reserve + critical·t over
+    CRITICAL_DURATIONS. (critical, reserve, r², points) or None.
+    """
+    t, y = [], []
+    for d, v in zip(DURATIONS, values):
+        if d in CRITICAL_DURATIONS and v is not None:
+            t.append(float(d))
+            y.append(v * d)
+    if len(t) < 3:
+        return None
+    t, y = np.array(t), np.array(y)
+    critical, reserve = np.polyfit(t, y, 1)
+    if critical <= 0 or reserve <= 0:
+        return None
+    residual = y - (critical * t + reserve)
+    ss_tot = float(((y - y.mean()) ** 2).sum())
+    r2 = 1.0 - float((residual ** 2).sum()) / ss_tot if ss_tot > 0 else 0.0
+    return float(critical), float(reserve), r2, len(t)
+
+
+def critical_power(power: list[Optional[float]]) -> Optional[dict]:
+    """Critical power (W) and W' (J) from a mean-max power curve."""
+    fit = _fit_critical(power)
+    if fit is None:
+        return None
+    cp, w_prime, r2, n = fit
+    return {"cp_w": round(cp, 1), "w_prime_j": round(w_prime), "r_squared": round(r2, 4), "n_points": n}
+
+
+def critical_speed(speed: list[Optional[float]]) -> Optional[dict]:
+    """Critical speed (m/s, and as min/km pace) and D' (m) from a mean-max speed curve."""
+    fit = _fit_critical(speed)
+    if fit is None:
+        return None
+    cs, d_prime, r2, n = fit
+    return {
+        "cs_ms":     round(cs, 3),
+        "cs_pace":   round(1000.0 / (cs * 60.0), 2),
+        "d_prime_m": round(d_prime, 1),
+        "r_squared": round(r2, 4),
+        "n_points":  n,
+    }
+
+
+def get_best_efforts(days: Optional[int] = 365, sport: str = "running", conn=None) -> dict:
+    """
+    Best-effort envelope over the window plus the critical power / speed
+    fits. Used by the API.
+
+    Returns:
+        durations       : list[int]  (seconds, DURATIONS)
+        power / speed / heart_rate : list[{value, workout_id, workout_date} | None]
+        critical_power  : {cp_w, w_prime_j, r_squared, n_points} | None
+        critical_speed  : {cs_ms, cs_pace, d_prime_m, r_squared, n_points} | None
+        workouts        : int  (workouts in the window)
+    """
+    workouts = load_mean_max(days, sport, conn)
+    best = envelope(workouts)
+
+    def values(metric):
+        return [e and e["value"] for e in best[metric]]
+
+    return {
+        "durations":      list(DURATIONS),
+        **best,
+        "critical_power": critical_power(values("power")),
+        "critical_speed": critical_speed(values("speed")),
+        "workouts":       len(workouts),
+    }
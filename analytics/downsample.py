@@ -0,0 +1,77 @@
+"""
+analytics/downsample.py
+
+Largest-Triangle-Three-Buckets (LTTB) downsampling for plotting workout
+time series (Steinarsson, 2013).
+
+The first and last points are kept and the rest are split into
+n_out - 2 equal buckets. From each bucket LTTB keeps the point that forms
+the largest triangle with the point kept from the previous bucket and the
+mean of the next bucket, so peaks, dips and slope changes survive where
+a stride or a bucket mean would flatten them.
+
+Buckets are laid out once as a padded index matrix and the next-bucket
+means come from prefix sums; only the choice of the kept point, which
+depends on the previous bucket's choice, is a loop — one small vector
+operation per output point.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices of the n_out points LTTB keeps from (x, y), ascending. x must
+    be increasing and neither array may contain NaN. All indices when the
+    series already has n_out points or fewer.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n <= 2:
+        return np.arange(n)
+    if n_out < 3:
+        raise ValueError("n_out must be at least 3")
+
+    n_buckets = n_out - 2
+    edges = np.linspace(1, n - 1, n_buckets + 1).astype(np.int64)
+    starts, ends = edges[:-1], edges[1:]
+
+    # Mean of each bucket; the triangle for bucket b uses the mean of b + 1
+    # and the last point for the final bucket.
+    cx = np.concatenate(([0.0], np.cumsum(x)))
+    cy = np.concatenate(([0.0], np.cumsum(y)))
+    sizes = ends - starts
+    next_x = np.append(((cx[ends] - cx[starts]) / sizes)[1:], x[-1])
+    next_y = np.append(((cy[ends] - cy[starts]) / sizes)[1:], y[-1])
+
+    # Padded (bucket, position) index matrix; padding repeats the bucket's
+    # last point, so it can never win over a real point.
+    index = np.minimum(starts[:, None] + np.arange(sizes.max()), ends[:, None] - 1)
+    bx, by = x[index], y[index]
+
+    # Scalars as Python floats: NumPy scalar arithmetic would dominate the loop
+    xs, ys, nxs, nys = x.tolist(), y.tolist(), next_x.tolist(), next_y.tolist()
+    kept = [0]
+    a = 0
+    for b in range(n_buckets):
+        # Twice the triangle area, as a linear function of the candidate point
+        ax, ay = xs[a], ys[a]
+        alpha, beta = ax - nxs[b], nys[b] - ay
+        area = np.abs(alpha * by[b] + beta * bx[b] - (alpha * ay + beta * ax))
+        a = int(index[b, area.argmax()])
+        kept.append(a)
+    kept.append(n - 1)
+    return np.array(kept, dtype=np.int64)
+
+
+def downsample(x: np.ndarray, y: np.ndarray, n_out: int) -> tuple[np.ndarray, np.ndarray]:
+    """(x, y) reduced to at most n_out points by LTTB, NaN points dropped first."""
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    valid = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[valid], y[valid]
+    keep = lttb_indices(x, y, n_out)
+    return x[keep], y[keep]
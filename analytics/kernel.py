@@ -0,0 +1,343 @@
+"""
+analytics/kernel.py
+
+NumPy kernel behind every per-workout running metric.
+
+Each function takes one workout's columnar series as loaded by
+analytics/workout_series.py — time-ordered float arrays, NaN for NULL,
+0 < pace < 20 min/km already applied — and computes its metric with
+vectorized masks instead of per-point Python loops:
+
+    gap_summary             GAP, gap vs pace, 2% gradient profile
+    aerobic_decoupling      Pa:HR drift, first half vs second half
+    economy_index           power (or HR) per m/s
+    fatigue_signature       early vs late window drift
+    cadence_speed_profile   mean cadence per 0.5 min/km pace band
+    biomechanics_summary    mean / std of the biomechanics columns
+    elevation_quartiles     HR and pace by quartile of cumulative gain
+    elevation_gain          total ascent
+
+analyze_workout runs all of them over one series. The get_* functions in
+running_economy.py, biomechanics.py and terrain_response.py are thin
+wrappers that load a series and call the matching kernel function.
+
+Point filters are shared: pace is filtered at load time, HR points need
+heart_rate > 40 (_HR_MIN), cadence points cadence > 0.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+
+# Minetti et al. (2002) cost of transport, highest power first for np.polyval
+# (see running_economy.py for the reference and the scalar version)
+MINETTI_COEFFS = np.array([155.4, -30.4, -43.3, 46.3, 19.5, 3.6])
+_FLAT_COST = MINETTI_COEFFS[-1]
+
+_HR_MIN = 40
+
+# Columns each kernel function reads
+GAP_COLUMNS          = ("pace", "gradient_pct")
+DECOUPLING_COLUMNS   = ("pace", "heart_rate")
+ECONOMY_COLUMNS      = ("pace", "power", "heart_rate")
+FATIGUE_COLUMNS      = ("heart_rate", "pace", "cadence", "ground_contact_time", "vertical_oscillation")
+CADENCE_COLUMNS      = ("pace", "cadence")
+BIOMECHANICS_COLUMNS = ("cadence", "ground_contact_time", "vertical_oscillation", "vertical_ratio", "pace", "heart_rate")
+ELEVATION_COLUMNS    = ("heart_rate", "pace", "altitude", "gradient_pct")
+
+ALL_COLUMNS = tuple(dict.fromkeys(
+    GAP_COLUMNS + DECOUPLING_COLUMNS + ECONOMY_COLUMNS + FATIGUE_COLUMNS
+    + CADENCE_COLUMNS + BIOMECHANICS_COLUMNS + ELEVATION_COLUMNS
+))
+
+
+def gap_multipliers(gradient_pct: np.ndarray) -> np.ndarray:
+    """
+    Vectorized gap_multiplier: Cr(0) / Cr(g) over an array of gradients (%),
+    clamped to ±45%, 1.0 where the polynomial is not positive.
+    """
+    g = np.clip(np.asarray(gradient_pct, dtype=np.float64) / 100.0, -0.45, 0.45)
+    cost = np.polyval(MINETTI_COEFFS, g)
+    return np.where(cost > 0, _FLAT_COST / np.where(cost > 0, cost, 1.0), 1.0)
+
+
+def _mean(values: np.ndarray) -> Optional[float]:
+    """Mean of the non-NaN values (SQL AVG semantics), None if there are none."""
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if len(values) else None
+
+
+def _round(v: Optional[float], digits: int = 3) -> Optional[float]:
+    return round(float(v), digits) if v is not None else None
+
+
+# ---------------------------------------------------------------------------
+# Running economy
+# ---------------------------------------------------------------------------
+
+def gap_summary(workout_id: int, s: dict[str, np.ndarray]) -> Optional[dict]:
+    pace, grad = s["pace"], s["gradient_pct"]
+    if len(pace) == 0:
+        return None
+
+    has_grad = ~np.isnan(grad)
+    # no gradient → GAP = pace
+    gap = np.where(has_grad, pace * gap_multipliers(np.where(has_grad, grad, 0.0)), pace)
+
+    avg_pace = float(pace.mean())
+    avg_gap  = float(gap.mean())
+
+    gap_vs_pace_pct = ((avg_pace - avg_gap) / avg_gap * 100) if avg_gap > 0 else 0.0
+
+    # bucket to nearest 2% (np.rint rounds half to even, like round())
+    buckets, counts = np.unique(np.rint(grad[has_grad] / 2).astype(int) * 2, return_counts=True)
+
+    return {
+        "workout_id":       workout_id,
+        "avg_pace":         round(avg_pace, 3),
+        "avg_gap":          round(avg_gap, 3),
+        "gap_vs_pace_pct":  round(gap_vs_pace_pct, 2),
+        "gradient_profile": [{"gradient_pct": int(k), "count": int(v)} for k, v in zip(buckets, counts)],
+        "rows_used":        len(pace),
+    }
+
+
+def aerobic_decoupling(workout_id: int, s: dict[str, np.ndarray]) -> Optional[dict]:
+    valid = s["heart_rate"] > _HR_MIN
+    speed, hr = 1.0 / s["pace"][valid], s["heart_rate"][valid]   # speed in km/min
+
+    n = len(hr)
+    if n < 40:   # need at least 40 data points for a meaningful split
+        return None
+
+    # Both halves' means from one cumulative sum per column
+    mid = n // 2
+    cs_speed, cs_hr = np.cumsum(speed), np.cumsum(hr)
+    ratio_first  = float((cs_speed[mid - 1] / mid) / (cs_hr[mid - 1] / mid))
+    ratio_second = float(((cs_speed[-1] - cs_speed[mid - 1]) / (n - mid)) / ((cs_hr[-1] - cs_hr[mid - 1]) / (n - mid)))
+
+    if ratio_first == 0:
+        return None
+
+    decoupling_pct = (ratio_first - ratio_second) / ratio_first * 100
+
+    if decoupling_pct < 5:
+        status = "efficient"
+    elif decoupling_pct < 10:
+        status = "moderate_drift"
+    else:
+        status = "cardiac_drift"
+
+    return {
+        "workout_id":      workout_id,
+        "decoupling_pct":  round(decoupling_pct, 2),
+        "ratio_first":     round(ratio_first, 6),
+        "ratio_second":    round(ratio_second, 6),
+        "status":          status,
+        "rows_used":       n,
+    }
+
+
+def economy_index(workout_id: int, s: dict[str, np.ndarray]) -> Optional[dict]:
+    # Power-based first, HR-based fallback
+    mode, secondary = "power", s["power"]
+    valid = secondary > 0
+    if valid.sum() < 20:
+        mode, secondary = "hr", s["heart_rate"]
+        valid = secondary > _HR_MIN
+    n = int(valid.sum())
+    if n < 20:
+        return None
+
+    avg_speed  = float((1000.0 / (s["pace"][valid] * 60.0)).mean())   # pace min/km → m/s
+    avg_second = float(secondary[valid].mean())
+
+    if avg_speed == 0:
+        return None
+
+    return {
+        "workout_id":  workout_id,
+        "rei":         round(avg_second / avg_speed, 3),
+        "mode":        mode,          # "power" or "hr"
+        "avg_speed_ms": round(avg_speed, 3),
+        "avg_power_or_hr": round(avg_second, 1),
+        "rows_used":   n,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Biomechanics
+# ---------------------------------------------------------------------------
+
+def fatigue_signature(workout_id: int, s: dict[str, np.ndarray], window_pct: float = 0.20) -> Optional[dict]:
+    n = len(s["pace"])
+    if n < 50:
+        return None
+
+    win = max(10, int(n * window_pct))
+
+    def drift(early_avg, late_avg):
+        if early_avg is None or late_avg is None or early_avg == 0:
+            return None
+        return round(late_avg - early_avg, 3)
+
+    def drift_pct(early_avg, late_avg):
+        if early_avg is None or late_avg is None or early_avg == 0:
+            return None
+        return round((late_avg - early_avg) / early_avg * 100, 2)
+
+    result = {
+        "workout_id": workout_id,
+        "n_rows":     n,
+        "window_pct": window_pct,
+        "window_size": win,
+    }
+
+    for name in FATIGUE_COLUMNS:
+        early_avg = _mean(s[name][:win])
+        late_avg  = _mean(s[name][n - win:])
+        result[f"{name}_early"] = _round(early_avg)
+        result[f"{name}_late"]  = _round(late_avg)
+        result[f"{name}_drift"] = drift(early_avg, late_avg)
+        result[f"{name}_drift_pct"] = drift_pct(early_avg, late_avg)
+
+    # Summary: overall fatigue score (0-100, higher = more fatigued)
+    # Combine GCT drift + HR drift + cadence drop (inverted)
+    scores = []
+    if result["ground_contact_time_drift_pct"] is not None:
+        scores.append(min(100, max(0, result["ground_contact_time_drift_pct"] * 5)))
+    if result["heart_rate_drift_pct"] is not None:
+        scores.append(min(100, max(0, result["heart_rate_drift_pct"] * 10)))
+    if result["cadence_drift_pct"] is not None:
+        scores.append(min(100, max(0, -result["cadence_drift_pct"] * 10)))
+
+    result["fatigue_score"] = round(sum(scores) / len(scores), 1) if scores else None
+
+    return result
+
+
+def cadence_speed_profile(workout_id: int, s: dict[str, np.ndarray]) -> Optional[list[dict]]:
+    valid = s["cadence"] > 0
+    if valid.sum() < 20:
+        return None
+
+    # Bucket by 0.5 min/km bands (nearest 0.5, half to even like round())
+    band_idx = np.rint(s["pace"][valid] * 2).astype(int)
+    bands, inverse, counts = np.unique(band_idx, return_inverse=True, return_counts=True)
+    sums = np.bincount(inverse, weights=s["cadence"][valid])
+
+    return [
+        {
+            "pace_band":    float(band / 2),
+            "avg_cadence":  round(float(total / count), 1),
+            "count":        int(count),
+        }
+        for band, total, count in zip(bands, sums, counts)
+        if count >= 5   # only bands with enough data
+    ]
+
+
+def biomechanics_summary(workout_id: int, s: dict[str, np.ndarray]) -> Optional[dict]:
+    n = len(s["pace"])
+    if n == 0:
+        return None
+
+    def std(name):
+        # sample standard deviation, None below two values — like STDDEV()
+        values = s[name][~np.isnan(s[name])]
+        return float(values.std(ddof=1)) if len(values) > 1 else None
+
+    return {
+        "workout_id":   workout_id,
+        "avg_cadence":  _round(_mean(s["cadence"]), 1),
+        "std_cadence":  _round(std("cadence"), 2),
+        "avg_gct":      _round(_mean(s["ground_contact_time"]), 1),
+        "std_gct":      _round(std("ground_contact_time"), 2),
+        "avg_vo":       _round(_mean(s["vertical_oscillation"]), 2),
+        "std_vo":       _round(std("vertical_oscillation"), 3),
+        "avg_vr":       _round(_mean(s["vertical_ratio"]), 2),
+        "std_vr":       _round(std("vertical_ratio"), 3),
+        "avg_pace":     _round(_mean(s["pace"]), 3),
+        "avg_hr":       _round(_mean(s["heart_rate"]), 1),
+        "n_rows":       n,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Terrain
+# ---------------------------------------------------------------------------
+
+def elevation_quartiles(workout_id: int, s: dict[str, np.ndarray]) -> Optional[dict]:
+    valid = ~np.isnan(s["altitude"]) & (s["heart_rate"] > _HR_MIN)
+    if valid.sum() < 50:
+        return None
+
+    hr, pace, grad, alt = (s[c][valid] for c in ("heart_rate", "pace", "gradient_pct", "altitude"))
+
+    # Cumulative elevation gain at each point
+    d_alt = np.diff(alt, prepend=alt[0])
+    cum_gain = np.cumsum(np.where(d_alt > 0, d_alt, 0.0))
+    total_gain = float(cum_gain[-1])
+
+    if total_gain < 20:   # less than 20m total gain → not meaningful
+        return None
+
+    # Split into quartiles by cumulative gain
+    quartile = np.minimum(3, (cum_gain / (total_gain / 4)).astype(int))
+
+    result = {
+        "workout_id":   workout_id,
+        "total_gain_m": round(total_gain, 1),
+        "quartiles":    [],
+    }
+
+    for i in range(4):
+        in_q = quartile == i
+        if not in_q.any():
+            continue
+        a_hr   = _mean(hr[in_q])
+        a_pace = _mean(pace[in_q])
+        a_grad = _mean(grad[in_q])
+        a_gap  = None
+        if a_pace and a_grad is not None:
+            a_gap = round(a_pace * float(gap_multipliers(a_grad)), 3)
+
+        result["quartiles"].append({
+            "quartile":    i + 1,
+            "count":       int(in_q.sum()),
+            "avg_hr":      _round(a_hr,   1),
+            "avg_pace":    _round(a_pace, 3),
+            "avg_gap":     a_gap,
+            "avg_gradient": _round(a_grad, 2),
+        })
+
+    return result
+
+
+def elevation_gain(s: dict[str, np.ndarray]) -> Optional[float]:
+    """Total positive altitude change (m) over the points that have altitude."""
+    alt = s["altitude"][~np.isnan(s["altitude"])]
+    if len(alt) < 2:
+        return None
+    d_alt = np.diff(alt)
+    return round(float(d_alt[d_alt > 0].sum()), 1)
+
+
+# ---------------------------------------------------------------------------
+# Everything at once
+# ---------------------------------------------------------------------------
+
+def analyze_workout(workout_id: int, s: dict[str, np.ndarray]) -> dict:
+    """All kernel metrics for one workout's series (ALL_COLUMNS)."""
+    return {
+        "gap":           gap_summary(workout_id, s),
+        "decoupling":    aerobic_decoupling(workout_id, s),
+        "economy":       economy_index(workout_id, s),
+        "fatigue":       fatigue_signature(workout_id, s),
+        "cadence_speed": cadence_speed_profile(workout_id, s),
+        "biomechanics":  biomechanics_summary(workout_id, s),
+        "elevation":     elevation_quartiles(workout_id, s),
+    }
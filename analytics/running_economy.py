@@ -25,6 +25,9 @@ import math
 from typing import Optional
 
 from db import get_connection
+from analytics import kernel
+from analytics.workout_analytics import load_running_analytics
+from analytics.workout_series import load_workout_series
 
 
 # ---------------------------------------------------------------------------
@@ -80,60 +83,8 @@ def get_workout_gap(workout_id: int, conn=None) -> Optional[dict]:
         gradient_profile: list of {gradient_pct, count} buckets
         rows_used       : int
     """
-    close = conn is None
-    if conn is None:
-        conn = get_connection()
-
-    cur = conn.cursor()
-    cur.execute("""
-        SELECT pace, gradient_pct
-        FROM workout_metrics
-        WHERE workout_id = %s
-          AND pace IS NOT NULL
-          AND pace > 0
-          AND pace < 20          -- filter GPS glitches (> 20 min/km)
-        ORDER BY metric_timestamp
-    """, (workout_id,))
-    rows = cur.fetchall()
-    if close:
-        conn.close()
-
-    if not rows:
-        return None
-
-    pace_vals = []
-    gap_vals  = []
-    bucket_counts = {}
-
-    for pace, grad in rows:
-        pace_vals.append(pace)
-        if grad is not None:
-            multiplier = gap_multiplier(grad)
-            gap_vals.append(pace * multiplier)
-            # bucket to nearest 2%
-            b = round(grad / 2) * 2
-            bucket_counts[b] = bucket_counts.get(b, 0) + 1
-        else:
-            gap_vals.append(pace)   # no gradient → GAP = pace
-
-    avg_pace = sum(pace_vals) / len(pace_vals)
-    avg_gap  = sum(gap_vals)  / len(gap_vals)
-
-    gap_vs_pace_pct = ((avg_pace - avg_gap) / avg_gap * 100) if avg_gap > 0 else 0.0
-
-    gradient_profile = [
-        {"gradient_pct": k, "count": v}
-        for k, v in sorted(bucket_counts.items())
-    ]
-
-    return {
-        "workout_id":       workout_id,
-        "avg_pace":         round(avg_pace, 3),
-        "avg_gap":          round(avg_gap, 3),
-        "gap_vs_pace_pct":  round(gap_vs_pace_pct, 2),
-        "gradient_profile": gradient_profile,
-        "rows_used":        len(rows),
-    }
+    s = load_workout_series(workout_id, kernel.GAP_COLUMNS, conn)
+    return kernel.gap_summary(workout_id, s) if s else None
 
 
 def get_aerobic_decoupling(workout_id: int, conn=None) -> Optional[dict]:
@@ -149,60 +100,8 @@ def get_aerobic_decoupling(workout_id: int, conn=None) -> Optional[dict]:
 
     Returns dict or None if insufficient data.
     """
-    close = conn is None
-    if conn is None:
-        conn = get_connection()
-
-    cur = conn.cursor()
-    cur.execute("""
-        SELECT pace, heart_rate
-        FROM workout_metrics
-        WHERE workout_id = %s
-          AND pace IS NOT NULL AND pace > 0 AND pace < 20
-          AND heart_rate IS NOT NULL AND heart_rate > 40
-        ORDER BY metric_timestamp
-    """, (workout_id,))
-    rows = cur.fetchall()
-    if close:
-        conn.close()
-
-    if len(rows) < 40:   # need at least 40 data points for a meaningful split
-        return None
-
-    mid   = len(rows) // 2
-    first  = rows[:mid]
-    second = rows[mid:]
-
-    def pa_hr_ratio(half):
-        # pace:HR  →  higher = more efficient (fast pace, low HR)
-        # We invert pace (speed = 1/pace in km/min) so higher = better
-        speeds = [1.0 / p for p, _ in half]
-        hrs    = [h for _, h in half]
-        return (sum(speeds) / len(speeds)) / (sum(hrs) / len(hrs))
-
-    ratio_first  = pa_hr_ratio(first)
-    ratio_second = pa_hr_ratio(second)
-
-    if ratio_first == 0:
-        return None
-
-    decoupling_pct = (ratio_first - ratio_second) / ratio_first * 100
-
-    if decoupling_pct < 5:
-        status = "efficient"
-    elif decoupling_pct < 10:
-        status = "moderate_drift"
-    else:
-        status = "cardiac_drift"
-
-    return {
-        "workout_id":      workout_id,
-        "decoupling_pct":  round(decoupling_pct, 2),
-        "ratio_first":     round(ratio_first, 6),
-        "ratio_second":    round(ratio_second, 6),
-        "status":          status,
-        "rows_used":       len(rows),
-    }
+    s = load_workout_series(workout_id, kernel.DECOUPLING_COLUMNS, conn)
+    return kernel.aerobic_decoupling(workout_id, s) if s else None
 
 
 def get_running_economy_index(workout_id: int, conn=None) -> Optional[dict]:
@@ -221,62 +120,8 @@ def get_running_economy_index(workout_id: int, conn=None) -> Optional[dict]:
 
     Returns dict or None.
     """
-    close = conn is None
-    if conn is None:
-        conn = get_connection()
-
-    cur = conn.cursor()
-
-    # Try power-based first
-    cur.execute("""
-        SELECT pace, power
-        FROM workout_metrics
-        WHERE workout_id = %s
-          AND pace IS NOT NULL AND pace > 0 AND pace < 20
-          AND power IS NOT NULL AND power > 0
-        ORDER BY metric_timestamp
-    """, (workout_id,))
-    rows = cur.fetchall()
-
-    mode = "power"
-    if len(rows) < 20:
-        # fallback to HR-based
-        cur.execute("""
-            SELECT pace, heart_rate
-            FROM workout_metrics
-            WHERE workout_id = %s
-              AND pace IS NOT NULL AND pace > 0 AND pace < 20
-              AND heart_rate IS NOT NULL AND heart_rate > 40
-            ORDER BY metric_timestamp
-        """, (workout_id,))
-        rows = cur.fetchall()
-        mode = "hr"
-
-    if close:
-        conn.close()
-
-    if len(rows) < 20:
-        return None
-
-    speeds_ms   = [1000.0 / (p * 60.0) for p, _ in rows]   # pace min/km → m/s
-    secondaries = [v for _, v in rows]
-
-    avg_speed  = sum(speeds_ms)   / len(speeds_ms)
-    avg_second = sum(secondaries) / len(secondaries)
-
-    if avg_speed == 0:
-        return None
-
-    rei = avg_second / avg_speed
-
-    return {
-        "workout_id":  workout_id,
-        "rei":         round(rei, 3),
-        "mode":        mode,          # "power" or "hr"
-        "avg_speed_ms": round(avg_speed, 3),
-        "avg_power_or_hr": round(avg_second, 1),
-        "rows_used":   len(rows),
-    }
+    s = load_workout_series(workout_id, kernel.ECONOMY_COLUMNS, conn)
+    return kernel.economy_index(workout_id, s) if s else None
 
 
 # ---------------------------------------------------------------------------
@@ -288,51 +133,39 @@ def get_running_trends(days: int = 365, conn=None) -> list[dict]:
     For every running/trail_running workout in the last `days` days,
     compute GAP, decoupling, and REI.
 
+    Values come from workout_analytics (one range read); workouts without a
+    current row are computed from the raw series (load_running_analytics).
+
     Returns list of dicts sorted by workout_date ascending.
     """
     close = conn is None
     if conn is None:
         conn = get_connection()
 
-    cur = conn.cursor()
-    cur.execute("""
-        SELECT workout_id, workout_date, sport, training_volume,
-               avg_heart_rate, normalized_power
-        FROM workouts
-        WHERE user_id = 1
-          AND sport IN ('running', 'trail_running')
-          AND workout_date >= CURRENT_DATE - (%s * INTERVAL '1 day')
-        ORDER BY workout_date
-    """, (days,))
-    workouts = cur.fetchall()
-
-    results = []
-    for wid, wdate, sport, distance_m, avg_hr, norm_power in workouts:
-        gap   = get_workout_gap(wid, conn)
-        decoup = get_aerobic_decoupling(wid, conn)
-        rei   = get_running_economy_index(wid, conn)
-
-        row = {
-            "workout_id":      wid,
-            "workout_date":    wdate,
-            "sport":           sport,
-            "distance_km":     round((distance_m or 0) / 1000, 2),
-            "avg_hr":          avg_hr,
-            "normalized_power": norm_power,
+    try:
+        rows = load_running_analytics(days, conn)
+    finally:
+        if close:
+            conn.close()
+
+    return [
+        {
+            "workout_id":      r["workout_id"],
+            "workout_date":    r["workout_date"],
+            "sport":           r["sport"],
+            "distance_km":     round((r["training_volume"] or 0) / 1000, 2),
+            "avg_hr":          r["avg_heart_rate"],
+            "normalized_power": r["normalized_power"],
             # GAP
-            "avg_pace":        gap["avg_pace"]        if gap else None,
-            "avg_gap":         gap["avg_gap"]         if gap else None,
-            "gap_vs_pace_pct": gap["gap_vs_pace_pct"] if gap else None,
+            "avg_pace":        r["avg_pace"],
+            "avg_gap":         r["avg_gap"],
+            "gap_vs_pace_pct": r["gap_vs_pace_pct"],
             # Decoupling
-            "decoupling_pct":  decoup["decoupling_pct"] if decoup else None,
-            "decoupling_status": decoup["status"]       if decoup else None,
+            "decoupling_pct":  r["decoupling_pct"],
+            "decoupling_status": r["decoupling_status"],
             # REI
-            "rei":             rei["rei"]   if rei else None,
-            "rei_mode":        rei["mode"]  if rei else None,
+            "rei":             r["rei"],
+            "rei_mode":        r["rei_mode"],
         }
-        results.append(row)
-
-    if close:
-        conn.close()
-
-    return results
+        for r in rows
+    ]
@@ -0,0 +1,169 @@
+"""
+analytics/series_store.py
+
+Columnar file store for workout time series.
+
+workout_metrics holds one row per second per workout — tuple header,
+SERIAL key, workout_id, timestamp and 12 nullable float8 columns — and
+every analytics scan reads whole rows. The store keeps each workout's
+analytics columns (STORE_COLUMNS) as a single float32 array of shape
+(len(STORE_COLUMNS), points) in time order, so each column is one
+contiguous run of bytes:
+
+    <SERIES_STORE_PATH>/<workout_id // 1000>/<workout_id>.npy   plain, memory-mapped on read
+    <SERIES_STORE_PATH>/<workout_id // 1000>/<workout_id>.npz   zlib-compressed
+
+.npy files are opened with mmap_mode="r", so a reader only pages in the
+columns it asks for and nothing is decoded. .npz files are smaller on
+disk but decompressed whole on every read.
+
+Postgres stays the source of truth. Files are written at ingest and by
+export_series_store.py when SERIES_BACKEND=files, and
+analytics/workout_series.py then reads from them, falling back to
+workout_metrics for workouts that have no file.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+
+import config
+
+STORE_COLUMNS = (
+    "heart_rate",
+    "pace",
+    "cadence",
+    "vertical_oscillation",
+    "vertical_ratio",
+    "ground_contact_time",
+    "power",
+    "altitude",
+    "gradient_pct",
+    "distance",
+)
+_INDEX = {col: i for i, col in enumerate(STORE_COLUMNS)}
+
+_SUFFIXES = (".npy", ".npz")
+
+
+def store_enabled() -> bool:
+    """True when SERIES_BACKEND selects the file store."""
+    return config.SERIES_BACKEND == "files"
+
+
+def _root(root) -> Path:
+    return Path(root if root is not None else config.SERIES_STORE_PATH)
+
+
+def series_path(workout_id: int, root=None, compress: bool = False) -> Path:
+    return _root(root) / str(workout_id // 1000) / f"{workout_id}{_SUFFIXES[compress]}"
+
+
+def _existing_path(workout_id: int, root=None) -> Optional[Path]:
+    for compress in (False, True):
+        path = series_path(workout_id, root, compress)
+        if path.exists():
+            return path
+    return None
+
+
+def has_series(workout_id: int, root=None) -> bool:
+    return _existing_path(workout_id, root) is not None
+
+
+def write_series(workout_id: int, series: dict, root=None, compress: bool = False) -> Path:
+    """
+    Store a workout's full, time-ordered series (a metrics_parser batch or
+    an unfiltered iter_workout_series workout). Columns missing from
+    `series` are stored as NaN. The file is replaced atomically.
+    """
+    n = len(series["pace"])
+    data = np.full((len(STORE_COLUMNS), n), np.nan, dtype=np.float32)
+    for col, i in _INDEX.items():
+        if col in series:
+            data[i] = series[col]
+
+    path = series_path(workout_id, root, compress)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        if compress:
+            np.savez_compressed(f, series=data)
+        else:
+            np.save(f, data)
+    os.replace(tmp, path)
+
+    other = series_path(workout_id, root, not compress)
+    if other.exists():
+        other.unlink()
+    return path
+
+
+def delete_series(workout_id: int, root=None) -> None:
+    for compress in (False, True):
+        series_path(workout_id, root, compress).unlink(missing_ok=True)
+
+
+def read_series(
+    workout_id: int, columns: Sequence[str], root=None, moving_only: bool = True
+) -> Optional[dict[str, np.ndarray]]:
+    """
+    {column: float64 array} for a stored workout, with the same
+    0 < pace < 20 filter as the Postgres loader unless moving_only=False.
+    None if the workout has no file or no point passes the filter.
+    """
+    unknown = set(columns) - set(STORE_COLUMNS)
+    if unknown:
+        raise ValueError(f"columns not in the series store: {sorted(unknown)}")
+
+    path = _existing_path(workout_id, root)
+    if path is None:
+        return None
+    if path.suffix == ".npy":
+        data = np.load(path, mmap_mode="r")
+    else:
+        with np.load(path) as archive:
+            data = archive["series"]
+
+    keep = slice(None)
+    if moving_only:
+        pace = data[_INDEX["pace"]]
+        with np.errstate(invalid="ignore"):
+            keep = (pace > 0) & (pace < 20)
+        if not keep.any():
+            return None
+    elif data.shape[1] == 0:
+        return None
+    return {col: data[_INDEX[col]][keep].astype(np.float64) for col in columns}
+
+
+def iter_stored_series(
+    workout_ids: Sequence[int], columns: Sequence[str], root=None, moving_only: bool = True
+) -> Iterator[tuple[int, dict[str, np.ndarray]]]:
+    """(workout_id, series) for the given workouts that have a file, in the order given."""
+    for workout_id in workout_ids:
+        series = read_series(workout_id, columns, root, moving_only)
+        if series is not None:
+            yield workout_id, series
+
+
+def stored_workout_ids(root=None) -> set[int]:
+    """Workout ids with a file in the store."""
+    return {
+        int(path.stem)
+        for suffix in _SUFFIXES
+        for path in _root(root).glob(f"*/*{suffix}")
+    }
+
+
+def store_bytes(root=None) -> int:
+    """Total size of the store's files on disk."""
+    return sum(
+        path.stat().st_size
+        for suffix in _SUFFIXES
+        for path in _root(root).glob(f"*/*{suffix}")
+    )
@@ -20,14 +20,27 @@ Terrain response analytics: how your body responds to elevation changes.
 4. Optimal Gradient Finder
    At which gradient is your pace:effort ratio (speed per HR beat) best?
    Most runners peak around -2 to 0%. Reveals whether you run downhills well.
+
+1, 3 and 4 are sums, counts and cross-products grouped by gradient band or
+2% bucket (TerrainAccumulator). Those sufficient statistics are stored per
+workout in workout_terrain_stats at ingest (replace_terrain_stats), so a
+date window is an aggregate over a few summary rows per run rather than
+every raw point. scan_terrain computes the same sums from the raw points
+through one server-side cursor. Each row carries TERRAIN_STATS_VERSION;
+recompute_derived.py rebuilds stale rows when the band definitions change,
+and until it has, load_terrain_stats sums those workouts from their series.
 """
 
 from __future__ import annotations
 
 from typing import Optional
 
+import numpy as np
+
 from db import get_connection
-from analytics.running_economy import gap_multiplier
+from analytics import kernel
+from analytics.kernel import gap_multipliers
+from analytics.workout_series import iter_workout_series, load_workout_series
 
 
 # ---------------------------------------------------------------------------
@@ -45,11 +58,342 @@ GRADIENT_BANDS = [
 ]
 
 
-def _band_for(gradient_pct: float) -> str:
-    for name, lo, hi in GRADIENT_BANDS:
-        if (lo is None or gradient_pct >= lo) and (hi is None or gradient_pct < hi):
-            return name
-    return "flat"
+BAND_MID = {
+    "steep_down": -10.0, "down": -6.0, "slight_down": -2.5,
+    "flat": 0.0, "slight_up": 2.5, "up": 6.0, "steep_up": 10.0,
+}
+
+# Inner edges of GRADIENT_BANDS: np.digitize(g, _BAND_EDGES) → band index,
+# with the same lo <= g < hi semantics as the band table.
+_BAND_EDGES = np.array([hi for _, _, hi in GRADIENT_BANDS[:-1]])
+
+# Curve uses |gradient| <= 30; the grade cost model and optimal gradient use <= 20
+_CURVE_MAX_GRADIENT = 30.0
+_MODEL_MAX_GRADIENT = 20.0
+
+# 2% buckets from -20 to +20
+_BUCKET_WIDTH = 2
+_BUCKETS = np.arange(-_MODEL_MAX_GRADIENT, _MODEL_MAX_GRADIENT + _BUCKET_WIDTH, _BUCKET_WIDTH).astype(int)
+
+_SCAN_CHUNK_ROWS = 50_000
+
+# Sufficient statistics kept per gradient band and per 2% bucket, in
+# workout_terrain_stats column order. x = gradient_pct, y = heart_rate.
+STAT_COLUMNS = (
+    "point_count",
+    "sum_hr",
+    "sum_pace",
+    "sum_gap",
+    "sum_speed_per_hr",
+    "sum_grad",
+    "sum_grad_hr",
+    "sum_grad_sq",
+    "sum_hr_sq",
+)
+
+# workout_terrain_stats.grouping values: band rows cover |gradient| <= 30
+# (group_key = index into GRADIENT_BANDS), grade2 rows |gradient| <= 20
+# (group_key = bucket gradient, e.g. -4)
+BAND_GROUPING  = "band"
+GRADE2_GROUPING = "grade2"
+
+# Bump when the bands, buckets, point filters or sums change
+TERRAIN_STATS_VERSION = 1
+
+
+def _group_sums(hr: np.ndarray, pace: np.ndarray, grad: np.ndarray, group: np.ndarray, n_groups: int) -> np.ndarray:
+    """(n_groups, len(STAT_COLUMNS)) matrix of per-group sums."""
+    weights = (
+        None,
+        hr,
+        pace,
+        pace * gap_multipliers(grad),
+        1000.0 / (pace * 60.0) / hr,
+        grad,
+        grad * hr,
+        grad * grad,
+        hr * hr,
+    )
+    return np.stack(
+        [np.bincount(group, weights=w, minlength=n_groups) for w in weights], axis=1
+    ).astype(np.float64)
+
+
+def _valid_points(hr: np.ndarray, pace: np.ndarray, grad: np.ndarray) -> np.ndarray:
+    """Mask matching the scan query's filters (NaN compares false, so NULLs drop)."""
+    with np.errstate(invalid="ignore"):
+        return (
+            (hr > 40) & (pace > 0) & (pace < 20)
+            & (grad >= -_CURVE_MAX_GRADIENT) & (grad <= _CURVE_MAX_GRADIENT)
+        )
+
+
+class TerrainAccumulator:
+    """
+    Streaming sums behind the HR-gradient curve, grade cost model and
+    optimal gradient. Feed (heart_rate, pace, gradient_pct) chunks with
+    add(), or pre-aggregated workout_terrain_stats rows with add_stats();
+    results are read from the accumulated sums at any point.
+    """
+
+    def __init__(self):
+        self.bands   = np.zeros((len(GRADIENT_BANDS), len(STAT_COLUMNS)))
+        self.buckets = np.zeros((len(_BUCKETS), len(STAT_COLUMNS)))
+
+    def add(self, hr: np.ndarray, pace: np.ndarray, grad: np.ndarray) -> None:
+        self.bands += _group_sums(hr, pace, grad, np.digitize(grad, _BAND_EDGES), len(GRADIENT_BANDS))
+
+        inner = np.abs(grad) <= _MODEL_MAX_GRADIENT
+        hr, pace, grad = hr[inner], pace[inner], grad[inner]
+        # np.rint rounds half to even, like round() in the per-row version
+        bucket = np.rint(grad / _BUCKET_WIDTH).astype(int) + len(_BUCKETS) // 2
+        self.buckets += _group_sums(hr, pace, grad, bucket, len(_BUCKETS))
+
+    def add_stats(self, grouping: str, group_key: int, values) -> None:
+        """Add one (grouping, group_key) row of sums, in STAT_COLUMNS order."""
+        if grouping == BAND_GROUPING:
+            self.bands[group_key] += values
+        elif grouping == GRADE2_GROUPING:
+            self.buckets[(group_key + int(_MODEL_MAX_GRADIENT)) // _BUCKET_WIDTH] += values
+        else:
+            raise ValueError(f"unknown terrain stats grouping: {grouping!r}")
+
+    def stats_rows(self) -> list[tuple]:
+        """
+        Every group as a (grouping, group_key, *sums) workout_terrain_stats
+        row. Empty groups are kept so that a workout with current-version
+        rows is known to be summarised, even if no point qualified.
+        """
+        rows = []
+        for grouping, keys, sums in (
+            (BAND_GROUPING,   range(len(GRADIENT_BANDS)), self.bands),
+            (GRADE2_GROUPING, _BUCKETS,                   self.buckets),
+        ):
+            for key, row in zip(keys, sums):
+                rows.append((grouping, int(key), int(row[0]), *(float(v) for v in row[1:])))
+        return rows
+
+    # ------------------------------------------------------------------
+
+    def hr_gradient_curve(self) -> list[dict]:
+        result = []
+        for i, (name, _, _) in enumerate(GRADIENT_BANDS):
+            count, sum_hr, sum_pace, sum_gap = self.bands[i, :4]
+            if count < 10:
+                continue
+            avg_hr   = sum_hr   / count
+            avg_pace = sum_pace / count
+            avg_gap  = sum_gap  / count
+            speed_ms = 1000.0 / (avg_pace * 60.0)
+            result.append({
+                "band":         name,
+                "gradient_mid": BAND_MID[name],
+                "avg_hr":       round(float(avg_hr),   1),
+                "avg_pace":     round(float(avg_pace), 3),
+                "avg_gap":      round(float(avg_gap),  3),
+                "efficiency":   round(float(speed_ms / avg_hr), 6),
+                "count":        int(count),
+            })
+        return result
+
+    def grade_cost_model(self) -> Optional[dict]:
+        total = dict(zip(STAT_COLUMNS, self.buckets.sum(axis=0)))
+        n = total["point_count"]
+        if n < 100:
+            return None
+
+        mean_x = total["sum_grad"] / n
+        mean_y = total["sum_hr"] / n
+        c_xx = total["sum_grad_sq"] - total["sum_grad"] * mean_x
+        c_yy = total["sum_hr_sq"]   - total["sum_hr"] * mean_y
+        c_xy = total["sum_grad_hr"] - total["sum_grad"] * mean_y
+        if c_xx <= 0:
+            return None
+
+        slope     = c_xy / c_xx
+        intercept = mean_y - slope * mean_x
+        # For a least-squares line, 1 - SS_res/SS_tot == SS_xy² / (SS_xx · SS_yy)
+        r2 = c_xy ** 2 / (c_xx * c_yy) if c_yy > 0 else 0.0
+
+        # Minetti theoretical: at typical running pace (~3 m/s = 5:33/km),
+        # estimate HR cost per 1% grade from metabolic cost ratio × typical HR (~150 bpm)
+        typical_hr = mean_y
+        cost_flat  = _minetti_cost_from_module(0.0)
+        cost_1pct  = _minetti_cost_from_module(0.01)
+        minetti_expected = (cost_1pct / cost_flat - 1.0) * typical_hr
+
+        return {
+            "slope_bpm_per_pct":  round(float(slope), 3),
+            "intercept":          round(float(intercept), 1),
+            "r_squared":          round(float(r2), 4),
+            "n_points":           int(n),
+            "minetti_expected":   round(float(minetti_expected), 3),
+            "mean_hr":            round(float(mean_y), 1),
+        }
+
+    def optimal_gradient(self) -> Optional[dict]:
+        bands = [
+            {
+                "gradient_pct":  int(b),
+                "speed_per_hr":  round(float(row[4] / row[0]), 7),
+                "count":         int(row[0]),
+            }
+            for b, row in zip(_BUCKETS, self.buckets)
+            if row[0] >= 20
+        ]
+
+        if not bands:
+            return None
+
+        optimal = max(bands, key=lambda x: x["speed_per_hr"])
+
+        return {
+            "bands":           bands,
+            "optimal_gradient": optimal["gradient_pct"],
+            "optimal_efficiency": optimal["speed_per_hr"],
+        }
+
+
+def scan_terrain(
+    days: int = 365, sport: str = "running", conn=None, chunk_rows: int = _SCAN_CHUNK_ROWS
+) -> TerrainAccumulator:
+    """
+    Stream every qualifying raw data point once through a server-side
+    cursor, chunk by chunk, into a TerrainAccumulator. Reference path for
+    load_terrain_stats (recompute_derived.py --verify-terrain).
+    """
+    close = conn is None
+    if conn is None:
+        conn = get_connection()
+
+    acc = TerrainAccumulator()
+    try:
+        with conn.cursor(name="terrain_scan") as cur:
+            cur.itersize = chunk_rows
+            cur.execute("""
+                SELECT wm.heart_rate, wm.pace, wm.gradient_pct
+                FROM workout_metrics wm
+                JOIN workouts w ON w.workout_id = wm.workout_id
+                WHERE w.user_id = 1
+                  AND w.sport = %s
+                  AND w.workout_date >= CURRENT_DATE - (%s * INTERVAL '1 day')
+                  AND wm.heart_rate IS NOT NULL AND wm.heart_rate > 40
+                  AND wm.pace IS NOT NULL AND wm.pace > 0 AND wm.pace < 20
+                  AND wm.gradient_pct IS NOT NULL
+                  AND wm.gradient_pct BETWEEN %s AND %s
+            """, (sport, days, -_CURVE_MAX_GRADIENT, _CURVE_MAX_GRADIENT))
+            while True:
+                rows = cur.fetchmany(chunk_rows)
+                if not rows:
+                    break
+                chunk = np.array(rows, dtype=np.float64)
+                acc.add(chunk[:, 0], chunk[:, 1], chunk[:, 2])
+    finally:
+        if close:
+            conn.close()
+
+    return acc
+
+
+def load_terrain_stats(days: int = 365, sport: str = "running", conn=None) -> TerrainAccumulator:
+    """
+    Sum the per-workout workout_terrain_stats rows in the window into a
+    TerrainAccumulator — a few hundred summary rows instead of every raw point.
+    Only rows at TERRAIN_STATS_VERSION count; workouts with stale or
+    missing rows are summed from their series (not written back).
+    """
+    close = conn is None
+    if conn is None:
+        conn = get_connection()
+
+    try:
+        cur = conn.cursor()
+        cur.execute(f"""
+            SELECT s.grouping, s.group_key, {", ".join(f"SUM(s.{c})" for c in STAT_COLUMNS)}
+            FROM workout_terrain_stats s
+            JOIN workouts w ON w.workout_id = s.workout_id
+            WHERE w.user_id = 1
+              AND w.sport = %s
+              AND w.workout_date >= CURRENT_DATE - (%s * INTERVAL '1 day')
+              AND s.stats_version = %s
+            GROUP BY s.grouping, s.group_key
+        """, (sport, days, TERRAIN_STATS_VERSION))
+        rows = cur.fetchall()
+
+        # Current-version rows exist for every summarised workout, empty groups included
+        cur.execute("""
+            SELECT w.workout_id
+            FROM workouts w
+            WHERE w.user_id = 1
+              AND w.sport = %s
+              AND w.workout_date >= CURRENT_DATE - (%s * INTERVAL '1 day')
+              AND w.metrics_row_count > 0
+              AND NOT EXISTS (
+                  SELECT 1 FROM workout_terrain_stats t
+                  WHERE t.workout_id = w.workout_id AND t.stats_version = %s
+              )
+        """, (sport, days, TERRAIN_STATS_VERSION))
+        stale = [r[0] for r in cur.fetchall()]
+        cur.close()
+
+        acc = TerrainAccumulator()
+        for grouping, group_key, *sums in rows:
+            acc.add_stats(grouping, group_key, np.array(sums, dtype=np.float64))
+
+        for _, series in iter_workout_series(stale, ("heart_rate", "pace", "gradient_pct"), conn):
+            hr, pace, grad = series["heart_rate"], series["pace"], series["gradient_pct"]
+            valid = _valid_points(hr, pace, grad)
+            if valid.any():
+                acc.add(hr[valid], pace[valid], grad[valid])
+        return acc
+    finally:
+        if close:
+            conn.close()
+
+
+def workout_terrain_stats(hr, pace, grad) -> list[tuple]:
+    """
+    workout_terrain_stats rows for one workout's series (float arrays,
+    NaN = NULL), using the same point filters as the raw scan.
+    """
+    hr, pace, grad = (np.asarray(a, dtype=np.float64) for a in (hr, pace, grad))
+    valid = _valid_points(hr, pace, grad)
+    acc = TerrainAccumulator()
+    if valid.any():
+        acc.add(hr[valid], pace[valid], grad[valid])
+    return acc.stats_rows()
+
+
+def insert_terrain_stats(cursor, rows: list[tuple]) -> None:
+    """
+    Bulk-insert (workout_id, grouping, group_key, *sums) rows at
+    TERRAIN_STATS_VERSION in one statement. Does not commit.
+    """
+    if not rows:
+        return
+    columns = list(zip(*rows))
+    types = ["int", "varchar", "smallint", "int"] + ["float8"] * (len(STAT_COLUMNS) - 1)
+    cursor.execute(
+        f"""
+        INSERT INTO workout_terrain_stats
+            (workout_id, grouping, group_key, stats_version, {", ".join(STAT_COLUMNS)})
+        SELECT v.workout_id, v.grouping, v.group_key, %s, {", ".join(f"v.{c}" for c in STAT_COLUMNS)}
+        FROM unnest({", ".join(f"%s::{t}[]" for t in types)})
+            AS v(workout_id, grouping, group_key, {", ".join(STAT_COLUMNS)})
+        """,
+        (TERRAIN_STATS_VERSION, *(list(c) for c in columns)),
+    )
+
+
+def replace_terrain_stats(cursor, workout_id: int, hr, pace, grad) -> int:
+    """
+    Rewrite a workout's workout_terrain_stats rows from its series.
+    Does not commit. Returns the number of rows written.
+    """
+    rows = [(workout_id, *row) for row in workout_terrain_stats(hr, pace, grad)]
+    cursor.execute("DELETE FROM workout_terrain_stats WHERE workout_id = %s", (workout_id,))
+    insert_terrain_stats(cursor, rows)
+    return len(rows)
 
 
 def get_hr_gradient_curve(days: int = 365, sport: str = "running", conn=None) -> list[dict]:
@@ -65,67 +409,7 @@ def get_hr_gradient_curve(days: int = 365, sport: str = "running", conn=None) ->
         efficiency      : float  (speed_ms / HR — higher = more efficient)
         count           : int
     """
-    close = conn is None
-    if conn is None:
-        conn = get_connection()
-
-    cur = conn.cursor()
-    cur.execute("""
-        SELECT wm.heart_rate, wm.pace, wm.gradient_pct
-        FROM workout_metrics wm
-        JOIN workouts w ON w.workout_id = wm.workout_id
-        WHERE w.user_id = 1
-          AND w.sport = %s
-          AND w.workout_date >= CURRENT_DATE - (%s * INTERVAL '1 day')
-          AND wm.heart_rate IS NOT NULL AND wm.heart_rate > 40
-          AND wm.pace IS NOT NULL AND wm.pace > 0 AND wm.pace < 20
-          AND wm.gradient_pct IS NOT NULL
-          AND wm.gradient_pct BETWEEN -30 AND 30
-    """, (sport, days))
-    rows = cur.fetchall()
-
-    if close:
-        conn.close()
-
-    if not rows:
-        return []
-
-    # Accumulate per band
-    band_data: dict[str, dict] = {
-        name: {"hr": [], "pace": [], "gap": []}
-        for name, _, _ in GRADIENT_BANDS
-    }
-    band_mid = {
-        "steep_down": -10.0, "down": -6.0, "slight_down": -2.5,
-        "flat": 0.0, "slight_up": 2.5, "up": 6.0, "steep_up": 10.0,
-    }
-
-    for hr, pace, grad in rows:
-        band = _band_for(grad)
-        band_data[band]["hr"].append(hr)
-        band_data[band]["pace"].append(pace)
-        band_data[band]["gap"].append(pace * gap_multiplier(grad))
-
-    result = []
-    for name, _, _ in GRADIENT_BANDS:
-        d = band_data[name]
-        if len(d["hr"]) < 10:
-            continue
-        avg_hr   = sum(d["hr"])   / len(d["hr"])
-        avg_pace = sum(d["pace"]) / len(d["pace"])
-        avg_gap  = sum(d["gap"])  / len(d["gap"])
-        speed_ms = 1000.0 / (avg_pace * 60.0)
-        result.append({
-            "band":         name,
-            "gradient_mid": band_mid[name],
-            "avg_hr":       round(avg_hr,   1),
-            "avg_pace":     round(avg_pace, 3),
-            "avg_gap":      round(avg_gap,  3),
-            "efficiency":   round(speed_ms / avg_hr, 6),
-            "count":        len(d["hr"]),
-        })
-
-    return result
+    return load_terrain_stats(days, sport, conn).hr_gradient_curve()
 
 
 # ---------------------------------------------------------------------------
@@ -144,79 +428,8 @@ def get_elevation_hr_decoupling(workout_id: int, conn=None) -> Optional[dict]:
 
     Returns dict or None if insufficient elevation data.
     """
-    close = conn is None
-    if conn is None:
-        conn = get_connection()
-
-    cur = conn.cursor()
-    cur.execute("""
-        SELECT metric_timestamp, heart_rate, pace, altitude, gradient_pct
-        FROM workout_metrics
-        WHERE workout_id = %s
-          AND altitude IS NOT NULL
-          AND heart_rate IS NOT NULL AND heart_rate > 40
-          AND pace IS NOT NULL AND pace > 0 AND pace < 20
-        ORDER BY metric_timestamp
-    """, (workout_id,))
-    rows = cur.fetchall()
-
-    if close:
-        conn.close()
-
-    if len(rows) < 50:
-        return None
-
-    # Compute cumulative elevation gain
-    cum_gain = 0.0
-    points = []
-    prev_alt = rows[0][3]
-    for ts, hr, pace, alt, grad in rows:
-        d_alt = alt - prev_alt
-        if d_alt > 0:
-            cum_gain += d_alt
-        points.append((hr, pace, grad, cum_gain))
-        prev_alt = alt
-
-    if cum_gain < 20:   # less than 20m total gain → not meaningful
-        return None
-
-    # Split into quartiles by cumulative gain
-    q_size = cum_gain / 4
-    quartiles = [[], [], [], []]
-    for hr, pace, grad, cg in points:
-        q = min(3, int(cg / q_size))
-        quartiles[q].append((hr, pace, grad))
-
-    def avg(data, idx):
-        vals = [r[idx] for r in data if r[idx] is not None]
-        return sum(vals) / len(vals) if vals else None
-
-    result = {
-        "workout_id":   workout_id,
-        "total_gain_m": round(cum_gain, 1),
-        "quartiles":    [],
-    }
-
-    for i, q in enumerate(quartiles):
-        if not q:
-            continue
-        a_hr   = avg(q, 0)
-        a_pace = avg(q, 1)
-        a_grad = avg(q, 2)
-        a_gap  = None
-        if a_pace and a_grad is not None:
-            a_gap = round(a_pace * gap_multiplier(a_grad), 3)
-
-        result["quartiles"].append({
-            "quartile":    i + 1,
-            "count":       len(q),
-            "avg_hr":      round(a_hr,   1) if a_hr   else None,
-            "avg_pace":    round(a_pace, 3) if a_pace else None,
-            "avg_gap":     a_gap,
-            "avg_gradient": round(a_grad, 2) if a_grad is not None else None,
-        })
-
-    return result
+    series = load_workout_series(workout_id, kernel.ELEVATION_COLUMNS, conn)
+    return kernel.elevation_quartiles(workout_id, series) if series else None
 
 
 # ---------------------------------------------------------------------------
@@ -225,79 +438,17 @@ def get_elevation_hr_decoupling(workout_id: int, conn=None) -> Optional[dict]:
 
 def get_grade_cost_model(days: int = 365, sport: str = "running", conn=None) -> Optional[dict]:
     """
-    Fit a linear model: HR ~ α + β × gradient_pct  (at matched pace bands).
-
-    To isolate gradient effect from pace effect, we group points into pace
-    bands (1 min/km wide) and within each band compute gradient vs HR.
+    Fit a linear model: HR ~ α + β × gradient_pct over points within ±20%.
 
     Returns:
         slope_bpm_per_pct : float  (HR cost per 1% gradient)
         intercept         : float
         r_squared         : float
+        n_points          : int
         minetti_expected  : float  (theoretical HR cost from Minetti model)
-        pace_bands        : list of {pace_band, slope} (per-pace-band slopes)
+        mean_hr           : float
     """
-    close = conn is None
-    if conn is None:
-        conn = get_connection()
-
-    cur = conn.cursor()
-    cur.execute("""
-        SELECT wm.heart_rate, wm.pace, wm.gradient_pct
-        FROM workout_metrics wm
-        JOIN workouts w ON w.workout_id = wm.workout_id
-        WHERE w.user_id = 1
-          AND w.sport = %s
-          AND w.workout_date >= CURRENT_DATE - (%s * INTERVAL '1 day')
-          AND wm.heart_rate IS NOT NULL AND wm.heart_rate > 40
-          AND wm.pace IS NOT NULL AND wm.pace > 0 AND wm.pace < 20
-          AND wm.gradient_pct IS NOT NULL
-          AND wm.gradient_pct BETWEEN -20 AND 20
-    """, (sport, days))
-    rows = cur.fetchall()
-
-    if close:
-        conn.close()
-
-    if len(rows) < 100:
-        return None
-
-    # Simple linear regression: y=HR, x=gradient_pct
-    xs = [r[2] for r in rows]
-    ys = [r[0] for r in rows]
-    n  = len(xs)
-
-    mean_x = sum(xs) / n
-    mean_y = sum(ys) / n
-    ss_xy  = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
-    ss_xx  = sum((x - mean_x) ** 2 for x in xs)
-
-    if ss_xx == 0:
-        return None
-
-    slope     = ss_xy / ss_xx
-    intercept = mean_y - slope * mean_x
-
-    # R²
-    ss_res = sum((y - (slope * x + intercept)) ** 2 for x, y in zip(xs, ys))
-    ss_tot = sum((y - mean_y) ** 2 for y in ys)
-    r2 = 1 - ss_res / ss_tot if ss_tot > 0 else 0.0
-
-    # Minetti theoretical: at typical running pace (~3 m/s = 5:33/km),
-    # estimate HR cost per 1% grade from metabolic cost ratio × typical HR (~150 bpm)
-    typical_hr = mean_y
-    cost_flat  = _minetti_cost_from_module(0.0)
-    cost_1pct  = _minetti_cost_from_module(0.01)
-    minetti_expected = (cost_1pct / cost_flat - 1.0) * typical_hr
-
-    return {
-        "slope_bpm_per_pct":  round(slope, 3),
-        "intercept":          round(intercept, 1),
-        "r_squared":          round(r2, 4),
-        "n_points":           n,
-        "minetti_expected":   round(minetti_expected, 3),
-        "mean_hr":            round(mean_y, 1),
-    }
+    return load_terrain_stats(days, sport, conn).grade_cost_model()
 
 
 def _minetti_cost_from_module(g: float) -> float:
@@ -315,84 +466,22 @@ def get_optimal_gradient(days: int = 365, sport: str = "running", conn=None) ->
 
     Returns list of {gradient_pct, speed_per_hr, count} and the optimal band.
     """
-    close = conn is None
-    if conn is None:
-        conn = get_connection()
-
-    cur = conn.cursor()
-    cur.execute("""
-        SELECT wm.heart_rate, wm.pace, wm.gradient_pct
-        FROM workout_metrics wm
-        JOIN workouts w ON w.workout_id = wm.workout_id
-        WHERE w.user_id = 1
-          AND w.sport = %s
-          AND w.workout_date >= CURRENT_DATE - (%s * INTERVAL '1 day')
-          AND wm.heart_rate IS NOT NULL AND wm.heart_rate > 40
-          AND wm.pace IS NOT NULL AND wm.pace > 0 AND wm.pace < 20
-          AND wm.gradient_pct IS NOT NULL
-          AND wm.gradient_pct BETWEEN -20 AND 20
-    """, (sport, days))
-    rows = cur.fetchall()
-
-    if close:
-        conn.close()
-
-    if not rows:
-        return None
-
-    buckets: dict[int, list[float]] = {}
-    for hr, pace, grad in rows:
-        speed_ms = 1000.0 / (pace * 60.0)
-        efficiency = speed_ms / hr
-        b = round(grad / 2) * 2   # 2% buckets
-        if b not in buckets:
-            buckets[b] = []
-        buckets[b].append(efficiency)
-
-    bands = [
-        {
-            "gradient_pct":  b,
-            "speed_per_hr":  round(sum(v) / len(v), 7),
-            "count":         len(v),
-        }
-        for b, v in sorted(buckets.items())
-        if len(v) >= 20
-    ]
-
-    if not bands:
-        return None
-
-    optimal = max(bands, key=lambda x: x["speed_per_hr"])
-
-    return {
-        "bands":           bands,
-        "optimal_gradient": optimal["gradient_pct"],
-        "optimal_efficiency": optimal["speed_per_hr"],
-    }
+    return load_terrain_stats(days, sport, conn).optimal_gradient()
 
 
 # ---------------------------------------------------------------------------
 # Combined summary for Streamlit / notebooks
 # ---------------------------------------------------------------------------
 
-def get_terrain_summary(days: int = 365, conn=None) -> dict:
+def get_terrain_summary(days: int = 365, sport: str = "running", conn=None) -> dict:
     """
-    Returns all terrain response analytics as a single dict.
-    Used by the Streamlit page and notebooks.
+    Returns all terrain response analytics as a single dict, from one
+    workout_terrain_stats query. Used by the API, the Streamlit page and notebooks.
     """
-    close = conn is None
-    if conn is None:
-        conn = get_connection()
-
-    curve   = get_hr_gradient_curve(days=days, conn=conn)
-    model   = get_grade_cost_model(days=days,  conn=conn)
-    optimal = get_optimal_gradient(days=days,  conn=conn)
-
-    if close:
-        conn.close()
+    acc = load_terrain_stats(days, sport, conn)
 
     return {
-        "hr_gradient_curve": curve,
-        "grade_cost_model":  model,
-        "optimal_gradient":  optimal,
+        "hr_gradient_curve": acc.hr_gradient_curve(),
+        "grade_cost_model":  acc.grade_cost_model(),
+        "optimal_gradient":  acc.optimal_gradient(),
     }
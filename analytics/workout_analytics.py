@@ -0,0 +1,168 @@
+"""
+analytics/workout_analytics.py
+
+Persisted per-workout analytics.
+
+A finished workout's GAP, decoupling, REI, biomechanics averages, fatigue
+drift and elevation gain never change, so they are computed once by the
+kernel (analytics/kernel.py) and stored in workout_analytics, keyed by
+workout_id:
+
+  - at ingest, from the batch that was just written (metrics_ingest.py)
+  - by recompute_derived.py, in parallel, when ANALYTICS_VERSION is bumped
+
+Trend queries read the table with one range query over the window.
+Workouts whose row is missing or from an older ANALYTICS_VERSION are
+computed on the fly from one bulk series scan, so results never depend
+on the backfill having run.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import numpy as np
+
+from analytics import kernel
+from analytics.workout_series import iter_workout_series
+
+# Bump whenever a kernel metric or the columns below change; rows with an
+# older version are recomputed by recompute_derived.py (and on read).
+ANALYTICS_VERSION = 1
+
+ANALYTICS_COLUMNS = (
+    # running economy
+    "avg_pace",
+    "avg_gap",
+    "gap_vs_pace_pct",
+    "decoupling_pct",
+    "decoupling_status",
+    "rei",
+    "rei_mode",
+    # biomechanics
+    "avg_cadence",
+    "avg_gct",
+    "avg_vo",
+    "avg_vr",
+    "avg_hr",
+    "fatigue_score",
+    "cadence_drift_pct",
+    "gct_drift_pct",
+    "hr_drift_pct",
+    # terrain
+    "elevation_gain_m",
+)
+
+
+def compute_analytics(workout_id: int, series: Optional[dict[str, np.ndarray]]) -> dict:
+    """workout_analytics values for one workout's series (kernel.ALL_COLUMNS)."""
+    row = dict.fromkeys(ANALYTICS_COLUMNS)
+    if not series or len(series["pace"]) == 0:
+        return row
+
+    gap    = kernel.gap_summary(workout_id, series)
+    decoup = kernel.aerobic_decoupling(workout_id, series)
+    rei    = kernel.economy_index(workout_id, series)
+    bio    = kernel.biomechanics_summary(workout_id, series)
+    fat    = kernel.fatigue_signature(workout_id, series)
+
+    if gap:
+        row.update(avg_pace=gap["avg_pace"], avg_gap=gap["avg_gap"], gap_vs_pace_pct=gap["gap_vs_pace_pct"])
+    if decoup:
+        row.update(decoupling_pct=decoup["decoupling_pct"], decoupling_status=decoup["status"])
+    if rei:
+        row.update(rei=rei["rei"], rei_mode=rei["mode"])
+    if bio:
+        row.update({k: bio[k] for k in ("avg_cadence", "avg_gct", "avg_vo", "avg_vr", "avg_hr")})
+    if fat:
+        row.update(
+            fatigue_score=fat["fatigue_score"],
+            cadence_drift_pct=fat["cadence_drift_pct"],
+            gct_drift_pct=fat["ground_contact_time_drift_pct"],
+            hr_drift_pct=fat["heart_rate_drift_pct"],
+        )
+    row["elevation_gain_m"] = kernel.elevation_gain(series)
+    return row
+
+
+def moving_series(batch) -> Optional[dict[str, np.ndarray]]:
+    """
+    Kernel series from a full, unfiltered series (a metrics_parser batch
+    or an iter_workout_series(moving_only=False) workout), with the
+    loader's 0 < pace < 20 filter applied — what load_workout_series
+    returns for the stored workout.
+    """
+    if not batch:
+        return None
+    with np.errstate(invalid="ignore"):
+        moving = (batch["pace"] > 0) & (batch["pace"] < 20)
+    return {col: np.asarray(batch[col], dtype=np.float64)[moving] for col in kernel.ALL_COLUMNS}
+
+
+_TEXT_COLUMNS = {"decoupling_status", "rei_mode"}
+
+_UPSERT_SQL = f"""
+    INSERT INTO workout_analytics (workout_id, analytics_version, computed_at, {", ".join(ANALYTICS_COLUMNS)})
+    SELECT v.workout_id, %s, NOW(), {", ".join(f"v.{c}" for c in ANALYTICS_COLUMNS)}
+    FROM unnest(%s::int[], {", ".join(
+        f"%s::{'varchar' if c in _TEXT_COLUMNS else 'float8'}[]" for c in ANALYTICS_COLUMNS
+    )}) AS v(workout_id, {", ".join(ANALYTICS_COLUMNS)})
+    ON CONFLICT (workout_id) DO UPDATE SET
+        analytics_version = EXCLUDED.analytics_version,
+        computed_at       = EXCLUDED.computed_at,
+        {", ".join(f"{c} = EXCLUDED.{c}" for c in ANALYTICS_COLUMNS)}
+"""
+
+
+def upsert_analytics_rows(cursor, rows: list[tuple[int, dict]]) -> None:
+    """
+    Write (workout_id, compute_analytics dict) pairs in one statement, one
+    array per column. Does not commit.
+    """
+    if not rows:
+        return
+    cursor.execute(
+        _UPSERT_SQL,
+        (
+            ANALYTICS_VERSION,
+            [wid for wid, _ in rows],
+            *([row[c] for _, row in rows] for c in ANALYTICS_COLUMNS),
+        ),
+    )
+
+
+def replace_workout_analytics(cursor, workout_id: int, series: Optional[dict[str, np.ndarray]]) -> dict:
+    """Compute and store one workout's analytics. Does not commit."""
+    row = compute_analytics(workout_id, series)
+    upsert_analytics_rows(cursor, [(workout_id, row)])
+    return row
+
+
+def load_running_analytics(days: int, conn) -> list[dict]:
+    """
+    Running / trail running workouts in the last `days` days with their
+    workout_analytics values, sorted by workout_date. Stale or missing
+    rows are computed from the raw series (not written back).
+    """
+    cur = conn.cursor()
+    cur.execute(f"""
+        SELECT w.workout_id, w.workout_date, w.sport, w.training_volume,
+               w.avg_heart_rate, w.normalized_power, a.analytics_version,
+               {", ".join(f"a.{c}" for c in ANALYTICS_COLUMNS)}
+        FROM workouts w
+        LEFT JOIN workout_analytics a ON a.workout_id = w.workout_id
+        WHERE w.user_id = 1
+          AND w.sport IN ('running', 'trail_running')
+          AND w.workout_date >= CURRENT_DATE - (%s * INTERVAL '1 day')
+        ORDER BY w.workout_date
+    """, (days,))
+    names = [d[0] for d in cur.description]
+    rows = [dict(zip(names, r)) for r in cur.fetchall()]
+    cur.close()
+
+    stale = {r["workout_id"]: r for r in rows if r["analytics_version"] != ANALYTICS_VERSION}
+    for wid, series in iter_workout_series(list(stale), kernel.ALL_COLUMNS, conn):
+        stale.pop(wid).update(compute_analytics(wid, series))
+    for wid, r in stale.items():   # no points at all
+        r.update(compute_analytics(wid, None))
+    return rows
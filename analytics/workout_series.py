@@ -0,0 +1,150 @@
+"""
+analytics/workout_series.py
+
+Bulk loader for workout_metrics time series.
+
+Multi-workout trends need several columns of every run in a window.
+Instead of one or more queries per workout, iter_workout_series streams
+them all through a single server-side cursor ordered by
+(workout_id, metric_timestamp) — the order of the UNIQUE index — and
+yields one workout at a time as NumPy column arrays (NULL → NaN). Only the
+current workout and one fetch chunk are held in memory.
+
+Every per-run metric (analytics/kernel.py) ignores points outside
+0 < pace < 20 min/km (GPS glitches), so by default the loader applies that
+filter server-side and the kernel functions assume it. Derivation jobs
+that rewrite stored values pass moving_only=False to get every point
+(and metric_id / distance).
+
+With SERIES_BACKEND=files, workouts that have a file in the columnar
+series store (analytics/series_store.py) are read from it instead, and
+only the rest are queried.
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+
+from analytics import series_store
+from db import get_connection
+
+
+SERIES_COLUMNS = (
+    "heart_rate",
+    "pace",
+    "cadence",
+    "vertical_oscillation",
+    "vertical_ratio",
+    "ground_contact_time",
+    "power",
+    "altitude",
+    "gradient_pct",
+    # full-series readers only (derivation and retention jobs)
+    "distance",
+    "latitude",
+    "longitude",
+    "altitude_min",
+    "altitude_max",
+    "metric_id",
+    "metric_epoch",
+)
+
+# Columns computed in the query; metric_epoch is metric_timestamp in seconds
+_EXPRESSIONS = {"metric_epoch": "EXTRACT(EPOCH FROM metric_timestamp)"}
+
+_CHUNK_ROWS = 50_000
+
+
+def _series_query(columns: Sequence[str], moving_only: bool) -> str:
+    unknown = set(columns) - set(SERIES_COLUMNS)
+    if unknown:
+        raise ValueError(f"unknown workout_metrics columns: {sorted(unknown)}")
+    moving = "AND pace IS NOT NULL AND pace > 0 AND pace < 20" if moving_only else ""
+    return f"""
+        SELECT workout_id, {", ".join(_EXPRESSIONS.get(c, c) for c in columns)}
+        FROM workout_metrics
+        WHERE workout_id = ANY(%s)
+          {moving}
+        ORDER BY workout_id, metric_timestamp
+    """
+
+
+def iter_workout_series(
+    workout_ids: Sequence[int],
+    columns: Sequence[str],
+    conn,
+    chunk_rows: int = _CHUNK_ROWS,
+    moving_only: bool = True,
+    from_store: Optional[bool] = None,
+) -> Iterator[tuple[int, dict[str, np.ndarray]]]:
+    """
+    Yield (workout_id, {column: float array}) for every workout in
+    `workout_ids` that has points, in workout_id order, from one query.
+
+    from_store=None follows SERIES_BACKEND; columns the store does not
+    keep (metric_id) are always read from workout_metrics.
+    """
+    if not workout_ids:
+        return
+    if from_store is None:
+        from_store = series_store.store_enabled()
+    if not from_store or not set(columns) <= set(series_store.STORE_COLUMNS):
+        yield from _iter_query(workout_ids, columns, conn, chunk_rows, moving_only)
+        return
+
+    ids = sorted(set(workout_ids))
+    stored = [wid for wid in ids if series_store.has_series(wid)]
+    missing = sorted(set(ids) - set(stored))
+    yield from heapq.merge(
+        series_store.iter_stored_series(stored, columns, moving_only=moving_only),
+        _iter_query(missing, columns, conn, chunk_rows, moving_only) if missing else iter(()),
+        key=lambda item: item[0],
+    )
+
+
+def _iter_query(workout_ids, columns, conn, chunk_rows, moving_only):
+    def emit(parts):
+        data = parts[0] if len(parts) == 1 else np.concatenate(parts)
+        return int(data[0, 0]), {col: data[:, i + 1] for i, col in enumerate(columns)}
+
+    pending: list[np.ndarray] = []
+    with conn.cursor(name="workout_series") as cur:
+        cur.itersize = chunk_rows
+        cur.execute(_series_query(columns, moving_only), (list(workout_ids),))
+        while True:
+            rows = cur.fetchmany(chunk_rows)
+            if not rows:
+                break
+            chunk = np.array(rows, dtype=np.float64)
+            starts = np.flatnonzero(np.diff(chunk[:, 0])) + 1
+            for segment in np.split(chunk, starts):
+                # A workout may continue into the next chunk, so it is only
+                # emitted once a different workout_id shows up.
+                if pending and pending[0][0, 0] != segment[0, 0]:
+                    yield emit(pending)
+                    pending = []
+                pending.append(segment)
+    if pending:
+        yield emit(pending)
+
+
+def load_workout_series(workout_id: int, columns: Sequence[str], conn=None) -> Optional[dict[str, np.ndarray]]:
+    """Series of a single workout, or None if it has no points."""
+    if (series_store.store_enabled() and set(columns) <= set(series_store.STORE_COLUMNS)
+            and series_store.has_series(workout_id)):
+        return series_store.read_series(workout_id, columns)
+
+    close = conn is None
+    if conn is None:
+        conn = get_connection()
+
+    try:
+        for _, series in iter_workout_series([workout_id], columns, conn):
+            return series
+        return None
+    finally:
+        if close:
+            conn.close()
@@ -0,0 +1,110 @@
+"""
+Columnar (struct-of-arrays) responses for the time-series routes.
+
+The default response of a series route is a list of row objects, each
+built and validated as a Pydantic model and encoded key by key. With
+?format=columnar the same data is returned as one array per field,
+
+    {"date": ["2025-01-01", ...], "load": [54.2, ...], ...}
+
+built straight from the DB rows (or NumPy arrays) without per-row models
+and encoded with orjson when it is installed (stdlib json otherwise).
+?format=arrow returns the columns as an Apache Arrow IPC stream
+(needs the optional pyarrow package). Either body is gzip-compressed when
+the client accepts it and it is large enough to be worth it.
+
+Field names are the ones the row format uses (plus any extra columns a
+route documents), so a client can switch formats without remapping.
+"""
+
+import gzip
+import json
+from collections.abc import Mapping, Sequence
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Literal
+
+import numpy as np
+from fastapi import HTTPException, Request
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:          # optional — falls back to stdlib json
+    orjson = None
+
+try:
+    import pyarrow
+except ImportError:          # optional — only needed for format=arrow
+    pyarrow = None
+
+ResponseFormat = Literal["rows", "columnar", "arrow"]
+
+ARROW_MEDIA_TYPE = "application/vnd.apache.arrow.stream"
+
+# Below this the gzip header and CPU cost outweigh the saving
+GZIP_MIN_BYTES = 1024
+
+
+def columns_from_rows(rows: Sequence, names: Sequence[str]) -> dict[str, list]:
+    """Transpose rows (tuples, SQLAlchemy rows or dicts) into {name: [values]}."""
+    if rows and isinstance(rows[0], Mapping):
+        return {name: [row.get(name) for row in rows] for name in names}
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    return {name: list(values) for name, values in zip(names, columns)}
+
+
+def _default(value):
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def _nan_to_none(values):
+    if isinstance(values, np.ndarray) and values.dtype.kind == "f":
+        return [None if v != v else v for v in values.tolist()]
+    return values
+
+
+def encode_json(columns: Mapping[str, Sequence]) -> bytes:
+    """JSON body for the columns; NaN is encoded as null."""
+    if orjson is not None:
+        return orjson.dumps(columns, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(
+        {name: _nan_to_none(values) for name, values in columns.items()},
+        default=_default, separators=(",", ":"),
+    ).encode()
+
+
+def encode_arrow(columns: Mapping[str, Sequence]) -> bytes:
+    """Arrow IPC stream with one record batch holding the columns."""
+    if pyarrow is None:
+        raise HTTPException(status_code=406, detail="format=arrow requires the pyarrow package")
+    table = pyarrow.table({
+        name: pyarrow.array(values, from_pandas=True) if isinstance(values, np.ndarray) else pyarrow.array(values)
+        for name, values in columns.items()
+    })
+    sink = pyarrow.BufferOutputStream()
+    with pyarrow.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def columnar_response(columns: Mapping[str, Sequence], fmt: ResponseFormat, request: Request) -> Response:
+    """Encode columns as JSON (fmt="columnar") or Arrow IPC (fmt="arrow"), gzipped if accepted."""
+    if fmt == "arrow":
+        body, media_type = encode_arrow(columns), ARROW_MEDIA_TYPE
+    else:
+        body, media_type = encode_json(columns), "application/json"
+
+    headers = {"Vary": "Accept-Encoding"}
+    if len(body) >= GZIP_MIN_BYTES and "gzip" in request.headers.get("accept-encoding", ""):
+        body = gzip.compress(body, compresslevel=5)
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=body, media_type=media_type, headers=headers)
@@ -4,6 +4,9 @@ Database and auth dependency injection for FastAPI.
 Provides:
   get_db()             — async SQLAlchemy session
   get_current_user_id()— decodes user_id from JWT Bearer token
+
+The engine records its statements for request instrumentation
+(api/instrumentation.py).
 """
 
 from collections.abc import AsyncGenerator
@@ -13,6 +16,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
+from api.instrumentation import instrument_engine
 from api.services.auth import decode_token
 from api.settings import settings
 
@@ -23,6 +27,7 @@ engine = create_async_engine(
     pool_pre_ping=True,
     echo=settings.db_echo,
 )
+instrument_engine(engine)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
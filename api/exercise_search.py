@@ -0,0 +1,141 @@
+"""
+In-process search-as-you-type index over the exercises taxonomy.
+
+The session builder searches on every keystroke, so the taxonomy is held
+in memory per process and searched without a round trip per query:
+
+  - word prefixes   every query word is a prefix of a word of the name
+                    ("bb ro" → "BB Row"), found by bisect on sorted tokens
+  - trigrams        pg_trgm-style similarity for typos ("benhc" → "Bench"),
+                    for names the prefix pass did not match
+  - filters         primary muscle and equipment, as id sets intersected
+                    before scoring
+
+Results rank by match tier (name starts with the query, word prefixes,
+trigram), then by how often the user logged the exercise recently, then
+by name. The database side (exercises_name_trgm_idx) serves
+StrengthService.list_exercises.
+
+The index is reloaded when exercises gains or loses rows (SIGNATURE_SQL
+of exercise_index.py) or after MAX_AGE_SECONDS, which picks up relabels
+from import_exercises.py.
+"""
+
+import time
+from bisect import bisect_left
+
+from exercise_index import normalize_name
+
+MAX_AGE_SECONDS = 300
+
+# Same cut-off as pg_trgm's default similarity_threshold
+SIMILARITY_THRESHOLD = 0.3
+
+# Starts-with, word prefixes, trigram
+_TIER_START, _TIER_PREFIX, _TIER_TRIGRAM = 3, 2, 1
+
+
+def trigrams(text: str) -> set[str]:
+    """pg_trgm trigrams of a normalized string: each word padded "  w "."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class SearchIndex:
+    """Index over exercise rows with exercise_id, name, primary_muscles and equipment."""
+
+    def __init__(self, exercises):
+        self.exercises = {ex.exercise_id: ex for ex in exercises}
+        self._names: dict[int, str] = {}
+        self._tokens: list[tuple[str, int]] = []
+        self._grams: dict[str, set[int]] = {}
+        self._gram_counts: dict[int, int] = {}
+        self._muscles: dict[str, set[int]] = {}
+        self._equipment: dict[str, set[int]] = {}
+        for exercise_id, ex in self.exercises.items():
+            name = normalize_name(ex.name)
+            self._names[exercise_id] = name
+            self._tokens.extend((token, exercise_id) for token in set(name.split()))
+            grams = trigrams(name)
+            self._gram_counts[exercise_id] = len(grams)
+            for gram in grams:
+                self._grams.setdefault(gram, set()).add(exercise_id)
+            for muscle in ex.primary_muscles or ():
+                self._muscles.setdefault(muscle, set()).add(exercise_id)
+            for item in ex.equipment or ():
+                self._equipment.setdefault(item, set()).add(exercise_id)
+        self._tokens.sort()
+
+    def __len__(self):
+        return len(self.exercises)
+
+    def _with_prefix(self, prefix: str) -> set[int]:
+        ids = set()
+        i = bisect_left(self._tokens, (prefix,))
+        while i < len(self._tokens) and self._tokens[i][0].startswith(prefix):
+            ids.add(self._tokens[i][1])
+            i += 1
+        return ids
+
+    def _filtered(self, muscles, equipment) -> set[int]:
+        ids = set(self.exercises)
+        if muscles:
+            ids &= set().union(*(self._muscles.get(m, ()) for m in muscles))
+        if equipment:
+            ids &= set().union(*(self._equipment.get(e, ()) for e in equipment))
+        return ids
+
+    def search(self, query: str, muscles=(), equipment=(), usage=None, limit: int = 20) -> list[int]:
+        """Ranked exercise ids. muscles / equipment match any of the given values;
+        usage is {exercise_id: times logged}. An empty query lists by usage."""
+        usage = usage or {}
+        candidates = self._filtered(muscles, equipment)
+        query = normalize_name(query)
+
+        scores: dict[int, tuple[int, float]] = {}
+        if not query:
+            scores = {i: (0, 0.0) for i in candidates}
+        else:
+            words = query.split()
+            matched = candidates
+            for word in words:
+                matched = matched & self._with_prefix(word)
+            for i in matched:
+                tier = _TIER_START if self._names[i].startswith(query) else _TIER_PREFIX
+                scores[i] = (tier, 1.0)
+
+            query_grams = trigrams(query)
+            shared: dict[int, int] = {}
+            for gram in query_grams:
+                for i in self._grams.get(gram, ()):
+                    if i in candidates and i not in scores:
+                        shared[i] = shared.get(i, 0) + 1
+            for i, n in shared.items():
+                similarity = n / (len(query_grams) + self._gram_counts[i] - n)
+                if similarity >= SIMILARITY_THRESHOLD:
+                    scores[i] = (_TIER_TRIGRAM, similarity)
+
+        ranked = sorted(
+            scores,
+            key=lambda i: (-scores[i][0], -round(scores[i][1], 1), -usage.get(i, 0), self._names[i]),
+        )
+        return ranked[:limit]
+
+
+_cache: dict = {"signature": None, "loaded_at": 0.0, "index": None}
+
+
+def cached_index(signature) -> SearchIndex | None:
+    """The cached index if it was built at `signature` within MAX_AGE_SECONDS, else None."""
+    if _cache["signature"] != signature or time.monotonic() - _cache["loaded_at"] > MAX_AGE_SECONDS:
+        return None
+    return _cache["index"]
+
+
+def store_index(signature, exercises) -> SearchIndex:
+    index = SearchIndex(exercises)
+    _cache.update(signature=tuple(signature), loaded_at=time.monotonic(), index=index)
+    return index
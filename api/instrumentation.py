@@ -0,0 +1,75 @@
+"""
+Request-level SQL instrumentation for the API.
+
+  instrument_engine()  SQLAlchemy cursor events → the active QueryStats
+                       (query_stats.py); psycopg2 calls made by the sync
+                       modules record through db.get_connection()'s cursor
+  query_stats_middleware
+                       one QueryStats per HTTP request; adds a Server-Timing
+                       header (db;dur=…;desc="N queries") and logs one JSON
+                       line per request on the "api.queries" logger, at
+                       WARNING when a statement repeats REPEAT_THRESHOLD times
+                       or more (N+1)
+
+Tests assert budgets with query_stats.query_budget().
+"""
+
+import json
+import logging
+import time
+
+from fastapi import Request
+from sqlalchemy import event
+
+import query_stats
+
+logger = logging.getLogger("api.queries")
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+
+def instrument_engine(engine):
+    """Record every statement of engine (sync or async) into the active QueryStats."""
+    sync_engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        if query_stats.current() is not None:
+            conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if query_stats.current() is not None and starts:
+            query_stats.record(statement, (time.perf_counter() - starts.pop()) * 1000)
+
+    return engine
+
+
+def server_timing(stats: query_stats.QueryStats) -> str:
+    return f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries"'
+
+
+async def query_stats_middleware(request: Request, call_next):
+    stats, token = query_stats.start()
+    start_time = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        query_stats.stop(token)
+
+    response.headers.append(SERVER_TIMING_HEADER, server_timing(stats))
+    repeated = stats.repeated()
+    logger.log(
+        logging.WARNING if repeated else logging.INFO,
+        json.dumps({
+            "method": request.method,
+            "path": request.url.path,
+            "status": response.status_code,
+            "ms": round((time.perf_counter() - start_time) * 1000, 1),
+            "queries": stats.count,
+            "db_ms": round(stats.total_ms, 1),
+            "repeated": repeated,
+        }),
+    )
+    return response
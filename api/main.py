@@ -15,6 +15,8 @@ from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
+from api.instrumentation import query_stats_middleware
+from api.pagination import NEXT_CURSOR_HEADER
 from api.settings import settings
 from api.routers.v1 import auth, dashboard, training, sleep, strength, checkin, running, sync
 
@@ -30,8 +32,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Query count, DB time and N+1 report per request (Server-Timing + log line)
+app.middleware("http")(query_stats_middleware)
+
 # ------------------------------------------------------------------
 # v1 routers
 # ------------------------------------------------------------------
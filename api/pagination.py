@@ -0,0 +1,56 @@
+"""
+Keyset (cursor) pagination for the listing routes.
+
+A page is the first `limit` rows after the cursor in the listing's sort
+order — `WHERE (key columns) < (cursor values) ORDER BY key DESC LIMIT`
+over an index on (user_id, key columns) — so every page costs the same
+however far back the history goes, unlike OFFSET or one `days` window.
+
+Listings fetch limit + 1 rows; page() trims the extra row and, when it
+was there, returns the next cursor: the last row's key values as
+base64url JSON. Routes send it in the X-Next-Cursor header, so the body
+keeps its list shape; no header means the last page. Without a limit a
+listing returns its whole window as before.
+"""
+
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from datetime import date, datetime
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+_PARSERS = {date: date.fromisoformat, datetime: datetime.fromisoformat, int: int}
+
+
+def encode_cursor(values: Sequence) -> str:
+    raw = json.dumps([v.isoformat() if isinstance(v, (date, datetime)) else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[type]) -> tuple:
+    """Key values from a cursor, parsed as `types`; 400 if it is not a cursor of that shape."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("wrong key length")
+        return tuple(None if v is None else _PARSERS[t](v) for v, t in zip(values, types))
+    except (binascii.Error, UnicodeDecodeError, TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def page(rows: list, limit: int | None, key: Callable) -> tuple[list, str | None]:
+    """(rows of this page, next cursor or None) from the limit + 1 rows fetched."""
+    if limit is None or len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(key(rows[-1]))
+
+
+def set_next_cursor(response: Response, next_cursor: str | None) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
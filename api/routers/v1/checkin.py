@@ -1,9 +1,10 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.deps import get_current_user_id, get_db
+from api.pagination import set_next_cursor
 from api.schemas.checkin import (
     DailyReadinessCreateSchema,
     DailyReadinessSchema,
@@ -101,8 +102,13 @@ async def get_journal(
 
 @router.get("/history", response_model=list[JournalHistoryRowSchema])
 async def get_history(
+    response: Response,
     days: int = Query(default=90, ge=7, le=365),
+    limit: int | None = Query(default=None, ge=1, le=500, description="Page size; the next page's cursor is in X-Next-Cursor"),
+    cursor: str | None = Query(default=None, description="X-Next-Cursor of the previous page"),
     db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user_id),
 ):
-    return await _svc.get_history(db, user_id, days)
+    rows, next_cursor = await _svc.get_history(db, user_id, days, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return rows
@@ -6,9 +6,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from api.deps import get_current_user_id, get_db
 from api.schemas.dashboard import DashboardSchema
 from api.services.dashboard import DashboardService
+from api.services.sync import SyncService
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 _svc = DashboardService()
+_sync = SyncService()
 
 
 @router.get("", response_model=DashboardSchema)
@@ -17,4 +19,6 @@ async def get_dashboard(
     user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
+    # Opening the app bumps the user up the sync scheduler's queue
+    await _sync.touch_last_active(db, user_id)
     return await _svc.get_dashboard(user_id, today, db=db)
@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 
 from api.deps import get_current_user_id
 from api.schemas.running import (
+    BestEffortsSchema,
     BiomechanicsTrendPointSchema,
     ElevationHRDecouplingSchema,
     RunningTrendPointSchema,
@@ -39,6 +40,15 @@ async def get_terrain_summary(
     return await _svc.get_terrain_summary(days, sport)
 
 
+@router.get("/best-efforts", response_model=BestEffortsSchema)
+async def get_best_efforts(
+    days: int | None = Query(default=None, ge=7, le=3650, description="Window in days; all time when omitted"),
+    sport: str = Query(default="running", pattern="^(running|trail_running|cycling)$"),
+    user_id: int = Depends(get_current_user_id),
+):
+    return await _svc.get_best_efforts(days, sport)
+
+
 @router.get("/workouts/{workout_id}/gap", response_model=WorkoutGAPSchema)
 async def get_workout_gap(
     workout_id: int,
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.columnar import ResponseFormat, columnar_response
 from api.deps import get_current_user_id, get_db
+from api.pagination import set_next_cursor
 from api.schemas.sleep import SleepDetailSchema, SleepListItemSchema, SleepTrendPointSchema
 from api.services.sleep import SleepService
 
@@ -11,19 +13,30 @@ _svc = SleepService()
 
 @router.get("", response_model=list[SleepListItemSchema])
 async def list_sleep(
+    response: Response,
     days: int = Query(default=90, ge=7, le=365),
+    limit: int | None = Query(default=None, ge=1, le=500, description="Page size; the next page's cursor is in X-Next-Cursor"),
+    cursor: str | None = Query(default=None, description="X-Next-Cursor of the previous page"),
     db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user_id),
 ):
-    return await _svc.list_sleep(db, user_id, days)
+    nights, next_cursor = await _svc.list_sleep(db, user_id, days, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return nights
 
 
 @router.get("/trends", response_model=list[SleepTrendPointSchema])
 async def get_sleep_trends(
+    request: Request,
     days: int = Query(default=90, ge=7, le=365),
+    fmt: ResponseFormat = Query(
+        default="rows", alias="format", description="rows, columnar ({field: [values]}) or arrow (IPC stream)",
+    ),
     db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user_id),
 ):
+    if fmt != "rows":
+        return columnar_response(await _svc.get_sleep_trend_columns(db, user_id, days), fmt, request)
     return await _svc.get_sleep_trends(db, user_id, days)
 
 
@@ -1,15 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.deps import get_current_user_id, get_db
+from api.pagination import set_next_cursor
 from api.schemas.strength import (
     ExerciseCreateSchema,
+    ExerciseProgressionsSchema,
     ExerciseSchema,
+    MuscleVolumeSchema,
     OneRMPointSchema,
     StrengthSessionCreateSchema,
     StrengthSessionListItemSchema,
     StrengthSessionSchema,
     StrengthWorkoutSchema,
+    UnmatchedExerciseSchema,
 )
 from api.services.strength import StrengthService
 
@@ -23,20 +29,30 @@ _svc = StrengthService()
 
 @router.get("/workouts", response_model=list[StrengthWorkoutSchema])
 async def list_garmin_sessions(
+    response: Response,
     days: int = Query(default=90, ge=7, le=365),
+    limit: int | None = Query(default=None, ge=1, le=500, description="Page size; the next page's cursor is in X-Next-Cursor"),
+    cursor: str | None = Query(default=None, description="X-Next-Cursor of the previous page"),
     db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user_id),
 ):
-    return await _svc.list_garmin_sessions(db, user_id, days)
+    workouts, next_cursor = await _svc.list_garmin_sessions(db, user_id, days, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return workouts
 
 
 @router.get("/sessions", response_model=list[StrengthSessionListItemSchema])
 async def list_sessions(
+    response: Response,
     days: int = Query(default=90, ge=7, le=365),
+    limit: int | None = Query(default=None, ge=1, le=500, description="Page size; the next page's cursor is in X-Next-Cursor"),
+    cursor: str | None = Query(default=None, description="X-Next-Cursor of the previous page"),
     db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user_id),
 ):
-    return await _svc.list_sessions(db, user_id, days)
+    sessions, next_cursor = await _svc.list_sessions(db, user_id, days, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return sessions
 
 
 @router.post("/sessions", response_model=StrengthSessionSchema, status_code=201)
@@ -48,6 +64,18 @@ async def create_session(
     return await _svc.create_session(db, user_id, payload)
 
 
+@router.get("/sessions/details", response_model=list[StrengthSessionSchema])
+async def get_sessions_with_sets(
+    ids: list[int] | None = Query(default=None, description="Session ids; the most recent sessions if omitted"),
+    last: int = Query(default=10, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user_id),
+):
+    if ids and len(ids) > 100:
+        raise HTTPException(status_code=422, detail="At most 100 session ids")
+    return await _svc.get_sessions_with_sets(db, user_id, ids, last)
+
+
 @router.get("/sessions/{session_id}", response_model=StrengthSessionSchema)
 async def get_session_detail(
     session_id: int,
@@ -82,6 +110,19 @@ async def get_tracked_exercises(
     return await _svc.get_tracked_exercises(db, user_id)
 
 
+# ------------------------------------------------------------------
+# Weekly volume per muscle
+# ------------------------------------------------------------------
+
+@router.get("/muscle-volume", response_model=list[MuscleVolumeSchema])
+async def get_muscle_volume(
+    weeks: int = Query(default=12, ge=1, le=104),
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user_id),
+):
+    return await _svc.get_muscle_volume(db, user_id, weeks)
+
+
 # ------------------------------------------------------------------
 # Exercise library
 # ------------------------------------------------------------------
@@ -95,6 +136,40 @@ async def list_exercises(
     return await _svc.list_exercises(db, search)
 
 
+@router.get("/exercises/search", response_model=list[ExerciseSchema])
+async def search_exercises(
+    q: str = Query(default="", max_length=100, description="Typed text; empty lists the most used"),
+    muscle: list[str] = Query(default=[], description="Primary muscle, any of"),
+    equipment: list[str] = Query(default=[], description="Equipment, any of"),
+    limit: int = Query(default=20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user_id),
+):
+    return await _svc.search_exercises(db, user_id, q, muscle, equipment, limit)
+
+
+@router.get("/exercises/progressions", response_model=list[ExerciseProgressionsSchema])
+async def get_progressions(
+    ids: list[int] = Query(description="Exercise ids"),
+    goal: Literal["power", "strength", "hypertrophy", "endurance", "stability"] | None = Query(
+        default=None, description="Goal branch; every branch if omitted"
+    ),
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user_id),
+):
+    if len(ids) > 200:
+        raise HTTPException(status_code=422, detail="At most 200 exercise ids")
+    return await _svc.get_progressions(db, ids, goal)
+
+
+@router.get("/exercises/unmatched", response_model=list[UnmatchedExerciseSchema])
+async def list_unmatched_exercises(
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user_id),
+):
+    return await _svc.list_unmatched_exercises(db, user_id)
+
+
 @router.post("/exercises", response_model=ExerciseSchema, status_code=201)
 async def create_exercise(
     payload: ExerciseCreateSchema,
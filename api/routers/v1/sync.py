@@ -1,72 +1,36 @@
 """
 POST /api/v1/sync  — trigger Garmin + environment data collection.
+GET  /api/v1/sync/runs — recent sync history for the current user.
 
 Runs workout.py → workout_metrics.py → sleep.py → environment.py
 sequentially as subprocesses and injects the user's Garmin credentials
-as environment variables so multi-user sync works correctly.
+as environment variables so multi-user sync works correctly. The same
+pipeline runs for every athlete on a schedule via sync_scheduler.py.
 """
 
-import asyncio
-import os
-import sys
-from pathlib import Path
-
-from fastapi import APIRouter, Depends
-from sqlalchemy import text
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.deps import get_current_user_id, get_db
+from api.schemas.sync import SyncResultSchema, SyncRunSchema
+from api.services.sync import SyncService
 
 router = APIRouter(prefix="/sync", tags=["sync"])
-
-_PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
-
-
-async def _fetch_garmin_creds(user_id: int, db: AsyncSession) -> dict:
-    result = await db.execute(
-        text("SELECT garmin_email, garmin_password FROM user_profile WHERE user_id = :uid"),
-        {"uid": user_id},
-    )
-    row = result.fetchone()
-    if row and row.garmin_email and row.garmin_password:
-        return {"GARMIN_EMAIL": row.garmin_email, "GARMIN_PASSWORD": row.garmin_password}
-    # Fall back to .env values if not set on profile
-    return {}
-
-
-async def _run(script: str, extra_env: dict) -> dict:
-    env = {**os.environ, **extra_env}
-    proc = await asyncio.create_subprocess_exec(
-        sys.executable, str(_PROJECT_ROOT / script),
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-        cwd=str(_PROJECT_ROOT),
-        env=env,
-    )
-    stdout, stderr = await proc.communicate()
-    return {
-        "script": script,
-        "ok":     proc.returncode == 0,
-        "stdout": stdout.decode(errors="replace").strip(),
-        "stderr": stderr.decode(errors="replace").strip(),
-    }
+_svc = SyncService()
 
 
-@router.post("", status_code=200)
+@router.post("", status_code=200, response_model=SyncResultSchema)
 async def trigger_sync(
     user_id: int = Depends(get_current_user_id),
     db: AsyncSession = Depends(get_db),
 ):
-    creds = await _fetch_garmin_creds(user_id, db)
-    results = []
+    return await _svc.sync_user(db, user_id, trigger="manual")
 
-    workout = await _run("workout.py", creds)
-    results.append(workout)
 
-    if workout["ok"]:
-        results.append(await _run("workout_metrics.py", creds))
-
-    results.append(await _run("sleep.py", creds))
-    results.append(await _run("environment.py", creds))
-
-    return {"ok": all(r["ok"] for r in results), "results": results}
+@router.get("/runs", response_model=list[SyncRunSchema])
+async def list_sync_runs(
+    limit: int = Query(default=20, ge=1, le=200),
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_db),
+):
+    return await _svc.list_runs(db, user_id, limit)
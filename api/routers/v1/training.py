@@ -1,14 +1,17 @@
 from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 
+from api.columnar import ResponseFormat, columnar_response
 from api.deps import get_current_user_id, get_db
+from api.pagination import set_next_cursor
 from api.schemas.training import (
     HRVHistoryPointSchema,
     TrainingHistoryPointSchema,
     WeeklyVolumeSchema,
     WorkoutDetailSchema,
     WorkoutListItemSchema,
+    WorkoutMetricPointSchema,
 )
 from api.services.training import TrainingService
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -19,19 +22,31 @@ _svc = TrainingService()
 
 @router.get("/history", response_model=list[TrainingHistoryPointSchema])
 async def get_training_history(
+    request: Request,
     today: date = Query(default_factory=date.today),
     days: int = Query(default=90, ge=7, le=365),
+    fmt: ResponseFormat = Query(
+        default="rows", alias="format", description="rows, columnar ({field: [values]}) or arrow (IPC stream)",
+    ),
     user_id: int = Depends(get_current_user_id),
 ):
+    if fmt != "rows":
+        return columnar_response(await _svc.get_training_history_columns(today, days), fmt, request)
     return await _svc.get_training_history(today, days)
 
 
 @router.get("/hrv-history", response_model=list[HRVHistoryPointSchema])
 async def get_hrv_history(
+    request: Request,
     today: date = Query(default_factory=date.today),
     days: int = Query(default=30, ge=7, le=180),
+    fmt: ResponseFormat = Query(
+        default="rows", alias="format", description="rows, columnar ({field: [values]}) or arrow (IPC stream)",
+    ),
     user_id: int = Depends(get_current_user_id),
 ):
+    if fmt != "rows":
+        return columnar_response(await _svc.get_hrv_history_columns(today, days), fmt, request)
     return await _svc.get_hrv_history(today, days)
 
 
@@ -46,12 +61,17 @@ async def get_weekly_volume(
 
 @router.get("/workouts", response_model=list[WorkoutListItemSchema])
 async def list_workouts(
+    response: Response,
     days: int = Query(default=90, ge=7, le=365),
     sport: str | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1, le=500, description="Page size; the next page's cursor is in X-Next-Cursor"),
+    cursor: str | None = Query(default=None, description="X-Next-Cursor of the previous page"),
     db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user_id),
 ):
-    return await _svc.list_workouts(db, user_id, days, sport)
+    workouts, next_cursor = await _svc.list_workouts(db, user_id, days, sport, limit, cursor)
+    set_next_cursor(response, next_cursor)
+    return workouts
 
 
 @router.get("/workouts/sports", response_model=list[str])
@@ -65,10 +85,42 @@ async def get_sport_options(
 @router.get("/workouts/{workout_id}", response_model=WorkoutDetailSchema)
 async def get_workout_detail(
     workout_id: int,
+    max_points: int | None = Query(
+        default=None, ge=10, le=20_000,
+        description="Return `series` downsampled (LTTB) to at most this many points per column instead of `metrics`",
+    ),
+    from_s: float | None = Query(default=None, ge=0, description="Seconds from the first point; range start"),
+    to_s: float | None = Query(default=None, ge=0, description="Seconds from the first point; range end"),
     db: AsyncSession = Depends(get_db),
     user_id: int = Depends(get_current_user_id),
 ):
-    result = await _svc.get_workout_detail(db, user_id, workout_id)
+    if from_s is not None and to_s is not None and to_s < from_s:
+        raise HTTPException(status_code=422, detail="to_s must not be before from_s")
+    result = await _svc.get_workout_detail(db, user_id, workout_id, max_points, from_s, to_s)
     if not result:
         raise HTTPException(status_code=404, detail="Workout not found")
     return result
+
+
+@router.get("/workouts/{workout_id}/metrics", response_model=list[WorkoutMetricPointSchema])
+async def get_workout_metrics(
+    request: Request,
+    workout_id: int,
+    from_s: float | None = Query(default=None, ge=0, description="Seconds from the first point; range start"),
+    to_s: float | None = Query(default=None, ge=0, description="Seconds from the first point; range end"),
+    fmt: ResponseFormat = Query(
+        default="rows", alias="format",
+        description="rows, columnar ({field: [values]} plus t, seconds from the first point) or arrow",
+    ),
+    db: AsyncSession = Depends(get_db),
+    user_id: int = Depends(get_current_user_id),
+):
+    if from_s is not None and to_s is not None and to_s < from_s:
+        raise HTTPException(status_code=422, detail="to_s must not be before from_s")
+    if fmt != "rows":
+        result = await _svc.get_workout_metric_columns(db, user_id, workout_id, from_s, to_s)
+    else:
+        result = await _svc.get_workout_metrics(db, user_id, workout_id, from_s, to_s)
+    if result is None:
+        raise HTTPException(status_code=404, detail="Workout not found")
+    return columnar_response(result, fmt, request) if fmt != "rows" else result
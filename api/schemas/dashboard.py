@@ -42,6 +42,8 @@ class ExerciseSuggestionSchema(BaseModel):
     pattern: str | None
     quality: str | None
     last_done: date | str | None
+    harder: str | None = None   # next harder variant in the goal branch
+    easier: str | None = None
 
 
 class GymRecSchema(BaseModel):
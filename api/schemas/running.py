@@ -113,3 +113,44 @@ class ElevationHRDecouplingSchema(BaseModel):
     workout_id: int
     total_gain_m: float
     quartiles: list[ElevationQuartileSchema]
+
+
+# ---------------------------------------------------------------------------
+# Best efforts (mean-maximal curves)
+# ---------------------------------------------------------------------------
+
+class BestEffortSchema(BaseModel):
+    value: float
+    workout_id: int
+    workout_date: date
+
+
+class BestEffortPointSchema(BaseModel):
+    duration_s: int
+    power: BestEffortSchema | None        # W
+    pace: BestEffortSchema | None         # min/km (from mean-max speed)
+    heart_rate: BestEffortSchema | None   # bpm
+
+
+class CriticalPowerSchema(BaseModel):
+    cp_w: float
+    w_prime_j: float
+    r_squared: float
+    n_points: int
+
+
+class CriticalSpeedSchema(BaseModel):
+    cs_ms: float
+    cs_pace: float                  # min/km
+    d_prime_m: float
+    r_squared: float
+    n_points: int
+
+
+class BestEffortsSchema(BaseModel):
+    sport: str
+    days: int | None                # None = all time
+    workouts: int
+    curve: list[BestEffortPointSchema]
+    critical_power: CriticalPowerSchema | None
+    critical_speed: CriticalSpeedSchema | None
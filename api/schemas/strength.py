@@ -58,6 +58,15 @@ class OneRMPointSchema(BaseModel):
     epley_1rm: float             # Epley estimate: weight × (1 + reps/30)
 
 
+class MuscleVolumeSchema(BaseModel):
+    week_start: date
+    muscle: str
+    sets: int                    # sets where the muscle is primary
+    tonnage_kg: float
+    secondary_sets: int          # sets where the muscle is secondary
+    secondary_tonnage_kg: float
+
+
 # ---------------------------------------------------------------------------
 # Exercise library
 # ---------------------------------------------------------------------------
@@ -88,6 +97,24 @@ class ExerciseSchema(BaseModel):
     notes: str | None
 
 
+class UnmatchedExerciseSchema(BaseModel):
+    name: str                    # logged name with no exercises row yet
+    times_logged: int
+    last_logged: date
+
+
+class ProgressionStepSchema(BaseModel):
+    exercise_id: int
+    name: str | None
+
+
+class ExerciseProgressionsSchema(BaseModel):
+    exercise_id: int
+    harder: list[ProgressionStepSchema]     # one step away, in the goal branch
+    easier: list[ProgressionStepSchema]
+    lateral: list[ProgressionStepSchema]
+
+
 # ---------------------------------------------------------------------------
 # Merged Garmin workout + logged session view
 # ---------------------------------------------------------------------------
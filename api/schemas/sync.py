@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class SyncScriptResultSchema(BaseModel):
+    script: str
+    ok: bool
+    stdout: str
+    stderr: str
+
+
+class SyncResultSchema(BaseModel):
+    ok: bool
+    run_id: int
+    duration_s: float
+    records_ingested: int
+    results: list[SyncScriptResultSchema]
+
+
+class SyncRunSchema(BaseModel):
+    run_id: int
+    trigger: str                        # 'manual' | 'scheduler'
+    started_at: datetime
+    finished_at: datetime | None        # None while the run is in flight
+    duration_s: float | None
+    ok: bool | None
+    records_ingested: int | None        # workouts + metric rows + sleep sessions added
+    errors: str | None
@@ -65,6 +65,12 @@ class WorkoutMetricPointSchema(BaseModel):
     gradient_pct: float | None
 
 
+class WorkoutSeriesSchema(BaseModel):
+    t: list[float]                            # seconds since series_start
+    values: list[float]
+    source_points: int                        # points before downsampling
+
+
 class WorkoutDetailSchema(BaseModel):
     workout_id: int
     workout_date: date
@@ -102,4 +108,6 @@ class WorkoutDetailSchema(BaseModel):
     location: str | None
     lat: float | None                         # start_latitude
     lon: float | None                         # start_longitude
-    metrics: list[WorkoutMetricPointSchema]
+    metrics: list[WorkoutMetricPointSchema]   # full resolution; empty when max_points is given
+    series_start: datetime | None = None      # first metric point of the workout
+    series: dict[str, WorkoutSeriesSchema] | None = None   # LTTB-downsampled, with max_points
@@ -6,7 +6,8 @@ CRUD for the three daily check-in tables:
   workout_reflection — post-workout RPE + quality
   journal_entries   — free-text daily journal (created via CREATE TABLE IF NOT EXISTS)
 
-All queries are async SQLAlchemy.
+All queries are async SQLAlchemy. The history pages by keyset cursor
+(api/pagination.py) when given a limit.
 """
 
 from datetime import date
@@ -14,6 +15,7 @@ from datetime import date
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.pagination import decode_cursor, page
 from api.schemas.checkin import (
     DailyReadinessCreateSchema,
     DailyReadinessSchema,
@@ -219,9 +221,30 @@ class CheckinService:
     # ------------------------------------------------------------------
 
     async def get_history(
-        self, db: AsyncSession, user_id: int, days: int = 90
-    ) -> list[JournalHistoryRowSchema]:
-        result = await db.execute(text("""
+        self, db: AsyncSession, user_id: int, days: int = 90,
+        limit: int | None = None, cursor: str | None = None,
+    ) -> tuple[list[JournalHistoryRowSchema], str | None]:
+        """(days with any entry, next cursor), newest first; keyed on entry_date."""
+        # Each source is cut to the page on its own (user_id, entry_date)
+        # index before the union, so a page never reads the whole history
+        where = "user_id = :uid AND entry_date >= CURRENT_DATE - (:days * INTERVAL '1 day')"
+        params: dict = {"uid": user_id, "days": days}
+
+        if cursor:
+            (params["c_date"],) = decode_cursor(cursor, (date,))
+            where += " AND entry_date < :c_date"
+
+        tail = ""
+        if limit:
+            tail = " ORDER BY entry_date DESC LIMIT :limit"
+            params["limit"] = limit + 1
+
+        dates = "\n                UNION\n".join(
+            f"                (SELECT entry_date FROM {table} WHERE {where}{tail})"
+            for table in ("daily_readiness", "workout_reflection", "journal_entries")
+        )
+
+        result = await db.execute(text(f"""
             SELECT
                 d.entry_date,
                 r.overall_feel, r.legs_feel, r.upper_body_feel, r.joint_feel,
@@ -229,14 +252,10 @@ class CheckinService:
                 wr.session_rpe, wr.session_quality, wr.load_feel, wr.notes AS reflection_notes,
                 je.content AS journal_note
             FROM (
-                SELECT entry_date FROM daily_readiness
-                WHERE user_id = :uid AND entry_date >= CURRENT_DATE - (:days * INTERVAL '1 day')
-                UNION
-                SELECT entry_date FROM workout_reflection
-                WHERE user_id = :uid AND entry_date >= CURRENT_DATE - (:days * INTERVAL '1 day')
-                UNION
-                SELECT entry_date FROM journal_entries
-                WHERE user_id = :uid AND entry_date >= CURRENT_DATE - (:days * INTERVAL '1 day')
+                SELECT entry_date FROM (
+{dates}
+                ) u
+                ORDER BY entry_date DESC{" LIMIT :limit" if limit else ""}
             ) d
             LEFT JOIN daily_readiness r
                 ON r.entry_date = d.entry_date AND r.user_id = :uid
@@ -245,7 +264,9 @@ class CheckinService:
             LEFT JOIN journal_entries je
                 ON je.entry_date = d.entry_date AND je.user_id = :uid
             ORDER BY d.entry_date DESC
-        """), {"uid": user_id, "days": days})
+        """), params)
+
+        rows, next_cursor = page(result.fetchall(), limit, lambda r: (r.entry_date,))
 
         return [
             JournalHistoryRowSchema(
@@ -263,5 +284,5 @@ class CheckinService:
                 reflection_notes=row.reflection_notes,
                 journal_note=row.journal_note,
             )
-            for row in result.fetchall()
-        ]
+            for row in rows
+        ], next_cursor
@@ -70,6 +70,8 @@ class RecommendationService:
                     pattern=ex.get("pattern"),
                     quality=ex.get("quality"),
                     last_done=ex.get("last_done"),
+                    harder=ex.get("harder"),
+                    easier=ex.get("easier"),
                 )
                 for ex in (exercises_raw or [])
             ],
@@ -1,10 +1,11 @@
 """
 RunningService
 
-Wraps the three sync analytics modules:
+Wraps the sync analytics modules:
   analytics/running_economy.py  — GAP, aerobic decoupling, REI
   analytics/biomechanics.py     — fatigue signature, cadence-speed, longitudinal trends
   analytics/terrain_response.py — HR-gradient curve, grade cost model, optimal gradient
+  analytics/best_efforts.py     — mean-maximal power/pace/HR curves, critical power/speed
 
 All analytics functions are psycopg2-based and run in a thread pool via
 asyncio.to_thread so they never block the async event loop.
@@ -14,7 +15,12 @@ import asyncio
 from typing import Literal
 
 from api.schemas.running import (
+    BestEffortPointSchema,
+    BestEffortSchema,
+    BestEffortsSchema,
     BiomechanicsTrendPointSchema,
+    CriticalPowerSchema,
+    CriticalSpeedSchema,
     ElevationHRDecouplingSchema,
     ElevationQuartileSchema,
     GradientProfileBucketSchema,
@@ -33,6 +39,7 @@ from analytics.running_economy import (
     get_aerobic_decoupling,
     get_running_economy_index,
 )
+from analytics.best_efforts import get_best_efforts
 from analytics.biomechanics import get_biomechanics_trends, get_fatigue_signature
 from analytics.terrain_response import (
     get_terrain_summary,
@@ -150,7 +157,7 @@ class RunningService:
     def _terrain_summary(self, days: int, sport: str) -> dict:
         conn = get_connection()
         try:
-            return get_terrain_summary(days=days, conn=conn)
+            return get_terrain_summary(days=days, sport=sport, conn=conn)
         finally:
             conn.close()
 
@@ -222,3 +229,45 @@ class RunningService:
             return get_elevation_hr_decoupling(workout_id, conn)
         finally:
             conn.close()
+
+    # ------------------------------------------------------------------
+    # Best efforts (multi-workout envelope of stored curves)
+    # ------------------------------------------------------------------
+
+    async def get_best_efforts(
+        self, days: int | None = None, sport: str = "running"
+    ) -> BestEffortsSchema:
+        raw = await asyncio.to_thread(self._best_efforts, days, sport)
+
+        def effort(e):
+            return BestEffortSchema(**e) if e else None
+
+        def pace(e):
+            # mean-max speed (m/s) → min/km
+            if not e or e["value"] <= 0:
+                return None
+            return BestEffortSchema(**{**e, "value": round(1000.0 / (e["value"] * 60.0), 2)})
+
+        return BestEffortsSchema(
+            sport=sport,
+            days=days,
+            workouts=raw["workouts"],
+            curve=[
+                BestEffortPointSchema(
+                    duration_s=d,
+                    power=effort(raw["power"][i]),
+                    pace=pace(raw["speed"][i]),
+                    heart_rate=effort(raw["heart_rate"][i]),
+                )
+                for i, d in enumerate(raw["durations"])
+            ],
+            critical_power=CriticalPowerSchema(**raw["critical_power"]) if raw["critical_power"] else None,
+            critical_speed=CriticalSpeedSchema(**raw["critical_speed"]) if raw["critical_speed"] else None,
+        )
+
+    def _best_efforts(self, days: int | None, sport: str) -> dict:
+        conn = get_connection()
+        try:
+            return get_best_efforts(days=days, sport=sport, conn=conn)
+        finally:
+            conn.close()
@@ -2,7 +2,9 @@
 SleepService
 
 Sleep session list, detail with baseline comparisons, and trend data.
-All queries are async SQLAlchemy.
+All queries are async SQLAlchemy. get_sleep_trend_columns returns the
+trend series as {field: [values]} for ?format=columnar (api/columnar.py).
+The list pages by keyset cursor (api/pagination.py) when given a limit.
 """
 
 from datetime import date
@@ -10,6 +12,8 @@ from datetime import date
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.columnar import columns_from_rows
+from api.pagination import decode_cursor, page
 from api.schemas.sleep import (
     SleepDetailSchema,
     SleepListItemSchema,
@@ -20,18 +24,31 @@ from api.schemas.sleep import (
 class SleepService:
 
     async def list_sleep(
-        self, db: AsyncSession, user_id: int, days: int = 90
-    ) -> list[SleepListItemSchema]:
-        result = await db.execute(text("""
+        self, db: AsyncSession, user_id: int, days: int = 90,
+        limit: int | None = None, cursor: str | None = None,
+    ) -> tuple[list[SleepListItemSchema], str | None]:
+        """(nights, next cursor), newest first; sleep_date is unique per user, so it is the key."""
+        query = """
             SELECT
                 sleep_id, sleep_date, duration_minutes, sleep_score,
                 overnight_hrv, rhr, body_battery_change, hrv_status
             FROM sleep_sessions
             WHERE user_id = :user_id
               AND sleep_date >= CURRENT_DATE - (:days * INTERVAL '1 day')
-            ORDER BY sleep_date DESC
-        """), {"user_id": user_id, "days": days})
+        """
+        params: dict = {"user_id": user_id, "days": days}
+
+        if cursor:
+            (params["c_date"],) = decode_cursor(cursor, (date,))
+            query += " AND sleep_date < :c_date"
 
+        query += " ORDER BY sleep_date DESC"
+        if limit:
+            query += " LIMIT :limit"
+            params["limit"] = limit + 1
+
+        result = await db.execute(text(query), params)
+        rows, next_cursor = page(result.fetchall(), limit, lambda r: (r.sleep_date,))
         return [
             SleepListItemSchema(
                 sleep_id=row.sleep_id,
@@ -43,8 +60,8 @@ class SleepService:
                 body_battery_change=row.body_battery_change,
                 hrv_status=row.hrv_status,
             )
-            for row in result.fetchall()
-        ]
+            for row in rows
+        ], next_cursor
 
     async def get_sleep_detail(
         self, db: AsyncSession, user_id: int, sleep_id: int
@@ -92,16 +109,6 @@ class SleepService:
     async def get_sleep_trends(
         self, db: AsyncSession, user_id: int, days: int = 90
     ) -> list[SleepTrendPointSchema]:
-        result = await db.execute(text("""
-            SELECT
-                sleep_date, sleep_score, overnight_hrv,
-                rhr, duration_minutes, body_battery_change
-            FROM sleep_sessions
-            WHERE user_id = :user_id
-              AND sleep_date >= CURRENT_DATE - (:days * INTERVAL '1 day')
-            ORDER BY sleep_date
-        """), {"user_id": user_id, "days": days})
-
         return [
             SleepTrendPointSchema(
                 sleep_date=row.sleep_date,
@@ -111,9 +118,28 @@ class SleepService:
                 duration_minutes=row.duration_minutes,
                 body_battery_change=row.body_battery_change,
             )
-            for row in result.fetchall()
+            for row in await self._sleep_trend_rows(db, user_id, days)
         ]
 
+    async def get_sleep_trend_columns(
+        self, db: AsyncSession, user_id: int, days: int = 90
+    ) -> dict[str, list]:
+        rows = await self._sleep_trend_rows(db, user_id, days)
+        return columns_from_rows(rows, SleepTrendPointSchema.model_fields)
+
+    async def _sleep_trend_rows(self, db: AsyncSession, user_id: int, days: int) -> list:
+        # Selected in SleepTrendPointSchema field order
+        result = await db.execute(text("""
+            SELECT
+                sleep_date, sleep_score, overnight_hrv,
+                rhr, duration_minutes, body_battery_change
+            FROM sleep_sessions
+            WHERE user_id = :user_id
+              AND sleep_date >= CURRENT_DATE - (:days * INTERVAL '1 day')
+            ORDER BY sleep_date
+        """), {"user_id": user_id, "days": days})
+        return result.fetchall()
+
     # ------------------------------------------------------------------
     # 7-day rolling baselines for a given date
     # ------------------------------------------------------------------
@@ -2,25 +2,72 @@
 StrengthService
 
 Strength session list/detail, 1RM progression, and exercise library.
-All queries are async SQLAlchemy.
+All queries are async SQLAlchemy. The session lists page by keyset
+cursor (api/pagination.py) when given a limit. Session detail, single or
+bulk, is one json_agg query that returns sessions with exercises and
+sets already nested. Session writes refresh the derived
+strength_exercise_stats / strength_weekly_muscle rows (strength_stats.py),
+which the 1RM and muscle volume queries read. Progression lookups run on
+the in-memory graph of progression_graph.py. Logged exercise names are
+resolved to exercises ids on write (exercise_index.py). Exercise search
+runs on an in-process index (api/exercise_search.py), ranked by the
+user's recent usage; list_exercises searches through pg_trgm.
 """
 
-from datetime import date
+from datetime import date, datetime
 
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api import exercise_search
+from api.pagination import decode_cursor, page
 from api.schemas.strength import (
     ExerciseCreateSchema,
+    ExerciseProgressionsSchema,
     ExerciseSchema,
+    MuscleVolumeSchema,
     OneRMPointSchema,
-    StrengthExerciseSchema,
+    ProgressionStepSchema,
     StrengthSessionCreateSchema,
     StrengthSessionListItemSchema,
     StrengthSessionSchema,
-    StrengthSetSchema,
     StrengthWorkoutSchema,
+    UnmatchedExerciseSchema,
 )
+from exercise_index import (
+    LOAD_SQL,
+    SIGNATURE_SQL,
+    ExerciseIndex,
+    cached_index,
+    store_index,
+)
+from progression_graph import (
+    LOAD_SQL as PROGRESSION_LOAD_SQL,
+    NAMES_SQL as PROGRESSION_NAMES_SQL,
+    SIGNATURE_SQL as PROGRESSION_SIGNATURE_SQL,
+    ProgressionGraph,
+    cached_graph,
+    store_graph,
+)
+from strength_stats import sqlalchemy_statements
+from strength_store import DELETE_EXERCISES, INSERT_EXERCISES_AND_SETS, insert_params, sqlalchemy_sql
+
+# Set-based session write (strength_store.py) and the strength_stats
+# refresh for one session, run in the writing transaction
+_DELETE_EXERCISES = text(sqlalchemy_sql(DELETE_EXERCISES))
+_INSERT_EXERCISES_AND_SETS = text(sqlalchemy_sql(INSERT_EXERCISES_AND_SETS))
+_STATS_REFRESH = [text(sql) for sql in sqlalchemy_statements()]
+
+_EXERCISE_COLUMNS = """
+    exercise_id, name, source, movement_pattern, quality_focus,
+    primary_muscles, secondary_muscles, equipment,
+    skill_level, bilateral, contraction_type,
+    systemic_fatigue, cns_load,
+    joint_stress, sport_carryover, goal_carryover, notes
+"""
+
+# Window of logged sessions that ranks exercise search results
+SEARCH_USAGE_DAYS = 180
 
 
 class StrengthService:
@@ -30,9 +77,31 @@ class StrengthService:
     # ------------------------------------------------------------------
 
     async def list_garmin_sessions(
-        self, db: AsyncSession, user_id: int, days: int = 90
-    ) -> list[StrengthWorkoutSchema]:
-        result = await db.execute(text("""
+        self, db: AsyncSession, user_id: int, days: int = 90,
+        limit: int | None = None, cursor: str | None = None,
+    ) -> tuple[list[StrengthWorkoutSchema], str | None]:
+        """(workouts, next cursor), newest first; keyed on (workout_date, start_time, workout_id)."""
+        # The page of workouts is picked first, so the set counts are only
+        # aggregated for the rows returned
+        page_query = """
+            SELECT workout_id, workout_date, start_time, end_time, calories_burned
+            FROM workouts
+            WHERE user_id = :user_id
+              AND sport = 'strength_training'
+              AND workout_date >= CURRENT_DATE - (:days * INTERVAL '1 day')
+        """
+        params: dict = {"user_id": user_id, "days": days}
+
+        if cursor:
+            params["c_date"], params["c_start"], params["c_id"] = decode_cursor(cursor, (date, datetime, int))
+            page_query += " AND (workout_date, start_time, workout_id) < (:c_date, :c_start, :c_id)"
+
+        page_query += " ORDER BY workout_date DESC, start_time DESC, workout_id DESC"
+        if limit:
+            page_query += " LIMIT :limit"
+            params["limit"] = limit + 1
+
+        result = await db.execute(text(f"""
             SELECT
                 w.workout_id,
                 w.workout_date,
@@ -43,22 +112,21 @@ class StrengthService:
                 ss.session_type,
                 COUNT(DISTINCT se.exercise_id) AS total_exercises,
                 COUNT(st.set_id)               AS total_sets
-            FROM workouts w
+            FROM ({page_query}) w
             LEFT JOIN strength_sessions ss
-                   ON ss.user_id = w.user_id
+                   ON ss.user_id = :user_id
                   AND ss.session_date = w.workout_date
             LEFT JOIN strength_exercises se ON se.session_id = ss.session_id
             LEFT JOIN strength_sets st      ON st.exercise_id = se.exercise_id
-            WHERE w.user_id = :user_id
-              AND w.sport = 'strength_training'
-              AND w.workout_date >= CURRENT_DATE - (:days * INTERVAL '1 day')
             GROUP BY
                 w.workout_id, w.workout_date, w.start_time, w.end_time,
                 w.calories_burned, ss.session_id, ss.session_type
-            ORDER BY w.workout_date DESC
-        """), {"user_id": user_id, "days": days})
+            ORDER BY w.workout_date DESC, w.start_time DESC, w.workout_id DESC
+        """), params)
 
-        rows = result.fetchall()
+        rows, next_cursor = page(
+            result.fetchall(), limit, lambda r: (r.workout_date, r.start_time, r.workout_id),
+        )
         out = []
         for row in rows:
             duration = None
@@ -74,31 +142,49 @@ class StrengthService:
                 total_exercises=row.total_exercises,
                 total_sets=row.total_sets,
             ))
-        return out
+        return out, next_cursor
 
     # ------------------------------------------------------------------
     # Session list
     # ------------------------------------------------------------------
 
     async def list_sessions(
-        self, db: AsyncSession, user_id: int, days: int = 90
-    ) -> list[StrengthSessionListItemSchema]:
-        result = await db.execute(text("""
+        self, db: AsyncSession, user_id: int, days: int = 90,
+        limit: int | None = None, cursor: str | None = None,
+    ) -> tuple[list[StrengthSessionListItemSchema], str | None]:
+        """(sessions, next cursor), newest first; session_date is unique per user, so it is the key."""
+        page_query = """
+            SELECT session_id, session_date, session_type
+            FROM strength_sessions
+            WHERE user_id = :user_id
+              AND session_date >= CURRENT_DATE - (:days * INTERVAL '1 day')
+        """
+        params: dict = {"user_id": user_id, "days": days}
+
+        if cursor:
+            (params["c_date"],) = decode_cursor(cursor, (date,))
+            page_query += " AND session_date < :c_date"
+
+        page_query += " ORDER BY session_date DESC"
+        if limit:
+            page_query += " LIMIT :limit"
+            params["limit"] = limit + 1
+
+        result = await db.execute(text(f"""
             SELECT
                 ss.session_id,
                 ss.session_date,
                 ss.session_type,
                 COUNT(DISTINCT se.exercise_id) AS total_exercises,
                 COUNT(st.set_id)               AS total_sets
-            FROM strength_sessions ss
+            FROM ({page_query}) ss
             LEFT JOIN strength_exercises se ON se.session_id = ss.session_id
             LEFT JOIN strength_sets st      ON st.exercise_id = se.exercise_id
-            WHERE ss.user_id = :user_id
-              AND ss.session_date >= CURRENT_DATE - (:days * INTERVAL '1 day')
             GROUP BY ss.session_id, ss.session_date, ss.session_type
             ORDER BY ss.session_date DESC
-        """), {"user_id": user_id, "days": days})
+        """), params)
 
+        rows, next_cursor = page(result.fetchall(), limit, lambda r: (r.session_date,))
         return [
             StrengthSessionListItemSchema(
                 session_id=row.session_id,
@@ -107,8 +193,8 @@ class StrengthService:
                 total_exercises=row.total_exercises,
                 total_sets=row.total_sets,
             )
-            for row in result.fetchall()
-        ]
+            for row in rows
+        ], next_cursor
 
     # ------------------------------------------------------------------
     # Session detail
@@ -117,77 +203,81 @@ class StrengthService:
     async def get_session_detail(
         self, db: AsyncSession, user_id: int, session_id: int
     ) -> StrengthSessionSchema | None:
-        result = await db.execute(text("""
-            SELECT session_id, session_date, session_type, raw_notes
-            FROM strength_sessions
+        sessions = await self._sessions_with_sets(db, """
+            SELECT * FROM strength_sessions
             WHERE session_id = :session_id AND user_id = :user_id
-        """), {"session_id": session_id, "user_id": user_id})
-
-        row = result.fetchone()
-        if not row:
-            return None
-
-        exercises = await self._get_exercises(db, session_id)
-
-        return StrengthSessionSchema(
-            session_id=row.session_id,
-            session_date=row.session_date,
-            session_type=row.session_type,
-            raw_notes=row.raw_notes,
-            exercises=exercises,
-        )
-
-    async def _get_exercises(
-        self, db: AsyncSession, session_id: int
-    ) -> list[StrengthExerciseSchema]:
-        result = await db.execute(text("""
-            SELECT exercise_id, exercise_order, name, notes
-            FROM strength_exercises
-            WHERE session_id = :session_id
-            ORDER BY exercise_order
-        """), {"session_id": session_id})
-
-        exercises = []
-        for row in result.fetchall():
-            sets = await self._get_sets(db, row.exercise_id)
-            exercises.append(StrengthExerciseSchema(
-                exercise_id=row.exercise_id,
-                exercise_order=row.exercise_order,
-                name=row.name,
-                notes=row.notes,
-                sets=sets,
-            ))
-        return exercises
-
-    async def _get_sets(
-        self, db: AsyncSession, exercise_id: int
-    ) -> list[StrengthSetSchema]:
-        result = await db.execute(text("""
+        """, {"session_id": session_id, "user_id": user_id})
+        return sessions[0] if sessions else None
+
+    async def get_sessions_with_sets(
+        self, db: AsyncSession, user_id: int,
+        session_ids: list[int] | None = None, last: int = 10,
+    ) -> list[StrengthSessionSchema]:
+        """The given sessions, or the `last` most recent ones, with all their sets; newest first."""
+        if session_ids:
+            return await self._sessions_with_sets(db, """
+                SELECT * FROM strength_sessions
+                WHERE user_id = :user_id AND session_id = ANY(:session_ids)
+            """, {"user_id": user_id, "session_ids": session_ids})
+        return await self._sessions_with_sets(db, """
+            SELECT * FROM strength_sessions
+            WHERE user_id = :user_id
+            ORDER BY session_date DESC
+            LIMIT :last
+        """, {"user_id": user_id, "last": last})
+
+    async def _sessions_with_sets(
+        self, db: AsyncSession, sessions_query: str, params: dict
+    ) -> list[StrengthSessionSchema]:
+        # One statement for any number of sessions: sets are aggregated per
+        # exercise and exercises per session with json_agg, so the rows come
+        # back already nested instead of one query per exercise
+        result = await db.execute(text(f"""
             SELECT
-                set_id, set_number, reps, reps_min, reps_max,
-                duration_seconds, weight_kg, is_bodyweight, band_color,
-                per_hand, per_side, plus_bar, weight_includes_bar, total_weight_kg
-            FROM strength_sets
-            WHERE exercise_id = :exercise_id
-            ORDER BY set_number
-        """), {"exercise_id": exercise_id})
+                ss.session_id, ss.session_date, ss.session_type, ss.raw_notes,
+                COALESCE(
+                    json_agg(json_build_object(
+                        'exercise_id',    se.exercise_id,
+                        'exercise_order', se.exercise_order,
+                        'name',           se.name,
+                        'notes',          se.notes,
+                        'sets',           sets.sets
+                    ) ORDER BY se.exercise_order) FILTER (WHERE se.exercise_id IS NOT NULL),
+                    '[]'
+                ) AS exercises
+            FROM ({sessions_query}) ss
+            LEFT JOIN strength_exercises se ON se.session_id = ss.session_id
+            LEFT JOIN LATERAL (
+                SELECT COALESCE(json_agg(json_build_object(
+                    'set_id',              st.set_id,
+                    'set_number',          st.set_number,
+                    'reps',                st.reps,
+                    'reps_min',            st.reps_min,
+                    'reps_max',            st.reps_max,
+                    'duration_seconds',    st.duration_seconds,
+                    'weight_kg',           st.weight_kg,
+                    'is_bodyweight',       COALESCE(st.is_bodyweight, FALSE),
+                    'band_color',          st.band_color,
+                    'per_hand',            COALESCE(st.per_hand, FALSE),
+                    'per_side',            COALESCE(st.per_side, FALSE),
+                    'plus_bar',            COALESCE(st.plus_bar, FALSE),
+                    'weight_includes_bar', COALESCE(st.weight_includes_bar, FALSE),
+                    'total_weight_kg',     st.total_weight_kg
+                ) ORDER BY st.set_number), '[]') AS sets
+                FROM strength_sets st
+                WHERE st.exercise_id = se.exercise_id
+            ) sets ON TRUE
+            GROUP BY ss.session_id, ss.session_date, ss.session_type, ss.raw_notes
+            ORDER BY ss.session_date DESC
+        """), params)
 
         return [
-            StrengthSetSchema(
-                set_id=row.set_id,
-                set_number=row.set_number,
-                reps=row.reps,
-                reps_min=row.reps_min,
-                reps_max=row.reps_max,
-                duration_seconds=row.duration_seconds,
-                weight_kg=row.weight_kg,
-                is_bodyweight=row.is_bodyweight or False,
-                band_color=row.band_color,
-                per_hand=row.per_hand or False,
-                per_side=row.per_side or False,
-                plus_bar=row.plus_bar or False,
-                weight_includes_bar=row.weight_includes_bar or False,
-                total_weight_kg=row.total_weight_kg,
+            StrengthSessionSchema(
+                session_id=row.session_id,
+                session_date=row.session_date,
+                session_type=row.session_type,
+                raw_notes=row.raw_notes,
+                exercises=row.exercises,
             )
             for row in result.fetchall()
         ]
@@ -215,51 +305,15 @@ class StrengthService:
         })
         session_id = result.fetchone().session_id
 
-        # Replace exercises
-        await db.execute(text(
-            "DELETE FROM strength_exercises WHERE session_id = :sid"
-        ), {"sid": session_id})
-
-        for ex in payload.exercises:
-            ex_result = await db.execute(text("""
-                INSERT INTO strength_exercises (session_id, exercise_order, name, notes)
-                VALUES (:sid, :order, :name, :notes)
-                RETURNING exercise_id
-            """), {
-                "sid": session_id,
-                "order": ex.exercise_order,
-                "name": ex.name,
-                "notes": ex.notes,
-            })
-            exercise_id = ex_result.fetchone().exercise_id
-
-            for s in ex.sets:
-                await db.execute(text("""
-                    INSERT INTO strength_sets (
-                        exercise_id, set_number, reps, duration_seconds,
-                        weight_kg, is_bodyweight, band_color,
-                        per_hand, per_side, plus_bar,
-                        weight_includes_bar, total_weight_kg
-                    ) VALUES (
-                        :exercise_id, :set_number, :reps, :duration_seconds,
-                        :weight_kg, :is_bodyweight, :band_color,
-                        :per_hand, :per_side, :plus_bar,
-                        :weight_includes_bar, :total_weight_kg
-                    )
-                """), {
-                    "exercise_id": exercise_id,
-                    "set_number": s.set_number,
-                    "reps": s.reps,
-                    "duration_seconds": s.duration_seconds,
-                    "weight_kg": s.weight_kg,
-                    "is_bodyweight": s.is_bodyweight,
-                    "band_color": s.band_color,
-                    "per_hand": s.per_hand,
-                    "per_side": s.per_side,
-                    "plus_bar": s.plus_bar,
-                    "weight_includes_bar": s.weight_includes_bar,
-                    "total_weight_kg": s.total_weight_kg,
-                })
+        # Replace exercises and sets: two statements whatever the session size
+        await db.execute(_DELETE_EXERCISES, {"session_id": session_id})
+        if payload.exercises:
+            index = await self._exercise_index(db)
+            exercises = [ex.model_dump() for ex in payload.exercises]
+            await db.execute(_INSERT_EXERCISES_AND_SETS, insert_params(session_id, exercises, index))
+
+        for statement in _STATS_REFRESH:
+            await db.execute(statement, {"session_id": session_id})
 
         await db.commit()
         return await self.get_session_detail(db, user_id, session_id)
@@ -276,21 +330,14 @@ class StrengthService:
         days: int = 365,
     ) -> list[OneRMPointSchema]:
         result = await db.execute(text("""
-            SELECT
-                ss.session_date,
-                MAX(
-                    st.total_weight_kg * (1.0 + st.reps / 30.0)
-                ) AS epley_1rm
-            FROM strength_sessions ss
-            JOIN strength_exercises se ON se.session_id = ss.session_id
-            JOIN strength_sets st      ON st.exercise_id = se.exercise_id
-            WHERE ss.user_id = :user_id
-              AND LOWER(se.name) = LOWER(:exercise_name)
-              AND st.reps IS NOT NULL AND st.reps > 0
-              AND st.total_weight_kg IS NOT NULL AND st.total_weight_kg > 0
-              AND ss.session_date >= CURRENT_DATE - (:days * INTERVAL '1 day')
-            GROUP BY ss.session_date
-            ORDER BY ss.session_date
+            SELECT session_date, MAX(best_e1rm_kg) AS epley_1rm
+            FROM strength_exercise_stats
+            WHERE user_id = :user_id
+              AND LOWER(name) = LOWER(:exercise_name)
+              AND session_date >= CURRENT_DATE - (:days * INTERVAL '1 day')
+              AND best_e1rm_kg IS NOT NULL
+            GROUP BY session_date
+            ORDER BY session_date
         """), {"user_id": user_id, "exercise_name": exercise_name, "days": days})
 
         return [
@@ -305,14 +352,40 @@ class StrengthService:
         self, db: AsyncSession, user_id: int
     ) -> list[str]:
         result = await db.execute(text("""
-            SELECT DISTINCT se.name
-            FROM strength_exercises se
-            JOIN strength_sessions ss ON ss.session_id = se.session_id
-            WHERE ss.user_id = :user_id
-            ORDER BY se.name
+            SELECT DISTINCT name
+            FROM strength_exercise_stats
+            WHERE user_id = :user_id
+            ORDER BY name
         """), {"user_id": user_id})
         return [row.name for row in result.fetchall()]
 
+    # ------------------------------------------------------------------
+    # Weekly volume per muscle
+    # ------------------------------------------------------------------
+
+    async def get_muscle_volume(
+        self, db: AsyncSession, user_id: int, weeks: int = 12
+    ) -> list[MuscleVolumeSchema]:
+        result = await db.execute(text("""
+            SELECT week_start, muscle, sets, tonnage_kg, secondary_sets, secondary_tonnage_kg
+            FROM strength_weekly_muscle
+            WHERE user_id = :user_id
+              AND week_start >= date_trunc('week', CURRENT_DATE - (:weeks * INTERVAL '1 week'))::date
+            ORDER BY week_start, muscle
+        """), {"user_id": user_id, "weeks": weeks})
+
+        return [
+            MuscleVolumeSchema(
+                week_start=row.week_start,
+                muscle=row.muscle,
+                sets=row.sets,
+                tonnage_kg=round(row.tonnage_kg, 1),
+                secondary_sets=row.secondary_sets,
+                secondary_tonnage_kg=round(row.secondary_tonnage_kg, 1),
+            )
+            for row in result.fetchall()
+        ]
+
     # ------------------------------------------------------------------
     # Exercise library
     # ------------------------------------------------------------------
@@ -320,24 +393,60 @@ class StrengthService:
     async def list_exercises(
         self, db: AsyncSession, search: str | None = None
     ) -> list[ExerciseSchema]:
-        query = """
-            SELECT
-                exercise_id, name, source, movement_pattern, quality_focus,
-                primary_muscles, secondary_muscles, equipment,
-                skill_level, bilateral, contraction_type,
-                systemic_fatigue, cns_load,
-                joint_stress, sport_carryover, goal_carryover, notes
-            FROM exercises
-        """
+        query = f"SELECT {_EXERCISE_COLUMNS} FROM exercises"
         params: dict = {}
         if search:
-            query += " WHERE LOWER(name) LIKE LOWER(:search)"
-            params["search"] = f"%{search}%"
-        query += " ORDER BY name"
+            # Substring or trigram match, both served by exercises_name_trgm_idx
+            query += " WHERE name ILIKE :pattern OR name % :search"
+            query += " ORDER BY similarity(name, :search) DESC, name"
+            params = {"pattern": f"%{search}%", "search": search}
+        else:
+            query += " ORDER BY name"
 
         result = await db.execute(text(query), params)
         return [self._map_exercise(row) for row in result.fetchall()]
 
+    async def search_exercises(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        q: str = "",
+        muscles: list[str] | None = None,
+        equipment: list[str] | None = None,
+        limit: int = 20,
+    ) -> list[ExerciseSchema]:
+        index = await self._search_index(db)
+        result = await db.execute(text("""
+            SELECT se.exercise_ref_id, COUNT(*) AS times_logged
+            FROM strength_exercise_stats es
+            JOIN strength_exercises se ON se.exercise_id = es.exercise_id
+            WHERE es.user_id = :user_id
+              AND es.session_date >= CURRENT_DATE - (:days * INTERVAL '1 day')
+              AND se.exercise_ref_id IS NOT NULL
+            GROUP BY se.exercise_ref_id
+        """), {"user_id": user_id, "days": SEARCH_USAGE_DAYS})
+        usage = {row.exercise_ref_id: row.times_logged for row in result.fetchall()}
+        ids = index.search(q, muscles or (), equipment or (), usage, limit)
+        return [index.exercises[i] for i in ids]
+
+    async def get_progressions(
+        self, db: AsyncSession, exercise_ids: list[int], goal_branch: str | None = None
+    ) -> list[ExerciseProgressionsSchema]:
+        graph = await self._progression_graph(db)
+
+        def steps(ids):
+            return [ProgressionStepSchema(exercise_id=i, name=graph.names.get(i)) for i in ids]
+
+        return [
+            ExerciseProgressionsSchema(
+                exercise_id=exercise_id,
+                harder=steps(next_steps["harder"]),
+                easier=steps(next_steps["easier"]),
+                lateral=steps(next_steps["lateral"]),
+            )
+            for exercise_id, next_steps in graph.next_steps_many(exercise_ids, goal_branch).items()
+        ]
+
     async def create_exercise(
         self, db: AsyncSession, payload: ExerciseCreateSchema
     ) -> ExerciseSchema:
@@ -379,8 +488,78 @@ class StrengthService:
             "goal_carryover": payload.goal_carryover,
             "notes": payload.notes,
         })
+        row = result.fetchone()
+
+        # Link logged exercises that now resolve to this exercise, with the
+        # same rules as every other write path (exercise_index.py), and
+        # refresh the muscle volume of their sessions
+        index = await self._exercise_index(db)
+        unresolved = await db.execute(text(
+            "SELECT DISTINCT name FROM strength_exercises WHERE exercise_ref_id IS NULL"
+        ))
+        names = [r.name for r in unresolved.fetchall() if index.resolve(r.name) == row.exercise_id]
+        if names:
+            linked = await db.execute(text("""
+                UPDATE strength_exercises SET exercise_ref_id = :ref
+                WHERE exercise_ref_id IS NULL AND name = ANY(:names)
+                RETURNING session_id
+            """), {"ref": row.exercise_id, "names": names})
+            for session_id in sorted({r.session_id for r in linked.fetchall()}):
+                for statement in _STATS_REFRESH:
+                    await db.execute(statement, {"session_id": session_id})
+
         await db.commit()
-        return self._map_exercise(result.fetchone())
+        return self._map_exercise(row)
+
+    async def list_unmatched_exercises(
+        self, db: AsyncSession, user_id: int
+    ) -> list[UnmatchedExerciseSchema]:
+        result = await db.execute(text("""
+            SELECT se.name, COUNT(*) AS times_logged, MAX(ss.session_date) AS last_logged
+            FROM strength_exercises se
+            JOIN strength_sessions ss ON ss.session_id = se.session_id
+            WHERE ss.user_id = :user_id AND se.exercise_ref_id IS NULL
+            GROUP BY se.name
+            ORDER BY times_logged DESC, se.name
+        """), {"user_id": user_id})
+        return [
+            UnmatchedExerciseSchema(
+                name=row.name,
+                times_logged=row.times_logged,
+                last_logged=row.last_logged,
+            )
+            for row in result.fetchall()
+        ]
+
+    async def _exercise_index(self, db: AsyncSession) -> ExerciseIndex:
+        result = await db.execute(text(SIGNATURE_SQL))
+        signature = tuple(result.one())
+        index = cached_index(signature)
+        if index is None:
+            result = await db.execute(text(LOAD_SQL))
+            index = store_index(signature, [tuple(r) for r in result.fetchall()])
+        return index
+
+    async def _progression_graph(self, db: AsyncSession) -> ProgressionGraph:
+        result = await db.execute(text(PROGRESSION_SIGNATURE_SQL))
+        signature = tuple(result.one())
+        graph = cached_graph(signature)
+        if graph is None:
+            rows = (await db.execute(text(PROGRESSION_LOAD_SQL))).fetchall()
+            name_rows = (await db.execute(text(PROGRESSION_NAMES_SQL))).fetchall()
+            graph = store_graph(signature, [tuple(r) for r in rows], [tuple(r) for r in name_rows])
+        return graph
+
+    async def _search_index(self, db: AsyncSession) -> exercise_search.SearchIndex:
+        result = await db.execute(text(SIGNATURE_SQL))
+        signature = tuple(result.one())
+        index = exercise_search.cached_index(signature)
+        if index is None:
+            result = await db.execute(text(f"SELECT {_EXERCISE_COLUMNS} FROM exercises"))
+            index = exercise_search.store_index(
+                signature, [self._map_exercise(row) for row in result.fetchall()]
+            )
+        return index
 
     def _map_exercise(self, row) -> ExerciseSchema:
         return ExerciseSchema(
@@ -0,0 +1,222 @@
+"""
+SyncService
+
+Runs the ingest pipeline for one user — workout.py → workout_metrics.py →
+sleep.py → environment.py as subprocesses, with the user's Garmin
+credentials injected as environment variables — and records every run in
+sync_runs (duration, records ingested, errors).
+
+Shared by POST /api/v1/sync (on demand) and sync_scheduler.py (all users).
+"""
+
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.schemas.sync import SyncResultSchema, SyncRunSchema, SyncScriptResultSchema
+from api.settings import settings
+
+_PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+# Tail of each failing script's stderr kept in sync_runs.errors
+_ERROR_TAIL_CHARS = 2000
+
+
+class SyncService:
+
+    # ------------------------------------------------------------------
+    # Pipeline
+    # ------------------------------------------------------------------
+
+    async def fetch_garmin_creds(self, db: AsyncSession, user_id: int) -> dict:
+        result = await db.execute(
+            text("SELECT garmin_email, garmin_password FROM user_profile WHERE user_id = :uid"),
+            {"uid": user_id},
+        )
+        row = result.fetchone()
+        if row and row.garmin_email and row.garmin_password:
+            return {"GARMIN_EMAIL": row.garmin_email, "GARMIN_PASSWORD": row.garmin_password}
+        # Fall back to .env values if not set on profile
+        return {}
+
+    async def run_script(self, script: str, extra_env: dict) -> SyncScriptResultSchema:
+        env = {**os.environ, **extra_env}
+        proc = await asyncio.create_subprocess_exec(
+            sys.executable, str(_PROJECT_ROOT / script),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            cwd=str(_PROJECT_ROOT),
+            env=env,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                proc.communicate(), timeout=settings.sync_script_timeout_seconds
+            )
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return SyncScriptResultSchema(
+                script=script, ok=False, stdout="",
+                stderr=f"timed out after {settings.sync_script_timeout_seconds}s",
+            )
+        return SyncScriptResultSchema(
+            script=script,
+            ok=proc.returncode == 0,
+            stdout=stdout.decode(errors="replace").strip(),
+            stderr=stderr.decode(errors="replace").strip(),
+        )
+
+    async def run_pipeline(self, user_id: int, creds: dict) -> list[SyncScriptResultSchema]:
+        # The scripts write for config.USER_ID
+        env = {**creds, "USER_ID": str(user_id)}
+        results = []
+
+        workout = await self.run_script("workout.py", env)
+        results.append(workout)
+
+        if workout.ok:
+            results.append(await self.run_script("workout_metrics.py", env))
+
+        results.append(await self.run_script("sleep.py", env))
+        results.append(await self.run_script("environment.py", env))
+        return results
+
+    async def sync_user(
+        self, db: AsyncSession, user_id: int, trigger: str = "manual"
+    ) -> SyncResultSchema:
+        """
+        Run the pipeline for one user and record it in sync_runs. The run row
+        is committed before the scripts start so in-flight syncs count toward
+        the scheduler's per-user rate limit.
+        """
+        before = await self._ingested_count(db, user_id)
+        result = await db.execute(text("""
+            INSERT INTO sync_runs (user_id, trigger, started_at)
+            VALUES (:uid, :trigger, NOW())
+            RETURNING run_id
+        """), {"uid": user_id, "trigger": trigger})
+        run_id = result.scalar_one()
+        await db.commit()
+
+        t0 = time.perf_counter()
+        try:
+            creds = await self.fetch_garmin_creds(db, user_id)
+            results = await self.run_pipeline(user_id, creds)
+            duration_s = time.perf_counter() - t0
+
+            records = max(await self._ingested_count(db, user_id) - before, 0)
+            ok = all(r.ok for r in results)
+            errors = "\n\n".join(
+                f"{r.script}: {r.stderr[-_ERROR_TAIL_CHARS:]}" for r in results if not r.ok
+            ) or None
+            await self._finish_run(db, run_id, duration_s, ok, records, errors)
+        except BaseException as exc:
+            # DB error, spawn failure or cancellation: never leave the run in flight
+            await db.rollback()
+            await self._finish_run(
+                db, run_id, time.perf_counter() - t0, False, None,
+                f"{type(exc).__name__}: {exc}"[-_ERROR_TAIL_CHARS:],
+            )
+            raise
+
+        return SyncResultSchema(
+            ok=ok, run_id=run_id, duration_s=duration_s,
+            records_ingested=records, results=results,
+        )
+
+    async def _finish_run(
+        self, db: AsyncSession, run_id: int, duration_s: float,
+        ok: bool, records: int | None, errors: str | None,
+    ) -> None:
+        await db.execute(text("""
+            UPDATE sync_runs
+            SET finished_at = NOW(), duration_s = :duration, ok = :ok,
+                records_ingested = :records, errors = :errors
+            WHERE run_id = :run_id
+        """), {"duration": duration_s, "ok": ok, "records": records, "errors": errors, "run_id": run_id})
+        await db.commit()
+
+    async def _ingested_count(self, db: AsyncSession, user_id: int) -> int:
+        result = await db.execute(text("""
+            SELECT
+                (SELECT COUNT(*) FROM workouts WHERE user_id = :uid)
+              + (SELECT COALESCE(SUM(metrics_row_count), 0) FROM workouts WHERE user_id = :uid)
+              + (SELECT COUNT(*) FROM sleep_sessions WHERE user_id = :uid)
+        """), {"uid": user_id})
+        return int(result.scalar_one())
+
+    # ------------------------------------------------------------------
+    # History
+    # ------------------------------------------------------------------
+
+    async def list_runs(
+        self, db: AsyncSession, user_id: int, limit: int = 20
+    ) -> list[SyncRunSchema]:
+        result = await db.execute(text("""
+            SELECT run_id, trigger, started_at, finished_at, duration_s,
+                   ok, records_ingested, errors
+            FROM sync_runs
+            WHERE user_id = :uid
+            ORDER BY started_at DESC
+            LIMIT :limit
+        """), {"uid": user_id, "limit": limit})
+        return [SyncRunSchema(**row._mapping) for row in result.fetchall()]
+
+    # ------------------------------------------------------------------
+    # Scheduler support
+    # ------------------------------------------------------------------
+
+    async def touch_last_active(self, db: AsyncSession, user_id: int) -> None:
+        """Mark the user as recently active (at most one write per 5 minutes)."""
+        await db.execute(text("""
+            UPDATE users SET last_active_at = NOW()
+            WHERE user_id = :uid
+              AND (last_active_at IS NULL OR last_active_at < NOW() - INTERVAL '5 minutes')
+        """), {"uid": user_id})
+        await db.commit()
+
+    async def list_sync_candidates(self, db: AsyncSession) -> list[dict]:
+        """Users with Garmin credentials, their last activity and last sync start."""
+        result = await db.execute(text("""
+            SELECT p.user_id, u.last_active_at, r.last_started_at
+            FROM user_profile p
+            JOIN users u ON u.user_id = p.user_id
+            LEFT JOIN (
+                SELECT user_id, MAX(started_at) AS last_started_at
+                FROM sync_runs
+                GROUP BY user_id
+            ) r ON r.user_id = p.user_id
+            WHERE p.garmin_email IS NOT NULL AND p.garmin_password IS NOT NULL
+        """))
+        return [dict(row._mapping) for row in result.fetchall()]
+
+
+def plan_sync_order(
+    candidates: list[dict],
+    now: datetime,
+    min_interval_s: float,
+    active_window_s: float,
+) -> list[int]:
+    """
+    Pick and order the users due for a sync.
+
+    A user is due when their last sync (manual or scheduled, finished or
+    not) started at least min_interval_s ago. Users active in the app within
+    active_window_s go first; within each group the stalest sync goes first,
+    never-synced users before everyone else.
+    """
+    def seconds_since(ts):
+        return (now - ts).total_seconds() if ts else float("inf")
+
+    due = [c for c in candidates if seconds_since(c["last_started_at"]) >= min_interval_s]
+    due.sort(key=lambda c: (
+        seconds_since(c["last_active_at"]) > active_window_s,
+        -seconds_since(c["last_started_at"]),
+    ))
+    return [c["user_id"] for c in due]
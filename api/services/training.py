@@ -4,11 +4,24 @@ TrainingService
 Handles training load history, HRV history, workout list, and workout detail.
 CRUD queries use the async SQLAlchemy session directly.
 Training load computations wrap the existing sync module via asyncio.to_thread.
+
+Workout detail returns the time series either as full-resolution points
+(metrics) or, with max_points, as one LTTB-downsampled array pair per
+column (series, analytics/downsample.py), so the payload is bounded by
+max_points whatever the workout length. from_s / to_s restrict either
+form to a time range for zooming in.
+
+The *_columns methods return the same series as {field: [values]}
+(api/columnar.py) for ?format=columnar, without building a model per row.
+
+The workout list pages by keyset cursor (api/pagination.py) when given a
+limit.
 """
 
 import asyncio
-from datetime import date
+from datetime import date, datetime, timedelta
 
+import numpy as np
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -19,12 +32,27 @@ from api.schemas.training import (
     WorkoutDetailSchema,
     WorkoutListItemSchema,
     WorkoutMetricPointSchema,
+    WorkoutSeriesSchema,
 )
 
+from analytics.downsample import downsample
+from api.columnar import columns_from_rows
+from api.pagination import decode_cursor, page
 from db import get_connection
 from training_load import get_history, get_hrv_history
 
 
+# workout_metrics columns returned by the workout detail, in query order
+METRIC_COLUMNS = (
+    "heart_rate", "pace", "cadence",
+    "vertical_oscillation", "vertical_ratio", "ground_contact_time",
+    "power", "latitude", "longitude", "altitude", "distance", "gradient_pct",
+)
+
+# Downsampled together at evenly spaced points, so the route stays a route
+_ROUTE_COLUMNS = ("latitude", "longitude")
+
+
 class TrainingService:
 
     # ------------------------------------------------------------------
@@ -34,15 +62,7 @@ class TrainingService:
     async def get_training_history(
         self, today: date, days: int = 90
     ) -> list[TrainingHistoryPointSchema]:
-        def _sync():
-            conn = get_connection()
-            try:
-                cur = conn.cursor()
-                return get_history(cur, today, days=days)
-            finally:
-                conn.close()
-
-        rows = await asyncio.to_thread(_sync)
+        rows = await asyncio.to_thread(self._training_history, today, days)
         return [
             TrainingHistoryPointSchema(
                 date=r["date"],
@@ -54,18 +74,22 @@ class TrainingService:
             for r in rows
         ]
 
+    async def get_training_history_columns(self, today: date, days: int = 90) -> dict[str, list]:
+        rows = await asyncio.to_thread(self._training_history, today, days)
+        return columns_from_rows(rows, TrainingHistoryPointSchema.model_fields)
+
+    def _training_history(self, today: date, days: int) -> list[dict]:
+        conn = get_connection()
+        try:
+            cur = conn.cursor()
+            return get_history(cur, today, days=days)
+        finally:
+            conn.close()
+
     async def get_hrv_history(
         self, today: date, days: int = 30
     ) -> list[HRVHistoryPointSchema]:
-        def _sync():
-            conn = get_connection()
-            try:
-                cur = conn.cursor()
-                return get_hrv_history(cur, today, days=days)
-            finally:
-                conn.close()
-
-        rows = await asyncio.to_thread(_sync)
+        rows = await asyncio.to_thread(self._hrv_history, today, days)
         return [
             HRVHistoryPointSchema(
                 date=r["date"],
@@ -77,6 +101,18 @@ class TrainingService:
             for r in rows
         ]
 
+    async def get_hrv_history_columns(self, today: date, days: int = 30) -> dict[str, list]:
+        rows = await asyncio.to_thread(self._hrv_history, today, days)
+        return columns_from_rows(rows, HRVHistoryPointSchema.model_fields)
+
+    def _hrv_history(self, today: date, days: int) -> list[dict]:
+        conn = get_connection()
+        try:
+            cur = conn.cursor()
+            return get_hrv_history(cur, today, days=days)
+        finally:
+            conn.close()
+
     # ------------------------------------------------------------------
     # Weekly volume (async SQL)
     # ------------------------------------------------------------------
@@ -84,16 +120,17 @@ class TrainingService:
     async def get_weekly_volume(
         self, db: AsyncSession, user_id: int, weeks: int = 12
     ) -> list[WeeklyVolumeSchema]:
+        # Per-exercise set counts from strength_stats.py, one row per
+        # exercise instead of one per set
         result = await db.execute(text("""
             SELECT
                 date_trunc('week', session_date)::date AS week_start,
                 COUNT(DISTINCT session_date)           AS training_days,
-                COUNT(st.set_id)                       AS total_sets
-            FROM strength_sessions ss
-            JOIN strength_exercises se ON se.session_id = ss.session_id
-            JOIN strength_sets st      ON st.exercise_id = se.exercise_id
-            WHERE ss.user_id = :user_id
+                SUM(sets)                              AS total_sets
+            FROM strength_exercise_stats
+            WHERE user_id = :user_id
               AND session_date >= CURRENT_DATE - (:weeks * INTERVAL '1 week')
+              AND sets > 0
             GROUP BY week_start
             ORDER BY week_start
         """), {"user_id": user_id, "weeks": weeks})
@@ -117,7 +154,10 @@ class TrainingService:
         user_id: int,
         days: int = 90,
         sport: str | None = None,
-    ) -> list[WorkoutListItemSchema]:
+        limit: int | None = None,
+        cursor: str | None = None,
+    ) -> tuple[list[WorkoutListItemSchema], str | None]:
+        """(workouts, next cursor), newest first; keyed on (workout_date, start_time, workout_id)."""
         query = """
             SELECT
                 workout_id, workout_date, sport, workout_type,
@@ -137,9 +177,21 @@ class TrainingService:
             query += " AND sport = :sport"
             params["sport"] = sport
 
-        query += " ORDER BY workout_date DESC, start_time DESC"
+        # start_time is the workouts upsert key, so it is set on every row
+        # and the row comparison never meets a NULL
+        if cursor:
+            params["c_date"], params["c_start"], params["c_id"] = decode_cursor(cursor, (date, datetime, int))
+            query += " AND (workout_date, start_time, workout_id) < (:c_date, :c_start, :c_id)"
+
+        query += " ORDER BY workout_date DESC, start_time DESC, workout_id DESC"
+        if limit:
+            query += " LIMIT :limit"
+            params["limit"] = limit + 1
 
         result = await db.execute(text(query), params)
+        rows, next_cursor = page(
+            result.fetchall(), limit, lambda r: (r.workout_date, r.start_time, r.workout_id),
+        )
         return [
             WorkoutListItemSchema(
                 workout_id=row.workout_id,
@@ -155,8 +207,8 @@ class TrainingService:
                 calories=row.calories_burned,
                 tss=row.training_stress_score,
             )
-            for row in result.fetchall()
-        ]
+            for row in rows
+        ], next_cursor
 
     async def get_sport_options(
         self, db: AsyncSession, user_id: int
@@ -173,7 +225,13 @@ class TrainingService:
     # ------------------------------------------------------------------
 
     async def get_workout_detail(
-        self, db: AsyncSession, user_id: int, workout_id: int
+        self,
+        db: AsyncSession,
+        user_id: int,
+        workout_id: int,
+        max_points: int | None = None,
+        from_s: float | None = None,
+        to_s: float | None = None,
     ) -> WorkoutDetailSchema | None:
         result = await db.execute(text("""
             SELECT
@@ -202,7 +260,12 @@ class TrainingService:
         if not row:
             return None
 
-        metrics = await self._get_workout_metrics(db, workout_id)
+        rows = await self._get_workout_metrics(db, workout_id, from_s, to_s)
+        series_start = rows[0].metric_timestamp - timedelta(seconds=float(rows[0].t)) if rows else None
+        if max_points is None:
+            metrics, series = self._metric_points(rows), None
+        else:
+            metrics, series = [], await asyncio.to_thread(self._downsample_series, rows, max_points)
 
         return WorkoutDetailSchema(
             workout_id=row.workout_id,
@@ -242,21 +305,75 @@ class TrainingService:
             lat=row.start_latitude,
             lon=row.start_longitude,
             metrics=metrics,
+            series_start=series_start,
+            series=series,
         )
 
-    async def _get_workout_metrics(
-        self, db: AsyncSession, workout_id: int
-    ) -> list[WorkoutMetricPointSchema]:
+    async def get_workout_metrics(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        workout_id: int,
+        from_s: float | None = None,
+        to_s: float | None = None,
+    ) -> list[WorkoutMetricPointSchema] | None:
+        if not await self._owns_workout(db, user_id, workout_id):
+            return None
+        return self._metric_points(await self._get_workout_metrics(db, workout_id, from_s, to_s))
+
+    async def get_workout_metric_columns(
+        self,
+        db: AsyncSession,
+        user_id: int,
+        workout_id: int,
+        from_s: float | None = None,
+        to_s: float | None = None,
+    ) -> dict[str, list] | None:
+        if not await self._owns_workout(db, user_id, workout_id):
+            return None
+        rows = await self._get_workout_metrics(db, workout_id, from_s, to_s)
+        return columns_from_rows(rows, ("metric_timestamp", "t", *METRIC_COLUMNS))
+
+    async def _owns_workout(self, db: AsyncSession, user_id: int, workout_id: int) -> bool:
         result = await db.execute(text("""
+            SELECT 1 FROM workouts WHERE workout_id = :workout_id AND user_id = :user_id
+        """), {"workout_id": workout_id, "user_id": user_id})
+        return result.fetchone() is not None
+
+    async def _get_workout_metrics(
+        self, db: AsyncSession, workout_id: int, from_s: float | None = None, to_s: float | None = None
+    ) -> list:
+        """
+        Rows of metric_timestamp, t (seconds since the workout's first
+        point) and METRIC_COLUMNS, optionally limited to from_s <= t <= to_s.
+        """
+        query = f"""
             SELECT
-                metric_timestamp, heart_rate, pace, cadence,
-                vertical_oscillation, vertical_ratio, ground_contact_time,
-                power, latitude, longitude, altitude, distance, gradient_pct
-            FROM workout_metrics
-            WHERE workout_id = :workout_id
-            ORDER BY metric_timestamp
-        """), {"workout_id": workout_id})
+                m.metric_timestamp,
+                EXTRACT(EPOCH FROM (m.metric_timestamp - f.first_ts)) AS t,
+                {", ".join(f"m.{c}" for c in METRIC_COLUMNS)}
+            FROM workout_metrics m
+            CROSS JOIN (
+                SELECT MIN(metric_timestamp) AS first_ts
+                FROM workout_metrics WHERE workout_id = :workout_id
+            ) f
+            WHERE m.workout_id = :workout_id
+        """
+        params: dict = {"workout_id": workout_id}
+
+        if from_s is not None:
+            query += " AND m.metric_timestamp >= f.first_ts + :from_s * INTERVAL '1 second'"
+            params["from_s"] = from_s
+        if to_s is not None:
+            query += " AND m.metric_timestamp <= f.first_ts + :to_s * INTERVAL '1 second'"
+            params["to_s"] = to_s
+
+        query += " ORDER BY m.metric_timestamp"
 
+        result = await db.execute(text(query), params)
+        return result.fetchall()
+
+    def _metric_points(self, rows) -> list[WorkoutMetricPointSchema]:
         return [
             WorkoutMetricPointSchema(
                 metric_timestamp=row.metric_timestamp,
@@ -273,5 +390,36 @@ class TrainingService:
                 distance=row.distance,
                 gradient_pct=row.gradient_pct,
             )
-            for row in result.fetchall()
+            for row in rows
         ]
+
+    def _downsample_series(self, rows, max_points: int) -> dict[str, WorkoutSeriesSchema]:
+        """
+        Each column with data as its own LTTB-downsampled (t, values)
+        pair of at most max_points; latitude / longitude share evenly
+        spaced points. Missing values are dropped, not sent as null.
+        """
+        if not rows:
+            return {}
+        data = np.array([row[1:] for row in rows], dtype=np.float64)   # t, *METRIC_COLUMNS
+        t = data[:, 0]
+        columns = {c: data[:, i + 1] for i, c in enumerate(METRIC_COLUMNS)}
+
+        series = {}
+        for col, values in columns.items():
+            if col in _ROUTE_COLUMNS:
+                continue
+            n = int((~np.isnan(values)).sum())
+            if n:
+                x, y = downsample(t, values, max_points)
+                series[col] = WorkoutSeriesSchema(t=x.tolist(), values=y.tolist(), source_points=n)
+
+        route = ~np.isnan(columns["latitude"]) & ~np.isnan(columns["longitude"])
+        n = int(route.sum())
+        if n:
+            keep = np.flatnonzero(route)[np.unique(np.linspace(0, n - 1, min(n, max_points)).astype(np.int64))]
+            for col in _ROUTE_COLUMNS:
+                series[col] = WorkoutSeriesSchema(
+                    t=t[keep].tolist(), values=columns[col][keep].tolist(), source_points=n,
+                )
+        return series
@@ -41,6 +41,13 @@ class Settings(BaseSettings):
     # Anthropic
     anthropic_api_key: str
 
+    # Sync scheduler (sync_scheduler.py)
+    sync_max_concurrency: int = 4          # users synced at the same time
+    sync_min_interval_minutes: int = 60    # per-user: no new run sooner than this after the last one
+    sync_jitter_seconds: int = 30          # random delay before each run starts
+    sync_active_window_hours: int = 24     # users seen in the app within this window go first
+    sync_script_timeout_seconds: int = 600
+
     @computed_field
     @property
     def database_url(self) -> str:
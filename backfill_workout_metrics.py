@@ -8,6 +8,7 @@ Usage:
     python backfill_workout_metrics.py
     python backfill_workout_metrics.py --days 365
     python backfill_workout_metrics.py --sport running
+    python backfill_workout_metrics.py --force     # re-ingest already populated workouts
 """
 
 import argparse
@@ -18,6 +19,8 @@ import garminconnect
 
 from config import GARMIN_EMAIL, GARMIN_PASSWORD
 from db import get_connection
+from metrics_ingest import metrics_ingested, replace_workout_metrics, store_workout_series
+from metrics_parser import parse_activity_details
 
 # Sports to include by default
 SUPPORTED_SPORTS = {
@@ -28,65 +31,6 @@ SUPPORTED_SPORTS = {
     "indoor_cycling",
 }
 
-# Maps Garmin metric descriptor keys to workout_metrics column names.
-GARMIN_KEY_TO_COLUMN = {
-    "directHeartRate":           "heart_rate",
-    "directSpeed":               "pace",               # converted m/s → min/km
-    "directDoubleCadence":       "cadence",
-    "directCadence":             "cadence",
-    "directVerticalOscillation": "vertical_oscillation",
-    "directVerticalRatio":       "vertical_ratio",
-    "directGroundContactTime":   "ground_contact_time",
-    "directPower":               "power",
-    "directLatitude":            "latitude",
-    "directLongitude":           "longitude",
-    "directAltitude":            "altitude",
-    "directElevation":           "altitude",           # some devices use this key
-    "directDistance":            "distance",
-}
-
-
-def speed_to_pace(speed_ms):
-    """Convert m/s to min/km. Returns None for zero/null speed."""
-    if not speed_ms:
-        return None
-    return (1000 / speed_ms) / 60
-
-
-def build_column_map(descriptors):
-    """
-    Return a dict of {metricsIndex: (column_name, transform_fn)} from the
-    activity's metricDescriptors list.
-
-    When both directCadence and directDoubleCadence are present, only
-    directDoubleCadence is mapped (it's the full steps/min value).
-    """
-    has_double_cadence = any(d["key"] == "directDoubleCadence" for d in descriptors)
-
-    col_map = {}
-    for d in descriptors:
-        key = d["key"]
-        idx = d["metricsIndex"]
-
-        if key == "directCadence" and has_double_cadence:
-            continue
-
-        if key not in GARMIN_KEY_TO_COLUMN:
-            continue
-
-        col_name = GARMIN_KEY_TO_COLUMN[key]
-
-        if col_name == "heart_rate":
-            transform = lambda v: int(v) if v is not None else None
-        elif col_name == "pace":
-            transform = speed_to_pace
-        else:
-            transform = lambda v: float(v) if v is not None else None
-
-        col_map[idx] = (col_name, transform)
-
-    return col_map
-
 
 def extract_workout_fields(activity):
     """Extract all summary fields from a Garmin activity dict."""
@@ -190,103 +134,6 @@ ON CONFLICT (user_id, start_time) DO UPDATE SET
 RETURNING workout_id;
 """
 
-SQL_INSERT_METRIC = """
-INSERT INTO workout_metrics (
-    workout_id, metric_timestamp,
-    heart_rate, pace, cadence,
-    vertical_oscillation, vertical_ratio, ground_contact_time, power,
-    latitude, longitude, altitude, distance, gradient_pct
-) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-ON CONFLICT DO NOTHING;
-"""
-
-
-def insert_metric_rows(cursor, workout_id, details):
-    """Parse and insert time-series metric rows. Returns count of rows inserted."""
-    descriptors = details.get("metricDescriptors", [])
-    data_points = details.get("activityDetailMetrics", [])
-
-    if not descriptors or not data_points:
-        return 0
-
-    timestamp_index = next(
-        (d["metricsIndex"] for d in descriptors if d["key"] == "directTimestamp"),
-        None,
-    )
-    if timestamp_index is None:
-        return 0
-
-    col_map = build_column_map(descriptors)
-    rows_inserted = 0
-    prev_altitude = None
-    prev_distance = None
-
-    for point in data_points:
-        metrics = point.get("metrics", [])
-        if timestamp_index >= len(metrics) or metrics[timestamp_index] is None:
-            continue
-
-        metric_timestamp = datetime.fromtimestamp(metrics[timestamp_index] / 1000)
-
-        values = {
-            "heart_rate": None,
-            "pace": None,
-            "cadence": None,
-            "vertical_oscillation": None,
-            "vertical_ratio": None,
-            "ground_contact_time": None,
-            "power": None,
-            "latitude": None,
-            "longitude": None,
-            "altitude": None,
-            "distance": None,
-        }
-
-        for idx, (col_name, transform) in col_map.items():
-            if idx < len(metrics) and metrics[idx] is not None:
-                values[col_name] = transform(metrics[idx])
-
-        # gradient_pct = Δaltitude / Δhorizontal_distance × 100
-        # Primary: cumulative distance; fallback: pace × Δt (1s per point)
-        gradient_pct = None
-        alt  = values["altitude"]
-        dist = values["distance"]
-        pace = values["pace"]   # min/km
-
-        if alt is not None and prev_altitude is not None:
-            d_alt = alt - prev_altitude
-            d_dist = None
-            if dist is not None and prev_distance is not None:
-                d_dist = dist - prev_distance
-            elif pace is not None and pace > 0:
-                speed_ms = 1000.0 / (pace * 60.0)
-                d_dist = speed_ms * 1.0   # 1-second intervals
-            if d_dist is not None and d_dist > 0.5:
-                gradient_pct = round(d_alt / d_dist * 100, 2)
-
-        if alt  is not None: prev_altitude = alt
-        if dist is not None: prev_distance = dist
-
-        cursor.execute(SQL_INSERT_METRIC, (
-            workout_id,
-            metric_timestamp,
-            values["heart_rate"],
-            values["pace"],
-            values["cadence"],
-            values["vertical_oscillation"],
-            values["vertical_ratio"],
-            values["ground_contact_time"],
-            values["power"],
-            values["latitude"],
-            values["longitude"],
-            values["altitude"],
-            values["distance"],
-            gradient_pct,
-        ))
-        rows_inserted += 1
-
-    return rows_inserted
-
 
 def main():
     parser = argparse.ArgumentParser(description="Backfill workout_metrics from Garmin history.")
@@ -302,6 +149,11 @@ def main():
         default=None,
         help="Filter to a single sport type (e.g. running, cycling). Default: all supported sports.",
     )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-ingest workouts whose series is already stored (replaced atomically).",
+    )
     args = parser.parse_args()
 
     target_sports = {args.sport} if args.sport else SUPPORTED_SPORTS
@@ -407,11 +259,7 @@ def main():
                 conn.commit()
 
             # Check if metrics already populated
-            cursor.execute(
-                "SELECT COUNT(*) FROM workout_metrics WHERE workout_id = %s",
-                (workout_id,),
-            )
-            if cursor.fetchone()[0] > 0:
+            if not args.force and metrics_ingested(cursor, workout_id):
                 print(f"Activity {i}/{len(matching)}: {activity_name} {activity_date} — skipped (already populated)")
                 total_skipped += 1
                 total_processed += 1
@@ -421,8 +269,10 @@ def main():
             details = client.get_activity_details(activity_id, maxchart=2000)
             time.sleep(1.5)
 
-            rows_inserted = insert_metric_rows(cursor, workout_id, details)
+            batch = parse_activity_details(details)
+            rows_inserted = replace_workout_metrics(cursor, workout_id, batch)
             conn.commit()
+            store_workout_series(workout_id, batch)
 
             print(f"Activity {i}/{len(matching)}: {activity_name} {activity_date} — {rows_inserted} metric rows inserted")
             total_rows_inserted += rows_inserted
@@ -0,0 +1,121 @@
+"""
+Benchmark: legacy pretty-JSON archive vs compressed content-addressed blobs.
+
+Uses the real activity details sample in the repo root. Reports on-disk size
+and write throughput per format, the effect of deduplicating identical
+re-downloads, and catalog lookup cost (JSONL scan vs SQLite primary key).
+
+Usage:
+    python benchmarks/bench_archive.py
+    python benchmarks/bench_archive.py --downloads 50 --catalog-size 20000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from workout_data_archiver import WorkoutArchiver, zstandard  # noqa: E402
+
+SAMPLE = ROOT / "activity_18698089374_details.json"
+
+
+def _dir_size(path):
+    return sum(f.stat().st_size for f in Path(path).rglob("*") if f.is_file())
+
+
+def bench_legacy(details, downloads, workdir):
+    """Old layout: one pretty JSON file per download, metadata wrapper included."""
+    t0 = time.perf_counter()
+    for i in range(downloads):
+        with open(os.path.join(workdir, f"details_{i}.json"), "w", encoding="utf-8") as f:
+            json.dump({"activity_id": 1, "data_type": "details", "data": details},
+                      f, indent=2, ensure_ascii=False, default=str)
+    return time.perf_counter() - t0, _dir_size(workdir)
+
+
+def bench_blobs(details, downloads, workdir, codec):
+    archiver = WorkoutArchiver(workdir, codec=codec)
+    t0 = time.perf_counter()
+    for _ in range(downloads):
+        archiver.save_activity_details(1, details)
+    elapsed = time.perf_counter() - t0
+
+    # Single-write cost (no dedup hit) for throughput
+    t1 = time.perf_counter()
+    archiver.store_blob({**details, "_bench_nonce": time.time()})
+    single = time.perf_counter() - t1
+
+    t2 = time.perf_counter()
+    archiver.load_payload(1, "details")
+    read = time.perf_counter() - t2
+    archiver.close()
+    return elapsed, single, read, _dir_size(os.path.join(workdir, "raw"))
+
+
+def bench_catalog(n, workdir):
+    jsonl = os.path.join(workdir, "catalog.jsonl")
+    with open(jsonl, "w", encoding="utf-8") as f:
+        for i in range(n):
+            f.write(json.dumps({"activity_id": i, "files": {}, "summary": {"activity_name": "Run"}}) + "\n")
+
+    t0 = time.perf_counter()
+    with open(jsonl, encoding="utf-8") as f:
+        found = any(json.loads(line)["activity_id"] == n - 1 for line in f)
+    scan = time.perf_counter() - t0
+    assert found
+
+    archiver = WorkoutArchiver(os.path.join(workdir, "arch"))
+    with archiver._conn:
+        archiver._conn.executemany(
+            "INSERT INTO activities (activity_id, cataloged_at, summary) VALUES (?, '', '{}')",
+            ((i,) for i in range(n)),
+        )
+    t1 = time.perf_counter()
+    assert archiver.is_archived(n - 1)
+    lookup = time.perf_counter() - t1
+    archiver.close()
+    return scan, lookup
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--downloads", type=int, default=20,
+                        help="Identical re-downloads of the same activity")
+    parser.add_argument("--catalog-size", type=int, default=10000)
+    args = parser.parse_args()
+
+    with open(SAMPLE, encoding="utf-8") as f:
+        details = json.load(f)["activityDetails"]
+    raw_mb = len(json.dumps(details, separators=(",", ":"))) / 1e6
+    n_points = len(details["activityDetailMetrics"])
+    print(f"Sample: {n_points} metric points, {raw_mb:.2f} MB compact JSON\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "legacy"))
+        t, size = bench_legacy(details, args.downloads, os.path.join(tmp, "legacy"))
+        print(f"{'legacy pretty JSON':<20} {size / 1e6:8.2f} MB on disk   "
+              f"{args.downloads * raw_mb / t:7.1f} MB/s write")
+
+        codecs = ["gzip"] + (["zstd"] if zstandard is not None else [])
+        for codec in codecs:
+            t, single, read, size = bench_blobs(details, args.downloads, os.path.join(tmp, codec), codec)
+            print(f"{codec + ' blobs':<20} {size / 1e6:8.2f} MB on disk   "
+                  f"{raw_mb / single:7.1f} MB/s write   {raw_mb / read:7.1f} MB/s read   "
+                  f"({args.downloads} downloads in {t:.2f}s, deduplicated)")
+        if zstandard is None:
+            print("(zstandard not installed — zstd codec skipped)")
+
+        scan, lookup = bench_catalog(args.catalog_size, tmp)
+        print(f"\nCatalog lookup, {args.catalog_size} entries: "
+              f"JSONL scan {scan * 1e3:.2f} ms  vs  SQLite {lookup * 1e3:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: best-effort curves.
+
+1. One workout's mean-max curve: a moving-average convolution per
+   duration (O(n·d)) vs one prefix-sum pass per duration (O(n)).
+2. A window's envelope: recomputing every workout's curve from its
+   series (what a query without workout_mean_max would do) vs an
+   element-wise max over the stored curves.
+
+The series are synthesised (1 Hz power / pace / HR runs).
+
+Usage:
+    python benchmarks/bench_best_efforts.py
+    python benchmarks/bench_best_efforts.py --runs 500 --seconds 5400
+"""
+
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from analytics.best_efforts import DURATIONS, envelope, mean_max_curves  # noqa: E402
+
+
+def synth_run(rng, seconds):
+    t = np.arange(seconds, dtype=np.float64)
+    return {
+        "metric_epoch": 1_700_000_000.0 + t,
+        "power": 250 + 40 * np.sin(t / 300) + rng.normal(0, 25, seconds),
+        "pace": 5.0 + 0.4 * np.sin(t / 500) + rng.normal(0, 0.1, seconds),
+        "heart_rate": 150 + 10 * np.sin(t / 600) + rng.normal(0, 2, seconds),
+    }
+
+
+def convolution_curve(power):
+    """Reference: moving average by convolution for every duration."""
+    return [
+        float(np.convolve(power, np.ones(d) / d, mode="valid").max()) if d <= len(power) else None
+        for d in DURATIONS
+    ]
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark best-effort curves.")
+    parser.add_argument("--runs", type=int, default=300, help="Workouts in the window (default: 300)")
+    parser.add_argument("--seconds", type=int, default=3600, help="Points per workout (default: 3600)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    runs = [synth_run(rng, args.seconds) for _ in range(args.runs)]
+
+    print(f"One workout, {args.seconds:,} points, {len(DURATIONS)} durations")
+    t_conv, ref = timed(lambda: convolution_curve(runs[0]["power"]))
+    t_prefix, curves = timed(lambda: mean_max_curves(runs[0]))
+    assert all(a is None and b is None or abs(a - b) < 0.05 for a, b in zip(ref, curves["power"]))
+    print(f"  convolution (power only)       {t_conv * 1000:8.1f} ms")
+    print(f"  prefix sums (power/speed/HR)   {t_prefix * 1000:8.1f} ms   ({t_conv / t_prefix:.1f}x)")
+
+    print(f"\nEnvelope over {args.runs} workouts")
+    start = date(2025, 1, 1)
+    stored = [(i, start + timedelta(days=i), mean_max_curves(s)) for i, s in enumerate(runs)]
+    t_scan, scanned = timed(lambda: envelope(
+        [(i, start + timedelta(days=i), mean_max_curves(s)) for i, s in enumerate(runs)]
+    ), repeat=1)
+    t_stored, best = timed(lambda: envelope(stored))
+    assert scanned == best
+    print(f"  recompute from series          {t_scan * 1000:8.1f} ms")
+    print(f"  max over stored curves         {t_stored * 1000:8.1f} ms   ({t_scan / t_stored:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Benchmark: row-object vs columnar responses for a workout's time series.
+
+Rows are synthesised the way the DB driver returns them (one tuple per
+1 Hz point of a long ride) and encoded the way each path does:
+
+  rows       one WorkoutMetricPointSchema per row, then FastAPI's
+             response_model path (validate, jsonable_encoder, json.dumps)
+  columnar   columns_from_rows + encode_json (orjson when installed,
+             stdlib json otherwise)
+  arrow      columns_from_rows + encode_arrow (only with pyarrow)
+
+Reports server time and payload size, raw and gzipped.
+
+Usage:
+    python benchmarks/bench_columnar.py
+    python benchmarks/bench_columnar.py --seconds 21600
+"""
+
+import argparse
+import gzip
+import json
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from api import columnar  # noqa: E402
+from api.schemas.training import WorkoutMetricPointSchema  # noqa: E402
+
+FIELDS = list(WorkoutMetricPointSchema.model_fields)
+
+
+def synth_rows(seconds):
+    rng = np.random.default_rng(0)
+    start = datetime(2025, 6, 1, 7, 0)
+    t = np.arange(seconds)
+    data = {
+        "heart_rate": (140 + 15 * np.sin(t / 600) + rng.normal(0, 2, seconds)).round().astype(int).tolist(),
+        "pace": (2.2 + 0.3 * np.sin(t / 300) + rng.normal(0, 0.05, seconds)).round(3).tolist(),
+        "cadence": (85 + rng.normal(0, 3, seconds)).round(1).tolist(),
+        "power": (210 + 40 * np.sin(t / 200) + rng.normal(0, 20, seconds)).round(1).tolist(),
+        "latitude": (45.0 + np.cumsum(rng.normal(0, 1e-5, seconds))).tolist(),
+        "longitude": (7.0 + np.cumsum(rng.normal(0, 1e-5, seconds))).tolist(),
+        "altitude": (400 + 50 * np.sin(t / 900)).round(1).tolist(),
+        "distance": (t * 7.5).astype(float).tolist(),
+        "gradient_pct": (3 * np.cos(t / 900)).round(2).tolist(),
+    }
+    rows = []
+    for i in range(seconds):
+        row = {f: None for f in FIELDS}
+        row["metric_timestamp"] = start + timedelta(seconds=i)
+        for k, v in data.items():
+            row[k] = v[i]
+        rows.append(tuple(row[f] for f in FIELDS))
+    return rows
+
+
+def rows_path(rows):
+    models = [WorkoutMetricPointSchema(**dict(zip(FIELDS, r))) for r in rows]
+    validated = TypeAdapter(list[WorkoutMetricPointSchema]).validate_python(models)
+    return json.dumps(jsonable_encoder(validated), separators=(",", ":")).encode()
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, result
+
+
+def report(name, seconds, body, base=None):
+    zipped = len(gzip.compress(body, compresslevel=5))
+    speedup = f"   ({base / seconds:5.1f}x)" if base else ""
+    print(f"  {name:<22} {seconds * 1000:8.1f} ms   {len(body) / 1024:8.0f} KiB   "
+          f"{zipped / 1024:7.0f} KiB gzip{speedup}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark row vs columnar time-series responses.")
+    parser.add_argument("--seconds", type=int, default=10_800, help="Points in the series (default: 10800, 3 h)")
+    args = parser.parse_args()
+
+    rows = synth_rows(args.seconds)
+    print(f"{args.seconds:,} points, {len(FIELDS)} fields")
+
+    t_rows, body = timed(lambda: rows_path(rows))
+    report("rows (Pydantic)", t_rows, body)
+
+    t, body = timed(lambda: columnar.encode_json(columnar.columns_from_rows(rows, FIELDS)))
+    report(f"columnar ({'orjson' if columnar.orjson else 'json'})", t, body, t_rows)
+
+    if columnar.orjson is not None:
+        orjson, columnar.orjson = columnar.orjson, None
+        t, body = timed(lambda: columnar.encode_json(columnar.columns_from_rows(rows, FIELDS)))
+        columnar.orjson = orjson
+        report("columnar (json)", t, body, t_rows)
+
+    if columnar.pyarrow is not None:
+        t, body = timed(lambda: columnar.encode_arrow(columnar.columns_from_rows(rows, FIELDS)))
+        report("arrow IPC", t, body, t_rows)
+    else:
+        print("  arrow IPC              skipped (pyarrow not installed)")
+
+
+if __name__ == "__main__":
+    main()
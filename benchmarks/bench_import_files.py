@@ -0,0 +1,93 @@
+"""
+Benchmark: offline GPX import throughput (parse + summarise, no DB).
+
+Synthesises GPX exports from the real activity details sample in the repo
+root (one file per day, timestamps shifted) and runs import_files.load_file
+over them serially and through the process pool.
+
+Usage:
+    python benchmarks/bench_import_files.py
+    python benchmarks/bench_import_files.py --files 64 --workers 8
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from import_files import load_file  # noqa: E402
+
+SAMPLE = ROOT / "activity_18698089374_details.json"
+DAY_MS = 86_400_000
+
+
+def sample_points():
+    with open(SAMPLE, encoding="utf-8") as f:
+        details = json.load(f)["activityDetails"]
+    idx = {d["key"]: d["metricsIndex"] for d in details["metricDescriptors"]}
+    keys = ["directTimestamp", "directLatitude", "directLongitude", "directElevation",
+            "directHeartRate", "directRunCadence", "directPower"]
+    return [[p["metrics"][idx[k]] for k in keys] for p in details["activityDetailMetrics"]]
+
+
+def write_gpx(path, points, shift_ms):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                '<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1" '
+                'xmlns:gpxtpx="http://www.garmin.com/xmlschemas/TrackPointExtension/v1">\n'
+                "<trk><name>Bench Run</name><type>running</type><trkseg>\n")
+        for ts, lat, lon, ele, hr, cad, power in points:
+            if ts is None or lat is None:
+                continue
+            when = datetime.fromtimestamp((ts + shift_ms) / 1000, timezone.utc).isoformat()
+            f.write(f'<trkpt lat="{lat}" lon="{lon}"><ele>{ele}</ele><time>{when}</time>'
+                    f"<extensions><power>{power}</power><gpxtpx:TrackPointExtension>"
+                    f"<gpxtpx:hr>{hr}</gpxtpx:hr><gpxtpx:cad>{cad}</gpxtpx:cad>"
+                    "</gpxtpx:TrackPointExtension></extensions></trkpt>\n")
+        f.write("</trkseg></trk></gpx>\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    points = sample_points()
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = []
+        for i in range(args.files):
+            path = os.path.join(workdir, f"run_{i:04d}.gpx")
+            write_gpx(path, points, i * DAY_MS)
+            paths.append(path)
+        size_mb = sum(os.path.getsize(p) for p in paths) / 1e6
+        worker = partial(load_file, user_id=1, max_hr=190)
+
+        t0 = time.perf_counter()
+        results = list(map(worker, paths))
+        t_serial = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=args.workers) as pool:
+            list(pool.map(worker, paths, chunksize=4))
+        t_pool = time.perf_counter() - t0
+
+    errors = [r[3] for r in results if r[3]]
+    rows = sum(len(r[2]["metric_timestamp"]) for r in results if r[2])
+    print(f"{args.files} GPX files, {size_mb:.1f} MB, {rows:,} points ({len(errors)} errors)")
+    print(f"serial         : {t_serial:6.2f}s  {rows / t_serial:>10,.0f} points/s")
+    print(f"pool ({args.workers:>2} procs) : {t_pool:6.2f}s  {rows / t_pool:>10,.0f} points/s  "
+          f"({t_serial / t_pool:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
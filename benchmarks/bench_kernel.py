@@ -0,0 +1,181 @@
+"""
+Benchmark: per-workout running metrics — the per-row Python versions vs
+analytics/kernel.py.
+
+Before the kernel, GAP, decoupling, REI, fatigue signature, cadence-speed
+profile, biomechanics summary and elevation quartiles each ran their own
+query and looped over the returned tuples in Python. The reference below
+keeps those loops and hands each one the rows its query would have
+returned (filtering is done up front and not timed, which favours the
+reference). The kernel gets the workout's columnar arrays once and
+computes all seven with analyze_workout.
+
+No database needed; reports milliseconds per workout.
+
+Usage:
+    python benchmarks/bench_kernel.py
+    python benchmarks/bench_kernel.py --seconds 10800 --repeat 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from analytics import kernel  # noqa: E402
+from analytics.running_economy import gap_multiplier  # noqa: E402
+
+
+# ---------------------------------------------------------------------------
+# Reference: the per-row loops, one per metric
+# ---------------------------------------------------------------------------
+
+def _avg(vals):
+    vals = [v for v in vals if v is not None]
+    return sum(vals) / len(vals) if vals else None
+
+
+def ref_gap(rows):  # (pace, grad)
+    paces, gaps, buckets = [], [], {}
+    for pace, grad in rows:
+        paces.append(pace)
+        if grad is not None:
+            gaps.append(pace * gap_multiplier(grad))
+            b = round(grad / 2) * 2
+            buckets[b] = buckets.get(b, 0) + 1
+        else:
+            gaps.append(pace)
+    return sum(paces) / len(paces), sum(gaps) / len(gaps), sorted(buckets.items())
+
+
+def ref_decoupling(rows):  # (pace, hr)
+    mid = len(rows) // 2
+
+    def ratio(half):
+        return (sum(1.0 / p for p, _ in half) / len(half)) / (sum(h for _, h in half) / len(half))
+    return ratio(rows[:mid]), ratio(rows[mid:])
+
+
+def ref_rei(rows):  # (pace, hr)
+    speeds = [1000.0 / (p * 60.0) for p, _ in rows]
+    return (sum(h for _, h in rows) / len(rows)) / (sum(speeds) / len(speeds))
+
+
+def ref_fatigue(rows):  # (hr, pace, cadence, gct, vo)
+    n = len(rows)
+    win = max(10, int(n * 0.2))
+    early, late = rows[:win], rows[n - win:]
+    return [(_avg([r[i] for r in early]), _avg([r[i] for r in late])) for i in range(5)]
+
+
+def ref_cadence(rows):  # (pace, cadence)
+    buckets = {}
+    for pace, cadence in rows:
+        buckets.setdefault(round(pace * 2) / 2, []).append(cadence)
+    return [(b, sum(v) / len(v)) for b, v in sorted(buckets.items()) if len(v) >= 5]
+
+
+def ref_biomechanics(rows):  # (cadence, gct, vo, vr, pace, hr) — was SQL AVG/STDDEV
+    out = []
+    for i in range(6):
+        vals = [r[i] for r in rows if r[i] is not None]
+        mean = sum(vals) / len(vals)
+        out.append((mean, (sum((v - mean) ** 2 for v in vals) / (len(vals) - 1)) ** 0.5))
+    return out
+
+
+def ref_elevation(rows):  # (hr, pace, alt, grad)
+    cum, points, prev = 0.0, [], rows[0][2]
+    for hr, pace, alt, grad in rows:
+        if alt - prev > 0:
+            cum += alt - prev
+        points.append((hr, pace, grad, cum))
+        prev = alt
+    q_size = cum / 4
+    quartiles = [[], [], [], []]
+    for hr, pace, grad, cg in points:
+        quartiles[min(3, int(cg / q_size))].append((hr, pace, grad))
+    return [(_avg([r[0] for r in q]), _avg([r[1] for r in q]), _avg([r[2] for r in q])) for q in quartiles if q]
+
+
+# ---------------------------------------------------------------------------
+# Data
+# ---------------------------------------------------------------------------
+
+def synthetic_series(seconds, seed=11):
+    rng = np.random.default_rng(seed)
+    t = np.arange(seconds)
+    altitude = 200 + 40 * np.sin(t / 600) + rng.normal(0, 0.3, seconds)
+    grad = np.clip(np.gradient(altitude) / 3.0 * 100, -30, 30)
+    return {
+        "heart_rate":           np.round(140 + 15 * t / seconds + rng.normal(0, 3, seconds)),
+        "pace":                 np.clip(5.2 + grad * 0.05 + rng.normal(0, 0.2, seconds), 3.5, 12),
+        "cadence":              rng.normal(172, 4, seconds),
+        "ground_contact_time":  rng.normal(245, 10, seconds),
+        "vertical_oscillation": rng.normal(8.5, 0.4, seconds),
+        "vertical_ratio":       rng.normal(7.5, 0.3, seconds),
+        "power":                rng.normal(260, 20, seconds),
+        "altitude":             altitude,
+        "gradient_pct":         grad,
+    }
+
+
+def reference_inputs(s):
+    """Row lists as each old per-metric query returned them."""
+    def rows(*cols):
+        return list(zip(*(s[c].tolist() for c in cols)))
+    return {
+        "gap":          rows("pace", "gradient_pct"),
+        "decoupling":   rows("pace", "heart_rate"),
+        "rei":          rows("pace", "power"),
+        "fatigue":      rows("heart_rate", "pace", "cadence", "ground_contact_time", "vertical_oscillation"),
+        "cadence":      rows("pace", "cadence"),
+        "biomechanics": rows("cadence", "ground_contact_time", "vertical_oscillation", "vertical_ratio",
+                             "pace", "heart_rate"),
+        "elevation":    rows("heart_rate", "pace", "altitude", "gradient_pct"),
+    }
+
+
+def run_reference(inputs):
+    ref_gap(inputs["gap"])
+    ref_decoupling(inputs["decoupling"])
+    ref_rei(inputs["rei"])
+    ref_fatigue(inputs["fatigue"])
+    ref_cadence(inputs["cadence"])
+    ref_biomechanics(inputs["biomechanics"])
+    ref_elevation(inputs["elevation"])
+
+
+def best_of(fn, arg, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seconds", type=int, default=3600, help="Points per workout (default: 3600)")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    s = synthetic_series(args.seconds)
+    inputs = reference_inputs(s)
+
+    t_ref = best_of(run_reference, inputs, args.repeat)
+    t_kernel = best_of(lambda series: kernel.analyze_workout(1, series), s, args.repeat)
+
+    print(f"Per-workout analytics, {args.seconds:,} points (best of {args.repeat})")
+    print(f"  per-row Python, 7 metrics : {t_ref * 1000:8.2f} ms")
+    print(f"  NumPy kernel, 7 metrics   : {t_kernel * 1000:8.2f} ms   ({t_ref / t_kernel:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
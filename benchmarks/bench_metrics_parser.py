@@ -0,0 +1,142 @@
+"""
+Benchmark: per-point Garmin details decoding vs the vectorized metrics_parser.
+
+The reference implementation is the row loop that workout_metrics.py and
+backfill_workout_metrics.py used before metrics_parser: decode each point,
+build a parameter tuple and hand it to executemany. The vectorized path
+parses the whole payload with NumPy and renders a COPY buffer.
+
+Both are timed without a database so the numbers isolate parse/serialise
+cost. "parse" is decoding alone; "parse+wire" adds rendering what goes to
+the server — psycopg2 literal adaptation per row for executemany, the COPY
+text stream for the vectorized path. The DB side (one statement per row vs
+a single COPY) only widens the gap.
+
+Usage:
+    python benchmarks/bench_metrics_parser.py
+    python benchmarks/bench_metrics_parser.py --repeat 50
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from psycopg2.extensions import adapt
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from metrics_parser import (  # noqa: E402
+    GARMIN_KEY_TO_COLUMN, copy_buffer, parse_activity_details,
+)
+
+SAMPLES = [
+    ROOT / "samples" / "activity_details_response.json",
+    ROOT / "activity_18698089374_details.json",
+]
+
+
+def load_details(path):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("activityDetails", data)
+
+
+def reference_rows(details, workout_id=1):
+    """The pre-vectorization row loop, producing executemany parameter tuples."""
+    descriptors = details["metricDescriptors"]
+    has_double = any(d["key"] == "directDoubleCadence" for d in descriptors)
+    col_map = {}
+    for d in descriptors:
+        if d["key"] == "directCadence" and has_double:
+            continue
+        if d["key"] in GARMIN_KEY_TO_COLUMN:
+            col_map[d["metricsIndex"]] = GARMIN_KEY_TO_COLUMN[d["key"]]
+    ts_idx = next(d["metricsIndex"] for d in descriptors if d["key"] == "directTimestamp")
+
+    rows = []
+    prev_alt = prev_dist = None
+    for point in details["activityDetailMetrics"]:
+        m = point.get("metrics", [])
+        if ts_idx >= len(m) or m[ts_idx] is None:
+            continue
+        v = dict.fromkeys(GARMIN_KEY_TO_COLUMN.values())
+        for idx, col in col_map.items():
+            if idx < len(m) and m[idx] is not None:
+                raw = m[idx]
+                if col == "heart_rate":
+                    v[col] = int(raw)
+                elif col == "pace":
+                    v[col] = (1000 / raw) / 60 if raw else None
+                else:
+                    v[col] = float(raw)
+        grad = None
+        alt, dist, pace = v["altitude"], v["distance"], v["pace"]
+        if alt is not None and prev_alt is not None:
+            d_dist = None
+            if dist is not None and prev_dist is not None:
+                d_dist = dist - prev_dist
+            elif pace is not None and pace > 0:
+                d_dist = 1000.0 / (pace * 60.0)
+            if d_dist is not None and d_dist > 0.5:
+                grad = round((alt - prev_alt) / d_dist * 100, 2)
+        if alt is not None:
+            prev_alt = alt
+        if dist is not None:
+            prev_dist = dist
+        rows.append((
+            workout_id, datetime.fromtimestamp(m[ts_idx] / 1000),
+            v["heart_rate"], v["pace"], v["cadence"], v["vertical_oscillation"],
+            v["vertical_ratio"], v["ground_contact_time"], v["power"],
+            v["latitude"], v["longitude"], v["altitude"], v["distance"], grad,
+        ))
+    return rows
+
+
+def reference_wire(details):
+    """Row loop + the client-side literal quoting executemany performs per row."""
+    return [
+        b"(" + b",".join(adapt(v).getquoted() for v in row) + b")"
+        for row in reference_rows(details)
+    ]
+
+
+def vectorized_wire(details):
+    return copy_buffer(1, parse_activity_details(details))
+
+
+def timed(fn, details, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(details)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'sample':<36} {'points':>7} {'stage':<11} {'row loop':>10} {'vectorized':>11} {'speedup':>8}")
+    for path in SAMPLES:
+        if not path.exists():
+            continue
+        details = load_details(path)
+        n = len(details["activityDetailMetrics"])
+        for stage, ref, vec in [
+            ("parse", reference_rows, parse_activity_details),
+            ("parse+wire", reference_wire, vectorized_wire),
+        ]:
+            t_ref = timed(ref, details, args.repeat)
+            t_vec = timed(vec, details, args.repeat)
+            print(f"{path.name:<36} {n:>7} {stage:<11} {t_ref * 1000:>8.2f}ms "
+                  f"{t_vec * 1000:>9.2f}ms {t_ref / t_vec:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
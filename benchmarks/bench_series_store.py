@@ -0,0 +1,178 @@
+"""
+Benchmark: workout series storage — workout_metrics rows vs the columnar
+series store (analytics/series_store.py), plain .npy and compressed .npz.
+
+Without a database, synthetic 1 Hz runs are written to a temporary store
+and compared with the size of the same points as workout_metrics rows,
+estimated from the heap tuple layout (24-byte header + null bitmap,
+SERIAL, workout_id, timestamp, 12 float8, 4-byte line pointer) plus the
+primary key and UNIQUE (workout_id, metric_timestamp) index entries.
+The scan reads the kernel's columns for every workout; the row path is
+timed from already-fetched tuples (np.array over fetchmany chunks, as
+iter_workout_series does), so it leaves out the server and network time
+a real query adds.
+
+With --db the sizes are pg_total_relation_size('workout_metrics') and
+the store after exporting the last --days days of workouts into a
+temporary directory, and the scans are iter_workout_series over those
+workouts with from_store=False / True.
+
+Usage:
+    python benchmarks/bench_series_store.py
+    python benchmarks/bench_series_store.py --runs 500 --seconds 3600
+    python benchmarks/bench_series_store.py --db --days 365
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from analytics import kernel, series_store  # noqa: E402
+
+# heap tuple (32) + line pointer (4) + 4 + 4 + 8 + 12 * 8 data, + ~16 B pkey and ~24 B unique index entries
+PG_BYTES_PER_ROW_ESTIMATE = 32 + 4 + 4 + 4 + 8 + 12 * 8 + 16 + 24
+
+CHUNK = 50_000
+
+
+def synthetic_series(seconds, rng):
+    t = np.arange(seconds)
+    altitude = 200 + 40 * np.sin(t / 600) + rng.normal(0, 0.3, seconds)
+    return {
+        "heart_rate":           np.round(140 + 15 * t / seconds + rng.normal(0, 3, seconds)),
+        "pace":                 np.clip(5.2 + rng.normal(0, 0.2, seconds), 3.5, 12),
+        "cadence":              np.round(rng.normal(172, 4, seconds)),
+        "ground_contact_time":  np.round(rng.normal(245, 10, seconds)),
+        "vertical_oscillation": np.round(rng.normal(8.5, 0.4, seconds), 1),
+        "vertical_ratio":       np.round(rng.normal(7.5, 0.3, seconds), 1),
+        "power":                np.round(rng.normal(260, 20, seconds)),
+        "altitude":             np.round(altitude, 1),
+        "gradient_pct":         np.round(np.clip(np.gradient(altitude) / 3.0 * 100, -30, 30), 2),
+        "distance":             np.cumsum(np.full(seconds, 3.2)),
+    }
+
+
+def scan_rows(row_chunks):
+    """Row-tuple path: chunks of fetched tuples → float arrays."""
+    n = 0
+    for rows in row_chunks:
+        chunk = np.array(rows, dtype=np.float64)
+        n += len(chunk)
+    return n
+
+
+def scan_store(workout_ids, root):
+    return sum(len(s["pace"]) for _, s in series_store.iter_stored_series(workout_ids, kernel.ALL_COLUMNS, root))
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def run_synthetic(args):
+    rng = np.random.default_rng(3)
+    runs = [synthetic_series(args.seconds, rng) for _ in range(args.runs)]
+    points = args.runs * args.seconds
+
+    # Rows as the driver returns them for the kernel query: (workout_id, *ALL_COLUMNS)
+    rows = [
+        (wid, *vals)
+        for wid, s in enumerate(runs, 1)
+        for vals in zip(*(s[c].tolist() for c in kernel.ALL_COLUMNS))
+    ]
+    row_chunks = [rows[i:i + CHUNK] for i in range(0, len(rows), CHUNK)]
+
+    with tempfile.TemporaryDirectory() as plain, tempfile.TemporaryDirectory() as packed:
+        for wid, s in enumerate(runs, 1):
+            series_store.write_series(wid, s, plain)
+            series_store.write_series(wid, s, packed, compress=True)
+        ids = list(range(1, args.runs + 1))
+
+        _, t_rows = timed(scan_rows, row_chunks)
+        _, t_npy = timed(scan_store, ids, plain)
+        _, t_npz = timed(scan_store, ids, packed)
+        sizes = (PG_BYTES_PER_ROW_ESTIMATE * points, series_store.store_bytes(plain), series_store.store_bytes(packed))
+
+    report(f"synthetic, {args.runs} runs x {args.seconds} s", points, sizes,
+           ("rows → arrays (client only)", t_rows), t_npy, t_npz, estimated=True)
+
+
+def run_db(args):
+    import config
+    from analytics.workout_series import iter_workout_series
+    from db import get_connection
+
+    conn = get_connection()
+    cur = conn.cursor()
+    cur.execute("SELECT pg_total_relation_size('workout_metrics'), (SELECT COUNT(*) FROM workout_metrics)")
+    table_bytes, table_rows = cur.fetchone()
+    cur.execute("""
+        SELECT workout_id FROM workouts
+        WHERE user_id = 1 AND metrics_row_count > 0
+          AND workout_date >= CURRENT_DATE - (%s * INTERVAL '1 day')
+        ORDER BY workout_id
+    """, (args.days,))
+    ids = [r[0] for r in cur.fetchall()]
+
+    def scan(from_store):
+        return sum(len(s["pace"]) for _, s in iter_workout_series(ids, kernel.ALL_COLUMNS, conn, from_store=from_store))
+
+    with tempfile.TemporaryDirectory() as plain, tempfile.TemporaryDirectory() as packed:
+        points = 0
+        for wid, s in iter_workout_series(ids, series_store.STORE_COLUMNS, conn, moving_only=False, from_store=False):
+            series_store.write_series(wid, s, plain)
+            series_store.write_series(wid, s, packed, compress=True)
+            points += len(s["pace"])
+
+        _, t_rows = timed(scan, False)
+        config.SERIES_STORE_PATH = plain
+        _, t_npy = timed(scan, True)
+        config.SERIES_STORE_PATH = packed
+        _, t_npz = timed(scan, True)
+        # workout_metrics size scaled to the exported workouts
+        sizes = (table_bytes * points / max(table_rows, 1),
+                 series_store.store_bytes(plain), series_store.store_bytes(packed))
+    conn.close()
+
+    report(f"database, {len(ids)} workouts from the last {args.days} days", points, sizes,
+           ("workout_metrics query", t_rows), t_npy, t_npz, estimated=False)
+
+
+def report(label, points, sizes, rows_timing, t_npy, t_npz, estimated):
+    pg, npy, npz = sizes
+    row_label, t_rows = rows_timing
+    print(f"Workout series storage ({label}, {points:,} points)")
+    print(f"  workout_metrics{' (estimate)' if estimated else '           '} : {pg / 1e6:9.1f} MB")
+    print(f"  series store .npy          : {npy / 1e6:9.1f} MB   ({pg / npy:.1f}x smaller)")
+    print(f"  series store .npz          : {npz / 1e6:9.1f} MB   ({pg / npz:.1f}x smaller)")
+    print(f"Scan, {len(kernel.ALL_COLUMNS)} kernel columns")
+    print(f"  {row_label:<27}: {t_rows:7.3f}s")
+    print(f"  .npy, memory-mapped        : {t_npy:7.3f}s   ({t_rows / t_npy:.1f}x faster)")
+    print(f"  .npz, decompressed         : {t_npz:7.3f}s   ({t_rows / t_npz:.1f}x faster)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=200, help="Synthetic runs (default: 200)")
+    parser.add_argument("--seconds", type=int, default=3600, help="Points per synthetic run")
+    parser.add_argument("--db", action="store_true", help="Benchmark against the configured database")
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    if args.db:
+        run_db(args)
+    else:
+        run_synthetic(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""
+Benchmark: terrain summary — three fetchall() scans with per-row Python
+aggregation (the previous implementation) vs one streaming NumPy scan.
+
+Without a database the rows are synthesised (a year of 1 Hz running data)
+and fed the way each driver path sees them: the old path materialises the
+full result as a list of tuples three times, the new path consumes
+fetchmany-sized chunks. Reports wall time and peak Python memory.
+
+With --db the old path runs against the configured database (user 1)
+and is compared with get_terrain_summary, which aggregates the
+per-workout workout_terrain_stats rows instead of scanning raw points.
+
+Usage:
+    python benchmarks/bench_terrain.py
+    python benchmarks/bench_terrain.py --runs 400 --seconds 3600
+    python benchmarks/bench_terrain.py --db --days 365
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+from analytics.running_economy import gap_multiplier  # noqa: E402
+from analytics.terrain_response import (  # noqa: E402
+    BAND_MID, GRADIENT_BANDS, TerrainAccumulator, _minetti_cost_from_module,
+)
+
+CHUNK = 50_000
+
+
+# ---------------------------------------------------------------------------
+# Previous implementation (aggregation half), kept here as the reference
+# ---------------------------------------------------------------------------
+
+def _band_for(g):
+    for name, lo, hi in GRADIENT_BANDS:
+        if (lo is None or g >= lo) and (hi is None or g < hi):
+            return name
+    return "flat"
+
+
+def legacy_curve(rows):
+    band_data = {name: {"hr": [], "pace": [], "gap": []} for name, _, _ in GRADIENT_BANDS}
+    for hr, pace, grad in rows:
+        band = _band_for(grad)
+        band_data[band]["hr"].append(hr)
+        band_data[band]["pace"].append(pace)
+        band_data[band]["gap"].append(pace * gap_multiplier(grad))
+    result = []
+    for name, _, _ in GRADIENT_BANDS:
+        d = band_data[name]
+        if len(d["hr"]) < 10:
+            continue
+        avg_hr, avg_pace = sum(d["hr"]) / len(d["hr"]), sum(d["pace"]) / len(d["pace"])
+        result.append({"band": name, "gradient_mid": BAND_MID[name], "avg_hr": round(avg_hr, 1),
+                       "avg_pace": round(avg_pace, 3), "avg_gap": round(sum(d["gap"]) / len(d["gap"]), 3),
+                       "efficiency": round(1000.0 / (avg_pace * 60.0) / avg_hr, 6), "count": len(d["hr"])})
+    return result
+
+
+def legacy_model(rows):
+    xs, ys = [r[2] for r in rows], [r[0] for r in rows]
+    n = len(xs)
+    mean_x, mean_y = sum(xs) / n, sum(ys) / n
+    ss_xy = sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys))
+    ss_xx = sum((x - mean_x) ** 2 for x in xs)
+    slope = ss_xy / ss_xx
+    intercept = mean_y - slope * mean_x
+    ss_res = sum((y - (slope * x + intercept)) ** 2 for x, y in zip(xs, ys))
+    ss_tot = sum((y - mean_y) ** 2 for y in ys)
+    minetti = (_minetti_cost_from_module(0.01) / _minetti_cost_from_module(0.0) - 1.0) * mean_y
+    return {"slope_bpm_per_pct": round(slope, 3), "intercept": round(intercept, 1),
+            "r_squared": round(1 - ss_res / ss_tot, 4), "n_points": n,
+            "minetti_expected": round(minetti, 3), "mean_hr": round(mean_y, 1)}
+
+
+def legacy_optimal(rows):
+    buckets = {}
+    for hr, pace, grad in rows:
+        buckets.setdefault(round(grad / 2) * 2, []).append(1000.0 / (pace * 60.0) / hr)
+    bands = [{"gradient_pct": b, "speed_per_hr": round(sum(v) / len(v), 7), "count": len(v)}
+             for b, v in sorted(buckets.items()) if len(v) >= 20]
+    optimal = max(bands, key=lambda x: x["speed_per_hr"])
+    return {"bands": bands, "optimal_gradient": optimal["gradient_pct"],
+            "optimal_efficiency": optimal["speed_per_hr"]}
+
+
+# ---------------------------------------------------------------------------
+# Synthetic source
+# ---------------------------------------------------------------------------
+
+def synthetic_rows(runs, seconds, seed=7):
+    """Yield (hr, pace, gradient) tuples run by run, like a cursor would."""
+    rng = np.random.default_rng(seed)
+    for _ in range(runs):
+        grad = np.round(np.clip(np.cumsum(rng.normal(0, 0.4, seconds)) % 50 - 25, -30, 30), 2)
+        pace = np.clip(5.5 + grad * 0.08 + rng.normal(0, 0.3, seconds), 3.0, 19.0)
+        hr = np.clip(150 + grad * 1.5 + rng.normal(0, 6, seconds), 41, 200).astype(int)
+        yield from zip(hr.tolist(), pace.tolist(), grad.tolist())
+
+
+def run_legacy(make_rows):
+    rows30 = list(make_rows())
+    curve = legacy_curve(rows30)
+    rows20 = [r for r in make_rows() if -20 <= r[2] <= 20]
+    model = legacy_model(rows20)
+    rows20 = [r for r in make_rows() if -20 <= r[2] <= 20]
+    optimal = legacy_optimal(rows20)
+    return {"hr_gradient_curve": curve, "grade_cost_model": model, "optimal_gradient": optimal}
+
+
+def run_streaming(make_rows):
+    acc = TerrainAccumulator()
+    source = make_rows()
+    while True:
+        chunk = [r for _, r in zip(range(CHUNK), source)]
+        if not chunk:
+            break
+        data = np.array(chunk, dtype=np.float64)
+        acc.add(data[:, 0], data[:, 1], data[:, 2])
+    return {"hr_gradient_curve": acc.hr_gradient_curve(), "grade_cost_model": acc.grade_cost_model(),
+            "optimal_gradient": acc.optimal_gradient()}
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=250, help="Synthetic runs (default: 250)")
+    parser.add_argument("--seconds", type=int, default=3600, help="Points per synthetic run")
+    parser.add_argument("--db", action="store_true", help="Benchmark against the configured database")
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    if args.db:
+        from analytics.terrain_response import get_terrain_summary
+        from db import get_connection
+
+        def fetch():
+            conn = get_connection()
+            cur = conn.cursor()
+            cur.execute("""
+                SELECT wm.heart_rate, wm.pace, wm.gradient_pct
+                FROM workout_metrics wm JOIN workouts w ON w.workout_id = wm.workout_id
+                WHERE w.user_id = 1 AND w.sport = 'running'
+                  AND w.workout_date >= CURRENT_DATE - (%s * INTERVAL '1 day')
+                  AND wm.heart_rate > 40 AND wm.pace > 0 AND wm.pace < 20
+                  AND wm.gradient_pct BETWEEN -30 AND 30
+            """, (args.days,))
+            rows = cur.fetchall()
+            conn.close()
+            return iter(rows)
+
+        legacy, t_old, m_old = measure(run_legacy, fetch)
+        new, t_new, m_new = measure(get_terrain_summary, args.days)
+        label, new_label = f"database, last {args.days} days", "workout_terrain_stats"
+    else:
+        make_rows = lambda: synthetic_rows(args.runs, args.seconds)  # noqa: E731
+        legacy, t_old, m_old = measure(run_legacy, make_rows)
+        new, t_new, m_new = measure(run_streaming, make_rows)
+        label, new_label = f"synthetic, {args.runs} runs x {args.seconds} s", "1x streaming NumPy"
+
+    n = new["grade_cost_model"]["n_points"] if new["grade_cost_model"] else 0
+    print(f"Terrain summary ({label}, {n:,} points within ±20%)")
+    print(f"  3x fetchall + per-row : {t_old:7.2f}s   peak {m_old / 1e6:8.1f} MB")
+    print(f"  {new_label:<22}: {t_new:7.2f}s   peak {m_new / 1e6:8.1f} MB   ({t_old / t_new:.1f}x faster)")
+    same = (legacy["optimal_gradient"]["optimal_gradient"] == new["optimal_gradient"]["optimal_gradient"]
+            and [b["count"] for b in legacy["hr_gradient_curve"]] == [b["count"] for b in new["hr_gradient_curve"]])
+    print(f"  results match         : {same}")
+
+
+if __name__ == "__main__":
+    main()
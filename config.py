@@ -37,4 +37,21 @@ DB_NAME = os.environ.get("DB_NAME", "quantifiedstrides")
 DB_USER = _require("DB_USER")
 DB_PASSWORD = _require("DB_PASSWORD")
 
+# Athlete the ingest scripts (workout.py, workout_metrics.py, sleep.py,
+# environment.py) write for; api/services/sync.py sets it per sync run
+USER_ID = int(os.environ.get("USER_ID", "1"))
+
+# Workout time-series reads (analytics/series_store.py):
+#   "postgres" — workout_metrics rows; "files" — per-workout columnar files,
+#   falling back to workout_metrics for workouts without one
+SERIES_BACKEND = os.environ.get("SERIES_BACKEND", "postgres")
+SERIES_STORE_PATH = os.environ.get("SERIES_STORE_PATH", "data/series")
+
+# workout_metrics retention (metrics_retention.py): workouts older than
+# METRICS_FULL_RESOLUTION_DAYS are compacted to METRICS_COMPACT_RESOLUTION_S
+METRICS_FULL_RESOLUTION_DAYS = int(os.environ.get("METRICS_FULL_RESOLUTION_DAYS", "180"))
+METRICS_COMPACT_RESOLUTION_S = int(os.environ.get("METRICS_COMPACT_RESOLUTION_S", "10"))
+
 ANTHROPIC_API_KEY = _require("ANTHROPIC_API_KEY")
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -1,12 +1,17 @@
 import psycopg2
 from config import DB_HOST, DB_NAME, DB_USER, DB_PASSWORD
+from query_stats import InstrumentedCursor
 
 
 def get_connection():
-    """Return a new psycopg2 connection to QuantifiedStrides DB."""
+    """Return a new psycopg2 connection to QuantifiedStrides DB.
+
+    Cursors record into the active query_stats.QueryStats, if any.
+    """
     return psycopg2.connect(
         host=DB_HOST,
         dbname=DB_NAME,
         user=DB_USER,
         password=DB_PASSWORD,
+        cursor_factory=InstrumentedCursor,
     )
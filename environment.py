@@ -2,7 +2,7 @@ from datetime import datetime
 
 import requests
 
-from config import OPENWEATHER_API_KEY
+from config import OPENWEATHER_API_KEY, USER_ID
 from db import get_connection
 
 conn = get_connection()
@@ -12,21 +12,10 @@ print("Cursor connected")
 today = datetime.now().date()
 print(f"Collecting environmental data for: {today}")
 
-# Skip if environment data for today already exists
-cursor.execute(
-    "SELECT env_id FROM environment_data WHERE record_datetime::date = %s",
-    (today,)
-)
-if cursor.fetchone():
-    print(f"Environment data for {today} already recorded. Skipping.")
-    cursor.close()
-    conn.close()
-    raise SystemExit(0)
-
 # Link to today's workout if one exists — NULL on rest days (no placeholder created)
 cursor.execute(
-    "SELECT workout_id, start_latitude, start_longitude, location FROM workouts WHERE workout_date = %s AND user_id = 1",
-    (today,)
+    "SELECT workout_id, start_latitude, start_longitude, location FROM workouts WHERE workout_date = %s AND user_id = %s",
+    (today, USER_ID)
 )
 row = cursor.fetchone()
 workout_id = row[0] if row else None
@@ -34,6 +23,18 @@ workout_lat = row[1] if row else None
 workout_lon = row[2] if row else None
 workout_location_name = row[3] if row else None
 
+# Skip if environment data for today already exists — for this athlete's
+# workout, or as a standalone (rest day) row
+cursor.execute(
+    "SELECT env_id FROM environment_data WHERE record_datetime::date = %s AND workout_id IS NOT DISTINCT FROM %s",
+    (today, workout_id)
+)
+if cursor.fetchone():
+    print(f"Environment data for {today} already recorded. Skipping.")
+    cursor.close()
+    conn.close()
+    raise SystemExit(0)
+
 if workout_id:
     print(f"Linking environment data to workout ID: {workout_id}")
 else:
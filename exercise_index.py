@@ -0,0 +1,133 @@
+"""
+Name → exercises.exercise_id resolution for logged strength exercises.
+
+strength_exercises.name is free text from the log; the taxonomy lives in
+exercises. Writers resolve each name once, at write time, and store the
+id in strength_exercises.exercise_ref_id, so taxonomy joins run on an
+indexed integer key instead of comparing names.
+
+A name resolves by exact match first, then by normalized form (case,
+punctuation and spacing folded: "Bench-press " → "bench press"). A
+normalized form shared by two exercises is ambiguous and stays
+unresolved rather than picking one. Unresolved names keep a NULL ref;
+unmatched_names() lists them for labeling (import_exercises.py).
+Linking a row later refreshes its session's derived rows
+(strength_stats.py), which attribute muscle volume through the ref.
+
+The index is held in memory per process and reloaded when the exercises
+table gains or loses rows (see SIGNATURE_SQL).
+
+Usage (link every unresolved row, then list what is still unmatched):
+    python exercise_index.py
+"""
+
+import re
+
+from db import get_connection
+from strength_stats import refresh_session
+
+LOAD_SQL = "SELECT exercise_id, name FROM exercises"
+
+# Cheap change check: new or deleted exercises change it, renames do not
+SIGNATURE_SQL = "SELECT COUNT(*), COALESCE(MAX(exercise_id), 0) FROM exercises"
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+def normalize_name(name: str) -> str:
+    return _NON_WORD.sub(" ", name.casefold()).strip()
+
+
+class ExerciseIndex:
+    def __init__(self, rows):
+        self._exact: dict[str, int] = {}
+        self._normalized: dict[str, int | None] = {}
+        for exercise_id, name in rows:
+            self._exact[name] = exercise_id
+            key = normalize_name(name)
+            # None marks a normalized form claimed by more than one exercise
+            self._normalized[key] = exercise_id if key not in self._normalized else None
+
+    def __len__(self):
+        return len(self._exact)
+
+    def resolve(self, name: str) -> int | None:
+        exercise_id = self._exact.get(name)
+        if exercise_id is None:
+            exercise_id = self._normalized.get(normalize_name(name))
+        return exercise_id
+
+
+_cache: dict = {"signature": None, "index": None}
+
+
+def cached_index(signature) -> ExerciseIndex | None:
+    """The cached index if it was built at `signature`, else None."""
+    return _cache["index"] if _cache["signature"] == signature else None
+
+
+def store_index(signature, rows) -> ExerciseIndex:
+    index = ExerciseIndex(rows)
+    _cache.update(signature=tuple(signature), index=index)
+    return index
+
+
+def get_index(cur) -> ExerciseIndex:
+    """The process-wide index, reloaded if exercises changed (psycopg2 cursor)."""
+    cur.execute(SIGNATURE_SQL)
+    signature = tuple(cur.fetchone())
+    index = cached_index(signature)
+    if index is None:
+        cur.execute(LOAD_SQL)
+        index = store_index(signature, cur.fetchall())
+    return index
+
+
+def link_unresolved(cur, index=None):
+    """Set exercise_ref_id on every unresolved strength_exercises row that now resolves,
+    and refresh the derived rows of the sessions touched.
+
+    Returns the number of distinct names linked. Does not commit.
+    """
+    index = index or get_index(cur)
+    cur.execute("SELECT DISTINCT name FROM strength_exercises WHERE exercise_ref_id IS NULL")
+    pairs = [(name, index.resolve(name)) for (name,) in cur.fetchall()]
+    pairs = [(name, ref) for name, ref in pairs if ref is not None]
+    if pairs:
+        names, refs = zip(*pairs)
+        cur.execute("""
+            UPDATE strength_exercises se
+            SET exercise_ref_id = m.ref
+            FROM unnest(%s::text[], %s::int[]) AS m(name, ref)
+            WHERE se.name = m.name AND se.exercise_ref_id IS NULL
+            RETURNING se.session_id
+        """, (list(names), list(refs)))
+        for session_id in sorted({r[0] for r in cur.fetchall()}):
+            refresh_session(cur, session_id)
+    return len(pairs)
+
+
+def unmatched_names(cur):
+    """[(name, times logged, last session date)] of names without an exercises row."""
+    cur.execute("""
+        SELECT se.name, COUNT(*), MAX(ss.session_date)
+        FROM strength_exercises se
+        JOIN strength_sessions ss ON ss.session_id = se.session_id
+        WHERE se.exercise_ref_id IS NULL
+        GROUP BY se.name
+        ORDER BY COUNT(*) DESC, se.name
+    """)
+    return cur.fetchall()
+
+
+if __name__ == "__main__":
+    conn = get_connection()
+    cur = conn.cursor()
+    print(f"Linked {link_unresolved(cur)} exercise names.")
+    conn.commit()
+    unmatched = unmatched_names(cur)
+    if unmatched:
+        print(f"{len(unmatched)} names have no exercises row (label with import_exercises.py):")
+        for name, count, last in unmatched:
+            print(f"  {name:<40} {count:>4}×  last {last}")
+    conn.close()
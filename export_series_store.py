@@ -0,0 +1,80 @@
+"""
+export_series_store.py
+
+Fills the columnar series store (analytics/series_store.py) from
+workout_metrics. Ingest keeps it current once SERIES_BACKEND=files is
+set; run this once before switching the flag, and with --prune after
+deleting workouts.
+
+Workouts are read in chunks with one query each (iter_workout_series,
+every point, straight from Postgres) and written as one file per
+workout. The report compares the store's size with workout_metrics
+(table + indexes).
+
+Usage:
+    python export_series_store.py                  # workouts without a file
+    python export_series_store.py --all --compress # rewrite everything as .npz
+    python export_series_store.py --prune          # also drop files of deleted workouts
+"""
+
+import argparse
+import time
+
+from analytics.series_store import (
+    STORE_COLUMNS, delete_series, has_series, store_bytes, stored_workout_ids, write_series,
+)
+from analytics.workout_series import iter_workout_series
+from db import get_connection
+
+CHUNK = 200
+
+
+def export(conn, workout_ids, compress):
+    """Write every listed workout's series. Returns points written."""
+    points = 0
+    for i in range(0, len(workout_ids), CHUNK):
+        chunk = workout_ids[i:i + CHUNK]
+        for wid, series in iter_workout_series(chunk, STORE_COLUMNS, conn, moving_only=False, from_store=False):
+            write_series(wid, series, compress=compress)
+            points += len(series["pace"])
+        print(f"  {min(i + CHUNK, len(workout_ids))}/{len(workout_ids)} workouts")
+    return points
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export workout_metrics to the columnar series store.")
+    parser.add_argument("--all", action="store_true", help="Rewrite workouts that already have a file")
+    parser.add_argument("--compress", action="store_true",
+                        help="Write zlib-compressed .npz files (smaller, not memory-mappable)")
+    parser.add_argument("--prune", action="store_true", help="Delete files of workouts no longer in the database")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT workout_id FROM workouts WHERE metrics_row_count > 0 ORDER BY workout_id")
+        workout_ids = [r[0] for r in cur.fetchall()]
+
+        if args.prune:
+            orphans = stored_workout_ids() - set(workout_ids)
+            for wid in orphans:
+                delete_series(wid)
+            print(f"Pruned {len(orphans)} files")
+
+        todo = workout_ids if args.all else [wid for wid in workout_ids if not has_series(wid)]
+        print(f"Exporting {len(todo)} workouts...")
+        t0 = time.perf_counter()
+        points = export(conn, todo, args.compress)
+        print(f"Done: {points:,} points in {time.perf_counter() - t0:.1f}s")
+
+        cur.execute("SELECT pg_total_relation_size('workout_metrics')")
+        table = cur.fetchone()[0]
+        store = store_bytes()
+        print(f"workout_metrics: {table / 1e6:,.1f} MB   series store: {store / 1e6:,.1f} MB "
+              f"({table / max(store, 1):.1f}x smaller)")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,15 @@ import apiFetch from './client'
 export const fetchGarminWorkouts   = (days = 90)         => apiFetch(`/api/v1/strength/workouts?days=${days}`)
 export const fetchSessions         = (days = 90)         => apiFetch(`/api/v1/strength/sessions?days=${days}`)
 export const fetchSession          = (id)                 => apiFetch(`/api/v1/strength/sessions/${id}`)
+export const fetchSessionDetails   = (last = 10)          => apiFetch(`/api/v1/strength/sessions/details?last=${last}`)
 export const fetch1RMHistory       = (exercise, days)     => apiFetch(`/api/v1/strength/1rm?exercise=${encodeURIComponent(exercise)}&days=${days}`)
 export const fetchTrackedExercises = ()                   => apiFetch('/api/v1/strength/1rm/exercises')
 export const fetchExerciseNames    = ()                   => apiFetch('/api/v1/strength/exercises').then(list => list.map(e => e.name))
+export const searchExercises       = (q, { muscles = [], equipment = [], limit = 20 } = {}) => {
+  const params = new URLSearchParams({ q, limit })
+  muscles.forEach(m => params.append('muscle', m))
+  equipment.forEach(e => params.append('equipment', e))
+  return apiFetch(`/api/v1/strength/exercises/search?${params}`)
+}
+export const fetchProgressions      = (ids, goal)         => apiFetch(`/api/v1/strength/exercises/progressions?${new URLSearchParams([...ids.map(id => ['ids', id]), ...(goal ? [['goal', goal]] : [])])}`)
 export const createSession         = (payload)            => apiFetch('/api/v1/strength/sessions', { method: 'POST', body: JSON.stringify(payload) })
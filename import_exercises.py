@@ -2,7 +2,7 @@
 Labels and imports exercises into the exercises table using Claude API.
 
 Usage:
-    python3 import_exercises.py              # label all exercises from strength_exercises
+    python3 import_exercises.py              # label logged exercises with no exercises row
     python3 import_exercises.py --dry-run    # print labels without inserting
 """
 
@@ -15,6 +15,7 @@ import anthropic
 
 from config import ANTHROPIC_API_KEY
 from db import get_connection
+from exercise_index import link_unresolved, unmatched_names
 
 
 MUSCLE_VOCABULARY = [
@@ -150,8 +151,8 @@ def main():
     conn = get_connection()
     cur  = conn.cursor()
 
-    cur.execute("SELECT DISTINCT name FROM strength_exercises ORDER BY name")
-    exercises = [row[0] for row in cur.fetchall()]
+    # Only names that exercise_index.py could not resolve to an exercises row
+    exercises = sorted(name for name, _, _ in unmatched_names(cur))
     print(f"Found {len(exercises)} exercises to label.\n")
 
     client = anthropic.Anthropic(api_key=ANTHROPIC_API_KEY)
@@ -196,10 +197,11 @@ def main():
             print(f"  DB error for '{name}': {e}")
             conn.rollback()
 
+    linked = link_unresolved(cur)
     conn.commit()
     cur.close()
     conn.close()
-    print(f"Done — {inserted} exercises inserted/updated.")
+    print(f"Done — {inserted} exercises inserted/updated, {linked} logged names linked.")
 
 
 if __name__ == "__main__":
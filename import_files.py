@@ -0,0 +1,438 @@
+"""
+import_files.py
+
+Imports local .fit / .gpx activity exports into workouts + workout_metrics,
+without going through Garmin Connect. Used to onboard an athlete's
+historical export and as a network-free data source for benchmarks.
+
+Files are parsed in parallel in a process pool (XML/FIT decoding and the
+summary math are CPU-bound); the main process writes each workout with the
+same upsert as backfill_workout_metrics.py and replaces its series with a
+single COPY through metrics_ingest.
+
+Summary fields mirror backfill_workout_metrics.extract_workout_fields, but
+are computed from the series itself: HR zones come from % of max HR
+(--max-hr, else the athlete's highest recorded max_heart_rate).
+
+FIT support needs the optional `fitparse` package; GPX uses the stdlib.
+
+Usage:
+    python import_files.py ~/exports
+    python import_files.py ~/exports --max-hr 188 --workers 8
+    python import_files.py ride.fit --sport mountain_biking --force
+"""
+
+import argparse
+import os
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+
+import numpy as np
+
+try:
+    import fitparse
+except ImportError:  # optional: only needed for .fit files
+    fitparse = None
+
+from metrics_parser import build_batch
+
+SUPPORTED_EXTENSIONS = {".fit", ".gpx"}
+
+RUNNING_SPORTS = {"running", "trail_running", "treadmill_running"}
+
+# (FIT sport, FIT sub_sport) → workouts.sport, matching Garmin typeKeys
+FIT_SPORTS = {
+    ("running", "trail"):            "trail_running",
+    ("running", "treadmill"):        "treadmill_running",
+    ("running", None):               "running",
+    ("cycling", "mountain"):         "mountain_biking",
+    ("cycling", "indoor_cycling"):   "indoor_cycling",
+    ("cycling", None):               "cycling",
+}
+
+# % of max HR lower bounds for zones 1–5 (below zone 1 is not counted)
+HR_ZONE_BOUNDS = [0.50, 0.60, 0.70, 0.80, 0.90]
+
+# Recording gaps longer than this (pauses) don't count toward zone time / steps
+MAX_POINT_GAP_S = 30
+
+EARTH_RADIUS_M = 6_371_000
+SEMICIRCLE_TO_DEG = 180 / 2**31
+
+
+# ---------------------------------------------------------------------------
+# Parsers — each returns (meta, ts_ms, columns) for metrics_parser.build_batch
+# ---------------------------------------------------------------------------
+
+def _epoch_ms(dt):
+    """Aware or naive-UTC datetime → epoch milliseconds."""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp() * 1000
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _float(text):
+    try:
+        return float(text)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+def cumulative_distance(lat, lon):
+    """Haversine running total in metres; points without a fix add nothing."""
+    lat_r, lon_r = np.radians(lat), np.radians(lon)
+    a = (np.sin(np.diff(lat_r) / 2) ** 2
+         + np.cos(lat_r[:-1]) * np.cos(lat_r[1:]) * np.sin(np.diff(lon_r) / 2) ** 2)
+    step = np.nan_to_num(2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(a)))
+    return np.concatenate([[0.0], np.cumsum(step)])
+
+
+def normalize_sport(name):
+    """GPX <type> / CLI value → workouts.sport key ('Trail Running' → trail_running)."""
+    if not name:
+        return None
+    return name.strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def parse_gpx(path):
+    """Stream a GPX file's track points with iterparse (constant memory)."""
+    meta = {"name": None, "sport": None}
+    fields = {k: [] for k in ("ts", "lat", "lon", "ele", "hr", "cad", "power")}
+
+    for _, el in ET.iterparse(path, events=("end",)):
+        tag = _local_name(el.tag)
+        if tag == "trkpt":
+            point = {_local_name(child.tag): child.text for child in el.iter()}
+            when = point.get("time")
+            fields["ts"].append(_epoch_ms(datetime.fromisoformat(when)) if when else np.nan)
+            fields["lat"].append(_float(el.get("lat")))
+            fields["lon"].append(_float(el.get("lon")))
+            fields["ele"].append(_float(point.get("ele")))
+            fields["hr"].append(_float(point.get("hr")))
+            fields["cad"].append(_float(point.get("cad")))
+            fields["power"].append(_float(point.get("power")))
+            el.clear()
+        elif tag == "type" and meta["sport"] is None:
+            meta["sport"] = normalize_sport(el.text)
+        elif tag == "name" and meta["name"] is None:
+            meta["name"] = (el.text or "").strip() or None
+
+    arrays = {k: np.array(v, dtype=np.float64) for k, v in fields.items()}
+    ts = arrays["ts"]
+    distance = cumulative_distance(arrays["lat"], arrays["lon"]) if len(ts) else ts
+
+    # GPX has no speed; derive it from the track, ignoring zero/unknown intervals
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dt = np.diff(ts) / 1000
+        step_speed = np.where(dt > 0, np.diff(distance) / dt, np.nan)
+    speed = np.concatenate([[np.nan], step_speed]) if len(ts) else ts
+
+    columns = {
+        "latitude":  arrays["lat"],
+        "longitude": arrays["lon"],
+        "altitude":  arrays["ele"],
+        "distance":  distance,
+        "speed":     speed,
+        "heart_rate": arrays["hr"],
+        "cadence":   arrays["cad"],      # per-leg; doubled for running below
+        "power":     arrays["power"],
+    }
+    return meta, ts, columns
+
+
+def parse_fit(path):
+    """Decode a FIT file's record messages (requires fitparse)."""
+    if fitparse is None:
+        raise RuntimeError("fitparse is not installed; run `pip install fitparse` to import .fit files")
+
+    meta = {"name": None, "sport": None, "calories": None}
+    keys = ("ts", "lat", "lon", "altitude", "distance", "speed", "heart_rate",
+            "cadence", "power", "vertical_oscillation", "vertical_ratio", "ground_contact_time")
+    fields = {k: [] for k in keys}
+
+    def get(values, *names):
+        for name in names:
+            if values.get(name) is not None:
+                return float(values[name])
+        return np.nan
+
+    for message in fitparse.FitFile(path).get_messages(("record", "session", "sport")):
+        values = message.get_values()
+        if message.name == "record":
+            ts = values.get("timestamp")
+            fields["ts"].append(_epoch_ms(ts) if ts else np.nan)
+            fields["lat"].append(get(values, "position_lat") * SEMICIRCLE_TO_DEG)
+            fields["lon"].append(get(values, "position_long") * SEMICIRCLE_TO_DEG)
+            fields["altitude"].append(get(values, "enhanced_altitude", "altitude"))
+            fields["distance"].append(get(values, "distance"))
+            fields["speed"].append(get(values, "enhanced_speed", "speed"))
+            fields["heart_rate"].append(get(values, "heart_rate"))
+            cadence = get(values, "cadence")
+            fields["cadence"].append(cadence + np.nan_to_num(get(values, "fractional_cadence")))
+            fields["power"].append(get(values, "power"))
+            fields["vertical_oscillation"].append(get(values, "vertical_oscillation") / 10)   # mm → cm
+            fields["vertical_ratio"].append(get(values, "vertical_ratio"))
+            fields["ground_contact_time"].append(get(values, "stance_time"))
+        else:
+            sport, sub_sport = values.get("sport"), values.get("sub_sport")
+            if sport and meta["sport"] is None:
+                sport, sub_sport = str(sport), str(sub_sport) if sub_sport else None
+                meta["sport"] = FIT_SPORTS.get((sport, sub_sport)) or FIT_SPORTS.get((sport, None)) or sport
+            if message.name == "session" and values.get("total_calories") is not None:
+                meta["calories"] = values["total_calories"]
+
+    arrays = {k: np.array(v, dtype=np.float64) for k, v in fields.items()}
+    ts = arrays.pop("ts")
+    arrays["latitude"], arrays["longitude"] = arrays.pop("lat"), arrays.pop("lon")
+    return meta, ts, arrays
+
+
+PARSERS = {".gpx": parse_gpx, ".fit": parse_fit}
+
+
+# ---------------------------------------------------------------------------
+# Summary fields from the series
+# ---------------------------------------------------------------------------
+
+def _nanmean(values):
+    values = values[~np.isnan(values)]
+    return float(values.mean()) if len(values) else None
+
+
+def _nanmax(values):
+    values = values[~np.isnan(values)]
+    return float(values.max()) if len(values) else None
+
+
+def _first_valid(values):
+    idx = np.flatnonzero(~np.isnan(values))
+    return float(values[idx[0]]) if len(idx) else None
+
+
+def point_durations(timestamps):
+    """Seconds each point represents (until the next one), with pauses capped out."""
+    seconds = timestamps.astype("datetime64[ms]").astype(np.int64) / 1000
+    dt = np.append(np.diff(seconds), 0.0)
+    return np.where(dt <= MAX_POINT_GAP_S, dt, 0.0)
+
+
+def hr_zone_seconds(heart_rate, durations, max_hr):
+    """Seconds in zones 1–5 by % of max HR. None per zone when max HR is unknown."""
+    if not max_hr:
+        return [None] * 5
+    pct = heart_rate / max_hr
+    zone = np.searchsorted(HR_ZONE_BOUNDS, pct, side="right")   # 0 = below zone 1
+    zone = np.where(np.isnan(pct), 0, zone)
+    totals = np.bincount(zone, weights=durations, minlength=6)
+    return [int(round(s)) for s in totals[1:6]]
+
+
+def elevation_change(altitude):
+    """Total ascent and descent in metres over the points that have altitude."""
+    steps = np.diff(altitude[~np.isnan(altitude)])
+    return float(steps[steps > 0].sum()), float(-steps[steps < 0].sum())
+
+
+def summarize(batch, sport, name, user_id, max_hr, calories=None):
+    """
+    Compute the workouts row for an imported series. Keys match
+    backfill_workout_metrics.extract_workout_fields / SQL_INSERT_WORKOUT.
+    """
+    timestamps = batch["metric_timestamp"]
+    start_time = timestamps[0].astype(datetime)
+    end_time = timestamps[-1].astype(datetime)
+    durations = point_durations(timestamps)
+
+    heart_rate = batch["heart_rate"]
+    cadence = batch["cadence"]
+    is_running = sport in RUNNING_SPORTS
+    moving_cadence = np.where(cadence > 0, cadence, np.nan) if is_running else np.full(len(cadence), np.nan)
+
+    # Stride length (cm) = metres per step × 100, from speed and step rate
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stride_cm = np.where(batch["pace"] > 0, 1000 / (batch["pace"] * 60), np.nan) / (moving_cadence / 60) * 100
+
+    zones = hr_zone_seconds(heart_rate, durations, max_hr)
+    gain, loss = elevation_change(batch["altitude"])
+    avg_hr, peak_hr = _nanmean(heart_rate), _nanmax(heart_rate)
+    avg_cad, peak_cad = _nanmean(moving_cadence), _nanmax(moving_cadence)
+    steps = np.nansum(moving_cadence / 60 * durations) if is_running else np.nan
+
+    return dict(
+        user_id=user_id,
+        sport=sport or "Unknown",
+        start_time=start_time,
+        end_time=end_time,
+        workout_type=name or "Unknown",
+        calories_burned=calories,
+        avg_heart_rate=int(avg_hr) if avg_hr is not None else None,
+        max_heart_rate=int(peak_hr) if peak_hr is not None else None,
+        vo2max=None,
+        lactate_threshold=None,
+        time_in_zone_1=zones[0],
+        time_in_zone_2=zones[1],
+        time_in_zone_3=zones[2],
+        time_in_zone_4=zones[3],
+        time_in_zone_5=zones[4],
+        training_volume=_nanmax(batch["distance"]) or 0.0,
+        avg_vertical_osc=_nanmean(batch["vertical_oscillation"]),
+        avg_ground_contact=_nanmean(batch["ground_contact_time"]),
+        avg_stride_length=_nanmean(stride_cm),
+        avg_vertical_ratio=_nanmean(batch["vertical_ratio"]),
+        avg_running_cadence=avg_cad,
+        max_running_cadence=peak_cad,
+        location="Unknown",
+        start_latitude=_first_valid(batch["latitude"]),
+        start_longitude=_first_valid(batch["longitude"]),
+        workout_date=start_time.date(),
+        elevation_gain=gain,
+        elevation_loss=loss,
+        aerobic_training_effect=None,
+        anaerobic_training_effect=None,
+        training_stress_score=None,
+        normalized_power=None,
+        avg_power=_nanmean(batch["power"]),
+        max_power=_nanmax(batch["power"]),
+        total_steps=int(steps) if is_running and steps > 0 else None,
+    )
+
+
+def load_file(path, user_id, max_hr, sport_override=None):
+    """
+    Process-pool worker: parse one file into (path, fields, batch, error).
+    Errors are returned, not raised, so one bad file doesn't stop the import.
+    """
+    try:
+        ext = os.path.splitext(path)[1].lower()
+        meta, ts_ms, columns = PARSERS[ext](path)
+        sport = sport_override or meta.get("sport")
+        if sport in RUNNING_SPORTS and "cadence" in columns:
+            columns["cadence"] = columns["cadence"] * 2        # per-leg → steps/min
+
+        batch = build_batch(ts_ms, columns)
+        if batch is None:
+            return path, None, None, "no timestamped points"
+
+        name = meta.get("name") or os.path.splitext(os.path.basename(path))[0]
+        fields = summarize(batch, sport, name, user_id, max_hr, meta.get("calories"))
+        return path, fields, batch, None
+    except Exception as e:
+        return path, None, None, str(e)
+
+
+def collect_paths(inputs):
+    """Expand files/directories into a sorted list of supported activity files."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                paths.extend(os.path.join(root, f) for f in files
+                             if os.path.splitext(f)[1].lower() in SUPPORTED_EXTENSIONS)
+        elif os.path.splitext(item)[1].lower() in SUPPORTED_EXTENSIONS:
+            paths.append(item)
+    return sorted(paths)
+
+
+def athlete_max_hr(cursor, user_id):
+    """Highest max_heart_rate recorded for the athlete, or None."""
+    cursor.execute("SELECT MAX(max_heart_rate) FROM workouts WHERE user_id = %s", (user_id,))
+    row = cursor.fetchone()
+    return row[0] if row and row[0] else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import local .fit/.gpx files into workouts + workout_metrics.")
+    parser.add_argument("paths", nargs="+", help="Files or directories (searched recursively)")
+    parser.add_argument("--user-id", type=int, default=1)
+    parser.add_argument("--max-hr", type=int, default=None,
+                        help="Max HR for zone times (default: athlete's highest recorded max HR)")
+    parser.add_argument("--sport", type=str, default=None,
+                        help="Override the sport for every file (e.g. running, mountain_biking)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Parser processes (default: CPU count)")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-import workouts whose series is already stored")
+    args = parser.parse_args()
+
+    # DB imports stay here so pool workers never need DB credentials
+    from backfill_workout_metrics import SQL_INSERT_WORKOUT
+    from db import get_connection
+    from metrics_ingest import metrics_ingested, replace_workout_metrics, store_workout_series
+
+    paths = collect_paths(args.paths)
+    if not paths:
+        print("No .fit or .gpx files found.")
+        return
+
+    conn = get_connection()
+    cursor = conn.cursor()
+
+    max_hr = args.max_hr or athlete_max_hr(cursor, args.user_id)
+    if not max_hr:
+        print("No max HR known (pass --max-hr); HR zone times will be left empty.")
+
+    print(f"Importing {len(paths)} files with {args.workers} workers (max HR {max_hr or 'unknown'})...")
+
+    total_imported = total_rows = total_skipped = total_failed = 0
+    t0 = time.perf_counter()
+
+    worker = partial(load_file, user_id=args.user_id, max_hr=max_hr, sport_override=normalize_sport(args.sport))
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for i, (path, fields, batch, error) in enumerate(pool.map(worker, paths, chunksize=4), start=1):
+            label = f"File {i}/{len(paths)}: {os.path.basename(path)}"
+            if error:
+                print(f"{label} — ERROR: {error}")
+                total_failed += 1
+                continue
+
+            try:
+                cursor.execute(
+                    "SELECT workout_id FROM workouts WHERE user_id = %s AND start_time = %s",
+                    (args.user_id, fields["start_time"]),
+                )
+                row = cursor.fetchone()
+                if row and not args.force and metrics_ingested(cursor, row[0]):
+                    print(f"{label} — skipped (already imported)")
+                    total_skipped += 1
+                    continue
+
+                if row:
+                    workout_id = row[0]     # keep the existing (e.g. Garmin) summary
+                else:
+                    cursor.execute(SQL_INSERT_WORKOUT, fields)
+                    workout_id = cursor.fetchone()[0]
+
+                rows = replace_workout_metrics(cursor, workout_id, batch)
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                print(f"{label} — ERROR: {e}")
+                total_failed += 1
+                continue
+            store_workout_series(workout_id, batch)
+
+            print(f"{label} — {fields['sport']} {fields['workout_date']}, {rows} metric rows")
+            total_imported += 1
+            total_rows += rows
+
+    elapsed = time.perf_counter() - t0
+    cursor.close()
+    conn.close()
+
+    print()
+    print("=== Import Summary ===")
+    print(f"Workouts imported  : {total_imported}")
+    print(f"Metric rows loaded : {total_rows} ({total_rows / elapsed:,.0f} rows/s)")
+    print(f"Skipped            : {total_skipped}")
+    print(f"Failed             : {total_failed}")
+
+
+if __name__ == "__main__":
+    main()
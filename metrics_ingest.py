@@ -0,0 +1,86 @@
+"""
+Idempotent workout_metrics ingest.
+
+A workout's time series is always written as a whole: the existing rows are
+deleted, the new batch is COPY'd in, its derived rows (workout_terrain_stats,
+workout_analytics, workout_mean_max) are rewritten and workouts.metrics_ingested_at /
+metrics_row_count are stamped — all inside the caller's transaction. A crash
+part-way rolls back to the previous complete series (or to none), so a
+workout is never left half-populated and re-ingesting is always safe.
+
+With SERIES_BACKEND=files the series is also written to the columnar
+series store (analytics/series_store.py) by store_workout_series(), which
+callers run only after the commit: a rolled-back replace leaves the file
+of the previous committed series in place. If the process dies between
+the commit and the file write, the file is stale (or missing) until the
+workout is re-ingested or export_series_store.py is rerun.
+
+"Already ingested?" is a primary-key lookup on workouts instead of a
+COUNT(*) over workout_metrics.
+
+Usage:
+    from metrics_ingest import metrics_ingested, replace_workout_metrics
+    if force or not metrics_ingested(cursor, workout_id):
+        rows = replace_workout_metrics(cursor, workout_id, batch)
+        conn.commit()
+        store_workout_series(workout_id, batch)
+"""
+
+from analytics.best_efforts import replace_mean_max
+from analytics.series_store import delete_series, store_enabled, write_series
+from analytics.terrain_response import replace_terrain_stats
+from analytics.workout_analytics import moving_series, replace_workout_analytics
+from metrics_parser import GRADIENT_VERSION, batch_size, copy_metrics
+
+
+def metrics_ingested(cursor, workout_id):
+    """True if a complete series has been ingested for this workout."""
+    cursor.execute(
+        "SELECT metrics_ingested_at IS NOT NULL FROM workouts WHERE workout_id = %s",
+        (workout_id,),
+    )
+    row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def replace_workout_metrics(cursor, workout_id, batch):
+    """
+    Atomically replace a workout's series with `batch` (a metrics_parser batch,
+    or None for "no time series"). Does not commit or touch the series
+    store (see store_workout_series). Returns rows written.
+    """
+    cursor.execute("DELETE FROM workout_metrics WHERE workout_id = %s", (workout_id,))
+
+    rows = copy_metrics(cursor, workout_id, batch) if batch and batch_size(batch) else 0
+
+    if rows:
+        replace_terrain_stats(cursor, workout_id, batch["heart_rate"], batch["pace"], batch["gradient_pct"])
+    else:
+        cursor.execute("DELETE FROM workout_terrain_stats WHERE workout_id = %s", (workout_id,))
+    replace_workout_analytics(cursor, workout_id, moving_series(batch) if rows else None)
+    replace_mean_max(cursor, workout_id, batch if rows else None)
+
+    cursor.execute(
+        """
+        UPDATE workouts
+        SET metrics_ingested_at = NOW(), metrics_row_count = %s, gradient_version = %s,
+            metrics_resolution_s = NULL
+        WHERE workout_id = %s
+        """,
+        (rows, GRADIENT_VERSION, workout_id),
+    )
+    return rows
+
+
+def store_workout_series(workout_id, batch):
+    """
+    Write `batch` to the series store, or delete the workout's file when it
+    has no time series. No-op unless SERIES_BACKEND=files. Call after the
+    commit of replace_workout_metrics.
+    """
+    if not store_enabled():
+        return
+    if batch and batch_size(batch):
+        write_series(workout_id, batch)
+    else:
+        delete_series(workout_id)
@@ -0,0 +1,302 @@
+"""
+Vectorized parser for Garmin activity details (metricDescriptors +
+activityDetailMetrics) → columnar workout_metrics batches.
+
+The Garmin payload is an array-of-arrays: each point is a list of values
+whose positions are described by metricDescriptors[].metricsIndex. Instead
+of decoding point by point, the whole payload is converted to one 2-D
+float array and each workout_metrics column is sliced out by index, with
+the unit transforms and gradient computed as array operations.
+
+Usage:
+    from metrics_parser import parse_activity_details, copy_metrics
+    batch = parse_activity_details(details)
+    if batch:
+        copy_metrics(cursor, workout_id, batch)
+"""
+
+import io
+from datetime import datetime, timezone
+
+import numpy as np
+
+# Maps Garmin metric descriptor keys to workout_metrics column names.
+# directDoubleCadence is the full steps/min figure; directCadence is half-cadence.
+# directDoubleCadence is preferred when both are present.
+GARMIN_KEY_TO_COLUMN = {
+    "directHeartRate":           "heart_rate",
+    "directSpeed":               "pace",               # converted m/s → min/km
+    "directDoubleCadence":       "cadence",
+    "directCadence":             "cadence",
+    "directVerticalOscillation": "vertical_oscillation",
+    "directVerticalRatio":       "vertical_ratio",
+    "directGroundContactTime":   "ground_contact_time",
+    "directPower":               "power",
+    "directLatitude":            "latitude",
+    "directLongitude":           "longitude",
+    "directAltitude":            "altitude",
+    "directElevation":           "altitude",           # some devices use this key
+    "directDistance":            "distance",
+}
+
+# Value columns of workout_metrics, in COPY order (after workout_id, metric_timestamp)
+METRIC_COLUMNS = [
+    "heart_rate",
+    "pace",
+    "cadence",
+    "vertical_oscillation",
+    "vertical_ratio",
+    "ground_contact_time",
+    "power",
+    "latitude",
+    "longitude",
+    "altitude",
+    "distance",
+    "gradient_pct",
+]
+
+INTEGER_COLUMNS = {"heart_rate"}
+
+# Optional columns written only by compacted series (metrics_retention.py);
+# NULL at full resolution
+AGGREGATE_COLUMNS = ["altitude_min", "altitude_max"]
+
+
+def build_index_map(descriptors):
+    """
+    Return {column_name: [metricsIndex, ...]} from the activity's
+    metricDescriptors list, in descriptor order.
+
+    Several keys can feed one column (directAltitude / directElevation);
+    later descriptors win when both carry a value, matching the row parser.
+    directCadence is dropped when directDoubleCadence is present.
+    """
+    has_double_cadence = any(d["key"] == "directDoubleCadence" for d in descriptors)
+
+    index_map = {}
+    for d in descriptors:
+        key = d["key"]
+        if key == "directCadence" and has_double_cadence:
+            continue
+        if key not in GARMIN_KEY_TO_COLUMN:
+            continue
+        index_map.setdefault(GARMIN_KEY_TO_COLUMN[key], []).append(d["metricsIndex"])
+    return index_map
+
+
+def to_matrix(data_points, width):
+    """activityDetailMetrics → 2-D float array (None → NaN), padding short rows."""
+    rows = [p.get("metrics") or [] for p in data_points]
+    try:
+        matrix = np.array(rows, dtype=np.float64)
+        if matrix.ndim == 2 and matrix.shape[1] >= width:
+            return matrix
+    except ValueError:
+        pass    # ragged — some points have fewer values than descriptors
+    return np.array(
+        [r + [None] * (width - len(r)) if len(r) < width else r[:width] for r in rows],
+        dtype=np.float64,
+    )
+
+
+def to_local_timestamps(ts_ms):
+    """
+    Epoch milliseconds → naive local datetime64[ms], identical to
+    datetime.fromtimestamp(ms / 1000) per point.
+
+    The UTC offset is applied as one vector add when it is constant across
+    the workout; a DST change mid-workout falls back to per-point conversion.
+    """
+    if len(ts_ms) == 0:
+        return np.array([], dtype="datetime64[ms]")
+
+    def offset_ms(ms):
+        s = ms / 1000
+        local = datetime.fromtimestamp(s)
+        utc = datetime.fromtimestamp(s, timezone.utc).replace(tzinfo=None)
+        return int(round((local - utc).total_seconds() * 1000))
+
+    first, last = offset_ms(ts_ms[0]), offset_ms(ts_ms[-1])
+    if first == last:
+        return (ts_ms.astype(np.int64) + first).astype("datetime64[ms]")
+    return np.array([datetime.fromtimestamp(ms / 1000) for ms in ts_ms], dtype="datetime64[ms]")
+
+
+def _prev_valid(values):
+    """For each position, the last non-NaN value strictly before it (NaN if none)."""
+    n = len(values)
+    idx = np.where(np.isnan(values), -1, np.arange(n))
+    np.maximum.accumulate(idx, out=idx)
+    prev_idx = np.empty(n, dtype=np.int64)
+    prev_idx[0] = -1
+    prev_idx[1:] = idx[:-1]
+    return np.where(prev_idx >= 0, values[np.maximum(prev_idx, 0)], np.nan)
+
+
+# Bump when compute_gradient changes; workouts.gradient_version records the
+# version each stored series was derived with (see recompute_derived.py).
+GRADIENT_VERSION = 1
+
+
+def compute_gradient(altitude, distance, pace, dt=1.0):
+    """
+    gradient_pct = Δaltitude / Δhorizontal_distance × 100, as array ops.
+
+    Δ is taken against the last point that had a value (gaps are bridged).
+    Primary: cumulative distance; fallback: pace × Δt (dt seconds per
+    point — 1 at full resolution). Points with < 0.5 m horizontal movement
+    get NaN.
+    """
+    with np.errstate(invalid="ignore", divide="ignore"):
+        d_alt = altitude - _prev_valid(altitude)
+        d_dist_gps = distance - _prev_valid(distance)
+        # pace in min/km → speed in m/s = 1000 / (pace × 60), × dt
+        d_dist_pace = np.where(pace > 0, 1000.0 / (pace * 60.0) * dt, np.nan)
+        d_dist = np.where(np.isnan(d_dist_gps), d_dist_pace, d_dist_gps)
+        gradient = np.where(d_dist > 0.5, np.round(d_alt / d_dist * 100, 2), np.nan)
+    return gradient
+
+
+def _unique_timestamp_index(timestamps):
+    """
+    Indices that collapse points sharing a local timestamp to the last one
+    received, in time order, so a batch always satisfies UNIQUE (workout_id,
+    metric_timestamp). Covers device resends and the repeated hour of a DST
+    fall-back. None when the timestamps are already strictly increasing.
+    """
+    ts = timestamps.astype(np.int64)
+    if len(ts) < 2 or np.all(np.diff(ts) > 0):
+        return None
+    _, last_from_end = np.unique(ts[::-1], return_index=True)
+    return len(ts) - 1 - last_from_end
+
+
+def build_batch(ts_ms, columns):
+    """
+    Assemble a columnar batch from raw per-point arrays of any source
+    (Garmin details, FIT, GPX).
+
+    ts_ms   : epoch milliseconds; points with NaN are dropped
+    columns : {name: float array aligned with ts_ms} in workout_metrics
+              units, except "speed" in m/s, which becomes pace. Missing
+              columns are NULL; gradient_pct is always derived.
+
+    Returns the batch dict described in parse_activity_details, or None
+    if no point has a timestamp.
+    """
+    ts_ms = np.asarray(ts_ms, dtype=np.float64)
+    valid = ~np.isnan(ts_ms)
+    if not valid.any():
+        return None
+
+    timestamps = to_local_timestamps(ts_ms[valid])
+    keep = _unique_timestamp_index(timestamps)
+    if keep is not None:
+        timestamps = timestamps[keep]
+    n = len(timestamps)
+
+    def select(values):
+        values = np.asarray(values, dtype=np.float64)[valid]
+        return values if keep is None else values[keep]
+
+    batch = {"metric_timestamp": timestamps}
+    for col in METRIC_COLUMNS:
+        batch[col] = select(columns[col]) if col in columns else np.full(n, np.nan)
+
+    if "speed" in columns:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            speed = select(columns["speed"])
+            batch["pace"] = np.where(speed != 0, (1000 / speed) / 60, np.nan)   # m/s → min/km
+    batch["heart_rate"] = np.trunc(batch["heart_rate"])
+
+    batch["gradient_pct"] = compute_gradient(batch["altitude"], batch["distance"], batch["pace"])
+    return batch
+
+
+def parse_activity_details(details):
+    """
+    Parse a Garmin activity details payload into a columnar batch.
+
+    Returns dict:
+        metric_timestamp : datetime64[ms] array (local time, unique, ascending)
+        <column>         : float64 array for every name in METRIC_COLUMNS
+                           (NaN = NULL; heart_rate is truncated to whole bpm)
+    or None if the payload has no usable time series.
+    """
+    descriptors = details.get("metricDescriptors", [])
+    data_points = details.get("activityDetailMetrics", [])
+    if not descriptors or not data_points:
+        return None
+
+    timestamp_index = next(
+        (d["metricsIndex"] for d in descriptors if d["key"] == "directTimestamp"),
+        None,
+    )
+    if timestamp_index is None:
+        return None
+
+    width = max(d["metricsIndex"] for d in descriptors) + 1
+    matrix = to_matrix(data_points, width)
+
+    columns = {}
+    for col, indices in build_index_map(descriptors).items():
+        merged = matrix[:, indices[0]]
+        for idx in indices[1:]:
+            values = matrix[:, idx]
+            merged = np.where(np.isnan(values), merged, values)
+        columns["speed" if col == "pace" else col] = merged   # directSpeed is m/s
+
+    return build_batch(matrix[:, timestamp_index], columns)
+
+
+def batch_size(batch):
+    return len(batch["metric_timestamp"])
+
+
+# ---------------------------------------------------------------------------
+# COPY output
+# ---------------------------------------------------------------------------
+
+def _format_column(values, integer=False):
+    """Float array → list of COPY text fields, NaN → \\N."""
+    null = np.isnan(values)
+    if null.all():
+        return [r"\N"] * len(values)
+    if integer:
+        return [r"\N" if x != x else str(int(x)) for x in values.tolist()]
+    return [r"\N" if x != x else repr(x) for x in values.tolist()]
+
+
+def copy_columns(batch):
+    """Value columns to COPY for a batch: METRIC_COLUMNS + any AGGREGATE_COLUMNS present."""
+    return METRIC_COLUMNS + [c for c in AGGREGATE_COLUMNS if c in batch]
+
+
+def copy_buffer(workout_id, batch):
+    """Render a batch as a tab-separated COPY text stream (StringIO)."""
+    n = batch_size(batch)
+    columns = [
+        [str(workout_id)] * n,
+        np.datetime_as_string(batch["metric_timestamp"], unit="ms").tolist(),
+    ]
+    columns += [_format_column(batch[c], c in INTEGER_COLUMNS) for c in copy_columns(batch)]
+
+    buf = io.StringIO()
+    buf.write("\n".join(map("\t".join, zip(*columns))))
+    buf.write("\n")
+    buf.seek(0)
+    return buf
+
+
+def copy_metrics(cursor, workout_id, batch):
+    """Bulk-load a batch into workout_metrics with COPY. Returns rows written."""
+    n = batch_size(batch)
+    if n == 0:
+        return 0
+    cursor.copy_expert(
+        "COPY workout_metrics (workout_id, metric_timestamp, "
+        + ", ".join(copy_columns(batch))
+        + ") FROM STDIN",
+        copy_buffer(workout_id, batch),
+    )
+    return n
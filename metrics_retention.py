@@ -0,0 +1,206 @@
+"""
+Tiered retention for workout_metrics.
+
+Workouts from the last METRICS_FULL_RESOLUTION_DAYS keep their full 1 Hz
+series. Older series are compacted to METRICS_COMPACT_RESOLUTION_S-second
+rows:
+
+    heart_rate, cadence, biomechanics, power,
+    latitude / longitude, altitude         mean of the bucket
+    pace                                   time-weighted (1 / mean speed) over moving points
+    altitude_min / altitude_max            range of the bucket
+    distance                               cumulative distance at the bucket end
+    gradient_pct                           recomputed from the compacted altitude / distance
+    metric_timestamp                       first point of the bucket
+
+so a long-window scan reads a tenth of the rows for everything outside
+the window, and the table grows with the window instead of the history.
+
+Before a full-resolution series is compacted, its workout_terrain_stats,
+workout_analytics and workout_mean_max rows are recomputed from it in the
+same transaction, so the stored derived values keep full-resolution accuracy.
+workouts.metrics_resolution_s records the resolution; readers get
+whichever series is stored (the kernel metrics work on point fractions,
+not on a 1 s spacing). Re-ingesting a workout restores 1 Hz.
+
+Chunks commit independently and compacted workouts are skipped, so the
+job can be stopped and rerun at any time.
+
+Usage:
+    python metrics_retention.py --dry-run
+    python metrics_retention.py                          # config defaults
+    python metrics_retention.py --keep-days 365 --resolution 5 --vacuum
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+import config
+from analytics.best_efforts import mean_max_curves, upsert_mean_max_rows
+from analytics.series_store import store_enabled, write_series
+from analytics.terrain_response import insert_terrain_stats, workout_terrain_stats
+from analytics.workout_analytics import compute_analytics, moving_series, upsert_analytics_rows
+from analytics.workout_series import iter_workout_series
+from db import get_connection
+from metrics_parser import AGGREGATE_COLUMNS, METRIC_COLUMNS, compute_gradient, copy_metrics
+
+RETENTION_COLUMNS = ("metric_epoch", *METRIC_COLUMNS, *AGGREGATE_COLUMNS)
+
+_MEAN_COLUMNS = [
+    "heart_rate", "cadence", "vertical_oscillation", "vertical_ratio",
+    "ground_contact_time", "power", "latitude", "longitude", "altitude",
+]
+
+CHUNK = 50
+
+
+def _bucket_reducers(starts):
+    def mean(values):
+        valid = ~np.isnan(values)
+        sums = np.add.reduceat(np.where(valid, values, 0.0), starts)
+        counts = np.add.reduceat(valid.astype(np.int64), starts)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, sums / counts, np.nan)
+
+    def extreme(ufunc, values, fill):
+        out = ufunc.reduceat(np.where(np.isnan(values), fill, values), starts)
+        return np.where(np.isinf(out), np.nan, out)
+
+    return mean, extreme
+
+
+def compact_series(series, resolution_s):
+    """
+    Aggregate a time-ordered full series (RETENTION_COLUMNS, every point)
+    into resolution_s-second buckets. Returns a metrics_parser batch with
+    AGGREGATE_COLUMNS, ready for copy_metrics.
+    """
+    epoch = series["metric_epoch"]
+    bucket = np.floor((epoch - epoch[0]) / resolution_s).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, np.diff(bucket) != 0])
+    mean, extreme = _bucket_reducers(starts)
+
+    batch = {"metric_timestamp": np.round(epoch[starts] * 1000).astype(np.int64).astype("datetime64[ms]")}
+    for col in _MEAN_COLUMNS:
+        batch[col] = mean(series[col])
+    batch["heart_rate"] = np.round(batch["heart_rate"])
+
+    pace = series["pace"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        speed = np.where((pace > 0) & (pace < 20), 1.0 / pace, np.nan)
+        batch["pace"] = 1.0 / mean(speed)
+
+    # An already-compacted series carries its own ranges
+    alt = series["altitude"]
+    lo = np.where(np.isnan(series["altitude_min"]), alt, series["altitude_min"])
+    hi = np.where(np.isnan(series["altitude_max"]), alt, series["altitude_max"])
+    batch["altitude_min"] = extreme(np.minimum, lo, np.inf)
+    batch["altitude_max"] = extreme(np.maximum, hi, -np.inf)
+    batch["distance"] = extreme(np.maximum, series["distance"], -np.inf)
+
+    batch["gradient_pct"] = compute_gradient(batch["altitude"], batch["distance"], batch["pace"], dt=resolution_s)
+    return batch
+
+
+def compact_chunk(conn, workouts, resolution_s):
+    """
+    Compact one chunk of (workout_id, current resolution) in one
+    transaction. Returns (rows before, rows after).
+    """
+    current = dict(workouts)
+    terrain_rows, analytics_rows, curve_rows, compacted = [], [], [], {}
+    before = 0
+    for wid, series in iter_workout_series(list(current), RETENTION_COLUMNS, conn,
+                                           moving_only=False, from_store=False):
+        before += len(series["pace"])
+        if current[wid] is None:
+            # Last chance to derive from the full series
+            terrain_rows.extend(
+                (wid, *row)
+                for row in workout_terrain_stats(series["heart_rate"], series["pace"], series["gradient_pct"])
+            )
+            analytics_rows.append((wid, compute_analytics(wid, moving_series(series))))
+            curve_rows.append((wid, 1, mean_max_curves(series)))
+        compacted[wid] = compact_series(series, resolution_s)
+
+    cur = conn.cursor()
+    if terrain_rows:
+        cur.execute("DELETE FROM workout_terrain_stats WHERE workout_id = ANY(%s)",
+                    (sorted({r[0] for r in terrain_rows}),))
+        insert_terrain_stats(cur, terrain_rows)
+    upsert_analytics_rows(cur, analytics_rows)
+    upsert_mean_max_rows(cur, curve_rows)
+
+    cur.execute("DELETE FROM workout_metrics WHERE workout_id = ANY(%s)", (list(compacted),))
+    after = [copy_metrics(cur, wid, batch) for wid, batch in compacted.items()]
+    cur.execute(
+        """
+        UPDATE workouts w
+        SET metrics_row_count = v.row_count, metrics_resolution_s = %s
+        FROM unnest(%s::int[], %s::int[]) AS v(workout_id, row_count)
+        WHERE w.workout_id = v.workout_id
+        """,
+        (resolution_s, list(compacted), after),
+    )
+    conn.commit()
+
+    if store_enabled():
+        for wid, batch in compacted.items():
+            write_series(wid, batch)
+    return before, sum(after)
+
+
+def select_workouts(conn, keep_days, resolution_s):
+    """(workout_id, metrics_resolution_s) of series older than keep_days and finer than resolution_s."""
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT workout_id, metrics_resolution_s
+        FROM workouts
+        WHERE metrics_row_count > 0
+          AND workout_date < CURRENT_DATE - (%s * INTERVAL '1 day')
+          AND COALESCE(metrics_resolution_s, 1) < %s
+        ORDER BY workout_id
+    """, (keep_days, resolution_s))
+    return cur.fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact workout_metrics series outside the retention window.")
+    parser.add_argument("--keep-days", type=int, default=config.METRICS_FULL_RESOLUTION_DAYS,
+                        help=f"Days kept at full resolution (default: {config.METRICS_FULL_RESOLUTION_DAYS})")
+    parser.add_argument("--resolution", type=int, default=config.METRICS_COMPACT_RESOLUTION_S,
+                        help=f"Seconds per compacted row (default: {config.METRICS_COMPACT_RESOLUTION_S})")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be compacted")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM workout_metrics afterwards")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        workouts = select_workouts(conn, args.keep_days, args.resolution)
+        print(f"{len(workouts)} workouts older than {args.keep_days} days to compact to {args.resolution} s")
+        if args.dry_run or not workouts:
+            return
+
+        t0 = time.perf_counter()
+        before = after = 0
+        for i in range(0, len(workouts), CHUNK):
+            b, a = compact_chunk(conn, workouts[i:i + CHUNK], args.resolution)
+            before += b
+            after += a
+            elapsed = time.perf_counter() - t0
+            print(f"  {min(i + CHUNK, len(workouts))}/{len(workouts)} workouts, "
+                  f"{before:,} → {after:,} rows ({before / elapsed:,.0f} rows/s)")
+
+        print(f"Done in {time.perf_counter() - t0:.1f}s: {before:,} rows → {after:,}")
+        if args.vacuum:
+            conn.autocommit = True
+            conn.cursor().execute("VACUUM (ANALYZE) workout_metrics")
+            print("OK: VACUUM (ANALYZE) workout_metrics")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
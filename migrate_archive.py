@@ -0,0 +1,85 @@
+"""
+One-time migration: convert a pretty-JSON workout archive to the
+content-addressed blob store + SQLite catalog used by WorkoutArchiver.
+
+Reads metadata/catalog.jsonl and every raw/{activities,details,hr_zones}/*.json
+file, stores each payload as a compressed blob (identical payloads collapse
+to one blob), and rebuilds the catalog index. The legacy catalog is renamed
+to catalog.jsonl.migrated; legacy JSON files are only deleted with
+--delete-legacy.
+
+Usage:
+    python migrate_archive.py
+    python migrate_archive.py --base-path data/workouts --delete-legacy
+"""
+
+import argparse
+import glob
+import json
+import os
+from datetime import datetime
+
+from workout_data_archiver import WorkoutArchiver
+
+LEGACY_DIRS = {"activities": "activity", "details": "details", "hr_zones": "hr_zones"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate a legacy JSON workout archive.")
+    parser.add_argument("--base-path", default="data/workouts")
+    parser.add_argument("--delete-legacy", action="store_true",
+                        help="Remove legacy JSON files once they are stored as blobs")
+    args = parser.parse_args()
+
+    archiver = WorkoutArchiver(args.base_path)
+    legacy_catalog = os.path.join(archiver.metadata_path, "catalog.jsonl")
+
+    # 1) Every legacy payload file → blob + activity_files link
+    migrated_files = []
+    legacy_bytes = 0
+    for dirname, data_type in LEGACY_DIRS.items():
+        for path in sorted(glob.glob(os.path.join(archiver.raw_path, dirname, "*.json"))):
+            with open(path, encoding="utf-8") as f:
+                wrapped = json.load(f)
+            legacy_bytes += os.path.getsize(path)
+            activity_id = wrapped.get("activity_id")
+            if activity_id is None or "data" not in wrapped:
+                print(f"SKIP (no activity_id/data): {path}")
+                continue
+            archived_at = datetime.fromisoformat(wrapped["archived_at"]) if wrapped.get("archived_at") else datetime.now()
+            # Files are visited oldest-first (names start with YYYYMMDD), so the
+            # newest download of each (activity, data_type) ends up linked.
+            archiver._save_payload(activity_id, wrapped.get("data_type", data_type), wrapped["data"], archived_at)
+            migrated_files.append(path)
+
+    # 2) Legacy catalog entries → activities table (last entry per activity wins)
+    entries = 0
+    if os.path.exists(legacy_catalog):
+        with open(legacy_catalog, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                archiver.save_catalog_entry(
+                    entry["activity_id"], entry.get("files", {}),
+                    entry.get("summary"), cataloged_at=entry.get("cataloged_at"),
+                )
+                entries += 1
+        os.replace(legacy_catalog, legacy_catalog + ".migrated")
+
+    stats = archiver.storage_stats()
+    archiver.close()
+
+    if args.delete_legacy:
+        for path in migrated_files:
+            os.remove(path)
+
+    print(f"Migrated {len(migrated_files)} legacy files and {entries} catalog entries.")
+    print(f"Legacy size : {legacy_bytes / 1e6:.2f} MB")
+    print(f"Blob store  : {stats['blobs']} blobs, {stats['stored_bytes'] / 1e6:.2f} MB "
+          f"({stats['raw_bytes'] / 1e6:.2f} MB uncompressed)")
+    print("Migration complete.")
+
+
+if __name__ == "__main__":
+    main()
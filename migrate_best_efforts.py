@@ -0,0 +1,35 @@
+"""
+One-time migration: persisted per-workout mean-maximal curves.
+
+  - workout_mean_max: best mean power, speed and heart rate per
+    analytics/best_efforts.DURATIONS entry, stamped with curve_version
+
+New ingests fill the table and /running/best-efforts computes missing
+rows on the fly; run `python recompute_derived.py` once to backfill
+existing workouts.
+"""
+from db import get_connection
+
+statements = [
+    """CREATE TABLE IF NOT EXISTS workout_mean_max (
+           workout_id     INT PRIMARY KEY REFERENCES workouts(workout_id) ON DELETE CASCADE,
+           curve_version  SMALLINT NOT NULL,
+           computed_at    TIMESTAMP NOT NULL,
+           resolution_s   SMALLINT NOT NULL,
+           power          FLOAT[],
+           speed          FLOAT[],
+           heart_rate     FLOAT[]
+       )""",
+    "CREATE INDEX IF NOT EXISTS workout_mean_max_version_idx ON workout_mean_max (curve_version)",
+]
+
+conn = get_connection()
+cur = conn.cursor()
+
+for s in statements:
+    cur.execute(s)
+    print(f"OK: {' '.join(s.split())[:70]}")
+
+conn.commit()
+conn.close()
+print("Migration complete. Backfill with: python recompute_derived.py")
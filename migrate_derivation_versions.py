@@ -0,0 +1,31 @@
+"""
+One-time migration: derivation versions for recompute_derived.py.
+
+  - workouts.gradient_version: metrics_parser.GRADIENT_VERSION that the
+    stored gradient_pct series was computed with (existing series are
+    stamped version 1)
+  - workout_terrain_stats.stats_version: TERRAIN_STATS_VERSION of each
+    summary row (existing rows are stamped version 1)
+
+workout_analytics already carries analytics_version. After any version
+bump, `python recompute_derived.py` rebuilds only the stale workouts.
+"""
+from db import get_connection
+
+statements = [
+    "ALTER TABLE workouts ADD COLUMN IF NOT EXISTS gradient_version SMALLINT",
+    "UPDATE workouts SET gradient_version = 1 WHERE metrics_row_count > 0 AND gradient_version IS NULL",
+    "ALTER TABLE workout_terrain_stats ADD COLUMN IF NOT EXISTS stats_version SMALLINT NOT NULL DEFAULT 1",
+    "ALTER TABLE workout_terrain_stats ALTER COLUMN stats_version DROP DEFAULT",
+]
+
+conn = get_connection()
+cur = conn.cursor()
+
+for s in statements:
+    cur.execute(s)
+    print(f"OK: {' '.join(s.split())[:70]}")
+
+conn.commit()
+conn.close()
+print("Migration complete.")
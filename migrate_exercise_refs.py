@@ -0,0 +1,44 @@
+"""
+One-time migration: resolve logged strength exercises to the taxonomy by id.
+
+  - strength_exercises.exercise_ref_id → exercises(exercise_id), set at
+    write time from the name (exercise_index.py); NULL while the name has
+    no exercises row
+  - index on exercise_ref_id for the taxonomy joins (recommend, recovery,
+    strength_stats)
+
+Existing rows are linked here, then every session's derived rows
+(strength_stats.py) are rebuilt, since muscle volume is attributed through
+the ref. Names that stay unmatched are listed for labeling with
+import_exercises.py.
+"""
+from db import get_connection
+from exercise_index import link_unresolved, unmatched_names
+from strength_stats import refresh_all
+
+statements = [
+    """ALTER TABLE strength_exercises
+           ADD COLUMN IF NOT EXISTS exercise_ref_id INT
+           REFERENCES exercises(exercise_id) ON DELETE SET NULL""",
+    """CREATE INDEX IF NOT EXISTS strength_exercises_ref_idx
+           ON strength_exercises (exercise_ref_id)""",
+]
+
+conn = get_connection()
+cur = conn.cursor()
+
+for s in statements:
+    cur.execute(s)
+    print(f"OK: {' '.join(s.split())[:70]}")
+
+print(f"OK: linked {link_unresolved(cur)} exercise names")
+conn.commit()
+print(f"OK: rebuilt derived rows of {refresh_all(conn)} strength sessions")
+
+unmatched = unmatched_names(cur)
+conn.close()
+if unmatched:
+    print(f"{len(unmatched)} names have no exercises row (label with import_exercises.py):")
+    for name, count, _ in unmatched:
+        print(f"  {name} ({count}×)")
+print("Migration complete.")
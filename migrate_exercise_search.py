@@ -0,0 +1,28 @@
+"""
+One-time migration: trigram index for exercise name search.
+
+  - pg_trgm extension
+  - GIN trigram index on exercises.name, serving the substring and fuzzy
+    matches of StrengthService.list_exercises
+
+Search-as-you-type (/strength/exercises/search) runs on the in-process
+index of api/exercise_search.py and needs no schema change.
+"""
+from db import get_connection
+
+statements = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """CREATE INDEX IF NOT EXISTS exercises_name_trgm_idx
+           ON exercises USING GIN (name gin_trgm_ops)""",
+]
+
+conn = get_connection()
+cur = conn.cursor()
+
+for s in statements:
+    cur.execute(s)
+    print(f"OK: {' '.join(s.split())[:70]}")
+
+conn.commit()
+conn.close()
+print("Migration complete.")
@@ -0,0 +1,47 @@
+"""
+One-time migration: secondary indexes for the hot workouts / workout_metrics
+queries.
+
+  - workouts (user_id, workout_date) INCLUDE (sport, training_volume,
+    start_time, end_time): per-day and date-range lookups in
+    training_load, recommend and alerts; the INCLUDE columns let the
+    weekly load sums run as index-only scans
+  - workouts (user_id, sport, workout_date): per-sport windows in
+    analytics/* (running trends, terrain stats)
+  - workouts (start_time): workout lookups by start time without user_id
+    (workout_metrics.py)
+  - workout_metrics BRIN (metric_timestamp): time-range scans over all
+    workouts (retention, exports); rows arrive in time order, so a BRIN
+    costs a few pages instead of a B-tree the size of the table
+
+workout_metrics lookups by workout_id, ordered by metric_timestamp, are
+already served by UNIQUE (workout_id, metric_timestamp).
+
+Indexes are built CONCURRENTLY, so the app keeps writing meanwhile.
+Optionally, migrate_partition_metrics.py range-partitions workout_metrics.
+"""
+from db import get_connection
+
+statements = [
+    """CREATE INDEX CONCURRENTLY IF NOT EXISTS workouts_user_date_idx
+           ON workouts (user_id, workout_date)
+           INCLUDE (sport, training_volume, start_time, end_time)""",
+    """CREATE INDEX CONCURRENTLY IF NOT EXISTS workouts_user_sport_date_idx
+           ON workouts (user_id, sport, workout_date)""",
+    "CREATE INDEX CONCURRENTLY IF NOT EXISTS workouts_start_time_idx ON workouts (start_time)",
+    """CREATE INDEX CONCURRENTLY IF NOT EXISTS workout_metrics_timestamp_brin
+           ON workout_metrics USING BRIN (metric_timestamp)""",
+    "ANALYZE workouts",
+    "ANALYZE workout_metrics",
+]
+
+conn = get_connection()
+conn.autocommit = True          # CREATE INDEX CONCURRENTLY cannot run in a transaction
+cur = conn.cursor()
+
+for s in statements:
+    cur.execute(s)
+    print(f"OK: {' '.join(s.split())[:70]}")
+
+conn.close()
+print("Migration complete.")
@@ -0,0 +1,26 @@
+"""
+One-time migration: compacted workout_metrics series (metrics_retention.py).
+
+  - workout_metrics.altitude_min / altitude_max: altitude range of a
+    compacted row (NULL at full resolution)
+  - workouts.metrics_resolution_s: seconds per stored row once a workout
+    has been compacted (NULL = full 1 Hz series)
+"""
+from db import get_connection
+
+statements = [
+    "ALTER TABLE workout_metrics ADD COLUMN IF NOT EXISTS altitude_min FLOAT",
+    "ALTER TABLE workout_metrics ADD COLUMN IF NOT EXISTS altitude_max FLOAT",
+    "ALTER TABLE workouts ADD COLUMN IF NOT EXISTS metrics_resolution_s SMALLINT",
+]
+
+conn = get_connection()
+cur = conn.cursor()
+
+for s in statements:
+    cur.execute(s)
+    print(f"OK: {' '.join(s.split())[:70]}")
+
+conn.commit()
+conn.close()
+print("Migration complete. Compact old series with: python metrics_retention.py --dry-run")
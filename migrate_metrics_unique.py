@@ -0,0 +1,50 @@
+"""
+One-time migration: make workout_metrics ingest idempotent.
+
+  - removes duplicate (workout_id, metric_timestamp) rows (keeps the newest)
+    and rows without a timestamp
+  - adds UNIQUE (workout_id, metric_timestamp) — also the index behind every
+    per-workout series lookup
+  - adds workouts.metrics_ingested_at / metrics_row_count and stamps them for
+    workouts that already have a series
+
+Workouts left half-populated by an earlier crash cannot be told apart from
+complete ones here; re-run `python backfill_workout_metrics.py --force` to
+replace every stored series.
+
+Runs in a single transaction.
+"""
+from db import get_connection
+
+statements = [
+    # workout_metrics — dedupe, then constrain
+    """DELETE FROM workout_metrics WHERE metric_timestamp IS NULL""",
+    """DELETE FROM workout_metrics a
+       USING workout_metrics b
+       WHERE a.workout_id = b.workout_id
+         AND a.metric_timestamp = b.metric_timestamp
+         AND a.metric_id < b.metric_id""",
+    "ALTER TABLE workout_metrics ALTER COLUMN metric_timestamp SET NOT NULL",
+    "ALTER TABLE workout_metrics DROP CONSTRAINT IF EXISTS workout_metrics_workout_id_metric_timestamp_key",
+    "ALTER TABLE workout_metrics ADD CONSTRAINT workout_metrics_workout_id_metric_timestamp_key UNIQUE (workout_id, metric_timestamp)",
+
+    # workouts — ingest bookkeeping
+    "ALTER TABLE workouts ADD COLUMN IF NOT EXISTS metrics_ingested_at TIMESTAMP",
+    "ALTER TABLE workouts ADD COLUMN IF NOT EXISTS metrics_row_count   INT",
+    """UPDATE workouts w
+       SET metrics_ingested_at = NOW(), metrics_row_count = c.n
+       FROM (SELECT workout_id, COUNT(*) AS n FROM workout_metrics GROUP BY workout_id) c
+       WHERE w.workout_id = c.workout_id
+         AND w.metrics_ingested_at IS NULL""",
+]
+
+conn = get_connection()
+cur = conn.cursor()
+
+for s in statements:
+    cur.execute(s)
+    print(f"OK ({cur.rowcount:>7} rows): {' '.join(s.split())[:70]}")
+
+conn.commit()
+conn.close()
+print("Migration complete.")
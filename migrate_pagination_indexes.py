@@ -0,0 +1,36 @@
+"""
+One-time migration: indexes for the keyset-paginated listings
+(api/pagination.py).
+
+  - workouts (user_id, workout_date, start_time, workout_id): pages of
+    /training/workouts, walked backwards from the cursor in sort order
+  - workouts (user_id, sport, workout_date, start_time, workout_id): the
+    same with a sport filter, and /strength/workouts; replaces
+    workouts_user_sport_date_idx, which is a prefix of it
+
+The date-keyed listings (sleep, strength sessions, check-in history) are
+already served by their UNIQUE (user_id, <date>) constraints.
+
+Indexes are built CONCURRENTLY, so the app keeps writing meanwhile.
+"""
+from db import get_connection
+
+statements = [
+    """CREATE INDEX CONCURRENTLY IF NOT EXISTS workouts_user_date_start_idx
+           ON workouts (user_id, workout_date, start_time, workout_id)""",
+    """CREATE INDEX CONCURRENTLY IF NOT EXISTS workouts_user_sport_date_start_idx
+           ON workouts (user_id, sport, workout_date, start_time, workout_id)""",
+    "DROP INDEX CONCURRENTLY IF EXISTS workouts_user_sport_date_idx",
+    "ANALYZE workouts",
+]
+
+conn = get_connection()
+conn.autocommit = True          # CREATE INDEX CONCURRENTLY cannot run in a transaction
+cur = conn.cursor()
+
+for s in statements:
+    cur.execute(s)
+    print(f"OK: {' '.join(s.split())[:70]}")
+
+conn.close()
+print("Migration complete.")
@@ -0,0 +1,131 @@
+"""
+Optional migration: range-partition workout_metrics.
+
+Rebuilds workout_metrics as a partitioned table and copies every row,
+in one transaction:
+
+  --by workout   RANGE (workout_id), --size workouts per partition
+                 (default 1000) — a workout's series is always in one
+                 partition and the per-workout queries prune to it
+  --by month     RANGE (metric_timestamp), one partition per month —
+                 time-range scans and retention prune to whole months,
+                 and old months can be detached cheaply
+
+Partitions cover the existing data plus --ahead more ranges; a DEFAULT
+partition catches anything beyond. The primary key becomes
+(metric_id, <partition key>) because every unique constraint must include
+the partition key; UNIQUE (workout_id, metric_timestamp) and the BRIN
+from migrate_indexes.py are recreated on every partition.
+
+The old table is kept as workout_metrics_unpartitioned until you drop it
+(--drop-old on a later run, after checking the row counts printed here).
+
+Usage:
+    python migrate_partition_metrics.py --by workout --size 1000
+    python migrate_partition_metrics.py --by month --ahead 6
+    python migrate_partition_metrics.py --drop-old
+"""
+
+import argparse
+from datetime import date
+
+from db import get_connection
+
+
+def _month_add(d, months):
+    y, m = divmod(d.year * 12 + d.month - 1 + months, 12)
+    return date(y, m + 1, 1)
+
+
+def partition_bounds(by, lo, hi, size, ahead):
+    """
+    [(suffix, from, to)] covering [lo, hi] plus `ahead` more ranges.
+    lo / hi are workout ids (by="workout") or dates (by="month").
+    """
+    bounds = []
+    if by == "workout":
+        start = (lo // size) * size
+        stop = (hi // size + 1 + ahead) * size
+        for frm in range(start, stop, size):
+            bounds.append((f"w{frm}", frm, frm + size))
+    else:
+        frm = date(lo.year, lo.month, 1)
+        stop = _month_add(date(hi.year, hi.month, 1), 1 + ahead)
+        while frm < stop:
+            to = _month_add(frm, 1)
+            bounds.append((f"{frm:%Y_%m}", frm.isoformat(), to.isoformat()))
+            frm = to
+    return bounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Range-partition workout_metrics.")
+    parser.add_argument("--by", choices=("workout", "month"), default="workout")
+    parser.add_argument("--size", type=int, default=1000, help="Workouts per partition for --by workout")
+    parser.add_argument("--ahead", type=int, default=4, help="Empty partitions to create past the current data")
+    parser.add_argument("--drop-old", action="store_true", help="Drop workout_metrics_unpartitioned and exit")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    cur = conn.cursor()
+
+    if args.drop_old:
+        cur.execute("DROP TABLE IF EXISTS workout_metrics_unpartitioned")
+        conn.commit()
+        conn.close()
+        print("OK: dropped workout_metrics_unpartitioned")
+        return
+
+    key = "workout_id" if args.by == "workout" else "metric_timestamp"
+    cur.execute("SELECT relkind FROM pg_class WHERE relname = 'workout_metrics'")
+    if cur.fetchone()[0] == "p":
+        raise SystemExit("workout_metrics is already partitioned.")
+
+    if args.by == "workout":
+        cur.execute("SELECT COALESCE(MIN(workout_id), 0), COALESCE(MAX(workout_id), 0) FROM workouts")
+    else:
+        cur.execute("SELECT COALESCE(MIN(metric_timestamp)::date, CURRENT_DATE), "
+                    "COALESCE(MAX(metric_timestamp)::date, CURRENT_DATE) FROM workout_metrics")
+    lo, hi = cur.fetchone()
+    bounds = partition_bounds(args.by, lo, hi, args.size, args.ahead)
+
+    statements = [
+        f"""CREATE TABLE workout_metrics_partitioned (
+               LIKE workout_metrics INCLUDING DEFAULTS,
+               PRIMARY KEY (metric_id, {key}),
+               UNIQUE (workout_id, metric_timestamp),
+               FOREIGN KEY (workout_id) REFERENCES workouts(workout_id) ON DELETE CASCADE
+           ) PARTITION BY RANGE ({key})""",
+        *(
+            f"""CREATE TABLE workout_metrics_{suffix} PARTITION OF workout_metrics_partitioned
+                   FOR VALUES FROM ('{frm}') TO ('{to}')"""
+            for suffix, frm, to in bounds
+        ),
+        "CREATE TABLE workout_metrics_default PARTITION OF workout_metrics_partitioned DEFAULT",
+        "INSERT INTO workout_metrics_partitioned SELECT * FROM workout_metrics",
+        "ALTER TABLE workout_metrics RENAME TO workout_metrics_unpartitioned",
+        "ALTER TABLE workout_metrics_partitioned RENAME TO workout_metrics",
+        "ALTER SEQUENCE workout_metrics_metric_id_seq OWNED BY workout_metrics.metric_id",
+        "ALTER INDEX IF EXISTS workout_metrics_timestamp_brin RENAME TO workout_metrics_unpartitioned_timestamp_brin",
+        "CREATE INDEX workout_metrics_timestamp_brin ON workout_metrics USING BRIN (metric_timestamp)",
+        "ANALYZE workout_metrics",
+    ]
+
+    for s in statements:
+        cur.execute(s)
+        print(f"OK: {' '.join(s.split())[:70]}")
+
+    cur.execute("SELECT (SELECT COUNT(*) FROM workout_metrics), (SELECT COUNT(*) FROM workout_metrics_unpartitioned)")
+    new_rows, old_rows = cur.fetchone()
+    if new_rows != old_rows:
+        conn.rollback()
+        raise SystemExit(f"Row count mismatch ({new_rows} vs {old_rows}); rolled back.")
+
+    conn.commit()
+    conn.close()
+    print(f"Migration complete: {new_rows:,} rows in {len(bounds)} partitions + default. "
+          "Drop the old table with: python migrate_partition_metrics.py --drop-old")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+One-time migration: derived strength tables (strength_stats.py).
+
+  - strength_exercise_stats: per logged exercise set count, tonnage and
+    best Epley e1RM; read by the 1RM charts and weekly volume
+  - strength_weekly_muscle: per user / week / muscle sets and tonnage,
+    attributed through the exercises taxonomy
+
+Both are filled here from the existing sessions; strength writes keep
+them current afterwards.
+"""
+from db import get_connection
+from strength_stats import refresh_all
+
+statements = [
+    """CREATE TABLE IF NOT EXISTS strength_exercise_stats (
+           exercise_id      INT PRIMARY KEY REFERENCES strength_exercises(exercise_id) ON DELETE CASCADE,
+           session_id       INT NOT NULL REFERENCES strength_sessions(session_id) ON DELETE CASCADE,
+           user_id          INT NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+           session_date     DATE NOT NULL,
+           name             VARCHAR(200) NOT NULL,
+           sets             INT NOT NULL,
+           tonnage_kg       FLOAT NOT NULL,
+           best_e1rm_kg     FLOAT,
+           best_e1rm_10_kg  FLOAT
+       )""",
+    """CREATE INDEX IF NOT EXISTS strength_exercise_stats_session_idx
+           ON strength_exercise_stats (session_id)""",
+    """CREATE INDEX IF NOT EXISTS strength_exercise_stats_user_name_date_idx
+           ON strength_exercise_stats (user_id, LOWER(name), session_date)""",
+    """CREATE INDEX IF NOT EXISTS strength_exercise_stats_user_date_idx
+           ON strength_exercise_stats (user_id, session_date)""",
+    """CREATE TABLE IF NOT EXISTS strength_weekly_muscle (
+           user_id               INT NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+           week_start            DATE NOT NULL,
+           muscle                TEXT NOT NULL,
+           sets                  INT NOT NULL,
+           tonnage_kg            FLOAT NOT NULL,
+           secondary_sets        INT NOT NULL,
+           secondary_tonnage_kg  FLOAT NOT NULL,
+           PRIMARY KEY (user_id, week_start, muscle)
+       )""",
+]
+
+conn = get_connection()
+cur = conn.cursor()
+
+for s in statements:
+    cur.execute(s)
+    print(f"OK: {' '.join(s.split())[:70]}")
+
+conn.commit()
+print(f"OK: backfilled {refresh_all(conn)} strength sessions")
+conn.close()
+print("Migration complete.")
@@ -0,0 +1,34 @@
+"""
+One-time migration: sync run history + activity tracking for the scheduler.
+
+  - sync_runs: one row per pipeline run (manual or scheduled)
+  - users.last_active_at: bumped when the app loads the dashboard
+"""
+from db import get_connection
+
+statements = [
+    """CREATE TABLE IF NOT EXISTS sync_runs (
+           run_id            SERIAL PRIMARY KEY,
+           user_id           INT NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+           trigger           VARCHAR(20) NOT NULL,
+           started_at        TIMESTAMP NOT NULL,
+           finished_at       TIMESTAMP,
+           duration_s        FLOAT,
+           ok                BOOLEAN,
+           records_ingested  INT,
+           errors            TEXT
+       )""",
+    "CREATE INDEX IF NOT EXISTS sync_runs_user_started_idx ON sync_runs (user_id, started_at DESC)",
+    "ALTER TABLE users ADD COLUMN IF NOT EXISTS last_active_at TIMESTAMP",
+]
+
+conn = get_connection()
+cur = conn.cursor()
+
+for s in statements:
+    cur.execute(s)
+    print(f"OK: {' '.join(s.split())[:70]}")
+
+conn.commit()
+conn.close()
+print("Migration complete.")
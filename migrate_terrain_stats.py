@@ -0,0 +1,40 @@
+"""
+One-time migration: per-workout terrain sufficient statistics.
+
+  - workout_terrain_stats: per gradient band / 2% bucket sums for each
+    workout, read by analytics/terrain_response.py instead of raw points
+
+New ingests fill the table; afterwards run
+`python recompute_derived.py` once to backfill existing workouts.
+"""
+from db import get_connection
+
+statements = [
+    """CREATE TABLE IF NOT EXISTS workout_terrain_stats (
+           workout_id        INT NOT NULL REFERENCES workouts(workout_id) ON DELETE CASCADE,
+           grouping          VARCHAR(10) NOT NULL,
+           group_key         SMALLINT NOT NULL,
+           stats_version     SMALLINT NOT NULL,
+           point_count       INT NOT NULL,
+           sum_hr            FLOAT NOT NULL,
+           sum_pace          FLOAT NOT NULL,
+           sum_gap           FLOAT NOT NULL,
+           sum_speed_per_hr  FLOAT NOT NULL,
+           sum_grad          FLOAT NOT NULL,
+           sum_grad_hr       FLOAT NOT NULL,
+           sum_grad_sq       FLOAT NOT NULL,
+           sum_hr_sq         FLOAT NOT NULL,
+           PRIMARY KEY (workout_id, grouping, group_key)
+       )""",
+]
+
+conn = get_connection()
+cur = conn.cursor()
+
+for s in statements:
+    cur.execute(s)
+    print(f"OK: {' '.join(s.split())[:70]}")
+
+conn.commit()
+conn.close()
+print("Migration complete. Backfill with: python recompute_derived.py")
@@ -0,0 +1,47 @@
+"""
+One-time migration: persisted per-workout running analytics.
+
+  - workout_analytics: GAP, decoupling, REI, biomechanics and fatigue
+    values per workout, stamped with analytics_version
+
+New ingests fill the table and trend queries compute missing rows on the
+fly; run `python recompute_derived.py` once to backfill existing workouts.
+"""
+from db import get_connection
+
+statements = [
+    """CREATE TABLE IF NOT EXISTS workout_analytics (
+           workout_id         INT PRIMARY KEY REFERENCES workouts(workout_id) ON DELETE CASCADE,
+           analytics_version  SMALLINT NOT NULL,
+           computed_at        TIMESTAMP NOT NULL,
+           avg_pace           FLOAT,
+           avg_gap            FLOAT,
+           gap_vs_pace_pct    FLOAT,
+           decoupling_pct     FLOAT,
+           decoupling_status  VARCHAR(20),
+           rei                FLOAT,
+           rei_mode           VARCHAR(10),
+           avg_cadence        FLOAT,
+           avg_gct            FLOAT,
+           avg_vo             FLOAT,
+           avg_vr             FLOAT,
+           avg_hr             FLOAT,
+           fatigue_score      FLOAT,
+           cadence_drift_pct  FLOAT,
+           gct_drift_pct      FLOAT,
+           hr_drift_pct       FLOAT,
+           elevation_gain_m   FLOAT
+       )""",
+    "CREATE INDEX IF NOT EXISTS workout_analytics_version_idx ON workout_analytics (analytics_version)",
+]
+
+conn = get_connection()
+cur = conn.cursor()
+
+for s in statements:
+    cur.execute(s)
+    print(f"OK: {' '.join(s.split())[:70]}")
+
+conn.commit()
+conn.close()
+print("Migration complete. Backfill with: python recompute_derived.py")
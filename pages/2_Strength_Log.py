@@ -8,6 +8,7 @@ from datetime import date
 
 from db import get_connection
 from session import current_user_id
+from strength_store import write_exercises
 from options import (
     get_muscles, get_equipment, get_joints, get_sport_carryover_keys,
     get_movement_patterns, get_quality_focuses, get_contraction_types,
@@ -257,30 +258,7 @@ if st.session_state.sl_exercises:
         """, (USER_ID, session_date, session_type))
         session_id = cur.fetchone()[0]
 
-        cur.execute("DELETE FROM strength_exercises WHERE session_id = %s", (session_id,))
-
-        for ex in st.session_state.sl_exercises:
-            cur.execute("""
-                INSERT INTO strength_exercises (session_id, exercise_order, name, notes)
-                VALUES (%s, %s, %s, %s) RETURNING exercise_id
-            """, (session_id, ex["exercise_order"], ex["name"], ex["notes"]))
-            exercise_id = cur.fetchone()[0]
-
-            for s in ex["sets"]:
-                cur.execute("""
-                    INSERT INTO strength_sets (
-                        exercise_id, set_number, reps, duration_seconds,
-                        weight_kg, is_bodyweight, band_color,
-                        per_hand, per_side, plus_bar,
-                        weight_includes_bar, total_weight_kg
-                    ) VALUES (%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s,%s)
-                """, (
-                    exercise_id, s["set_number"], s.get("reps"), s.get("duration_seconds"),
-                    s.get("weight_kg"), s.get("is_bodyweight"), s.get("band_color"),
-                    s.get("per_hand"), s.get("per_side"), s.get("plus_bar"),
-                    s.get("weight_includes_bar"), s.get("total_weight_kg"),
-                ))
-
+        write_exercises(cur, session_id, st.session_state.sl_exercises)
         conn.commit()
         cur.close()
         conn.close()
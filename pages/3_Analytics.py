@@ -63,22 +63,16 @@ def load_1rm_history(today_iso, exercise_name, days):
     start = date.fromisoformat(today_iso) - timedelta(days=days)
     conn  = get_connection()
     cur   = conn.cursor()
-    # Epley: 1RM = w × (1 + reps/30)
+    # Epley: 1RM = w × (1 + reps/30), over sets of 1-10 reps (strength_stats.py)
     cur.execute("""
-        SELECT ss.session_date,
-               MAX(st.total_weight_kg * (1 + st.reps / 30.0)) AS epley_1rm
-        FROM strength_sessions ss
-        JOIN strength_exercises se ON se.session_id = ss.session_id
-        JOIN strength_sets st ON st.exercise_id = se.exercise_id
-        WHERE ss.user_id = %s
-          AND se.name = %s
-          AND ss.session_date BETWEEN %s AND %s
-          AND st.total_weight_kg IS NOT NULL
-          AND st.reps IS NOT NULL
-          AND st.reps > 0
-          AND st.reps <= 10
-        GROUP BY ss.session_date
-        ORDER BY ss.session_date
+        SELECT session_date, MAX(best_e1rm_10_kg) AS epley_1rm
+        FROM strength_exercise_stats
+        WHERE user_id = %s
+          AND name = %s
+          AND session_date BETWEEN %s AND %s
+          AND best_e1rm_10_kg IS NOT NULL
+        GROUP BY session_date
+        ORDER BY session_date
     """, (USER_ID, exercise_name, start, date.fromisoformat(today_iso)))
     rows = cur.fetchall()
     cur.close()
@@ -91,12 +85,11 @@ def load_tracked_exercises():
     conn = get_connection()
     cur  = conn.cursor()
     cur.execute("""
-        SELECT DISTINCT se.name
-        FROM strength_exercises se
-        JOIN strength_sets st ON st.exercise_id = se.exercise_id
-        WHERE st.total_weight_kg IS NOT NULL AND st.reps IS NOT NULL AND st.reps BETWEEN 1 AND 10
-        ORDER BY se.name
-    """)
+        SELECT DISTINCT name
+        FROM strength_exercise_stats
+        WHERE user_id = %s AND best_e1rm_10_kg IS NOT NULL
+        ORDER BY name
+    """, (USER_ID,))
     names = [r[0] for r in cur.fetchall()]
     cur.close()
     conn.close()
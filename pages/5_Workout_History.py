@@ -96,51 +96,41 @@ def load_strength_session(user_id, workout_date):
     conn = get_connection()
     cur  = conn.cursor()
     cur.execute("""
-        SELECT ss.session_id, ss.session_type,
-               se.exercise_id, se.exercise_order, se.name, se.notes
+        SELECT ss.session_type,
+               se.exercise_id, se.exercise_order, se.name, se.notes,
+               st.set_number, st.reps, st.duration_seconds,
+               st.total_weight_kg, st.is_bodyweight, st.band_color, st.per_hand, st.per_side
         FROM strength_sessions ss
-        JOIN strength_exercises se ON se.session_id = ss.session_id
+        JOIN strength_exercises se  ON se.session_id = ss.session_id
+        LEFT JOIN strength_sets st  ON st.exercise_id = se.exercise_id
         WHERE ss.user_id = %s AND ss.session_date = %s
-        ORDER BY se.exercise_order
+        ORDER BY se.exercise_order, se.exercise_id, st.set_number
     """, (user_id, workout_date,))
-    ex_rows = cur.fetchall()
-    if not ex_rows:
-        cur.close()
-        conn.close()
+    rows = cur.fetchall()
+    cur.close()
+    conn.close()
+    if not rows:
         return None
 
-    session_type = ex_rows[0][1]
+    # Rows arrive in exercise order, one per set, so one pass groups them
     exercises = {}
-    for row in ex_rows:
-        eid = row[2]
+    for row in rows:
+        eid = row[1]
         if eid not in exercises:
-            exercises[eid] = {"order": row[3], "name": row[4], "notes": row[5], "sets": []}
-
-    exercise_ids = list(exercises.keys())
-    cur.execute("""
-        SELECT exercise_id, set_number, reps, duration_seconds,
-               total_weight_kg, is_bodyweight, band_color, per_hand, per_side
-        FROM strength_sets
-        WHERE exercise_id = ANY(%s)
-        ORDER BY exercise_id, set_number
-    """, (exercise_ids,))
-    for s in cur.fetchall():
-        eid = s[0]
-        exercises[eid]["sets"].append({
-            "set_number":       s[1],
-            "reps":             s[2],
-            "duration_seconds": s[3],
-            "total_weight_kg":  s[4],
-            "is_bodyweight":    s[5],
-            "band_color":       s[6],
-            "per_hand":         s[7],
-            "per_side":         s[8],
-        })
-
-    cur.close()
-    conn.close()
-    return {"session_type": session_type,
-            "exercises": sorted(exercises.values(), key=lambda e: e["order"])}
+            exercises[eid] = {"order": row[2], "name": row[3], "notes": row[4], "sets": []}
+        if row[5] is not None:
+            exercises[eid]["sets"].append({
+                "set_number":       row[5],
+                "reps":             row[6],
+                "duration_seconds": row[7],
+                "total_weight_kg":  row[8],
+                "is_bodyweight":    row[9],
+                "band_color":       row[10],
+                "per_hand":         row[11],
+                "per_side":         row[12],
+            })
+
+    return {"session_type": rows[0][0], "exercises": list(exercises.values())}
 
 
 @st.cache_data(ttl=300)
@@ -0,0 +1,162 @@
+"""
+In-memory exercise progression graph (exercise_progressions).
+
+exercise_progressions is a branching tree: an exercise progresses
+'harder', 'easier' or 'lateral' to others, per goal branch (power,
+strength, ...; NULL = every branch). The graph is loaded once per
+process into CSR arrays (compressed sparse rows):
+
+  nodes    exercise ids, sorted; an exercise's position is its row
+  offsets  row i's edges are edges[offsets[i]:offsets[i + 1]]
+  targets  edge → target row
+  kinds    edge → progression type code
+  branches edge → goal branch code (-1 = every branch)
+
+A 'harder' edge a → b also makes b → a an 'easier' step (and the other
+way round) unless the table lists that pair itself, so chains only need
+to be entered in one direction.
+
+Next-step and shortest-path queries are cached per (exercise, type,
+branch); the recommendation engine asks for every suggestion, the API
+for many exercises at once (/strength/exercises/progressions). The graph
+is reloaded when exercise_progressions gains or loses rows.
+"""
+
+from array import array
+from collections import deque
+from functools import lru_cache
+
+TYPES = ("harder", "easier", "lateral")
+BRANCHES = ("power", "strength", "hypertrophy", "endurance", "stability")
+
+_INVERSE = {"harder": "easier", "easier": "harder"}
+
+LOAD_SQL = """
+    SELECT p.from_exercise_id, p.to_exercise_id, p.progression_type, p.goal_branch, t.name
+    FROM exercise_progressions p
+    JOIN exercises t ON t.exercise_id = p.to_exercise_id
+    WHERE p.progression_type IS NOT NULL
+"""
+
+NAMES_SQL = """
+    SELECT exercise_id, name FROM exercises
+    WHERE exercise_id IN (SELECT from_exercise_id FROM exercise_progressions)
+"""
+
+SIGNATURE_SQL = "SELECT COUNT(*), COALESCE(MAX(progression_id), 0) FROM exercise_progressions"
+
+
+class ProgressionGraph:
+    def __init__(self, edges, names=None):
+        """edges: [(from_id, to_id, progression_type, goal_branch)]; names: {exercise_id: name}."""
+        self.names = dict(names or {})
+        listed = {(a, b, kind, branch) for a, b, kind, branch in edges}
+        implied = {
+            (b, a, _INVERSE[kind], branch)
+            for a, b, kind, branch in listed
+            if kind in _INVERSE and (b, a, _INVERSE[kind], branch) not in listed
+        }
+        all_edges = sorted(
+            listed | implied,
+            key=lambda e: (e[0], TYPES.index(e[2]), e[3] or "", e[1]),
+        )
+
+        self.nodes = array("i", sorted({e[0] for e in all_edges} | {e[1] for e in all_edges}))
+        self._row = {exercise_id: i for i, exercise_id in enumerate(self.nodes)}
+        self.offsets = array("i", [0] * (len(self.nodes) + 1))
+        self.targets = array("i")
+        self.kinds = array("b")
+        self.branches = array("b")
+        for a, b, kind, branch in all_edges:
+            self.offsets[self._row[a] + 1] += 1
+            self.targets.append(self._row[b])
+            self.kinds.append(TYPES.index(kind))
+            self.branches.append(BRANCHES.index(branch) if branch else -1)
+        for i in range(len(self.nodes)):
+            self.offsets[i + 1] += self.offsets[i]
+
+        self.next_steps = lru_cache(maxsize=None)(self._next_steps)
+        self.path = lru_cache(maxsize=4096)(self._path)
+
+    def __len__(self):
+        return len(self.targets)
+
+    def _steps(self, row: int, kind: int, branch: int | None):
+        for edge in range(self.offsets[row], self.offsets[row + 1]):
+            if self.kinds[edge] != kind:
+                continue
+            if branch is not None and self.branches[edge] not in (-1, branch):
+                continue
+            yield self.targets[edge]
+
+    def _next_steps(self, exercise_id: int, progression_type: str,
+                    goal_branch: str | None = None) -> tuple[int, ...]:
+        """Exercise ids one step away, in table order. goal_branch None takes every branch."""
+        row = self._row.get(exercise_id)
+        if row is None:
+            return ()
+        branch = BRANCHES.index(goal_branch) if goal_branch else None
+        steps = dict.fromkeys(self._steps(row, TYPES.index(progression_type), branch))
+        return tuple(self.nodes[t] for t in steps)
+
+    def _path(self, from_id: int, to_id: int, progression_type: str = "harder",
+              goal_branch: str | None = None) -> tuple[int, ...] | None:
+        """Shortest chain of progression_type steps from one exercise to another,
+        both ends included; None if to_id is not reachable."""
+        start, goal = self._row.get(from_id), self._row.get(to_id)
+        if start is None or goal is None:
+            return None
+        kind = TYPES.index(progression_type)
+        branch = BRANCHES.index(goal_branch) if goal_branch else None
+        previous = {start: None}
+        queue = deque([start])
+        while queue:
+            row = queue.popleft()
+            if row == goal:
+                chain = []
+                while row is not None:
+                    chain.append(self.nodes[row])
+                    row = previous[row]
+                return tuple(reversed(chain))
+            for target in self._steps(row, kind, branch):
+                if target not in previous:
+                    previous[target] = row
+                    queue.append(target)
+        return None
+
+    def next_steps_many(self, exercise_ids, goal_branch: str | None = None) -> dict[int, dict[str, tuple[int, ...]]]:
+        """{exercise_id: {progression_type: next step ids}} for every given exercise."""
+        return {
+            exercise_id: {kind: self.next_steps(exercise_id, kind, goal_branch) for kind in TYPES}
+            for exercise_id in exercise_ids
+        }
+
+
+_cache: dict = {"signature": None, "graph": None}
+
+
+def cached_graph(signature) -> ProgressionGraph | None:
+    """The cached graph if it was built at `signature`, else None."""
+    return _cache["graph"] if _cache["signature"] == signature else None
+
+
+def store_graph(signature, rows, name_rows) -> ProgressionGraph:
+    """Build from LOAD_SQL and NAMES_SQL rows and cache it."""
+    names = dict(name_rows)
+    names.update((to_id, name) for _, to_id, _, _, name in rows)
+    graph = ProgressionGraph([row[:4] for row in rows], names)
+    _cache.update(signature=tuple(signature), graph=graph)
+    return graph
+
+
+def get_graph(cur) -> ProgressionGraph:
+    """The process-wide graph, reloaded if exercise_progressions changed (psycopg2 cursor)."""
+    cur.execute(SIGNATURE_SQL)
+    signature = tuple(cur.fetchone())
+    graph = cached_graph(signature)
+    if graph is None:
+        cur.execute(LOAD_SQL)
+        rows = cur.fetchall()
+        cur.execute(NAMES_SQL)
+        graph = store_graph(signature, rows, cur.fetchall())
+    return graph
@@ -0,0 +1,148 @@
+"""
+Per-request SQL statistics: query count, DB time and repeated statements.
+
+Both drivers record into the QueryStats active in the current context:
+
+  psycopg2    InstrumentedCursor, the cursor_factory of db.get_connection(),
+              so every sync module (training_load, recommend, ...) counts
+  SQLAlchemy  engine events, see api/instrumentation.py
+
+Statements are fingerprinted (literals and placeholders folded to "?",
+IN lists collapsed), so the same statement run in a loop — an N+1 such as
+a query per day or per exercise — shows up as one fingerprint with a high
+count. Nothing is recorded outside count_queries() or a request, and the
+cost per statement is then one ContextVar lookup.
+
+The stats object is shared, not copied: asyncio.to_thread() and new tasks
+copy the context, and their queries land in the request's QueryStats.
+
+Usage in tests:
+    with query_budget(3):
+        get_metrics(cur, today)
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import psycopg2.extensions
+
+# A fingerprint run this many times in one request is reported as N+1
+REPEAT_THRESHOLD = 5
+
+_current: ContextVar["QueryStats | None"] = ContextVar("query_stats", default=None)
+
+_FOLD = [
+    (re.compile(r"--[^\n]*"), " "),                                   # line comments
+    (re.compile(r"/\*.*?\*/", re.S), " "),                            # block comments
+    (re.compile(r"'(?:[^']|'')*'"), "?"),                             # string literals
+    (re.compile(r"%\(\w+\)s|%s|\$\d+|(?<![:\w]):\w+"), "?"),          # placeholders
+    (re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b"), "?"),                # numbers
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?)"),               # IN (?, ?, ...)
+    (re.compile(r"\s+"), " "),
+]
+
+
+def fingerprint(sql) -> str:
+    """Statement shape without literals, placeholders, comments or spacing."""
+    if isinstance(sql, bytes):
+        sql = sql.decode("utf-8", "replace")
+    sql = str(sql)
+    for pattern, repl in _FOLD:
+        sql = pattern.sub(repl, sql)
+    return sql.strip().lower()
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.by_fingerprint: Counter = Counter()
+        self.ms_by_fingerprint: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, sql, ms: float):
+        fp = fingerprint(sql)
+        with self._lock:
+            self.count += 1
+            self.total_ms += ms
+            self.by_fingerprint[fp] += 1
+            self.ms_by_fingerprint[fp] += ms
+
+    def repeated(self, threshold: int = REPEAT_THRESHOLD) -> dict[str, int]:
+        """{fingerprint: times run} for statements run at least `threshold` times."""
+        return {fp: n for fp, n in self.by_fingerprint.most_common() if n >= threshold}
+
+
+def current() -> QueryStats | None:
+    return _current.get()
+
+
+def start() -> tuple[QueryStats, object]:
+    """Activate a new QueryStats in this context; returns (stats, token for stop())."""
+    stats = QueryStats()
+    return stats, _current.set(stats)
+
+
+def stop(token):
+    _current.reset(token)
+
+
+def record(sql, ms: float):
+    stats = _current.get()
+    if stats is not None:
+        stats.record(sql, ms)
+
+
+class InstrumentedCursor(psycopg2.extensions.cursor):
+    """psycopg2 cursor that records its statements into the active QueryStats."""
+
+    def execute(self, query, vars=None):
+        if _current.get() is None:
+            return super().execute(query, vars)
+        start_time = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            record(_query_text(query, self), (time.perf_counter() - start_time) * 1000)
+
+    def executemany(self, query, vars_list):
+        if _current.get() is None:
+            return super().executemany(query, vars_list)
+        start_time = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            record(_query_text(query, self), (time.perf_counter() - start_time) * 1000)
+
+
+def _query_text(query, cur):
+    # psycopg2.sql.Composed needs a connection to render
+    return query.as_string(cur) if hasattr(query, "as_string") else query
+
+
+@contextmanager
+def count_queries():
+    """Collect the statements run inside the block; yields the QueryStats."""
+    stats, token = start()
+    try:
+        yield stats
+    finally:
+        stop(token)
+
+
+@contextmanager
+def query_budget(max_queries: int, max_repeats: int | None = None):
+    """Fail with AssertionError if the block runs more than max_queries
+    statements, or any one statement more than max_repeats times."""
+    with count_queries() as stats:
+        yield stats
+    assert stats.count <= max_queries, (
+        f"{stats.count} queries, budget {max_queries}: {dict(stats.by_fingerprint.most_common(5))}"
+    )
+    if max_repeats is not None:
+        over = stats.repeated(max_repeats + 1)
+        assert not over, f"statements run more than {max_repeats} times: {over}"
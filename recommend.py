@@ -14,6 +14,7 @@ import sys
 from datetime import date, datetime, timedelta
 
 from db import get_connection
+from progression_graph import get_graph
 from training_load import get_metrics, tsb_intensity_hint
 from recovery import get_hrv_status, get_muscle_freshness
 from alerts import get_alerts, interpret_metrics
@@ -272,7 +273,7 @@ def get_gym_analysis(cur, today, user_id=1):
                e.primary_muscles, e.cns_load, e.systemic_fatigue
         FROM ranked r
         JOIN strength_exercises se ON se.session_id = r.session_id
-        LEFT JOIN exercises e ON e.name = se.name
+        LEFT JOIN exercises e ON e.exercise_id = se.exercise_ref_id
         WHERE r.rn <= 2
         ORDER BY r.session_date DESC, se.exercise_order
     """, (user_id, today,))
@@ -320,24 +321,22 @@ def get_last_performance(cur, name, user_id=1):
     Each row: (set_number, reps, duration_seconds, total_weight_kg,
                 is_bodyweight, band_color, per_hand, per_side)
     """
+    # Latest logged row of the exercise, from strength_exercise_stats
+    # (strength_stats.py) on its (user_id, LOWER(name), session_date) index
     cur.execute("""
         SELECT st.set_number, st.reps, st.duration_seconds,
                st.weight_kg, st.total_weight_kg, st.is_bodyweight, st.band_color,
                st.per_hand, st.per_side
         FROM strength_sets st
-        JOIN strength_exercises se ON st.exercise_id = se.exercise_id
-        JOIN strength_sessions ss ON se.session_id = ss.session_id
-        WHERE se.name = %s
-          AND ss.user_id = %s
-          AND ss.session_date = (
-              SELECT MAX(ss2.session_date)
-              FROM strength_exercises se2
-              JOIN strength_sessions ss2 ON se2.session_id = ss2.session_id
-              WHERE se2.name = %s
-                AND ss2.user_id = %s
-          )
+        WHERE st.exercise_id = (
+            SELECT exercise_id
+            FROM strength_exercise_stats
+            WHERE user_id = %s AND LOWER(name) = LOWER(%s) AND name = %s
+            ORDER BY session_date DESC
+            LIMIT 1
+        )
         ORDER BY st.set_number
-    """, (name, user_id, name, user_id))
+    """, (user_id, name, name))
     rows = cur.fetchall()
     return rows if rows else None
 
@@ -345,17 +344,21 @@ def get_last_performance(cur, name, user_id=1):
 _MED_BALL = {"Med Ball Chest-to-Ground Throws", "Med Ball Twist Throws"}
 
 
-def _build_set_suggestion(name, pattern, quality_focus, bilateral, last_perf, is_light):
+def _build_set_suggestion(name, pattern, quality_focus, bilateral, last_perf, is_light,
+                          harder=None, easier=None):
     """
     Returns a suggestion dict: sets, reps (or duration), weight string, note.
+    harder / easier: name of the next variant in the exercise's goal branch
+    (progression_graph.py), offered where weight and reps alone stall.
 
     Progression rules:
       power + BW plyo      → never add weight, quality focus
       power + weighted     → same reps, increase weight when 5 reps feels easy
       power + band         → maintain band, lighter when ready
       med ball             → fixed implement, no progression
-      strength + BW        → reps → 15, then add weight
-      strength + weighted  → 6-10 scheme, +2.5kg when all sets ≥ 8 reps
+      strength + BW        → reps → 15, then add weight or the harder variant
+      strength + weighted  → 6-10 scheme, +2.5kg when all sets ≥ 8 reps,
+                             easier variant when sets fall below 6 reps
       stability            → maintain reps/duration
     """
     # Unpack last performance
@@ -433,9 +436,11 @@ def _build_set_suggestion(name, pattern, quality_focus, bilateral, last_perf, is
 
     if is_bw:
         if avg_reps and avg_reps >= bw_rep_limit:
+            note = f"hit {bw_rep_limit} reps — time to add weight, aim for 8 reps"
+            if harder:
+                note += f" (or progress to {harder})"
             return {"name": name, "sets": n_sets, "reps": 8,
-                    "weight_str": "+2.5kg",
-                    "note": f"hit {bw_rep_limit} reps — time to add weight, aim for 8 reps"}
+                    "weight_str": "+2.5kg", "note": note}
         suggest_reps = int(avg_reps) + 1 if avg_reps else bw_rep_limit - 3
         return {"name": name, "sets": n_sets, "reps": suggest_reps,
                 "weight_str": "BW",
@@ -455,6 +460,8 @@ def _build_set_suggestion(name, pattern, quality_focus, bilateral, last_perf, is
     elif min_reps is not None and min_reps < 6:
         suggest_w = max((base_w or 0) - 2.5, 0)
         note = f"consider dropping to {fmt_w(suggest_w)} (fell below 6 reps last time)"
+        if easier:
+            note += f" or switching to {easier}"
         r    = 8
     else:
         suggest_w = base_w
@@ -513,7 +520,7 @@ def get_weekly_muscle_frequency(cur, today, user_id=1):
         SELECT DISTINCT ss.session_date, e.primary_muscles
         FROM strength_sessions ss
         JOIN strength_exercises se ON se.session_id = ss.session_id
-        JOIN exercises e ON e.name = se.name
+        JOIN exercises e ON e.exercise_id = se.exercise_ref_id
         WHERE ss.user_id = %s
           AND ss.session_date >= %s AND ss.session_date < %s
           AND e.primary_muscles IS NOT NULL
@@ -562,9 +569,9 @@ def get_exercise_suggestions(cur, gym_rec, today, user_id=1):
     cur.execute(f"""
         SELECT e.name, e.movement_pattern, e.quality_focus, e.cns_load,
                e.bilateral, e.primary_muscles, MAX(ss.session_date) AS last_done,
-               e.contraction_type
+               e.contraction_type, e.exercise_id
         FROM exercises e
-        LEFT JOIN strength_exercises se ON se.name = e.name
+        LEFT JOIN strength_exercises se ON se.exercise_ref_id = e.exercise_id
         LEFT JOIN strength_sessions ss ON ss.session_id = se.session_id
         WHERE e.movement_pattern IN ({placeholders})
         GROUP BY e.exercise_id, e.name, e.movement_pattern,
@@ -646,7 +653,7 @@ def get_exercise_suggestions(cur, gym_rec, today, user_id=1):
     covered_patterns = set()
 
     def _add(row, check_overlap=False):
-        name, pattern, qf, cns, bilateral, muscles, last_done, ct = row
+        name, pattern, qf, cns, bilateral, muscles, last_done, ct, _ = row
         if name in used_names:
             return False
         muscles = muscles or []
@@ -680,10 +687,21 @@ def get_exercise_suggestions(cur, gym_rec, today, user_id=1):
     _ORDER = {"power": 0, "strength": 1, "hypertrophy": 1, "stability": 2,
               "endurance": 2, "isolation": 2}
 
+    # Next variants in each exercise's own goal branch
+    graph = get_graph(cur)
+
+    def variant(exercise_id, kind, qf):
+        steps = graph.next_steps(exercise_id, kind, qf)
+        return graph.names.get(steps[0]) if steps else None
+
     suggestions = []
-    for name, pattern, qf, cns, bilateral, muscles, last_done, ct in selected:
+    for name, pattern, qf, cns, bilateral, muscles, last_done, ct, exercise_id in selected:
         last_perf = get_last_performance(cur, name, user_id)
-        s = _build_set_suggestion(name, pattern, qf, bilateral, last_perf, is_light)
+        harder    = variant(exercise_id, "harder", qf)
+        easier    = variant(exercise_id, "easier", qf)
+        s = _build_set_suggestion(name, pattern, qf, bilateral, last_perf, is_light, harder, easier)
+        s["harder"]    = harder
+        s["easier"]    = easier
         s["pattern"]   = pattern
         s["quality"]   = qf
         s["last_done"] = last_done
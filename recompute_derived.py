@@ -0,0 +1,259 @@
+"""
+recompute_derived.py
+
+Rebuilds every value derived from the stored workout_metrics series after
+its formula changes. Each derivation is stamped with a version per row:
+
+  - workout_metrics.gradient_pct   workouts.gradient_version
+                                   (metrics_parser.GRADIENT_VERSION)
+  - workout_terrain_stats          stats_version
+                                   (analytics/terrain_response.py TERRAIN_STATS_VERSION)
+  - workout_analytics              analytics_version
+                                   (analytics/workout_analytics.py ANALYTICS_VERSION)
+  - workout_mean_max               curve_version
+                                   (analytics/best_efforts.py CURVE_VERSION)
+
+Bump the constant next to the formula you changed and run this script.
+A workout is selected when any of its versions is behind and is rebuilt
+in full, since terrain stats and analytics are computed from gradient_pct.
+Workouts compacted by metrics_retention.py are rebuilt from their stored
+(compacted) series, so their curves lose the durations finer than the
+compacted resolution.
+
+Workouts are split into chunks and processed by a pool of worker
+processes. Each worker streams its chunk's full series with one query
+(iter_workout_series), recomputes on the NumPy arrays, writes every table
+with one array-parameter statement each and commits once per chunk. A
+committed chunk is stamped with the current versions, so an interrupted
+run resumes where it stopped when started again (except with --all).
+
+--verify-terrain compares the summary-table terrain results for a window
+against a raw scan of every point in it.
+
+Usage:
+    python recompute_derived.py
+    python recompute_derived.py --since 2025-01-01 --user 1
+    python recompute_derived.py --all --workers 8 --chunk 100   # ignore versions
+    python recompute_derived.py --verify-terrain --days 365 --sport running
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date
+
+import numpy as np
+
+from analytics import kernel
+from analytics.best_efforts import CURVE_VERSION, mean_max_curves, upsert_mean_max_rows
+from analytics.series_store import store_enabled, write_series
+from analytics.terrain_response import (
+    TERRAIN_STATS_VERSION,
+    insert_terrain_stats,
+    load_terrain_stats,
+    scan_terrain,
+    workout_terrain_stats,
+)
+from analytics.workout_analytics import ANALYTICS_VERSION, compute_analytics, moving_series, upsert_analytics_rows
+from analytics.workout_series import iter_workout_series
+from db import get_connection
+from metrics_parser import GRADIENT_VERSION, compute_gradient
+
+FULL_COLUMNS = (*kernel.ALL_COLUMNS, "distance", "metric_id", "metric_epoch")
+
+
+def gradient_updates(series, dt=1):
+    """
+    Recompute gradient_pct for one full series (dt seconds per point) in
+    place. Returns (metric_ids, gradient_pct) for the points whose stored
+    value changed, with NaN as None so that psycopg2 writes NULL.
+    """
+    new = compute_gradient(series["altitude"], series["distance"], series["pace"], dt=dt)
+    old = series["gradient_pct"]
+    changed = ~((new == old) | (np.isnan(new) & np.isnan(old)))
+    series["gradient_pct"] = new
+    metric_ids = series["metric_id"][changed].astype(np.int64).tolist()
+    values = [None if np.isnan(v) else float(v) for v in new[changed]]
+    return metric_ids, values
+
+
+def recompute_chunk(resolutions, gradient_ids):
+    """
+    Worker: rebuild derived values for one chunk of workouts
+    ({workout_id: seconds per stored point}) in one transaction.
+    gradient_pct is recomputed only for `gradient_ids`, and their
+    series-store files are rewritten after the commit when the store is
+    enabled.
+    Returns (workouts, points) processed.
+    """
+    workout_ids = list(resolutions)
+    metric_ids, gradients, terrain_rows, analytics_rows, curve_rows = [], [], [], [], []
+    store_rows = []
+    points = 0
+
+    conn = get_connection()
+    try:
+        seen = set()
+        for wid, series in iter_workout_series(workout_ids, FULL_COLUMNS, conn, moving_only=False):
+            seen.add(wid)
+            points += len(series["pace"])
+            if wid in gradient_ids:
+                ids, values = gradient_updates(series, resolutions[wid])
+                metric_ids.extend(ids)
+                gradients.extend(values)
+                if store_enabled():
+                    store_rows.append((wid, series))
+            terrain_rows.extend(
+                (wid, *row)
+                for row in workout_terrain_stats(series["heart_rate"], series["pace"], series["gradient_pct"])
+            )
+            analytics_rows.append((wid, compute_analytics(wid, moving_series(series))))
+            curve_rows.append((wid, resolutions[wid], mean_max_curves(series, resolutions[wid])))
+
+        empty = np.array([], dtype=np.float64)
+        for wid in workout_ids:
+            if wid not in seen:
+                terrain_rows.extend((wid, *row) for row in workout_terrain_stats(empty, empty, empty))
+                analytics_rows.append((wid, compute_analytics(wid, None)))
+                curve_rows.append((wid, resolutions[wid], mean_max_curves(None)))
+
+        cur = conn.cursor()
+        if metric_ids:
+            cur.execute(
+                """
+                UPDATE workout_metrics m
+                SET gradient_pct = v.gradient_pct
+                FROM unnest(%s::int[], %s::float8[]) AS v(metric_id, gradient_pct)
+                WHERE m.metric_id = v.metric_id
+                """,
+                (metric_ids, gradients),
+            )
+        if gradient_ids:
+            cur.execute(
+                "UPDATE workouts SET gradient_version = %s WHERE workout_id = ANY(%s)",
+                (GRADIENT_VERSION, sorted(gradient_ids)),
+            )
+        cur.execute("DELETE FROM workout_terrain_stats WHERE workout_id = ANY(%s)", (list(workout_ids),))
+        insert_terrain_stats(cur, terrain_rows)
+        upsert_analytics_rows(cur, analytics_rows)
+        upsert_mean_max_rows(cur, curve_rows)
+        conn.commit()
+
+        # Files follow the committed rows, never a rolled-back chunk
+        for wid, series in store_rows:
+            write_series(wid, series)
+        return len(workout_ids), points
+    finally:
+        conn.close()
+
+
+def select_workouts(conn, since=None, user_id=None, recompute_all=False):
+    """
+    [(workout_id, gradient_stale, resolution_s)] for workouts with a stored series whose
+    derived values are behind the current versions (all of them with
+    recompute_all), optionally limited to a user and a start date.
+    """
+    cur = conn.cursor()
+    cur.execute("""
+        SELECT w.workout_id,
+               %(all)s OR w.gradient_version IS DISTINCT FROM %(gradient)s,
+               COALESCE(w.metrics_resolution_s, 1)
+        FROM workouts w
+        LEFT JOIN workout_analytics a ON a.workout_id = w.workout_id
+        LEFT JOIN workout_mean_max c ON c.workout_id = w.workout_id
+        WHERE w.metrics_row_count > 0
+          AND (%(since)s::date IS NULL OR w.workout_date >= %(since)s::date)
+          AND (%(user)s::int IS NULL OR w.user_id = %(user)s::int)
+          AND (
+              %(all)s
+              OR w.gradient_version IS DISTINCT FROM %(gradient)s
+              OR a.analytics_version IS DISTINCT FROM %(analytics)s
+              OR c.curve_version IS DISTINCT FROM %(curves)s
+              OR NOT EXISTS (
+                  SELECT 1 FROM workout_terrain_stats t
+                  WHERE t.workout_id = w.workout_id AND t.stats_version = %(terrain)s
+              )
+          )
+        ORDER BY w.workout_id
+    """, {
+        "all": recompute_all, "since": since, "user": user_id,
+        "gradient": GRADIENT_VERSION, "analytics": ANALYTICS_VERSION, "terrain": TERRAIN_STATS_VERSION,
+        "curves": CURVE_VERSION,
+    })
+    return cur.fetchall()
+
+
+def make_chunks(selected, size):
+    """Split select_workouts rows into ({workout_id: resolution_s}, {gradient workout_ids}) chunks."""
+    chunks = []
+    for i in range(0, len(selected), size):
+        part = selected[i:i + size]
+        chunks.append(({wid: res for wid, _, res in part}, {wid for wid, stale, _ in part if stale}))
+    return chunks
+
+
+def verify_terrain(conn, days, sport):
+    stored = load_terrain_stats(days, sport, conn)
+    raw = scan_terrain(days, sport, conn)
+    ok = True
+    for name in ("hr_gradient_curve", "grade_cost_model", "optimal_gradient"):
+        same = getattr(stored, name)() == getattr(raw, name)()
+        ok &= same
+        print(f"  {name:<18} {'match' if same else 'MISMATCH'}")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recompute stale derived workout values in parallel.")
+    parser.add_argument("--all", action="store_true", help="Recompute every workout, not only stale ones")
+    parser.add_argument("--since", type=date.fromisoformat, default=None,
+                        help="Only workouts on or after this date (YYYY-MM-DD)")
+    parser.add_argument("--user", type=int, default=None, help="Only this user's workouts")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument("--chunk", type=int, default=200, help="Workouts per chunk (default: 200)")
+    parser.add_argument("--verify-terrain", action="store_true",
+                        help="Compare terrain summary results against a raw scan instead of recomputing")
+    parser.add_argument("--days", type=int, default=365, help="Window for --verify-terrain (default: 365)")
+    parser.add_argument("--sport", default="running", help="Sport for --verify-terrain (default: running)")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    try:
+        if args.verify_terrain:
+            print(f"Verifying terrain stats: {args.sport}, last {args.days} days")
+            if not verify_terrain(conn, args.days, args.sport):
+                raise SystemExit(1)
+            return
+        selected = select_workouts(conn, args.since, args.user, args.all)
+    finally:
+        conn.close()
+
+    versions = (f"gradient v{GRADIENT_VERSION}, terrain v{TERRAIN_STATS_VERSION}, "
+                f"analytics v{ANALYTICS_VERSION}, curves v{CURVE_VERSION}")
+    if not selected:
+        print(f"Derived values are current ({versions}).")
+        return
+
+    chunks = make_chunks(selected, args.chunk)
+    print(f"Recomputing {len(selected)} workouts ({versions}) "
+          f"in {len(chunks)} chunks, {args.workers} workers...")
+
+    t0 = time.perf_counter()
+    done = points = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        for future in as_completed(pool.submit(recompute_chunk, *c) for c in chunks):
+            workouts, rows = future.result()
+            done += workouts
+            points += rows
+            elapsed = time.perf_counter() - t0
+            print(f"  {done}/{len(selected)} workouts, {points:,} rows  "
+                  f"({points / elapsed:,.0f} rows/s, {done / elapsed:.1f} workouts/s)")
+
+    elapsed = time.perf_counter() - t0
+    print(f"Done: {done} workouts, {points:,} rows in {elapsed:.1f}s ({points / elapsed:,.0f} rows/s)")
+
+
+if __name__ == "__main__":
+    main()
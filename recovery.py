@@ -240,7 +240,7 @@ def get_muscle_freshness(cur, today, lookback: int = 14, user_id: int = 1) -> di
                COUNT(st.set_id) AS num_sets
         FROM strength_sessions ss
         JOIN strength_exercises se ON se.session_id = ss.session_id
-        LEFT JOIN exercises e ON e.name = se.name
+        LEFT JOIN exercises e ON e.exercise_id = se.exercise_ref_id
         JOIN strength_sets st ON st.exercise_id = se.exercise_id
         WHERE ss.user_id = %s
           AND ss.session_date BETWEEN %s AND %s
@@ -1,10 +1,13 @@
 -- QuantifiedStrides PostgreSQL Schema
 -- Run this once against a fresh database: psql -d quantifiedstrides -f schema.sql
 
+CREATE EXTENSION IF NOT EXISTS pg_trgm;   -- exercise name search
+
 CREATE TABLE users (
-    user_id       SERIAL PRIMARY KEY,
-    name          VARCHAR(100),
-    date_of_birth DATE
+    user_id        SERIAL PRIMARY KEY,
+    name           VARCHAR(100),
+    date_of_birth  DATE,
+    last_active_at TIMESTAMP      -- last app open; sync scheduler priority
 );
 
 -- Default single athlete
@@ -51,8 +54,17 @@ CREATE TABLE workouts (
     start_latitude            FLOAT,
     start_longitude           FLOAT,
     workout_date              DATE,
+    metrics_ingested_at       TIMESTAMP,   -- set when workout_metrics holds a complete series
+    metrics_row_count         INT,
+    gradient_version          SMALLINT,    -- metrics_parser.GRADIENT_VERSION of the stored gradient_pct
+    metrics_resolution_s      SMALLINT,    -- seconds per workout_metrics row once compacted; NULL = full (1 Hz)
     UNIQUE (user_id, start_time)
 );
+CREATE INDEX workouts_user_date_idx ON workouts (user_id, workout_date)
+    INCLUDE (sport, training_volume, start_time, end_time);
+CREATE INDEX workouts_user_date_start_idx ON workouts (user_id, workout_date, start_time, workout_id);
+CREATE INDEX workouts_user_sport_date_start_idx ON workouts (user_id, sport, workout_date, start_time, workout_id);
+CREATE INDEX workouts_start_time_idx ON workouts (start_time);
 
 CREATE TABLE sleep_sessions (
     sleep_id              SERIAL PRIMARY KEY,
@@ -110,15 +122,86 @@ CREATE TABLE daily_subjective (
 CREATE TABLE workout_metrics (
     metric_id             SERIAL PRIMARY KEY,
     workout_id            INT NOT NULL REFERENCES workouts(workout_id),
-    metric_timestamp      TIMESTAMP,
+    metric_timestamp      TIMESTAMP NOT NULL,
     heart_rate            INT,
     pace                  FLOAT,
     cadence               FLOAT,
     vertical_oscillation  FLOAT,
     vertical_ratio        FLOAT,
     ground_contact_time   FLOAT,
-    power                 FLOAT
+    power                 FLOAT,
+    latitude              FLOAT,
+    longitude             FLOAT,
+    altitude              FLOAT,
+    distance              FLOAT,
+    gradient_pct          FLOAT,
+    altitude_min          FLOAT,       -- compacted rows only (metrics_retention.py)
+    altitude_max          FLOAT,
+    UNIQUE (workout_id, metric_timestamp)
+);
+-- Time-range scans across workouts; rows arrive in time order
+CREATE INDEX workout_metrics_timestamp_brin ON workout_metrics USING BRIN (metric_timestamp);
+
+-- Per-workout terrain sufficient statistics (analytics/terrain_response.py),
+-- written at metrics ingest. grouping 'band' = GRADIENT_BANDS index,
+-- 'grade2' = 2% gradient bucket; x = gradient_pct, y = heart_rate.
+CREATE TABLE workout_terrain_stats (
+    workout_id        INT NOT NULL REFERENCES workouts(workout_id) ON DELETE CASCADE,
+    grouping          VARCHAR(10) NOT NULL,
+    group_key         SMALLINT NOT NULL,
+    stats_version     SMALLINT NOT NULL,
+    point_count       INT NOT NULL,
+    sum_hr            FLOAT NOT NULL,
+    sum_pace          FLOAT NOT NULL,
+    sum_gap           FLOAT NOT NULL,
+    sum_speed_per_hr  FLOAT NOT NULL,
+    sum_grad          FLOAT NOT NULL,
+    sum_grad_hr       FLOAT NOT NULL,
+    sum_grad_sq       FLOAT NOT NULL,
+    sum_hr_sq         FLOAT NOT NULL,
+    PRIMARY KEY (workout_id, grouping, group_key)
+);
+
+-- Per-workout running analytics (analytics/workout_analytics.py), written at
+-- metrics ingest; rows with an older analytics_version are refreshed by
+-- recompute_derived.py.
+CREATE TABLE workout_analytics (
+    workout_id         INT PRIMARY KEY REFERENCES workouts(workout_id) ON DELETE CASCADE,
+    analytics_version  SMALLINT NOT NULL,
+    computed_at        TIMESTAMP NOT NULL,
+    avg_pace           FLOAT,
+    avg_gap            FLOAT,
+    gap_vs_pace_pct    FLOAT,
+    decoupling_pct     FLOAT,
+    decoupling_status  VARCHAR(20),
+    rei                FLOAT,
+    rei_mode           VARCHAR(10),
+    avg_cadence        FLOAT,
+    avg_gct            FLOAT,
+    avg_vo             FLOAT,
+    avg_vr             FLOAT,
+    avg_hr             FLOAT,
+    fatigue_score      FLOAT,
+    cadence_drift_pct  FLOAT,
+    gct_drift_pct      FLOAT,
+    hr_drift_pct       FLOAT,
+    elevation_gain_m   FLOAT
+);
+CREATE INDEX workout_analytics_version_idx ON workout_analytics (analytics_version);
+
+-- Per-workout mean-maximal curves (analytics/best_efforts.py), one value per
+-- best_efforts.DURATIONS entry, written at metrics ingest; rows with an older
+-- curve_version are refreshed by recompute_derived.py.
+CREATE TABLE workout_mean_max (
+    workout_id     INT PRIMARY KEY REFERENCES workouts(workout_id) ON DELETE CASCADE,
+    curve_version  SMALLINT NOT NULL,
+    computed_at    TIMESTAMP NOT NULL,
+    resolution_s   SMALLINT NOT NULL,   -- seconds per point of the series it was computed from
+    power          FLOAT[],             -- W
+    speed          FLOAT[],             -- m/s
+    heart_rate     FLOAT[]              -- bpm
 );
+CREATE INDEX workout_mean_max_version_idx ON workout_mean_max (curve_version);
 
 CREATE TABLE nutrition_log (
     nutrition_id    SERIAL PRIMARY KEY,
@@ -218,6 +301,9 @@ CREATE TABLE exercises (
     notes             TEXT
 );
 
+-- Fuzzy / substring name search (StrengthService.list_exercises)
+CREATE INDEX exercises_name_trgm_idx ON exercises USING GIN (name gin_trgm_ops);
+
 -- Progression chains (branching tree — one exercise can progress multiple ways)
 CREATE TABLE exercise_progressions (
     progression_id    SERIAL PRIMARY KEY,
@@ -243,12 +329,15 @@ CREATE TABLE strength_sessions (
 );
 
 CREATE TABLE strength_exercises (
-    exercise_id    SERIAL PRIMARY KEY,
-    session_id     INT NOT NULL REFERENCES strength_sessions(session_id),
-    exercise_order INT NOT NULL,
-    name           VARCHAR(200) NOT NULL,
-    notes          TEXT
+    exercise_id     SERIAL PRIMARY KEY,
+    session_id      INT NOT NULL REFERENCES strength_sessions(session_id),
+    exercise_order  INT NOT NULL,
+    name            VARCHAR(200) NOT NULL,
+    notes           TEXT,
+    -- exercises row the name resolves to (exercise_index.py); NULL if unmatched
+    exercise_ref_id INT REFERENCES exercises(exercise_id) ON DELETE SET NULL
 );
+CREATE INDEX strength_exercises_ref_idx ON strength_exercises (exercise_ref_id);
 
 CREATE TABLE strength_sets (
     set_id               SERIAL PRIMARY KEY,
@@ -267,3 +356,45 @@ CREATE TABLE strength_sets (
     weight_includes_bar  BOOLEAN DEFAULT FALSE,
     total_weight_kg      FLOAT
 );
+
+-- Derived from the strength tables on every session write (strength_stats.py)
+CREATE TABLE strength_exercise_stats (
+    exercise_id      INT PRIMARY KEY REFERENCES strength_exercises(exercise_id) ON DELETE CASCADE,
+    session_id       INT NOT NULL REFERENCES strength_sessions(session_id) ON DELETE CASCADE,
+    user_id          INT NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    session_date     DATE NOT NULL,
+    name             VARCHAR(200) NOT NULL,
+    sets             INT NOT NULL,
+    tonnage_kg       FLOAT NOT NULL,      -- sum of total_weight_kg × reps
+    best_e1rm_kg     FLOAT,               -- Epley, any rep count
+    best_e1rm_10_kg  FLOAT                -- Epley, sets of 1-10 reps
+);
+CREATE INDEX strength_exercise_stats_session_idx ON strength_exercise_stats (session_id);
+CREATE INDEX strength_exercise_stats_user_name_date_idx ON strength_exercise_stats (user_id, LOWER(name), session_date);
+CREATE INDEX strength_exercise_stats_user_date_idx ON strength_exercise_stats (user_id, session_date);
+
+-- Sets and tonnage per muscle per week (Monday), via exercises.primary_muscles / secondary_muscles
+CREATE TABLE strength_weekly_muscle (
+    user_id               INT NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    week_start            DATE NOT NULL,
+    muscle                TEXT NOT NULL,
+    sets                  INT NOT NULL,
+    tonnage_kg            FLOAT NOT NULL,
+    secondary_sets        INT NOT NULL,
+    secondary_tonnage_kg  FLOAT NOT NULL,
+    PRIMARY KEY (user_id, week_start, muscle)
+);
+
+CREATE TABLE sync_runs (
+    run_id            SERIAL PRIMARY KEY,
+    user_id           INT NOT NULL REFERENCES users(user_id) ON DELETE CASCADE,
+    trigger           VARCHAR(20) NOT NULL,     -- 'manual' | 'scheduler'
+    started_at        TIMESTAMP NOT NULL,
+    finished_at       TIMESTAMP,                -- NULL while in flight
+    duration_s        FLOAT,
+    ok                BOOLEAN,
+    records_ingested  INT,
+    errors            TEXT
+);
+
+CREATE INDEX sync_runs_user_started_idx ON sync_runs (user_id, started_at DESC);
@@ -2,7 +2,7 @@ from datetime import datetime
 
 import garminconnect
 
-from config import GARMIN_EMAIL, GARMIN_PASSWORD
+from config import GARMIN_EMAIL, GARMIN_PASSWORD, USER_ID
 from db import get_connection
 
 # 1) Connect to Garmin
@@ -19,8 +19,8 @@ print(today_date_str)
 
 # Guard: skip if sleep data for today is already recorded
 cursor.execute(
-    "SELECT sleep_id FROM sleep_sessions WHERE user_id = 1 AND sleep_date = %s",
-    (today_date,)
+    "SELECT sleep_id FROM sleep_sessions WHERE user_id = %s AND sleep_date = %s",
+    (USER_ID, today_date)
 )
 if cursor.fetchone():
     print(f"Sleep data for {today_date_str} already recorded. Skipping.")
@@ -71,7 +71,7 @@ hrv_status     = sleep_data.get("hrvStatus", "")
 battery_change = sleep_data.get("bodyBatteryChange")
 
 cursor.execute(sql_insert, (
-    1,  # user_id
+    USER_ID,
     today_date,
     duration_minutes,
     float(sleep_score) if sleep_score else None,
@@ -11,6 +11,7 @@ import sys
 from datetime import date, datetime
 
 from db import get_connection
+from strength_store import write_exercises
 
 BAR_WEIGHT_KG = 20.0
 
@@ -22,18 +23,6 @@ ON CONFLICT (user_id, session_date) DO UPDATE SET
     raw_notes    = EXCLUDED.raw_notes
 RETURNING session_id;
 """
-DELETE_EXERCISES = "DELETE FROM strength_exercises WHERE session_id = %s;"
-INSERT_EXERCISE  = """
-INSERT INTO strength_exercises (session_id, exercise_order, name, notes)
-VALUES (%s, %s, %s, %s) RETURNING exercise_id;
-"""
-INSERT_SET = """
-INSERT INTO strength_sets (
-    exercise_id, set_number, reps,
-    duration_seconds, weight_kg, is_bodyweight, band_color,
-    per_hand, per_side, plus_bar, weight_includes_bar, total_weight_kg
-) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
-"""
 
 BAND_COLORS = ["yellow", "blue", "green", "red", "black"]
 BACK = "__BACK__"
@@ -326,23 +315,7 @@ def save(session_date, session_type, exercises):
 
     cur.execute(INSERT_SESSION, (1, session_date, session_type, None))
     session_id = cur.fetchone()[0]
-    cur.execute(DELETE_EXERCISES, (session_id,))
-
-    for ex in exercises:
-        cur.execute(INSERT_EXERCISE, (
-            session_id, ex["exercise_order"], ex["name"], ex["notes"],
-        ))
-        exercise_id = cur.fetchone()[0]
-        for s in ex["sets"]:
-            cur.execute(INSERT_SET, (
-                exercise_id, s["set_number"], s["reps"],
-                s["duration_seconds"], s["weight_kg"],
-                s["is_bodyweight"], s["band_color"],
-                s["per_hand"], s["per_side"],
-                s["plus_bar"], s["weight_includes_bar"],
-                s["total_weight_kg"],
-            ))
-
+    write_exercises(cur, session_id, exercises)
     conn.commit()
     cur.close()
     conn.close()
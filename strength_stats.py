@@ -0,0 +1,130 @@
+"""
+Derived strength tables, refreshed on every strength session write.
+
+  strength_exercise_stats  one row per logged exercise: set count, tonnage
+                           (Σ total_weight_kg × reps) and best Epley e1RM,
+                           over all sets and over sets of 1–10 reps
+  strength_weekly_muscle   one row per user × week (Monday) × muscle: sets
+                           and tonnage where the muscle is primary and where
+                           it is secondary, attributed through the exercises
+                           taxonomy (exercises.primary_muscles /
+                           secondary_muscles, via exercise_ref_id)
+
+The 1RM charts and weekly volume read these instead of aggregating every
+set of the history per view. Writers call refresh_session() (psycopg2) or
+run SESSION_REFRESH through their own session after replacing a session's
+exercises and sets, in the same transaction. The statements only take
+%(session_id)s, so the async API formats them into SQLAlchemy :session_id
+parameters; see sqlalchemy_statements().
+
+Usage (rebuild every session, e.g. after editing the exercise taxonomy):
+    python strength_stats.py
+"""
+
+from db import get_connection
+
+# Epley: 1RM = w × (1 + reps / 30); above ~10 reps it overestimates
+EPLEY_MAX_REPS = 10
+
+_DELETE_EXERCISE_STATS = """
+DELETE FROM strength_exercise_stats WHERE session_id = %(session_id)s
+"""
+
+_INSERT_EXERCISE_STATS = f"""
+INSERT INTO strength_exercise_stats (
+    exercise_id, session_id, user_id, session_date, name,
+    sets, tonnage_kg, best_e1rm_kg, best_e1rm_{EPLEY_MAX_REPS}_kg
+)
+SELECT
+    se.exercise_id, ss.session_id, ss.user_id, ss.session_date, se.name,
+    COUNT(st.set_id),
+    COALESCE(SUM(st.total_weight_kg * st.reps) FILTER (WHERE st.total_weight_kg > 0 AND st.reps > 0), 0),
+    MAX(st.total_weight_kg * (1.0 + st.reps / 30.0))
+        FILTER (WHERE st.total_weight_kg > 0 AND st.reps > 0),
+    MAX(st.total_weight_kg * (1.0 + st.reps / 30.0))
+        FILTER (WHERE st.total_weight_kg > 0 AND st.reps BETWEEN 1 AND {EPLEY_MAX_REPS})
+FROM strength_sessions ss
+JOIN strength_exercises se ON se.session_id = ss.session_id
+LEFT JOIN strength_sets st ON st.exercise_id = se.exercise_id
+WHERE ss.session_id = %(session_id)s
+GROUP BY se.exercise_id, ss.session_id, ss.user_id, ss.session_date, se.name
+"""
+
+# The whole week of the session is rebuilt from strength_exercise_stats,
+# so other sessions that week keep counting
+_DELETE_WEEKLY_MUSCLE = """
+DELETE FROM strength_weekly_muscle wm
+USING strength_sessions ss
+WHERE ss.session_id = %(session_id)s
+  AND wm.user_id = ss.user_id
+  AND wm.week_start = date_trunc('week', ss.session_date)::date
+"""
+
+_INSERT_WEEKLY_MUSCLE = """
+INSERT INTO strength_weekly_muscle (
+    user_id, week_start, muscle,
+    sets, tonnage_kg, secondary_sets, secondary_tonnage_kg
+)
+SELECT
+    es.user_id, w.week_start, m.muscle,
+    COALESCE(SUM(es.sets)       FILTER (WHERE m.is_primary), 0),
+    COALESCE(SUM(es.tonnage_kg) FILTER (WHERE m.is_primary), 0),
+    COALESCE(SUM(es.sets)       FILTER (WHERE NOT m.is_primary), 0),
+    COALESCE(SUM(es.tonnage_kg) FILTER (WHERE NOT m.is_primary), 0)
+FROM strength_sessions ss
+CROSS JOIN LATERAL (SELECT date_trunc('week', ss.session_date)::date AS week_start) w
+JOIN strength_exercise_stats es
+  ON es.user_id = ss.user_id
+ AND es.session_date >= w.week_start
+ AND es.session_date <  w.week_start + 7
+JOIN strength_exercises se ON se.exercise_id = es.exercise_id
+JOIN exercises e ON e.exercise_id = se.exercise_ref_id
+CROSS JOIN LATERAL (
+    SELECT unnest(e.primary_muscles), TRUE
+    UNION ALL
+    SELECT unnest(e.secondary_muscles), FALSE
+) m(muscle, is_primary)
+WHERE ss.session_id = %(session_id)s
+GROUP BY es.user_id, w.week_start, m.muscle
+"""
+
+# In order: exercise rows first, the week is rebuilt from them
+SESSION_REFRESH = (
+    _DELETE_EXERCISE_STATS,
+    _INSERT_EXERCISE_STATS,
+    _DELETE_WEEKLY_MUSCLE,
+    _INSERT_WEEKLY_MUSCLE,
+)
+
+
+def sqlalchemy_statements() -> list[str]:
+    """SESSION_REFRESH with :session_id placeholders, for sqlalchemy.text()."""
+    return [sql % {"session_id": ":session_id"} for sql in SESSION_REFRESH]
+
+
+def refresh_session(cur, session_id):
+    """Rebuild the derived rows of one session and its week. Does not commit."""
+    for sql in SESSION_REFRESH:
+        cur.execute(sql, {"session_id": session_id})
+
+
+def refresh_all(conn=None):
+    """Rebuild the derived rows of every strength session."""
+    close = conn is None
+    if conn is None:
+        conn = get_connection()
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT session_id FROM strength_sessions ORDER BY session_date")
+        session_ids = [r[0] for r in cur.fetchall()]
+        for session_id in session_ids:
+            refresh_session(cur, session_id)
+        conn.commit()
+        return len(session_ids)
+    finally:
+        if close:
+            conn.close()
+
+
+if __name__ == "__main__":
+    print(f"Refreshed {refresh_all()} strength sessions.")
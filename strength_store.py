@@ -0,0 +1,100 @@
+"""
+Set-based write of a strength session's exercises and sets.
+
+A session is saved by replacing its exercises: one DELETE, then a single
+INSERT statement for all exercises and all of their sets, so the number
+of round trips does not grow with the session. The exercises get their
+ids from the sequence up front (nextval in the first CTE), which pairs
+every set with its exercise by position without relying on the order of
+RETURNING rows. The derived strength tables (strength_stats.py) are
+refreshed in the same transaction.
+
+Used by strength_log.save, the Strength Log page (psycopg2) and
+StrengthService.create_session (async, via sqlalchemy_sql()).
+"""
+
+import re
+
+from exercise_index import get_index
+from strength_stats import refresh_session
+
+DELETE_EXERCISES = "DELETE FROM strength_exercises WHERE session_id = %(session_id)s"
+
+# CAST() rather than ::type, which SQLAlchemy text() would take for a bind
+INSERT_EXERCISES_AND_SETS = """
+WITH ex AS (
+    SELECT nextval(pg_get_serial_sequence('strength_exercises', 'exercise_id'))::int AS exercise_id,
+           u.exercise_order, u.name, u.notes, u.ref, u.pos
+    FROM unnest(
+        CAST(%(exercise_order)s AS int[]), CAST(%(name)s AS text[]),
+        CAST(%(notes)s AS text[]), CAST(%(exercise_ref_id)s AS int[])
+    ) WITH ORDINALITY AS u(exercise_order, name, notes, ref, pos)
+),
+inserted AS (
+    INSERT INTO strength_exercises (exercise_id, session_id, exercise_order, name, notes, exercise_ref_id)
+    SELECT exercise_id, %(session_id)s, exercise_order, name, notes, ref FROM ex
+)
+INSERT INTO strength_sets (
+    exercise_id, set_number, reps, duration_seconds,
+    weight_kg, is_bodyweight, band_color,
+    per_hand, per_side, plus_bar,
+    weight_includes_bar, total_weight_kg
+)
+SELECT ex.exercise_id, s.set_number, s.reps, s.duration_seconds,
+       s.weight_kg, s.is_bodyweight, s.band_color,
+       s.per_hand, s.per_side, s.plus_bar,
+       s.weight_includes_bar, s.total_weight_kg
+FROM unnest(
+    CAST(%(set_pos)s AS int[]), CAST(%(set_number)s AS int[]),
+    CAST(%(reps)s AS int[]), CAST(%(duration_seconds)s AS int[]),
+    CAST(%(weight_kg)s AS float8[]), CAST(%(is_bodyweight)s AS boolean[]),
+    CAST(%(band_color)s AS text[]), CAST(%(per_hand)s AS boolean[]),
+    CAST(%(per_side)s AS boolean[]), CAST(%(plus_bar)s AS boolean[]),
+    CAST(%(weight_includes_bar)s AS boolean[]), CAST(%(total_weight_kg)s AS float8[])
+) AS s(pos, set_number, reps, duration_seconds,
+       weight_kg, is_bodyweight, band_color,
+       per_hand, per_side, plus_bar,
+       weight_includes_bar, total_weight_kg)
+JOIN ex ON ex.pos = s.pos
+"""
+
+_SET_FIELDS = (
+    "set_number", "reps", "duration_seconds", "weight_kg", "is_bodyweight", "band_color",
+    "per_hand", "per_side", "plus_bar", "weight_includes_bar", "total_weight_kg",
+)
+
+
+def insert_params(session_id, exercises, index):
+    """Column arrays for INSERT_EXERCISES_AND_SETS.
+
+    exercises: [{exercise_order, name, notes, sets: [{set_number, reps, ...}]}];
+    missing set fields are NULL. index resolves names (exercise_index.py).
+    """
+    params = {
+        "session_id": session_id,
+        "exercise_order": [ex["exercise_order"] for ex in exercises],
+        "name": [ex["name"] for ex in exercises],
+        "notes": [ex.get("notes") for ex in exercises],
+        "exercise_ref_id": [index.resolve(ex["name"]) for ex in exercises],
+        "set_pos": [],
+        **{field: [] for field in _SET_FIELDS},
+    }
+    for pos, ex in enumerate(exercises, 1):
+        for s in ex["sets"]:
+            params["set_pos"].append(pos)
+            for field in _SET_FIELDS:
+                params[field].append(s.get(field))
+    return params
+
+
+def write_exercises(cur, session_id, exercises):
+    """Replace the session's exercises and sets and refresh its derived rows. Does not commit."""
+    cur.execute(DELETE_EXERCISES, {"session_id": session_id})
+    if exercises:
+        cur.execute(INSERT_EXERCISES_AND_SETS, insert_params(session_id, exercises, get_index(cur)))
+    refresh_session(cur, session_id)
+
+
+def sqlalchemy_sql(sql: str) -> str:
+    """A %(name)s statement with :name placeholders, for sqlalchemy.text()."""
+    return re.sub(r"%\((\w+)\)s", r":\1", sql)
@@ -0,0 +1,110 @@
+"""
+sync_scheduler.py
+
+Runs incremental Garmin syncs for every athlete with credentials on their
+profile — the scheduled counterpart of POST /api/v1/sync.
+
+Each cycle:
+  - picks users whose last sync (manual or scheduled) started at least
+    --min-interval minutes ago (per-user rate limit)
+  - orders them: users who opened the app within --active-window hours
+    first, then by stalest sync
+  - runs at most --concurrency syncs at once; each run waits a random
+    0..--jitter seconds after getting its slot so starts don't align
+  - records every run in sync_runs (duration, records ingested, errors)
+
+Each run's scripts get the athlete's USER_ID (config.py), so concurrent
+runs write and count only their own rows.
+
+Defaults come from the sync_* settings in api/settings.py.
+
+Usage:
+    python sync_scheduler.py                 # loop forever, cycle every 5 min
+    python sync_scheduler.py --once
+    python sync_scheduler.py --concurrency 8 --min-interval 30
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime
+
+from api.deps import AsyncSessionLocal
+from api.services.sync import SyncService, plan_sync_order
+from api.settings import settings
+
+_svc = SyncService()
+
+
+async def _sync_one(user_id: int, sem: asyncio.Semaphore, jitter_s: float) -> None:
+    async with sem:
+        await asyncio.sleep(random.uniform(0, jitter_s))
+        t0 = time.perf_counter()
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await _svc.sync_user(db, user_id, trigger="scheduler")
+        except Exception as e:
+            print(f"user {user_id}: ERROR {type(e).__name__}: {e}")
+            return
+        status = "ok" if result.ok else "FAILED"
+        print(f"user {user_id}: {status} in {time.perf_counter() - t0:.1f}s, "
+              f"{result.records_ingested} records (run {result.run_id})")
+
+
+async def run_cycle(args) -> int:
+    """Sync every due user once. Returns the number of users synced."""
+    async with AsyncSessionLocal() as db:
+        candidates = await _svc.list_sync_candidates(db)
+
+    due = plan_sync_order(
+        candidates,
+        now=datetime.now(),
+        min_interval_s=args.min_interval * 60,
+        active_window_s=args.active_window * 3600,
+    )
+    if args.limit:
+        due = due[:args.limit]
+
+    print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {len(candidates)} users with credentials, "
+          f"{len(due)} due, concurrency {args.concurrency}")
+
+    # Semaphore waiters are served FIFO, so creating tasks in priority
+    # order keeps the priority order under the concurrency limit.
+    sem = asyncio.Semaphore(args.concurrency)
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_sync_one(uid, sem, args.jitter) for uid in due))
+    if due:
+        print(f"Cycle finished: {len(due)} users in {time.perf_counter() - t0:.1f}s")
+    return len(due)
+
+
+async def main_async(args) -> None:
+    while True:
+        await run_cycle(args)
+        if args.once:
+            return
+        await asyncio.sleep(args.interval * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scheduled multi-user Garmin sync.")
+    parser.add_argument("--once", action="store_true", help="Run a single cycle and exit")
+    parser.add_argument("--interval", type=float, default=5,
+                        help="Minutes between cycles (default: 5)")
+    parser.add_argument("--concurrency", type=int, default=settings.sync_max_concurrency)
+    parser.add_argument("--min-interval", type=float, default=settings.sync_min_interval_minutes,
+                        help="Minimum minutes between two syncs of the same user")
+    parser.add_argument("--jitter", type=float, default=settings.sync_jitter_seconds,
+                        help="Max random delay (seconds) before each run starts")
+    parser.add_argument("--active-window", type=float, default=settings.sync_active_window_hours,
+                        help="Hours since last app open that count as recently active")
+    parser.add_argument("--limit", type=int, default=None,
+                        help="Max users per cycle (default: all due users)")
+    args = parser.parse_args()
+
+    asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
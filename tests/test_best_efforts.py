@@ -0,0 +1,148 @@
+"""Tests for mean-maximal curves and the best-effort envelope (analytics/best_efforts.py)."""
+
+from datetime import date
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def be():
+    from analytics import best_efforts
+    return best_efforts
+
+
+def series(power, hr=None, pace=None, step=1.0):
+    n = len(power)
+    return {
+        "metric_epoch": 1_700_000_000.0 + step * np.arange(n),
+        "power": np.asarray(power, dtype=float),
+        "heart_rate": np.full(n, 150.0) if hr is None else np.asarray(hr, dtype=float),
+        "pace": np.full(n, 5.0) if pace is None else np.asarray(pace, dtype=float),
+    }
+
+
+def brute_force(values, window):
+    return max(np.mean(values[i:i + window]) for i in range(len(values) - window + 1))
+
+
+def curve_at(be, curves, metric, duration):
+    return curves[metric][be.DURATIONS.index(duration)]
+
+
+class TestMeanMaxCurves:
+    def test_matches_brute_force(self, be):
+        rng = np.random.default_rng(3)
+        power = rng.uniform(100, 400, 900)
+        curves = be.mean_max_curves(series(power))
+        for d in (5, 30, 300, 600):
+            assert curve_at(be, curves, "power", d) == pytest.approx(brute_force(power, d), abs=0.05)
+
+    def test_durations_longer_than_workout_are_none(self, be):
+        curves = be.mean_max_curves(series(np.full(100, 200.0)))
+        assert curve_at(be, curves, "power", 60) == 200.0
+        assert curve_at(be, curves, "power", 120) is None
+
+    def test_short_gaps_hold_long_gaps_are_pauses(self, be):
+        s = series(np.full(60, 300.0))
+        s["metric_epoch"] = np.r_[np.arange(30.0), np.arange(30.0) + 30 + be.MAX_GAP_S + 5]
+        curves = be.mean_max_curves(s)
+        assert curve_at(be, curves, "power", 30) == 300.0
+        # 60 s windows span the pause, which counts as zero power
+        assert curve_at(be, curves, "power", 60) < 300.0
+
+        s["metric_epoch"] = np.r_[np.arange(30.0), np.arange(30.0) + 30 + be.MAX_GAP_S - 2]
+        assert curve_at(be, be.mean_max_curves(s), "power", 60) == 300.0
+
+    def test_speed_from_pace_with_stops_as_zero(self, be):
+        pace = np.r_[np.full(30, 4.0), np.full(30, np.inf), np.full(30, 5.0)]
+        curves = be.mean_max_curves(series(np.full(90, np.nan), pace=pace))
+        assert curve_at(be, curves, "speed", 30) == round(1000 / 240, 3)
+        assert curve_at(be, curves, "speed", 60) == pytest.approx(1000 / 240 / 2, abs=0.001)
+        assert curves["power"] == [None] * len(be.DURATIONS)
+
+    def test_heart_rate_needs_full_coverage(self, be):
+        hr = np.r_[np.full(20, 170.0), np.full(20, np.nan), np.full(20, 150.0)]
+        curves = be.mean_max_curves(series(np.zeros(60), hr=hr))
+        assert curve_at(be, curves, "heart_rate", 15) == 170.0
+        assert curve_at(be, curves, "heart_rate", 30) is None
+
+    def test_compacted_series_skips_finer_durations(self, be):
+        curves = be.mean_max_curves(series(np.full(60, 250.0), step=10.0), resolution_s=10)
+        assert curve_at(be, curves, "power", 5) is None
+        assert curve_at(be, curves, "power", 15) is None
+        assert curve_at(be, curves, "power", 10) == 250.0
+        assert curve_at(be, curves, "power", 600) == 250.0
+
+    def test_batch_timestamps(self, be):
+        import metrics_parser
+        n = 40
+        batch = metrics_parser.build_batch(
+            1_700_000_000_000 + 1000 * np.arange(n), {"heart_rate": np.full(n, 150.0), "speed": np.full(n, 3.0)},
+        )
+        assert curve_at(be, be.mean_max_curves(batch), "speed", 30) == 3.0
+
+    def test_no_series_is_all_none(self, be):
+        assert be.mean_max_curves(None) == {m: [None] * len(be.DURATIONS) for m in be.CURVE_METRICS}
+
+
+class TestUpsert:
+    def test_curves_as_array_literals(self, be):
+        cursor = MagicMock()
+        curves = be.mean_max_curves(None)
+        curves["power"] = [310.5] + [None] * (len(be.DURATIONS) - 1)
+        be.upsert_mean_max_rows(cursor, [(4, 1, curves)])
+        sql, params = cursor.execute.call_args.args
+        assert sql.split()[2] == "workout_mean_max"
+        assert params[:3] == (be.CURVE_VERSION, [4], [1])
+        assert params[3] == ["{310.5" + ",NULL" * (len(be.DURATIONS) - 1) + "}"]
+        assert params[4:] == ([None], [None])
+
+    def test_nothing_to_write(self, be):
+        cursor = MagicMock()
+        be.upsert_mean_max_rows(cursor, [])
+        cursor.execute.assert_not_called()
+
+
+class TestEnvelope:
+    def test_elementwise_max_with_source(self, be):
+        n = len(be.DURATIONS)
+        a = {"power": [400.0, 300.0] + [None] * (n - 2), "speed": [None] * n, "heart_rate": [None] * n}
+        b = {"power": [350.0, 320.0, 250.0] + [None] * (n - 3), "speed": [None] * n, "heart_rate": [None] * n}
+        best = be.envelope([(1, date(2025, 5, 1), a), (2, date(2025, 6, 1), b)])
+        assert [e and (e["value"], e["workout_id"]) for e in best["power"][:4]] == [
+            (400.0, 1), (320.0, 2), (250.0, 2), None,
+        ]
+        assert best["speed"] == [None] * n
+
+    def test_empty_window(self, be):
+        assert be.envelope([])["heart_rate"] == [None] * len(be.DURATIONS)
+
+
+class TestCriticalModels:
+    def curve(self, be, critical, reserve):
+        return [critical + reserve / d if d in be.CRITICAL_DURATIONS else None for d in be.DURATIONS]
+
+    def test_recovers_critical_power(self, be):
+        cp = be.critical_power(self.curve(be, 250.0, 20_000.0))
+        assert cp["cp_w"] == pytest.approx(250.0, abs=0.1)
+        assert cp["w_prime_j"] == pytest.approx(20_000, abs=1)
+        assert cp["r_squared"] == pytest.approx(1.0)
+        assert cp["n_points"] == len(be.CRITICAL_DURATIONS)
+
+    def test_recovers_critical_speed(self, be):
+        cs = be.critical_speed(self.curve(be, 4.0, 200.0))
+        assert cs["cs_ms"] == pytest.approx(4.0, abs=0.001)
+        assert cs["cs_pace"] == round(1000 / 240, 2)
+        assert cs["d_prime_m"] == pytest.approx(200.0, abs=0.1)
+
+    def test_needs_three_durations(self, be):
+        curve = self.curve(be, 250.0, 20_000.0)
+        for d in be.CRITICAL_DURATIONS[2:]:
+            curve[be.DURATIONS.index(d)] = None
+        assert be.critical_power(curve) is None
+
+    def test_implausible_fit_is_none(self, be):
+        # A negative W' is not physiological
+        assert be.critical_power(self.curve(be, 250.0, -1_000.0)) is None
@@ -0,0 +1,71 @@
+"""Tests for columnar time-series responses (api/columnar.py)."""
+
+import gzip
+import json
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+
+@pytest.fixture
+def columnar():
+    from api import columnar
+    return columnar
+
+
+def request(accept_encoding=None):
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    return Request({"type": "http", "headers": headers})
+
+
+class TestColumnsFromRows:
+    def test_tuples(self, columnar):
+        rows = [(date(2025, 1, 1), 50.0), (date(2025, 1, 2), None)]
+        assert columnar.columns_from_rows(rows, ["date", "load"]) == {
+            "date": [date(2025, 1, 1), date(2025, 1, 2)], "load": [50.0, None],
+        }
+
+    def test_dicts_with_missing_keys(self, columnar):
+        rows = [{"date": 1, "hrv": 60.0, "rhr": 48}, {"date": 2, "hrv": 58.0}]
+        assert columnar.columns_from_rows(rows, ["date", "rhr"]) == {"date": [1, 2], "rhr": [48, None]}
+
+    def test_no_rows_keeps_every_field(self, columnar):
+        assert columnar.columns_from_rows([], ["a", "b"]) == {"a": [], "b": []}
+
+
+class TestEncodeJson:
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_same_body_with_and_without_orjson(self, columnar, monkeypatch, use_orjson):
+        if use_orjson and columnar.orjson is None:
+            pytest.skip("orjson not installed")
+        if not use_orjson:
+            monkeypatch.setattr(columnar, "orjson", None)
+        body = columnar.encode_json({
+            "date": [date(2025, 1, 1)], "hr": np.array([61.5, np.nan]), "kg": [Decimal("82.5")],
+        })
+        assert json.loads(body) == {"date": ["2025-01-01"], "hr": [61.5, None], "kg": [82.5]}
+
+
+class TestColumnarResponse:
+    def test_gzip_when_accepted_and_large(self, columnar):
+        columns = {"v": list(range(2000))}
+        response = columnar.columnar_response(columns, "columnar", request("gzip, br"))
+        assert response.headers["content-encoding"] == "gzip"
+        assert json.loads(gzip.decompress(response.body)) == columns
+
+    def test_plain_when_small_or_not_accepted(self, columnar):
+        small = columnar.columnar_response({"v": [1]}, "columnar", request("gzip"))
+        assert "content-encoding" not in small.headers
+        large = columnar.columnar_response({"v": list(range(2000))}, "columnar", request())
+        assert "content-encoding" not in large.headers
+        assert large.media_type == "application/json"
+
+    def test_arrow_without_pyarrow_is_406(self, columnar, monkeypatch):
+        monkeypatch.setattr(columnar, "pyarrow", None)
+        with pytest.raises(HTTPException) as exc:
+            columnar.columnar_response({"v": [1]}, "arrow", request())
+        assert exc.value.status_code == 406
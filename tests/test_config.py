@@ -35,3 +35,16 @@ class TestConfigLoading:
             import importlib, config as cfg
             importlib.reload(cfg)
             assert cfg.DB_HOST == "myserver"
+
+    def test_user_id_defaults_to_first_user(self):
+        env = {k: v for k, v in os.environ.items() if k != "USER_ID"}
+        with patch.dict(os.environ, env, clear=True):
+            import importlib, config as cfg
+            importlib.reload(cfg)
+            assert cfg.USER_ID == 1
+
+    def test_user_id_override(self):
+        with patch.dict(os.environ, {"USER_ID": "2"}):
+            import importlib, config as cfg
+            importlib.reload(cfg)
+            assert cfg.USER_ID == 2
@@ -0,0 +1,68 @@
+"""Tests for LTTB downsampling (analytics/downsample.py)."""
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def ds():
+    from analytics import downsample
+    return downsample
+
+
+def reference_lttb(x, y, n_out):
+    """Point-by-point LTTB, as in the original description."""
+    n = len(x)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    kept, a = [0], 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        if b + 1 < n_out - 2:
+            cx, cy = x[hi:edges[b + 2]].mean(), y[hi:edges[b + 2]].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        best, best_area = lo, -1.0
+        for i in range(lo, hi):
+            area = abs((x[a] - cx) * (y[i] - y[a]) - (x[a] - x[i]) * (cy - y[a]))
+            if area > best_area:
+                best, best_area = i, area
+        kept.append(best)
+        a = best
+    kept.append(n - 1)
+    return np.array(kept)
+
+
+class TestLttbIndices:
+    @pytest.mark.parametrize("n, n_out", [(1000, 100), (997, 50), (250, 3), (5000, 1234)])
+    def test_matches_reference(self, ds, n, n_out):
+        rng = np.random.default_rng(n)
+        x = np.cumsum(rng.uniform(0.5, 1.5, n))
+        y = np.cumsum(rng.normal(0, 1, n))
+        np.testing.assert_array_equal(ds.lttb_indices(x, y, n_out), reference_lttb(x, y, n_out))
+
+    def test_keeps_endpoints_and_spikes(self, ds):
+        x = np.arange(1000.0)
+        y = np.zeros(1000)
+        y[437] = 50.0
+        y[811] = -30.0
+        kept = ds.lttb_indices(x, y, 20)
+        assert len(kept) == 20
+        assert kept[0] == 0 and kept[-1] == 999
+        assert {437, 811} <= set(kept.tolist())
+        assert (np.diff(kept) > 0).all()
+
+    def test_short_series_unchanged(self, ds):
+        np.testing.assert_array_equal(ds.lttb_indices(np.arange(5.0), np.ones(5), 10), np.arange(5))
+
+    def test_needs_three_points_out(self, ds):
+        with pytest.raises(ValueError):
+            ds.lttb_indices(np.arange(10.0), np.ones(10), 2)
+
+
+class TestDownsample:
+    def test_drops_missing_points(self, ds):
+        y = np.arange(10.0)
+        y[[2, 5]] = np.nan
+        x, v = ds.downsample(np.arange(10.0), y, 100)
+        assert x.tolist() == [0, 1, 3, 4, 6, 7, 8, 9]
+        assert v.tolist() == x.tolist()
@@ -0,0 +1,87 @@
+"""Tests for logged-name → exercises id resolution (exercise_index.py)."""
+
+import pytest
+
+
+@pytest.fixture
+def ei():
+    import exercise_index
+    return exercise_index
+
+
+ROWS = [
+    (1, "Bench Press"),
+    (2, "Pull-Up"),
+    (3, "Romanian Deadlift"),
+    (4, "Push Up"),
+    (5, "push-up"),
+]
+
+
+class TestNormalizeName:
+    def test_folds_case_punctuation_and_spacing(self, ei):
+        assert ei.normalize_name("  Bench-Press ") == "bench press"
+        assert ei.normalize_name("Pull_up (weighted)") == "pull up weighted"
+
+
+class TestExerciseIndex:
+    def test_exact_then_normalized(self, ei):
+        index = ei.ExerciseIndex(ROWS)
+        assert index.resolve("Bench Press") == 1
+        assert index.resolve("bench  press") == 1
+        assert index.resolve("pull up") == 2
+        assert index.resolve("ROMANIAN-DEADLIFT") == 3
+
+    def test_unknown_name(self, ei):
+        assert ei.ExerciseIndex(ROWS).resolve("Zercher Squat") is None
+
+    def test_ambiguous_normalized_form_unresolved(self, ei):
+        index = ei.ExerciseIndex(ROWS)
+        assert index.resolve("Push Up") == 4          # exact still wins
+        assert index.resolve("push-up") == 5
+        assert index.resolve("PUSH UP") is None
+
+
+class TestCache:
+    def test_reused_until_signature_changes(self, ei):
+        index = ei.store_index((5, 5), ROWS)
+        assert ei.cached_index((5, 5)) is index
+        assert ei.cached_index((6, 6)) is None
+
+
+class TestLinkUnresolved:
+    def test_links_by_normalized_name(self, ei, db):
+        conn, cur = db
+        cur.execute("INSERT INTO exercises (name, source) VALUES ('Test Goblet Squat', 'custom') RETURNING exercise_id")
+        ref = cur.fetchone()[0]
+        cur.execute("INSERT INTO strength_sessions (user_id, session_date) VALUES (1, '2099-05-01') RETURNING session_id")
+        sid = cur.fetchone()[0]
+        cur.execute("""
+            INSERT INTO strength_exercises (session_id, exercise_order, name) VALUES
+                (%s, 1, 'test goblet-squat'), (%s, 2, 'Test Unlabeled Carry')
+        """, (sid, sid))
+        assert ei.link_unresolved(cur) >= 1
+        cur.execute("SELECT name, exercise_ref_id FROM strength_exercises WHERE session_id = %s", (sid,))
+        assert dict(cur.fetchall()) == {"test goblet-squat": ref, "Test Unlabeled Carry": None}
+        assert "Test Unlabeled Carry" in [name for name, _, _ in ei.unmatched_names(cur)]
+
+    def test_linking_refreshes_muscle_volume(self, ei, db):
+        conn, cur = db
+        cur.execute("""
+            INSERT INTO exercises (name, source, primary_muscles)
+            VALUES ('Test Farmer Carry', 'custom', ARRAY['forearms'])
+        """)
+        cur.execute("INSERT INTO strength_sessions (user_id, session_date) VALUES (1, '2099-05-06') RETURNING session_id")
+        sid = cur.fetchone()[0]
+        cur.execute("""
+            INSERT INTO strength_exercises (session_id, exercise_order, name)
+            VALUES (%s, 1, 'test farmer carry') RETURNING exercise_id
+        """, (sid,))
+        cur.execute("INSERT INTO strength_sets (exercise_id, set_number, reps, total_weight_kg) VALUES (%s, 1, 10, 40)",
+                    (cur.fetchone()[0],))
+        ei.link_unresolved(cur)
+        cur.execute("""
+            SELECT muscle, sets FROM strength_weekly_muscle
+            WHERE user_id = 1 AND week_start = '2099-05-04' AND muscle = 'forearms'
+        """)
+        assert cur.fetchall() == [("forearms", 1)]
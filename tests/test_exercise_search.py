@@ -0,0 +1,70 @@
+"""Tests for the in-process exercise search index (api/exercise_search.py)."""
+
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def es():
+    from api import exercise_search
+    return exercise_search
+
+
+def exercise(exercise_id, name, muscles=(), equipment=()):
+    return SimpleNamespace(
+        exercise_id=exercise_id, name=name,
+        primary_muscles=list(muscles), equipment=list(equipment),
+    )
+
+
+EXERCISES = [
+    exercise(1, "Barbell Bench Press", ["chest"], ["barbell", "bench"]),
+    exercise(2, "Dumbbell Bench Press", ["chest"], ["dumbbell", "bench"]),
+    exercise(3, "Bent-Over Barbell Row", ["lats"], ["barbell"]),
+    exercise(4, "Bench Dips", ["triceps"], ["bench"]),
+    exercise(5, "Back Squat", ["quads"], ["barbell"]),
+]
+
+
+@pytest.fixture
+def index(es):
+    return es.SearchIndex(EXERCISES)
+
+
+class TestTrigrams:
+    def test_padded_words(self, es):
+        assert es.trigrams("row") == {"  r", " ro", "row", "ow "}
+
+
+class TestSearch:
+    def test_word_prefixes(self, index):
+        assert index.search("bar ro") == [3]
+
+    def test_starts_with_ranks_first(self, index):
+        assert index.search("bench")[0] == 4
+
+    def test_typo_falls_back_to_trigrams(self, index):
+        assert 5 in index.search("bak squat")
+
+    def test_usage_breaks_ties(self, index):
+        assert index.search("bench press", usage={2: 5})[:2] == [2, 1]
+
+    def test_muscle_and_equipment_filters(self, index):
+        assert index.search("b", muscles=["chest"], equipment=["dumbbell"]) == [2]
+        assert index.search("bench", muscles=["quads"]) == []
+
+    def test_empty_query_lists_by_usage(self, index):
+        assert index.search("", usage={5: 3, 3: 1}, limit=2) == [5, 3]
+
+    def test_no_match(self, index):
+        assert index.search("zzzz") == []
+
+
+class TestCache:
+    def test_reload_on_signature_or_age(self, es, monkeypatch):
+        index = es.store_index((5, 5), EXERCISES)
+        assert es.cached_index((5, 5)) is index
+        assert es.cached_index((6, 6)) is None
+        monkeypatch.setattr(es, "MAX_AGE_SECONDS", -1)
+        assert es.cached_index((5, 5)) is None
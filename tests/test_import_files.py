@@ -0,0 +1,92 @@
+"""Tests for import_files.py — offline GPX/FIT parsing and series summaries."""
+
+import numpy as np
+import pytest
+
+GPX = """<?xml version="1.0" encoding="UTF-8"?>
+<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1"
+     xmlns:gpxtpx="http://www.garmin.com/xmlschemas/TrackPointExtension/v1">
+  <metadata><time>2026-03-13T06:00:00Z</time></metadata>
+  <trk>
+    <name>Hill Reps</name>
+    <type>Trail Running</type>
+    <trkseg>
+{points}
+    </trkseg>
+  </trk>
+</gpx>
+"""
+
+POINT = """      <trkpt lat="{lat}" lon="23.6"><ele>{ele}</ele><time>2026-03-13T06:30:{sec:02d}Z</time>
+        <extensions><gpxtpx:TrackPointExtension><gpxtpx:hr>{hr}</gpxtpx:hr><gpxtpx:cad>85</gpxtpx:cad>
+        </gpxtpx:TrackPointExtension></extensions></trkpt>"""
+
+
+@pytest.fixture
+def imp():
+    import import_files
+    return import_files
+
+
+@pytest.fixture
+def gpx_file(tmp_path):
+    # 10 points, 1 s apart, ~3.3 m north per second, climbing 0.1 m/s
+    points = "\n".join(
+        POINT.format(lat=46.75 + i * 0.00003, ele=400 + i * 0.1, sec=i, hr=150 + i)
+        for i in range(10)
+    )
+    path = tmp_path / "hill_reps.gpx"
+    path.write_text(GPX.format(points=points), encoding="utf-8")
+    return str(path)
+
+
+class TestGpx:
+    def test_parse(self, imp, gpx_file):
+        meta, ts, columns = imp.parse_gpx(gpx_file)
+        assert meta == {"name": "Hill Reps", "sport": "trail_running"}
+        assert len(ts) == 10
+        assert np.all(np.diff(ts) == 1000)
+        assert columns["distance"][-1] == pytest.approx(9 * 3.336, rel=0.01)
+        assert columns["speed"][5] == pytest.approx(3.336, rel=0.01)
+        assert np.isnan(columns["speed"][0])
+
+    def test_load_file_builds_batch_and_summary(self, imp, gpx_file):
+        path, fields, batch, error = imp.load_file(gpx_file, user_id=1, max_hr=200)
+        assert error is None
+        assert len(batch["metric_timestamp"]) == 10
+        assert np.nanmax(batch["gradient_pct"]) == pytest.approx(3.0, abs=0.1)
+        assert fields["sport"] == "trail_running"
+        assert fields["workout_type"] == "Hill Reps"
+        assert fields["avg_running_cadence"] == 170.0   # per-leg cad doubled
+        assert fields["avg_heart_rate"] == 154
+        assert fields["time_in_zone_3"] == 9            # 150–159 bpm of 200 = 75–80%
+        assert fields["elevation_gain"] == pytest.approx(0.9)
+
+    def test_bad_file_returns_error(self, imp, tmp_path):
+        path = tmp_path / "broken.gpx"
+        path.write_text("<gpx><trk>", encoding="utf-8")
+        assert imp.load_file(str(path), user_id=1, max_hr=190)[3]
+
+
+class TestSummary:
+    def test_hr_zones_by_percent_of_max(self, imp):
+        hr = np.array([90.0, 110.0, 130.0, 150.0, 170.0, 190.0, np.nan])
+        durations = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0])
+        assert imp.hr_zone_seconds(hr, durations, 200) == [2, 3, 4, 5, 6]
+        assert imp.hr_zone_seconds(hr, durations, None) == [None] * 5
+
+    def test_pauses_do_not_count(self, imp):
+        ts = np.array([0, 1000, 2000, 62000, 63000], dtype="datetime64[ms]")
+        np.testing.assert_array_equal(imp.point_durations(ts), [1, 1, 0, 1, 0])
+
+    def test_collect_paths(self, imp, tmp_path):
+        (tmp_path / "a").mkdir()
+        for name in ("a/run.GPX", "ride.fit", "notes.txt"):
+            (tmp_path / name).write_text("")
+        found = [p.replace(str(tmp_path), "") for p in imp.collect_paths([str(tmp_path)])]
+        assert found == ["/a/run.GPX", "/ride.fit"]
+
+    def test_fit_requires_fitparse(self, imp, monkeypatch, tmp_path):
+        monkeypatch.setattr(imp, "fitparse", None)
+        with pytest.raises(RuntimeError, match="fitparse"):
+            imp.parse_fit(str(tmp_path / "x.fit"))
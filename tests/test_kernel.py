@@ -0,0 +1,104 @@
+"""Tests for the per-workout NumPy analytics kernel (analytics/kernel.py)."""
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def kernel():
+    from analytics import kernel
+    return kernel
+
+
+def series(n, **columns):
+    """A series with every kernel column; unspecified columns are constant."""
+    base = {
+        "heart_rate": 150.0, "pace": 5.0, "cadence": 170.0, "ground_contact_time": 250.0,
+        "vertical_oscillation": 8.0, "vertical_ratio": 7.0, "power": np.nan,
+        "altitude": 100.0, "gradient_pct": 0.0,
+    }
+    out = {c: np.full(n, v, dtype=np.float64) for c, v in base.items()}
+    out.update({c: np.asarray(v, dtype=np.float64) for c, v in columns.items()})
+    return out
+
+
+class TestGapMultipliers:
+    def test_polyval_matches_scalar_version(self, kernel):
+        from analytics.running_economy import gap_multiplier
+        grads = np.array([-45.0, -20.0, -8.5, -1.0, 0.0, 2.5, 10.0, 45.0])
+        assert kernel.gap_multipliers(grads) == pytest.approx([gap_multiplier(g) for g in grads])
+
+
+class TestRunningEconomy:
+    def test_gap_buckets_and_missing_gradient(self, kernel):
+        from analytics.running_economy import gap_multiplier
+        out = kernel.gap_summary(7, series(4, gradient_pct=[1.0, 3.0, np.nan, -0.4]))
+        # 1% → 0 and 3% → 4 (half to even), -0.4% → 0; NaN is not bucketed
+        assert out["gradient_profile"] == [{"gradient_pct": 0, "count": 2}, {"gradient_pct": 4, "count": 1}]
+        expected = np.mean([5.0 * gap_multiplier(1.0), 5.0 * gap_multiplier(3.0), 5.0, 5.0 * gap_multiplier(-0.4)])
+        assert out["avg_gap"] == round(expected, 3)
+        assert out["rows_used"] == 4
+
+    def test_decoupling_needs_40_hr_points(self, kernel):
+        hr = np.concatenate([np.full(39, 150.0), np.full(21, 30.0)])
+        assert kernel.aerobic_decoupling(7, series(60, heart_rate=hr)) is None
+
+    def test_decoupling_drift(self, kernel):
+        hr = np.concatenate([np.full(20, 140.0), np.full(21, 154.0)])
+        out = kernel.aerobic_decoupling(7, series(41, heart_rate=hr))
+        # odd length: the second half takes the extra point
+        assert out["ratio_second"] == round(0.2 / 154.0, 6)
+        assert out["decoupling_pct"] == pytest.approx(100 * (1 - 140 / 154), abs=0.01)
+        assert out["status"] == "moderate_drift"
+
+    def test_economy_index_falls_back_to_hr(self, kernel):
+        power = np.concatenate([np.full(19, 250.0), np.full(11, np.nan)])
+        out = kernel.economy_index(7, series(30, power=power))
+        assert out["mode"] == "hr"
+        assert out["rei"] == round(150.0 / (1000.0 / 300.0), 3)
+
+    def test_economy_index_uses_power(self, kernel):
+        out = kernel.economy_index(7, series(30, power=np.full(30, 250.0)))
+        assert (out["mode"], out["avg_power_or_hr"], out["rows_used"]) == ("power", 250.0, 30)
+
+
+class TestBiomechanics:
+    def test_summary_matches_sql_aggregates(self, kernel):
+        out = kernel.biomechanics_summary(7, series(3, cadence=[1.0, 2.0, 3.0], vertical_ratio=[np.nan, 7.0, np.nan]))
+        assert out["std_cadence"] == 1.0          # sample standard deviation
+        assert out["avg_vr"] == 7.0 and out["std_vr"] is None
+        assert out["n_rows"] == 3
+
+    def test_fatigue_windows(self, kernel):
+        hr = np.linspace(140, 160, 100)
+        out = kernel.fatigue_signature(7, series(100, heart_rate=hr))
+        assert out["window_size"] == 20
+        assert out["heart_rate_early"] == round(hr[:20].mean(), 3)
+        assert out["cadence_drift"] == 0.0
+        assert out["fatigue_score"] == pytest.approx(min(100, out["heart_rate_drift_pct"] * 10) / 3, abs=0.1)
+
+    def test_cadence_bands(self, kernel):
+        pace = np.array([5.0] * 10 + [5.25] * 10 + [5.74] * 4)
+        cadence = np.array([170.0] * 10 + [160.0] * 10 + [150.0] * 4)
+        out = kernel.cadence_speed_profile(7, series(24, pace=pace, cadence=cadence))
+        # 5.25 → band 5.0 (half to even); the 5.5 band has < 5 points
+        assert out == [{"pace_band": 5.0, "avg_cadence": 165.0, "count": 20}]
+
+
+class TestElevationQuartiles:
+    def test_quartiles_by_cumulative_gain(self, kernel):
+        altitude = np.concatenate([np.linspace(100, 140, 80), np.full(20, 140.0)])
+        out = kernel.elevation_quartiles(7, series(100, altitude=altitude, gradient_pct=np.full(100, 5.0)))
+        assert out["total_gain_m"] == 40.0
+        assert [q["quartile"] for q in out["quartiles"]] == [1, 2, 3, 4]
+        assert sum(q["count"] for q in out["quartiles"]) == 100
+        assert out["quartiles"][3]["count"] > 20        # the flat tail sits at full gain
+
+    def test_flat_run_is_not_meaningful(self, kernel):
+        assert kernel.elevation_quartiles(7, series(100)) is None
+
+
+def test_analyze_workout_runs_every_metric(kernel):
+    out = kernel.analyze_workout(7, series(120, altitude=np.linspace(100, 160, 120)))
+    assert set(out) == {"gap", "decoupling", "economy", "fatigue", "cadence_speed", "biomechanics", "elevation"}
+    assert all(v is not None for v in out.values())
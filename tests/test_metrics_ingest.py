@@ -0,0 +1,143 @@
+"""Tests for metrics_ingest.py — atomic per-workout series replacement."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def ingest():
+    import metrics_ingest
+    return metrics_ingest
+
+
+@pytest.fixture
+def batch():
+    import metrics_parser
+    return metrics_parser.parse_activity_details({
+        "metricDescriptors": [
+            {"metricsIndex": 0, "key": "directTimestamp"},
+            {"metricsIndex": 1, "key": "directHeartRate"},
+        ],
+        "activityDetailMetrics": [
+            {"metrics": [1_700_000_000_000, 140.0]},
+            {"metrics": [1_700_000_001_000, 141.0]},
+        ],
+    })
+
+
+def _terrain_points(batch):
+    """Points the terrain scan would keep (HR > 40, 0 < pace < 20, |gradient| <= 30)."""
+    hr, pace, grad = batch["heart_rate"], batch["pace"], batch["gradient_pct"]
+    return int(((hr > 40) & (pace > 0) & (pace < 20) & (np.abs(grad) <= 30)).sum())
+
+
+def _statements(cursor):
+    return [" ".join(c.args[0].split()) for c in cursor.execute.call_args_list]
+
+
+class TestReplaceWorkoutMetrics:
+    def test_delete_copy_then_stamp(self, ingest, batch):
+        cursor = MagicMock()
+        assert ingest.replace_workout_metrics(cursor, 9, batch) == 2
+
+        delete, stats_delete, stats_insert, analytics, curves, update = _statements(cursor)
+        assert delete.startswith("DELETE FROM workout_metrics WHERE workout_id")
+        assert stats_delete.startswith("DELETE FROM workout_terrain_stats WHERE workout_id")
+        assert stats_insert.startswith("INSERT INTO workout_terrain_stats")
+        assert analytics.startswith("INSERT INTO workout_analytics")
+        assert curves.startswith("INSERT INTO workout_mean_max")
+        assert update.startswith("UPDATE workouts SET metrics_ingested_at = NOW(), metrics_row_count")
+        assert cursor.execute.call_args_list[-1].args[1] == (2, ingest.GRADIENT_VERSION, 9)
+        cursor.copy_expert.assert_called_once()
+
+    def test_terrain_stats_written_with_series(self, ingest):
+        import metrics_parser
+        n = 50
+        batch = metrics_parser.build_batch(
+            1_700_000_000_000 + 1000 * np.arange(n),
+            {"heart_rate": np.full(n, 150.0), "speed": np.full(n, 3.0),
+             "altitude": np.linspace(100, 110, n), "distance": np.linspace(0, 150, n)},
+        )
+        cursor = MagicMock()
+        ingest.replace_workout_metrics(cursor, 9, batch)
+
+        calls = {c.args[0].split()[2]: c.args[1] for c in cursor.execute.call_args_list
+                 if c.args[0].split()[0] == "INSERT"}
+        _, workout_ids, groupings, _, counts, *_ = calls["workout_terrain_stats"]
+        assert set(workout_ids) == {9}
+        assert sum(n for g, n in zip(groupings, counts) if g == "band") == _terrain_points(batch) > 0
+
+    def test_analytics_written_with_series(self, ingest, batch):
+        cursor = MagicMock()
+        ingest.replace_workout_metrics(cursor, 9, batch)
+        sql, params = next(c.args for c in cursor.execute.call_args_list if "workout_analytics" in c.args[0])
+        assert sql.split()[0] == "INSERT"
+        assert params[1] == [9]
+
+    def test_mean_max_curves_written_with_series(self, ingest):
+        import metrics_parser
+        n = 40
+        batch = metrics_parser.build_batch(
+            1_700_000_000_000 + 1000 * np.arange(n),
+            {"heart_rate": np.full(n, 150.0), "speed": np.full(n, 3.0)},
+        )
+        cursor = MagicMock()
+        ingest.replace_workout_metrics(cursor, 9, batch)
+
+        params = next(c.args[1] for c in cursor.execute.call_args_list if "workout_mean_max" in c.args[0])
+        _, workout_ids, resolutions, power, speed, heart_rate = params
+        assert (workout_ids, resolutions, power) == ([9], [1], [None])
+        assert speed[0].startswith("{3.0,3.0,3.0,3.0,NULL,")
+        assert heart_rate[0].startswith("{150.0,150.0,150.0,150.0,NULL,")
+
+    def test_no_series_still_marks_ingested(self, ingest):
+        cursor = MagicMock()
+        assert ingest.replace_workout_metrics(cursor, 9, None) == 0
+        cursor.copy_expert.assert_not_called()
+        assert cursor.execute.call_args_list[-1].args[1] == (0, ingest.GRADIENT_VERSION, 9)
+
+    def test_series_store_untouched_before_commit(self, ingest, batch, tmp_path, monkeypatch):
+        import config
+        from analytics import series_store
+        monkeypatch.setattr(config, "SERIES_BACKEND", "files")
+        monkeypatch.setattr(config, "SERIES_STORE_PATH", str(tmp_path))
+        ingest.replace_workout_metrics(MagicMock(), 9, batch)
+        assert not series_store.has_series(9)
+
+    def test_does_not_commit(self, ingest, batch):
+        cursor = MagicMock()
+        ingest.replace_workout_metrics(cursor, 9, batch)
+        cursor.connection.commit.assert_not_called()
+
+
+class TestStoreWorkoutSeries:
+    @pytest.fixture
+    def store(self, tmp_path, monkeypatch):
+        import config
+        from analytics import series_store
+        monkeypatch.setattr(config, "SERIES_BACKEND", "files")
+        monkeypatch.setattr(config, "SERIES_STORE_PATH", str(tmp_path))
+        return series_store
+
+    def test_written_then_deleted(self, ingest, batch, store):
+        ingest.store_workout_series(9, batch)
+        assert store.has_series(9)
+        ingest.store_workout_series(9, None)
+        assert not store.has_series(9)
+
+    def test_disabled_is_noop(self, ingest, batch, store, monkeypatch):
+        import config
+        monkeypatch.setattr(config, "SERIES_BACKEND", "postgres")
+        ingest.store_workout_series(9, batch)
+        assert not store.has_series(9)
+
+
+class TestMetricsIngested:
+    @pytest.mark.parametrize("row, expected", [((True,), True), ((False,), False), (None, False)])
+    def test_lookup(self, ingest, row, expected):
+        cursor = MagicMock()
+        cursor.fetchone.return_value = row
+        assert ingest.metrics_ingested(cursor, 9) is expected
+        assert "FROM workouts WHERE workout_id" in _statements(cursor)[0]
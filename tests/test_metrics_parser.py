@@ -0,0 +1,195 @@
+"""Tests for metrics_parser.py — vectorized Garmin details → workout_metrics batches."""
+
+import json
+import math
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).parent.parent
+
+
+@pytest.fixture
+def mp():
+    import metrics_parser
+    return metrics_parser
+
+
+def _descriptors(*keys):
+    return [{"metricsIndex": i, "key": k} for i, k in enumerate(keys)]
+
+
+def _details(keys, rows):
+    return {
+        "metricDescriptors": _descriptors(*keys),
+        "activityDetailMetrics": [{"metrics": r} for r in rows],
+    }
+
+
+T0 = 1_700_000_000_000
+
+
+def reference_rows(details, key_to_column):
+    """Mirror of the per-point loop the parser replaced (values only)."""
+    descriptors = details["metricDescriptors"]
+    has_double = any(d["key"] == "directDoubleCadence" for d in descriptors)
+    col_map = {
+        d["metricsIndex"]: key_to_column[d["key"]]
+        for d in descriptors
+        if d["key"] in key_to_column and not (d["key"] == "directCadence" and has_double)
+    }
+    ts_idx = next(d["metricsIndex"] for d in descriptors if d["key"] == "directTimestamp")
+
+    rows, prev_alt, prev_dist = [], None, None
+    for point in details["activityDetailMetrics"]:
+        m = point.get("metrics", [])
+        if ts_idx >= len(m) or m[ts_idx] is None:
+            continue
+        v = dict.fromkeys(key_to_column.values())
+        for idx, col in col_map.items():
+            if idx < len(m) and m[idx] is not None:
+                raw = m[idx]
+                if col == "heart_rate":
+                    v[col] = int(raw)
+                elif col == "pace":
+                    v[col] = (1000 / raw) / 60 if raw else None
+                else:
+                    v[col] = float(raw)
+        v["gradient_pct"] = None
+        alt, dist, pace = v["altitude"], v["distance"], v["pace"]
+        if alt is not None and prev_alt is not None:
+            d_dist = None
+            if dist is not None and prev_dist is not None:
+                d_dist = dist - prev_dist
+            elif pace is not None and pace > 0:
+                d_dist = 1000.0 / (pace * 60.0)
+            if d_dist is not None and d_dist > 0.5:
+                v["gradient_pct"] = round((alt - prev_alt) / d_dist * 100, 2)
+        if alt is not None:
+            prev_alt = alt
+        if dist is not None:
+            prev_dist = dist
+        v["metric_timestamp"] = datetime.fromtimestamp(m[ts_idx] / 1000)
+        rows.append(v)
+    return rows
+
+
+def assert_matches_reference(mp, details):
+    expected = reference_rows(details, mp.GARMIN_KEY_TO_COLUMN)
+    batch = mp.parse_activity_details(details)
+    assert mp.batch_size(batch) == len(expected)
+
+    timestamps = batch["metric_timestamp"].astype(datetime)
+    for i, row in enumerate(expected):
+        assert timestamps[i] == row["metric_timestamp"]
+        for col in mp.METRIC_COLUMNS:
+            got = batch[col][i]
+            if row[col] is None:
+                assert math.isnan(got), (i, col)
+            elif col == "gradient_pct":
+                # np.round vs round() may differ by one unit in the last place on .5 ties
+                assert got == pytest.approx(row[col], abs=0.011), (i, col)
+            else:
+                assert got == pytest.approx(row[col]), (i, col)
+
+
+class TestMatchesRowLoop:
+    def test_real_activity_sample(self, mp):
+        with open(ROOT / "activity_18698089374_details.json", encoding="utf-8") as f:
+            details = json.load(f)["activityDetails"]
+        assert_matches_reference(mp, details)
+
+    def test_short_sample(self, mp):
+        with open(ROOT / "samples" / "activity_details_response.json", encoding="utf-8") as f:
+            assert_matches_reference(mp, json.load(f))
+
+    def test_gaps_bridge_to_last_value(self, mp):
+        details = _details(
+            ["directTimestamp", "directElevation", "directSumDistance", "directDistance", "directSpeed"],
+            [
+                [T0, 100.0, None, 0.0, 3.0],
+                [T0 + 1000, None, None, None, 3.0],
+                [T0 + 2000, 101.0, None, None, 3.0],   # pace fallback, Δalt vs 100.0
+                [T0 + 3000, 102.0, None, 20.0, 0.0],   # speed 0 → pace NULL
+                [T0 + 4000, 103.0, None, 40.0, None],
+            ],
+        )
+        assert_matches_reference(mp, details)
+
+
+class TestParser:
+    def test_double_cadence_preferred(self, mp):
+        details = _details(
+            ["directTimestamp", "directCadence", "directDoubleCadence"],
+            [[T0, 85.0, 170.0]],
+        )
+        assert mp.build_index_map(details["metricDescriptors"]) == {"cadence": [2]}
+        assert mp.parse_activity_details(details)["cadence"][0] == 170.0
+
+    def test_speed_converted_and_zero_is_null(self, mp):
+        details = _details(["directTimestamp", "directSpeed"], [[T0, 4.0], [T0 + 1000, 0.0]])
+        pace = mp.parse_activity_details(details)["pace"]
+        assert pace[0] == pytest.approx(1000 / 4.0 / 60)
+        assert math.isnan(pace[1])
+
+    def test_ragged_rows_and_missing_timestamps(self, mp):
+        details = _details(
+            ["directTimestamp", "directHeartRate", "directPower"],
+            [[T0, 140.7, 250.0], [T0 + 1000, 141.0], [None, 150.0, 300.0], []],
+        )
+        batch = mp.parse_activity_details(details)
+        assert mp.batch_size(batch) == 2
+        np.testing.assert_array_equal(batch["heart_rate"], [140.0, 141.0])
+        assert batch["power"][0] == 250.0 and math.isnan(batch["power"][1])
+
+    def test_duplicate_timestamps_keep_last(self, mp):
+        details = _details(
+            ["directTimestamp", "directHeartRate"],
+            [[T0, 140.0], [T0 + 1000, 141.0], [T0, 150.0], [T0 + 2000, 142.0]],
+        )
+        batch = mp.parse_activity_details(details)
+        assert mp.batch_size(batch) == 3
+        assert np.all(np.diff(batch["metric_timestamp"].astype(np.int64)) > 0)
+        np.testing.assert_array_equal(batch["heart_rate"], [150.0, 141.0, 142.0])
+
+    def test_no_timestamp_descriptor(self, mp):
+        assert mp.parse_activity_details(_details(["directHeartRate"], [[140]])) is None
+        assert mp.parse_activity_details({"metricDescriptors": [], "activityDetailMetrics": []}) is None
+
+
+class TestCopyBuffer:
+    def test_format(self, mp):
+        details = _details(
+            ["directTimestamp", "directHeartRate", "directAltitude"],
+            [[T0, 142.0, 12.5], [T0 + 1000, None, None]],
+        )
+        lines = mp.copy_buffer(7, mp.parse_activity_details(details)).read().splitlines()
+        assert len(lines) == 2
+
+        first = lines[0].split("\t")
+        assert len(first) == 2 + len(mp.METRIC_COLUMNS)
+        assert first[0] == "7"
+        assert first[1] == datetime.fromtimestamp(T0 / 1000).isoformat(timespec="milliseconds")
+        assert first[2] == "142"
+        assert first[2 + mp.METRIC_COLUMNS.index("altitude")] == "12.5"
+        assert first[2 + mp.METRIC_COLUMNS.index("power")] == r"\N"
+        assert lines[1].split("\t")[2:] == [r"\N"] * len(mp.METRIC_COLUMNS)
+
+    def test_copy_metrics_uses_copy(self, mp):
+        cursor = MagicMock()
+        details = _details(["directTimestamp", "directHeartRate"], [[T0, 150.0]])
+        assert mp.copy_metrics(cursor, 1, mp.parse_activity_details(details)) == 1
+        sql = cursor.copy_expert.call_args[0][0]
+        assert sql.startswith("COPY workout_metrics (workout_id, metric_timestamp, heart_rate")
+
+    def test_aggregate_columns_only_when_present(self, mp):
+        cursor = MagicMock()
+        batch = mp.parse_activity_details(_details(["directTimestamp", "directAltitude"], [[T0, 100.0]]))
+        batch["altitude_min"], batch["altitude_max"] = np.array([99.0]), np.array([101.0])
+        mp.copy_metrics(cursor, 1, batch)
+        sql, buf = cursor.copy_expert.call_args[0]
+        assert sql.endswith("gradient_pct, altitude_min, altitude_max) FROM STDIN")
+        assert buf.read().split("\t")[-2:] == ["99.0", "101.0\n"]
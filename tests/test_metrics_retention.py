@@ -0,0 +1,65 @@
+"""Tests for workout_metrics retention / compaction (metrics_retention.py)."""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def retention():
+    import metrics_retention
+    return metrics_retention
+
+
+def full_series(n, start=1_700_000_000.0):
+    nan = np.full(n, np.nan)
+    series = {c: nan.copy() for c in ("metric_epoch", "cadence", "vertical_oscillation", "vertical_ratio",
+                                      "ground_contact_time", "power", "latitude", "longitude",
+                                      "altitude_min", "altitude_max")}
+    series.update(
+        metric_epoch=start + np.arange(n, dtype=float),
+        heart_rate=np.arange(n, dtype=float) + 140,
+        pace=np.full(n, 5.0),
+        altitude=np.arange(n, dtype=float) + 100,
+        distance=np.arange(n, dtype=float) * 3.0,
+        gradient_pct=nan.copy(),
+    )
+    return series
+
+
+class TestCompactSeries:
+    def test_buckets(self, retention):
+        batch = retention.compact_series(full_series(25), 10)
+        assert len(batch["metric_timestamp"]) == 3
+        assert batch["heart_rate"].tolist() == [144.0, 154.0, 162.0]
+        assert batch["altitude_min"].tolist() == [100.0, 110.0, 120.0]
+        assert batch["altitude_max"].tolist() == [109.0, 119.0, 124.0]
+        assert batch["distance"].tolist() == [27.0, 57.0, 72.0]
+        assert batch["metric_timestamp"][1] == np.datetime64(datetime.utcfromtimestamp(1_700_000_010), "ms")
+
+    def test_pace_is_time_weighted_over_moving_points(self, retention):
+        s = full_series(10)
+        s["pace"] = np.array([4.0] * 5 + [6.0] * 4 + [np.nan])
+        pace = retention.compact_series(s, 10)["pace"][0]
+        assert pace == pytest.approx(1 / ((5 / 4 + 4 / 6) / 9))
+
+    def test_gradient_recomputed_from_compacted_points(self, retention):
+        import metrics_parser
+        batch = retention.compact_series(full_series(30), 10)
+        expected = metrics_parser.compute_gradient(batch["altitude"], batch["distance"], batch["pace"], dt=10)
+        np.testing.assert_array_equal(batch["gradient_pct"], expected)
+        assert batch["gradient_pct"][1] == pytest.approx(10 / 30 * 100, abs=0.01)
+
+    def test_recompaction_keeps_altitude_range(self, retention):
+        s = full_series(4)
+        s["metric_epoch"] = 1_700_000_000.0 + np.array([0.0, 5.0, 10.0, 15.0])
+        s["altitude_min"] = np.array([90.0, 95.0, 100.0, 105.0])
+        s["altitude_max"] = np.array([110.0, 115.0, 120.0, 125.0])
+        batch = retention.compact_series(s, 10)
+        assert batch["altitude_min"].tolist() == [90.0, 100.0]
+        assert batch["altitude_max"].tolist() == [115.0, 125.0]
+
+    def test_empty_bucket_values_stay_null(self, retention):
+        batch = retention.compact_series(full_series(10), 10)
+        assert np.isnan(batch["power"]).all()
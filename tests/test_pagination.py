@@ -0,0 +1,64 @@
+"""Tests for keyset pagination cursors (api/pagination.py)."""
+
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, Response
+
+
+@pytest.fixture
+def pagination():
+    from api import pagination
+    return pagination
+
+
+WORKOUT_KEY = (date, datetime, int)
+
+
+class TestCursor:
+    def test_round_trip(self, pagination):
+        key = (date(2025, 3, 14), datetime(2025, 3, 14, 6, 45, 12), 90210)
+        cursor = pagination.encode_cursor(key)
+        assert "=" not in cursor
+        assert pagination.decode_cursor(cursor, WORKOUT_KEY) == key
+
+    def test_null_value_round_trips(self, pagination):
+        cursor = pagination.encode_cursor((date(2025, 3, 14), None, 7))
+        assert pagination.decode_cursor(cursor, WORKOUT_KEY) == (date(2025, 3, 14), None, 7)
+
+    @pytest.mark.parametrize("cursor", [
+        "not a cursor!",
+        "e30",                                          # {}
+        "WyIyMDI1LTAzLTE0Il0",                          # ["2025-03-14"], wrong length
+        "WyJ5ZXN0ZXJkYXkiLG51bGwsMV0",                  # ["yesterday",null,1]
+    ])
+    def test_invalid_is_400(self, pagination, cursor):
+        with pytest.raises(HTTPException) as exc:
+            pagination.decode_cursor(cursor, WORKOUT_KEY)
+        assert exc.value.status_code == 400
+
+
+class TestPage:
+    def rows(self, n):
+        return [SimpleNamespace(d=date(2025, 1, 31 - i), id=i) for i in range(n)]
+
+    def test_extra_row_means_next_page(self, pagination):
+        rows, cursor = pagination.page(self.rows(4), 3, lambda r: (r.d, r.id))
+        assert [r.id for r in rows] == [0, 1, 2]
+        assert pagination.decode_cursor(cursor, (date, int)) == (date(2025, 1, 29), 2)
+
+    def test_last_page_has_no_cursor(self, pagination):
+        rows, cursor = pagination.page(self.rows(3), 3, lambda r: (r.d, r.id))
+        assert len(rows) == 3 and cursor is None
+
+    def test_no_limit_returns_everything(self, pagination):
+        rows, cursor = pagination.page(self.rows(10), None, lambda r: (r.d, r.id))
+        assert len(rows) == 10 and cursor is None
+
+    def test_set_next_cursor_header(self, pagination):
+        response = Response()
+        pagination.set_next_cursor(response, None)
+        assert pagination.NEXT_CURSOR_HEADER not in response.headers
+        pagination.set_next_cursor(response, "abc")
+        assert response.headers[pagination.NEXT_CURSOR_HEADER] == "abc"
@@ -0,0 +1,89 @@
+"""Tests for the in-memory exercise progression graph (progression_graph.py)."""
+
+import pytest
+
+
+@pytest.fixture
+def pg():
+    import progression_graph
+    return progression_graph
+
+
+# Push-up chain: 1 → 2 → 3 for strength, 1 → 4 for power, 2 → 5 lateral, 6 easier than 1
+EDGES = [
+    (1, 2, "harder", "strength"),
+    (2, 3, "harder", "strength"),
+    (1, 4, "harder", "power"),
+    (2, 5, "lateral", None),
+    (1, 6, "easier", None),
+]
+NAMES = {1: "Push-Up", 2: "Decline Push-Up", 3: "Archer Push-Up",
+         4: "Clap Push-Up", 5: "Ring Push-Up", 6: "Incline Push-Up"}
+
+
+@pytest.fixture
+def graph(pg):
+    return pg.ProgressionGraph(EDGES, NAMES)
+
+
+class TestCsr:
+    def test_offsets_cover_edges(self, graph):
+        assert graph.offsets[0] == 0
+        assert graph.offsets[-1] == len(graph.targets) == len(graph.kinds) == len(graph)
+        assert list(graph.nodes) == [1, 2, 3, 4, 5, 6]
+
+
+class TestNextSteps:
+    def test_by_goal_branch(self, graph):
+        assert graph.next_steps(1, "harder", "strength") == (2,)
+        assert graph.next_steps(1, "harder", "power") == (4,)
+        assert set(graph.next_steps(1, "harder")) == {2, 4}
+
+    def test_null_branch_applies_to_every_branch(self, graph):
+        assert graph.next_steps(2, "lateral", "strength") == (5,)
+
+    def test_inverse_steps_are_implied(self, graph):
+        assert graph.next_steps(3, "easier", "strength") == (2,)
+        assert graph.next_steps(6, "harder", "stability") == (1,)
+
+    def test_unknown_exercise(self, graph):
+        assert graph.next_steps(99, "harder") == ()
+
+    def test_many(self, graph):
+        steps = graph.next_steps_many([1, 3], "strength")
+        assert steps[1]["harder"] == (2,)
+        assert steps[3] == {"harder": (), "easier": (2,), "lateral": ()}
+
+
+class TestPath:
+    def test_shortest_chain(self, graph):
+        assert graph.path(1, 3, "harder", "strength") == (1, 2, 3)
+        assert graph.path(3, 1, "easier") == (3, 2, 1)
+
+    def test_unreachable_in_branch(self, graph):
+        assert graph.path(1, 3, "harder", "power") is None
+
+
+class TestCache:
+    def test_store_and_reload(self, pg):
+        rows = [(1, 2, "harder", "strength", "Decline Push-Up")]
+        graph = pg.store_graph((1, 1), rows, [(1, "Push-Up")])
+        assert pg.cached_graph((1, 1)) is graph
+        assert pg.cached_graph((2, 2)) is None
+        assert graph.names == {1: "Push-Up", 2: "Decline Push-Up"}
+
+
+class TestSetSuggestion:
+    def test_bodyweight_rep_limit_offers_harder_variant(self):
+        from recommend import _build_set_suggestion
+        last_perf = [(1, 15, None, None, None, True, None, False, False)] * 3
+        s = _build_set_suggestion("Push-Up", "push_h", "strength", True, last_perf, False,
+                                  harder="Decline Push-Up")
+        assert "Decline Push-Up" in s["note"]
+
+    def test_missed_reps_offer_easier_variant(self):
+        from recommend import _build_set_suggestion
+        last_perf = [(1, 4, None, 40.0, 40.0, False, None, False, False)] * 3
+        s = _build_set_suggestion("Dips", "push_v", "strength", True, last_perf, False,
+                                  easier="Bench Dips")
+        assert s["note"].endswith("or switching to Bench Dips")
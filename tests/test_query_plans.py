@@ -0,0 +1,167 @@
+"""
+EXPLAIN regression tests for the hot workouts / workout_metrics queries.
+
+Each test seeds a large dataset inside the per-test transaction (rolled
+back afterwards), runs the real query function through a cursor that
+EXPLAINs every statement before executing it, and fails if a plan reads
+workouts or workout_metrics with a sequential scan. Needs the database
+with the indexes from migrate_indexes.py.
+"""
+
+from datetime import date, timedelta
+
+import pytest
+
+SEED_USERS = 200          # including the default athlete
+SEED_DAYS = 400           # one workout per user per day → ~80k workouts
+SEED_SERIES = 2_000       # workouts with a 100-point series → 200k metric rows
+
+HOT_TABLES = ("workouts", "workout_metrics")
+
+
+class ExplainingCursor:
+    """Wraps a psycopg2 cursor; EXPLAINs each statement, then runs it."""
+
+    def __init__(self, cur, conn, plans):
+        self._cur, self._conn, self._plans = cur, conn, plans
+
+    def execute(self, sql, params=None):
+        with self._conn.cursor() as explain:
+            explain.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+            self._plans.append((" ".join(sql.split()), explain.fetchone()[0][0]["Plan"]))
+        self._cur.execute(sql, params)
+
+    def __getattr__(self, name):
+        return getattr(self._cur, name)
+
+    def __iter__(self):
+        return iter(self._cur)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._cur.close()
+
+
+class ExplainingConnection:
+    def __init__(self, conn):
+        self._conn = conn
+        self.plans = []
+
+    def cursor(self, name=None, **kwargs):
+        cur = self._conn.cursor(name, **kwargs) if name else self._conn.cursor(**kwargs)
+        return ExplainingCursor(cur, self._conn, self.plans)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+
+def seq_scans(plan):
+    """Relations in `plan` read by a Seq Scan on a hot table (partitions included)."""
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name", "").startswith(HOT_TABLES):
+        found.append(plan["Relation Name"])
+    for child in plan.get("Plans", []):
+        found.extend(seq_scans(child))
+    return found
+
+
+@pytest.fixture
+def seeded(db):
+    conn, cur = db
+    cur.execute("INSERT INTO users (name) SELECT 'plan-seed-' || g FROM generate_series(2, %s) g", (SEED_USERS,))
+    cur.execute("""
+        INSERT INTO workouts (user_id, sport, start_time, end_time, workout_date,
+                              training_volume, time_in_hr_zone_2, metrics_row_count)
+        SELECT u.user_id,
+               (ARRAY['running', 'trail_running', 'cycling', 'strength_training'])[1 + d %% 4],
+               (CURRENT_DATE - d) + TIME '07:00',
+               (CURRENT_DATE - d) + TIME '08:00',
+               CURRENT_DATE - d,
+               8000, 1800, 100
+        FROM users u CROSS JOIN generate_series(0, %s) d
+        ON CONFLICT (user_id, start_time) DO NOTHING
+    """, (SEED_DAYS - 1,))
+    cur.execute("""
+        INSERT INTO workout_metrics (workout_id, metric_timestamp, heart_rate, pace, gradient_pct)
+        SELECT w.workout_id, w.start_time + s * INTERVAL '1 second', 150, 5.0, 1.0
+        FROM (SELECT workout_id, start_time FROM workouts ORDER BY workout_id DESC LIMIT %s) w
+        CROSS JOIN generate_series(0, 99) s
+        ON CONFLICT (workout_id, metric_timestamp) DO NOTHING
+    """, (SEED_SERIES,))
+    cur.execute("ANALYZE workouts")
+    cur.execute("ANALYZE workout_metrics")
+    return ExplainingConnection(conn)
+
+
+def assert_no_seq_scans(conn):
+    assert conn.plans, "no statement was executed"
+    offenders = [(sql[:80], seq_scans(plan)) for sql, plan in conn.plans if seq_scans(plan)]
+    assert not offenders, f"sequential scans on hot tables: {offenders}"
+
+
+TODAY = date.today()
+
+
+class TestHotQueryPlans:
+    def test_training_load_daily_trimp(self, seeded):
+        from training_load import _trimp_for_date
+        _trimp_for_date(seeded.cursor(), TODAY - timedelta(days=3))
+        assert_no_seq_scans(seeded)
+
+    def test_recommend_yesterdays_training(self, seeded):
+        from recommend import get_yesterdays_training
+        get_yesterdays_training(seeded.cursor(), TODAY - timedelta(days=1))
+        assert_no_seq_scans(seeded)
+
+    def test_recommend_recent_load(self, seeded):
+        from recommend import get_recent_load, get_recent_load_by_sport
+        get_recent_load(seeded.cursor(), TODAY)
+        get_recent_load_by_sport(seeded.cursor(), TODAY)
+        assert_no_seq_scans(seeded)
+
+    def test_recommend_consecutive_days(self, seeded):
+        from recommend import get_consecutive_training_days
+        get_consecutive_training_days(seeded.cursor(), TODAY)
+        assert_no_seq_scans(seeded)
+
+    def test_alerts_consecutive_days(self, seeded):
+        from alerts import _consecutive_days
+        _consecutive_days(seeded.cursor(), TODAY)
+        assert_no_seq_scans(seeded)
+
+    def test_analytics_running_window(self, seeded):
+        from analytics.workout_analytics import load_running_analytics
+        load_running_analytics(30, seeded)
+        assert_no_seq_scans(seeded)
+
+    def test_analytics_terrain_window(self, seeded):
+        from analytics.terrain_response import load_terrain_stats
+        load_terrain_stats(30, "running", seeded)
+        assert_no_seq_scans(seeded)
+
+    def test_analytics_series_scan(self, seeded):
+        from analytics.workout_series import iter_workout_series
+        cur = seeded.cursor()
+        cur.execute("SELECT workout_id FROM workout_metrics GROUP BY workout_id ORDER BY workout_id DESC LIMIT 20")
+        ids = [r[0] for r in cur.fetchall()]
+        seeded.plans.clear()
+        list(iter_workout_series(ids, ("heart_rate", "pace"), seeded, from_store=False))
+        assert_no_seq_scans(seeded)
+
+
+class TestPartitionBounds:
+    def test_workout_ranges_cover_data_and_ahead(self):
+        from migrate_partition_metrics import partition_bounds
+        bounds = partition_bounds("workout", 1, 2500, 1000, ahead=1)
+        assert bounds == [("w0", 0, 1000), ("w1000", 1000, 2000), ("w2000", 2000, 3000), ("w3000", 3000, 4000)]
+
+    def test_month_ranges_roll_over_the_year(self):
+        from migrate_partition_metrics import partition_bounds
+        bounds = partition_bounds("month", date(2025, 11, 20), date(2025, 12, 3), None, ahead=1)
+        assert bounds == [
+            ("2025_11", "2025-11-01", "2025-12-01"),
+            ("2025_12", "2025-12-01", "2026-01-01"),
+            ("2026_01", "2026-01-01", "2026-02-01"),
+        ]
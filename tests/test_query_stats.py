@@ -0,0 +1,114 @@
+"""Tests for request SQL instrumentation (query_stats.py, api/instrumentation.py)."""
+
+import asyncio
+import logging
+
+import pytest
+
+
+@pytest.fixture
+def qs():
+    import query_stats
+    return query_stats
+
+
+@pytest.fixture
+def instrumentation():
+    from api import instrumentation
+    return instrumentation
+
+
+class TestFingerprint:
+    def test_folds_literals_and_placeholders(self, qs):
+        a = qs.fingerprint("SELECT * FROM workouts WHERE user_id = %s AND workout_date = '2025-05-01'")
+        b = qs.fingerprint("select *  from workouts\n WHERE user_id = :user_id AND workout_date = $2")
+        assert a == b == "select * from workouts where user_id = ? and workout_date = ?"
+
+    def test_collapses_in_lists(self, qs):
+        assert qs.fingerprint("SELECT 1 WHERE x IN (1, 2, 3)") == qs.fingerprint("SELECT 1 WHERE x IN (%s)")
+
+    def test_keeps_casts_and_identifiers(self, qs):
+        fp = qs.fingerprint("SELECT best_e1rm_10_kg, :d::date FROM t -- note")
+        assert fp == "select best_e1rm_10_kg, ?::date from t"
+
+
+class TestBudget:
+    def test_counts_inside_block_only(self, qs):
+        qs.record("SELECT 1", 1.0)
+        with qs.count_queries() as stats:
+            qs.record("SELECT 1", 1.5)
+            qs.record("SELECT 2", 0.5)
+        qs.record("SELECT 3", 1.0)
+        assert stats.count == 2
+        assert stats.total_ms == pytest.approx(2.0)
+
+    def test_over_budget_fails(self, qs):
+        with pytest.raises(AssertionError, match="3 queries, budget 2"):
+            with qs.query_budget(2):
+                for _ in range(3):
+                    qs.record("SELECT 1", 0.1)
+
+    def test_repeated_statement_fails(self, qs):
+        with pytest.raises(AssertionError, match="more than 1 times"):
+            with qs.query_budget(10, max_repeats=1):
+                for day in range(3):
+                    qs.record(f"SELECT * FROM workouts WHERE workout_date = '2025-05-0{day + 1}'", 0.1)
+
+    def test_repeated_threshold(self, qs):
+        with qs.count_queries() as stats:
+            for _ in range(qs.REPEAT_THRESHOLD):
+                qs.record("SELECT %s", 0.1)
+            qs.record("SELECT 1 FROM t", 0.1)
+        assert stats.repeated() == {"select ?": qs.REPEAT_THRESHOLD}
+
+    def test_shared_with_threads(self, qs):
+        async def run():
+            await asyncio.gather(*(asyncio.to_thread(qs.record, "SELECT 1", 0.1) for _ in range(4)))
+        with qs.count_queries() as stats:
+            asyncio.run(run())
+        assert stats.count == 4
+
+
+class TestSqlalchemyEvents:
+    def test_engine_statements_recorded(self, qs, instrumentation):
+        from sqlalchemy import create_engine, text
+        engine = instrumentation.instrument_engine(create_engine("sqlite://"))
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            with qs.query_budget(3, max_repeats=2) as stats:
+                for n in range(2):
+                    conn.execute(text("SELECT :n"), {"n": n})
+        assert stats.count == 2
+        assert stats.by_fingerprint == {"select ?": 2}
+
+
+class TestMiddleware:
+    def test_server_timing_and_log_line(self, qs, instrumentation, caplog):
+        from starlette.requests import Request
+        from starlette.responses import Response
+
+        async def call_next(request):
+            for _ in range(qs.REPEAT_THRESHOLD):
+                qs.record("SELECT * FROM strength_sets WHERE exercise_id = %s", 2.0)
+            return Response("ok")
+
+        request = Request({"type": "http", "method": "GET", "path": "/api/v1/dashboard",
+                           "headers": [], "query_string": b""})
+        with caplog.at_level(logging.INFO, logger="api.queries"):
+            response = asyncio.run(instrumentation.query_stats_middleware(request, call_next))
+
+        assert response.headers["server-timing"] == f'db;dur={2.0 * qs.REPEAT_THRESHOLD:.1f};desc="5 queries"'
+        record = caplog.records[-1]
+        assert record.levelno == logging.WARNING
+        assert '"queries": 5' in record.getMessage()
+        assert "strength_sets" in record.getMessage()
+        assert qs.current() is None
+
+
+class TestCursorBudget:
+    def test_last_performance_is_one_query(self, qs, db):
+        from recommend import get_last_performance
+        conn, _ = db
+        cur = conn.cursor(cursor_factory=qs.InstrumentedCursor)
+        with qs.query_budget(1):
+            get_last_performance(cur, "Bench Press")
@@ -0,0 +1,50 @@
+"""Tests for the derived-value recompute job (recompute_derived.py)."""
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def job():
+    import recompute_derived
+    return recompute_derived
+
+
+class TestGradientUpdates:
+    def test_only_changed_points_are_returned(self, job):
+        from metrics_parser import compute_gradient
+        altitude = np.array([100.0, 101.0, 102.0, 102.0])
+        distance = np.array([0.0, 10.0, 20.0, 30.0])
+        pace = np.full(4, 5.0)
+        current = compute_gradient(altitude, distance, pace)
+        stored = current.copy()
+        stored[2] = 0.0
+        series = {"altitude": altitude, "distance": distance, "pace": pace,
+                  "gradient_pct": stored, "metric_id": np.array([11.0, 12.0, 13.0, 14.0])}
+
+        ids, values = job.gradient_updates(series)
+
+        assert ids == [13]
+        assert values == [current[2]]
+        np.testing.assert_array_equal(series["gradient_pct"], current)
+
+    def test_compacted_series_uses_its_spacing(self, job):
+        series = {"altitude": np.array([100.0, 101.0]), "distance": np.full(2, np.nan),
+                  "pace": np.full(2, 5.0), "gradient_pct": np.full(2, np.nan),
+                  "metric_id": np.array([1.0, 2.0])}
+        _, values = job.gradient_updates(series, dt=10)
+        assert values == [round(1.0 / (1000 / 300 * 10) * 100, 2)]
+
+    def test_nan_is_written_as_null(self, job):
+        series = {"altitude": np.array([100.0, 101.0]), "distance": np.array([0.0, 0.1]),
+                  "pace": np.full(2, np.nan), "gradient_pct": np.array([np.nan, 3.0]),
+                  "metric_id": np.array([1.0, 2.0])}
+        assert job.gradient_updates(series) == ([2], [None])
+
+
+class TestMakeChunks:
+    def test_gradient_ids_follow_their_chunk(self, job):
+        selected = [(1, True, 1), (2, False, 1), (3, False, 1), (4, True, 10), (5, True, 1)]
+        assert job.make_chunks(selected, 2) == [
+            ({1: 1, 2: 1}, {1}), ({3: 1, 4: 10}, {4}), ({5: 1}, {5}),
+        ]
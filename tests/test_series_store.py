@@ -0,0 +1,94 @@
+"""Tests for the columnar workout series store (analytics/series_store.py)."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    import config
+    from analytics import series_store
+    monkeypatch.setattr(config, "SERIES_STORE_PATH", str(tmp_path))
+    monkeypatch.setattr(config, "SERIES_BACKEND", "files")
+    return series_store
+
+
+def series(pace):
+    n = len(pace)
+    return {"pace": np.array(pace, dtype=float), "heart_rate": np.arange(n, dtype=float) + 140,
+            "altitude": np.linspace(100, 101, n)}
+
+
+class TestReadWrite:
+    @pytest.mark.parametrize("compress", [False, True])
+    def test_round_trip_applies_pace_filter(self, store, compress):
+        store.write_series(7, series([5.0, np.nan, 25.0, 6.0]), compress=compress)
+        out = store.read_series(7, ("pace", "heart_rate", "power"))
+        assert out["pace"].tolist() == [5.0, 6.0]
+        assert out["heart_rate"].tolist() == [140.0, 143.0]
+        assert np.isnan(out["power"]).all()
+        assert out["pace"].dtype == np.float64
+
+    def test_full_series(self, store):
+        store.write_series(7, series([5.0, np.nan]))
+        assert len(store.read_series(7, ("pace",), moving_only=False)["pace"]) == 2
+
+    def test_no_moving_points_is_none(self, store):
+        store.write_series(7, series([np.nan, 30.0]))
+        assert store.read_series(7, ("pace",)) is None
+
+    def test_missing_workout_is_none(self, store):
+        assert store.read_series(8, ("pace",)) is None
+
+    def test_switching_codec_replaces_the_file(self, store):
+        store.write_series(1007, series([5.0]))
+        store.write_series(1007, series([5.0]), compress=True)
+        assert store.stored_workout_ids() == {1007}
+        assert store.series_path(1007, compress=True).parent.name == "1"
+
+    def test_rejects_columns_not_stored(self, store):
+        store.write_series(7, series([5.0]))
+        with pytest.raises(ValueError):
+            store.read_series(7, ("metric_id",))
+
+    def test_delete(self, store):
+        store.write_series(7, series([5.0]))
+        store.delete_series(7)
+        assert not store.has_series(7)
+
+
+class TestWorkoutSeriesBackend:
+    def test_files_merged_with_query_in_workout_order(self, store):
+        from analytics import workout_series
+        store.write_series(1, series([5.0]))
+        store.write_series(3, series([7.0]))
+        conn = MagicMock()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchmany.side_effect = [[(2, 6.0)], []]
+
+        out = list(workout_series.iter_workout_series([3, 2, 1], ("pace",), conn))
+
+        assert [(wid, s["pace"].tolist()) for wid, s in out] == [(1, [5.0]), (2, [6.0]), (3, [7.0])]
+        assert cur.execute.call_args.args[1] == ([2],)
+
+    def test_columns_not_stored_use_the_query(self, store):
+        from analytics import workout_series
+        store.write_series(1, series([5.0]))
+        conn = MagicMock()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchmany.side_effect = [[(1, 5.0, 11)], []]
+        out = list(workout_series.iter_workout_series([1], ("pace", "metric_id"), conn))
+        assert out[0][1]["metric_id"].tolist() == [11.0]
+
+    def test_postgres_backend_ignores_files(self, store, monkeypatch):
+        import config
+        from analytics import workout_series
+        monkeypatch.setattr(config, "SERIES_BACKEND", "postgres")
+        store.write_series(1, series([5.0]))
+        conn = MagicMock()
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchmany.side_effect = [[]]
+        assert list(workout_series.iter_workout_series([1], ("pace",), conn)) == []
+        cur.execute.assert_called_once()
@@ -0,0 +1,139 @@
+"""Tests for StrengthService session detail assembly (api/services/strength.py)."""
+
+import asyncio
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def strength():
+    from api.services import strength
+    return strength
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeSession:
+    """Records statements; every execute returns the same canned rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append((statement.text, params))
+        return FakeResult(self.rows)
+
+
+def strength_set(set_id, set_number, reps, weight):
+    return {
+        "set_id": set_id, "set_number": set_number, "reps": reps, "reps_min": None, "reps_max": None,
+        "duration_seconds": None, "weight_kg": weight, "is_bodyweight": False, "band_color": None,
+        "per_hand": False, "per_side": False, "plus_bar": False, "weight_includes_bar": False,
+        "total_weight_kg": weight,
+    }
+
+
+def session_row(session_id, day, exercises):
+    return SimpleNamespace(
+        session_id=session_id, session_date=date(2025, 5, day), session_type="upper",
+        raw_notes=None, exercises=exercises,
+    )
+
+
+BENCH = {"exercise_id": 11, "exercise_order": 1, "name": "Bench Press", "notes": None,
+         "sets": [strength_set(101, 1, 5, 80.0), strength_set(102, 2, 5, 82.5)]}
+ROW = {"exercise_id": 12, "exercise_order": 2, "name": "Barbell Row", "notes": "strict",
+       "sets": [strength_set(103, 1, 8, 60.0)]}
+
+
+class TestSessionDetail:
+    def test_one_statement_for_many_exercises(self, strength):
+        db = FakeSession([session_row(7, 20, [BENCH, ROW])])
+        session = asyncio.run(strength.StrengthService().get_session_detail(db, 1, 7))
+        assert len(db.statements) == 1
+        assert [e.name for e in session.exercises] == ["Bench Press", "Barbell Row"]
+        assert [s.total_weight_kg for s in session.exercises[0].sets] == [80.0, 82.5]
+        assert db.statements[0][1] == {"session_id": 7, "user_id": 1}
+
+    def test_missing_session(self, strength):
+        assert asyncio.run(strength.StrengthService().get_session_detail(FakeSession([]), 1, 7)) is None
+
+    def test_session_without_exercises(self, strength):
+        db = FakeSession([session_row(7, 20, [])])
+        assert asyncio.run(strength.StrengthService().get_session_detail(db, 1, 7)).exercises == []
+
+
+class TestSessionsWithSets:
+    def test_last_sessions_in_one_statement(self, strength):
+        db = FakeSession([session_row(8, 22, [ROW]), session_row(7, 20, [BENCH])])
+        sessions = asyncio.run(strength.StrengthService().get_sessions_with_sets(db, 1, last=2))
+        assert len(db.statements) == 1
+        assert db.statements[0][1] == {"user_id": 1, "last": 2}
+        assert [s.session_id for s in sessions] == [8, 7]
+
+    def test_by_ids(self, strength):
+        db = FakeSession([])
+        asyncio.run(strength.StrengthService().get_sessions_with_sets(db, 1, [7, 8]))
+        sql, params = db.statements[0]
+        assert "ANY(:session_ids)" in sql
+        assert params == {"user_id": 1, "session_ids": [7, 8]}
+
+
+class RoutedSession:
+    """Records statements; returns the rows of the first matching SQL fragment."""
+
+    def __init__(self, routes):
+        self.routes = routes
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append((statement.text, params))
+        for fragment, rows in self.routes.items():
+            if fragment in statement.text:
+                return RoutedResult(rows)
+        return RoutedResult([])
+
+    async def commit(self):
+        pass
+
+
+class RoutedResult(FakeResult):
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def one(self):
+        return self._rows[0]
+
+
+class TestCreateExercise:
+    def test_links_only_names_the_index_resolves(self, strength):
+        from api.schemas.strength import ExerciseCreateSchema
+        new = SimpleNamespace(
+            exercise_id=3, name="Goblet Squat", source="custom", movement_pattern=None, quality_focus=None,
+            primary_muscles=[], secondary_muscles=[], equipment=[], skill_level=None, bilateral=True,
+            contraction_type=None, systemic_fatigue=None, cns_load=None, joint_stress={},
+            sport_carryover={}, goal_carryover={}, notes=None,
+        )
+        db = RoutedSession({
+            "INSERT INTO exercises": [new],
+            "COUNT(*)": [(3, 990003)],
+            "SELECT exercise_id, name FROM exercises": [(1, "Row"), (2, "Row!"), (3, "Goblet Squat")],
+            "SELECT DISTINCT name": [SimpleNamespace(name="goblet-squat"), SimpleNamespace(name="row")],
+            "RETURNING session_id": [SimpleNamespace(session_id=9), SimpleNamespace(session_id=9)],
+        })
+        payload = ExerciseCreateSchema(name="Goblet Squat", source="custom")
+        asyncio.run(strength.StrengthService().create_exercise(db, payload))
+
+        update = next(p for sql, p in db.statements if "UPDATE strength_exercises" in sql)
+        assert update == {"ref": 3, "names": ["goblet-squat"]}    # "row" is ambiguous
+        refreshes = [p for sql, p in db.statements if "strength_weekly_muscle" in sql]
+        assert refreshes and all(p == {"session_id": 9} for p in refreshes)
@@ -0,0 +1,100 @@
+"""Tests for the derived strength tables (strength_stats.py)."""
+
+import pytest
+
+
+@pytest.fixture
+def ss():
+    import strength_stats
+    return strength_stats
+
+
+def log_session(cur, day, exercises):
+    """Insert a session; exercises is [(name, [(reps, total_weight_kg), ...])]."""
+    cur.execute(
+        "INSERT INTO strength_sessions (user_id, session_date) VALUES (1, %s) RETURNING session_id", (day,)
+    )
+    session_id = cur.fetchone()[0]
+    for order, (name, sets) in enumerate(exercises, 1):
+        cur.execute("""
+            INSERT INTO strength_exercises (session_id, exercise_order, name, exercise_ref_id)
+            VALUES (%s, %s, %s, (SELECT exercise_id FROM exercises WHERE name = %s))
+            RETURNING exercise_id
+        """, (session_id, order, name, name))
+        exercise_id = cur.fetchone()[0]
+        for n, (reps, weight) in enumerate(sets, 1):
+            cur.execute("""
+                INSERT INTO strength_sets (exercise_id, set_number, reps, total_weight_kg, is_bodyweight)
+                VALUES (%s, %s, %s, %s, %s)
+            """, (exercise_id, n, reps, weight, weight is None))
+    return session_id
+
+
+@pytest.fixture
+def taxonomy(db):
+    conn, cur = db
+    cur.execute("""
+        INSERT INTO exercises (name, source, primary_muscles, secondary_muscles) VALUES
+            ('Test Bench Press', 'custom', ARRAY['chest'], ARRAY['triceps', 'front_delts']),
+            ('Test Dips',        'custom', ARRAY['triceps'], ARRAY['chest'])
+    """)
+    return conn, cur
+
+
+class TestSqlalchemyStatements:
+    def test_named_placeholders(self, ss):
+        statements = ss.sqlalchemy_statements()
+        assert len(statements) == len(ss.SESSION_REFRESH)
+        for sql in statements:
+            assert "%(" not in sql
+            assert ":session_id" in sql
+
+
+class TestRefreshSession:
+    def test_exercise_stats(self, ss, taxonomy):
+        conn, cur = taxonomy
+        sid = log_session(cur, "2099-04-07", [
+            ("Test Bench Press", [(5, 100.0), (15, 90.0), (None, 60.0)]),
+            ("Test Dips", [(10, None)]),
+        ])
+        ss.refresh_session(cur, sid)
+        cur.execute("""
+            SELECT name, sets, tonnage_kg, best_e1rm_kg, best_e1rm_10_kg
+            FROM strength_exercise_stats WHERE session_id = %s ORDER BY name
+        """, (sid,))
+        bench, dips = cur.fetchall()
+        assert bench[:3] == ("Test Bench Press", 3, 5 * 100.0 + 15 * 90.0)
+        assert bench[3] == pytest.approx(90.0 * (1 + 15 / 30))
+        assert bench[4] == pytest.approx(100.0 * (1 + 5 / 30))    # the 15-rep set is out of range
+        assert dips == ("Test Dips", 1, 0.0, None, None)
+
+    def test_weekly_muscle_counts_whole_week(self, ss, taxonomy):
+        conn, cur = taxonomy
+        monday = log_session(cur, "2099-04-06", [("Test Bench Press", [(5, 100.0), (5, 100.0)])])
+        thursday = log_session(cur, "2099-04-09", [("Test Dips", [(10, 20.0)])])
+        ss.refresh_session(cur, monday)
+        ss.refresh_session(cur, thursday)
+        cur.execute("""
+            SELECT muscle, sets, tonnage_kg, secondary_sets, secondary_tonnage_kg
+            FROM strength_weekly_muscle
+            WHERE user_id = 1 AND week_start = '2099-04-06'
+            ORDER BY muscle
+        """)
+        assert cur.fetchall() == [
+            ("chest", 2, 1000.0, 1, 200.0),
+            ("front_delts", 0, 0.0, 2, 1000.0),
+            ("triceps", 1, 200.0, 2, 1000.0),
+        ]
+
+    def test_relogging_replaces_rows(self, ss, taxonomy):
+        conn, cur = taxonomy
+        sid = log_session(cur, "2099-04-08", [("Test Bench Press", [(5, 100.0)])])
+        ss.refresh_session(cur, sid)
+        cur.execute("DELETE FROM strength_sets WHERE exercise_id IN "
+                    "(SELECT exercise_id FROM strength_exercises WHERE session_id = %s)", (sid,))
+        cur.execute("DELETE FROM strength_exercises WHERE session_id = %s", (sid,))
+        ss.refresh_session(cur, sid)
+        cur.execute("SELECT COUNT(*) FROM strength_exercise_stats WHERE session_id = %s", (sid,))
+        assert cur.fetchone()[0] == 0
+        cur.execute("SELECT COUNT(*) FROM strength_weekly_muscle WHERE user_id = 1 AND week_start = '2099-04-06'")
+        assert cur.fetchone()[0] == 0
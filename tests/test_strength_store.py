@@ -0,0 +1,71 @@
+"""Tests for the set-based strength session write (strength_store.py)."""
+
+import pytest
+
+
+@pytest.fixture
+def store():
+    import strength_store
+    return strength_store
+
+
+class FakeIndex:
+    def __init__(self, refs):
+        self.refs = refs
+
+    def resolve(self, name):
+        return self.refs.get(name)
+
+
+EXERCISES = [
+    {"exercise_order": 1, "name": "Bench Press", "notes": None, "sets": [
+        {"set_number": 1, "reps": 5, "total_weight_kg": 80.0},
+        {"set_number": 2, "reps": 5, "total_weight_kg": 82.5},
+    ]},
+    {"exercise_order": 2, "name": "Plank", "notes": "hold", "sets": [
+        {"set_number": 1, "duration_seconds": 60, "is_bodyweight": True},
+    ]},
+]
+
+
+class TestInsertParams:
+    def test_column_arrays(self, store):
+        params = store.insert_params(7, EXERCISES, FakeIndex({"Bench Press": 3}))
+        assert params["session_id"] == 7
+        assert params["name"] == ["Bench Press", "Plank"]
+        assert params["notes"] == [None, "hold"]
+        assert params["exercise_ref_id"] == [3, None]
+        assert params["set_pos"] == [1, 1, 2]
+        assert params["reps"] == [5, 5, None]
+        assert params["duration_seconds"] == [None, None, 60]
+
+    def test_all_set_arrays_aligned(self, store):
+        params = store.insert_params(7, EXERCISES, FakeIndex({}))
+        for field in store._SET_FIELDS:
+            assert len(params[field]) == len(params["set_pos"])
+
+
+class TestSqlalchemySql:
+    def test_named_placeholders(self, store):
+        sql = store.sqlalchemy_sql(store.INSERT_EXERCISES_AND_SETS)
+        assert "%(" not in sql
+        assert ":session_id" in sql and ":set_pos" in sql
+
+
+class TestWriteExercises:
+    def test_replaces_session(self, store, db):
+        conn, cur = db
+        cur.execute(
+            "INSERT INTO strength_sessions (user_id, session_date) VALUES (1, '2099-05-04') RETURNING session_id"
+        )
+        sid = cur.fetchone()[0]
+        store.write_exercises(cur, sid, EXERCISES)
+        store.write_exercises(cur, sid, EXERCISES[:1])
+        cur.execute("""
+            SELECT se.name, st.set_number, st.reps, st.total_weight_kg
+            FROM strength_exercises se JOIN strength_sets st ON st.exercise_id = se.exercise_id
+            WHERE se.session_id = %s ORDER BY st.set_number
+        """, (sid,))
+        assert cur.fetchall() == [("Bench Press", 1, 5, 80.0), ("Bench Press", 2, 5, 82.5)]
+        cur.execute("SELECT sets FROM strength_exercise_stats WHERE session_id = %s", (sid,))
+        assert cur.fetchall() == [(2,)]
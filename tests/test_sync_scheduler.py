@@ -0,0 +1,120 @@
+"""Tests for the sync scheduler's due-user selection and run bookkeeping (api/services/sync.py)."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+NOW = datetime(2026, 3, 13, 12, 0)
+HOUR = 3600
+
+
+@pytest.fixture
+def plan(monkeypatch):
+    # api.settings validates these at import time
+    monkeypatch.setenv("JWT_SECRET", "test_secret")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test_key")
+    from api.services.sync import plan_sync_order
+    return lambda candidates: plan_sync_order(candidates, NOW, min_interval_s=HOUR, active_window_s=24 * HOUR)
+
+
+def user(user_id, active_h=None, synced_h=None):
+    return {
+        "user_id": user_id,
+        "last_active_at": NOW - timedelta(hours=active_h) if active_h is not None else None,
+        "last_started_at": NOW - timedelta(hours=synced_h) if synced_h is not None else None,
+    }
+
+
+class TestPlanSyncOrder:
+    def test_recent_runs_are_rate_limited(self, plan):
+        assert plan([user(1, synced_h=0.5), user(2, synced_h=2)]) == [2]
+
+    def test_recently_active_users_first(self, plan):
+        candidates = [user(1, active_h=72, synced_h=10), user(2, active_h=1, synced_h=2)]
+        assert plan(candidates) == [2, 1]
+
+    def test_stalest_first_within_group(self, plan):
+        candidates = [user(1, synced_h=2), user(2, synced_h=20), user(3)]
+        assert plan(candidates) == [3, 2, 1]
+
+    def test_never_active_treated_as_inactive(self, plan):
+        assert plan([user(1, synced_h=5), user(2, active_h=0, synced_h=3)]) == [2, 1]
+
+
+class FakeResult:
+    def __init__(self, value):
+        self.value = value
+
+    def scalar_one(self):
+        return self.value
+
+    def fetchone(self):
+        return None
+
+
+class FakeSession:
+    """Records statements and params; INSERT returns run 42, counts return 0."""
+
+    def __init__(self):
+        self.statements = []
+        self.rolled_back = False
+
+    async def execute(self, statement, params=None):
+        self.statements.append((statement.text, params))
+        return FakeResult(42 if "INSERT INTO sync_runs" in statement.text else 0)
+
+    async def commit(self):
+        pass
+
+    async def rollback(self):
+        self.rolled_back = True
+
+
+@pytest.fixture
+def sync_service(monkeypatch):
+    monkeypatch.setenv("JWT_SECRET", "test_secret")
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test_key")
+    from api.services.sync import SyncService
+    return SyncService()
+
+
+class TestSyncUser:
+    def test_failed_pipeline_still_finishes_run(self, sync_service, monkeypatch):
+        async def spawn_fails(user_id, creds):
+            raise OSError("cannot spawn")
+        monkeypatch.setattr(sync_service, "run_pipeline", spawn_fails)
+        db = FakeSession()
+
+        with pytest.raises(OSError):
+            asyncio.run(sync_service.sync_user(db, 1))
+
+        sql, params = db.statements[-1]
+        assert "UPDATE sync_runs" in sql
+        assert params["run_id"] == 42 and params["ok"] is False
+        assert params["errors"] == "OSError: cannot spawn"
+        assert db.rolled_back
+
+    def test_scripts_write_and_count_for_synced_user(self, sync_service, monkeypatch):
+        from api.schemas.sync import SyncScriptResultSchema
+        rows = {1: 10, 2: 0}
+
+        class CountingSession(FakeSession):
+            async def execute(self, statement, params=None):
+                if "sleep_sessions" in statement.text:
+                    self.statements.append((statement.text, params))
+                    return FakeResult(rows[params["uid"]])
+                return await super().execute(statement, params)
+
+        async def run_script(script, extra_env):
+            # Each script writes one row for the athlete it was started for
+            rows[int(extra_env["USER_ID"])] += 1
+            return SyncScriptResultSchema(script=script, ok=True, stdout="", stderr="")
+        monkeypatch.setattr(sync_service, "run_script", run_script)
+        db = CountingSession()
+
+        result = asyncio.run(sync_service.sync_user(db, 2))
+
+        assert rows == {1: 10, 2: 4}
+        assert result.ok and result.records_ingested == 4
+        assert {params["uid"] for _, params in db.statements if "uid" in params} == {2}
@@ -0,0 +1,145 @@
+"""Tests for the streaming terrain accumulator (analytics/terrain_response.py)."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def terrain():
+    from analytics import terrain_response
+    return terrain_response
+
+
+def accumulate(terrain, rows, chunk=None):
+    data = np.array(rows, dtype=np.float64)
+    acc = terrain.TerrainAccumulator()
+    chunk = chunk or len(data)
+    for i in range(0, len(data), chunk):
+        part = data[i:i + chunk]
+        acc.add(part[:, 0], part[:, 1], part[:, 2])
+    return acc
+
+
+def random_rows(n=5000, seed=3):
+    rng = np.random.default_rng(seed)
+    grad = np.round(rng.uniform(-30, 30, n), 1)
+    pace = rng.uniform(4.0, 9.0, n)
+    hr = np.round(150 + grad + rng.normal(0, 5, n))
+    return list(zip(hr, pace, grad))
+
+
+class TestTerrainAccumulator:
+    def test_band_edges_are_lower_inclusive(self, terrain):
+        rows = [(150, 5.0, g) for g in (-8.0, -4.0, -1.0, 1.0, 4.0, 8.0) for _ in range(10)]
+        curve = terrain.TerrainAccumulator()
+        data = np.array(rows)
+        curve.add(data[:, 0], data[:, 1], data[:, 2])
+        assert [b["band"] for b in curve.hr_gradient_curve()] == [
+            "down", "slight_down", "flat", "slight_up", "up", "steep_up"]
+
+    def test_curve_matches_per_band_means(self, terrain):
+        from analytics.running_economy import gap_multiplier
+        rows = random_rows()
+        curve = {b["band"]: b for b in accumulate(terrain, rows).hr_gradient_curve()}
+        flat = [r for r in rows if -1 <= r[2] < 1]
+        assert curve["flat"]["count"] == len(flat)
+        assert curve["flat"]["avg_hr"] == pytest.approx(np.mean([r[0] for r in flat]), abs=0.05)
+        assert curve["flat"]["avg_gap"] == pytest.approx(
+            np.mean([r[1] * gap_multiplier(r[2]) for r in flat]), abs=5e-4)
+
+    def test_model_matches_least_squares_fit(self, terrain):
+        rows = random_rows()
+        model = accumulate(terrain, rows).grade_cost_model()
+        inner = np.array([r for r in rows if abs(r[2]) <= 20])
+        slope, intercept = np.polyfit(inner[:, 2], inner[:, 0], 1)
+        assert model["n_points"] == len(inner)
+        assert model["slope_bpm_per_pct"] == pytest.approx(slope, abs=1e-3)
+        assert model["intercept"] == pytest.approx(intercept, abs=0.1)
+        assert model["r_squared"] == pytest.approx(np.corrcoef(inner[:, 2], inner[:, 0])[0, 1] ** 2, abs=1e-4)
+
+    def test_chunked_scan_matches_single_chunk(self, terrain):
+        rows = random_rows()
+        whole, chunked = accumulate(terrain, rows), accumulate(terrain, rows, chunk=333)
+        assert chunked.hr_gradient_curve() == whole.hr_gradient_curve()
+        assert chunked.optimal_gradient() == whole.optimal_gradient()
+        for key, value in whole.grade_cost_model().items():
+            assert chunked.grade_cost_model()[key] == pytest.approx(value)
+
+    def test_buckets_round_half_to_even(self, terrain):
+        # 1% and 3% sit on bucket midpoints: round(0.5) → 0, round(1.5) → 2
+        rows = [(150, 5.0, 1.0)] * 20 + [(150, 5.0, 3.0)] * 20
+        optimal = accumulate(terrain, rows).optimal_gradient()
+        assert [(b["gradient_pct"], b["count"]) for b in optimal["bands"]] == [(0, 20), (4, 20)]
+
+    def test_minimum_counts(self, terrain):
+        rows = [(150, 5.0, 0.0)] * 19 + [(150, 5.0, 25.0)] * 9
+        acc = accumulate(terrain, rows)
+        assert [b["band"] for b in acc.hr_gradient_curve()] == ["flat"]
+        assert acc.grade_cost_model() is None
+        assert acc.optimal_gradient() is None
+
+
+class TestWorkoutTerrainStats:
+    def test_summary_rows_reproduce_raw_scan(self, terrain):
+        # Three "workouts" summarised separately, then merged like load_terrain_stats
+        rows = random_rows(6000)
+        merged = terrain.TerrainAccumulator()
+        for part in np.array_split(np.array(rows), 3):
+            for grouping, key, *sums in terrain.workout_terrain_stats(part[:, 0], part[:, 1], part[:, 2]):
+                merged.add_stats(grouping, key, np.array(sums))
+        raw = accumulate(terrain, rows)
+        assert merged.hr_gradient_curve() == raw.hr_gradient_curve()
+        assert merged.optimal_gradient() == raw.optimal_gradient()
+        assert merged.grade_cost_model() == raw.grade_cost_model()
+
+    def test_applies_scan_filters(self, terrain):
+        hr   = np.array([150, 40, 150, 150, np.nan, 150])
+        pace = np.array([5.0, 5.0, 20.0, 5.0, 5.0, 5.0])
+        grad = np.array([0.0, 0.0, 0.0, 31.0, 0.0, np.nan])
+        rows = terrain.workout_terrain_stats(hr, pace, grad)
+        assert [(r[0], r[1], r[2]) for r in rows if r[2]] == [("band", 3, 1), ("grade2", 0, 1)]
+
+    def test_empty_series_keeps_every_group(self, terrain):
+        rows = terrain.workout_terrain_stats([], [], [])
+        assert len(rows) == len(terrain.GRADIENT_BANDS) + 21
+        assert all(r[2] == 0 for r in rows)
+
+    def test_bucket_rows_keyed_by_gradient(self, terrain):
+        rows = terrain.workout_terrain_stats([150.0, 150.0], [5.0, 5.0], [-20.0, 20.0])
+        assert [r[1] for r in rows if r[0] == "grade2" and r[2]] == [-20, 20]
+
+    def test_insert_is_one_versioned_statement(self, terrain):
+        cursor = MagicMock()
+        rows = [(7, *r) for r in terrain.workout_terrain_stats([150.0], [5.0], [2.0])]
+        terrain.insert_terrain_stats(cursor, rows)
+        sql, params = cursor.execute.call_args.args
+        assert "unnest(" in sql
+        assert params[0] == terrain.TERRAIN_STATS_VERSION
+        assert params[1] == [7] * len(rows)
+        assert len(params) == 1 + len(rows[0])
+
+
+
+class TestLoadTerrainStats:
+    def test_current_version_rows_plus_stale_workouts_from_series(self, terrain, monkeypatch):
+        stored = accumulate(terrain, [(150.0, 5.0, 2.0)] * 30)
+        conn = MagicMock()
+        cur = conn.cursor.return_value
+        cur.fetchall.side_effect = [stored.stats_rows(), [(5,)]]
+
+        requested = []
+
+        def fake_iter(ids, columns, _conn):
+            requested.extend(ids)
+            yield 5, {"heart_rate": np.full(50, 150.0), "pace": np.full(50, 5.0), "gradient_pct": np.full(50, 2.0)}
+
+        monkeypatch.setattr(terrain, "iter_workout_series", fake_iter)
+        acc = terrain.load_terrain_stats(30, "running", conn)
+
+        (sums_sql, sums_params), (_, stale_params) = (c.args for c in cur.execute.call_args_list)
+        assert "s.stats_version = %s" in sums_sql
+        assert sums_params == stale_params == ("running", 30, terrain.TERRAIN_STATS_VERSION)
+        assert requested == [5]
+        assert acc.bands[:, 0].sum() == 80
@@ -0,0 +1,90 @@
+"""Tests for persisted per-workout analytics (analytics/workout_analytics.py)."""
+
+from datetime import date
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def wa():
+    from analytics import workout_analytics
+    return workout_analytics
+
+
+def series(n=120):
+    rng = np.random.default_rng(5)
+    return {
+        "heart_rate": np.linspace(140, 160, n), "pace": np.full(n, 5.0), "cadence": np.full(n, 170.0),
+        "ground_contact_time": np.full(n, 250.0), "vertical_oscillation": np.full(n, 8.0),
+        "vertical_ratio": np.full(n, 7.0), "power": np.full(n, np.nan),
+        "altitude": np.linspace(100, 130, n) + rng.normal(0, 0.01, n), "gradient_pct": np.full(n, 2.0),
+    }
+
+
+class TestComputeAnalytics:
+    def test_matches_kernel(self, wa):
+        from analytics import kernel
+        s = series()
+        row = wa.compute_analytics(7, s)
+        assert set(row) == set(wa.ANALYTICS_COLUMNS)
+        assert row["avg_gap"] == kernel.gap_summary(7, s)["avg_gap"]
+        assert row["hr_drift_pct"] == kernel.fatigue_signature(7, s)["heart_rate_drift_pct"]
+        assert row["rei_mode"] == "hr"
+        assert row["elevation_gain_m"] == pytest.approx(30.0, abs=0.5)
+
+    def test_no_series_is_all_null(self, wa):
+        assert wa.compute_analytics(7, None) == dict.fromkeys(wa.ANALYTICS_COLUMNS)
+
+    def test_moving_series_applies_pace_filter(self, wa):
+        from analytics import kernel
+        batch = {c: np.arange(4, dtype=float) for c in kernel.ALL_COLUMNS}
+        batch["pace"] = np.array([5.0, np.nan, 25.0, 6.0])
+        s = wa.moving_series(batch)
+        assert s["pace"].tolist() == [5.0, 6.0]
+        assert s["heart_rate"].tolist() == [0.0, 3.0]
+
+
+class TestUpsert:
+    def test_version_and_column_order(self, wa):
+        cursor = MagicMock()
+        row = wa.compute_analytics(7, series())
+        wa.upsert_analytics_rows(cursor, [(7, row), (8, row)])
+        sql, params = cursor.execute.call_args.args
+        assert "ON CONFLICT (workout_id) DO UPDATE" in sql
+        assert params == (wa.ANALYTICS_VERSION, [7, 8], *([row[c]] * 2 for c in wa.ANALYTICS_COLUMNS))
+
+    def test_no_rows_is_a_no_op(self, wa):
+        cursor = MagicMock()
+        wa.upsert_analytics_rows(cursor, [])
+        cursor.execute.assert_not_called()
+
+
+class TestLoadRunningAnalytics:
+    def test_only_stale_rows_are_recomputed(self, wa, monkeypatch):
+        names = ["workout_id", "workout_date", "sport", "training_volume", "avg_heart_rate",
+                 "normalized_power", "analytics_version", *wa.ANALYTICS_COLUMNS]
+        current = [1, date(2026, 3, 1), "running", 10000, 150, None, wa.ANALYTICS_VERSION,
+                   *[0.0] * len(wa.ANALYTICS_COLUMNS)]
+        stale = [2, date(2026, 3, 2), "running", 8000, 148, None, None, *[None] * len(wa.ANALYTICS_COLUMNS)]
+        empty = [3, date(2026, 3, 3), "running", 0, None, None, None, *[None] * len(wa.ANALYTICS_COLUMNS)]
+
+        conn = MagicMock()
+        cur = conn.cursor.return_value
+        cur.description = [(n,) for n in names]
+        cur.fetchall.return_value = [current, stale, empty]
+
+        requested = []
+
+        def fake_iter(ids, columns, _conn):
+            requested.extend(ids)
+            yield 2, series()
+
+        monkeypatch.setattr(wa, "iter_workout_series", fake_iter)
+        rows = wa.load_running_analytics(365, conn)
+
+        assert requested == [2, 3]
+        assert rows[0]["avg_gap"] == 0.0
+        assert rows[1]["avg_gap"] == wa.compute_analytics(2, series())["avg_gap"]
+        assert rows[2]["avg_gap"] is None
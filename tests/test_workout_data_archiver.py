@@ -0,0 +1,99 @@
+"""Tests for workout_data_archiver.py — blob store, dedup and catalog index."""
+
+import gzip
+import json
+import os
+
+import pytest
+
+
+# config.py validates env vars at import time, so import inside fixtures
+# (after set_env_vars has run) rather than at module level.
+
+@pytest.fixture
+def archiver_module():
+    import workout_data_archiver
+    return workout_data_archiver
+
+
+@pytest.fixture
+def archiver(archiver_module, tmp_path):
+    a = archiver_module.WorkoutArchiver(str(tmp_path / "workouts"), codec="gzip")
+    yield a
+    a.close()
+
+
+@pytest.fixture
+def activity(mock_garmin_activity):
+    return {**mock_garmin_activity, "activityId": 18698089374}
+
+
+class TestBlobStore:
+    def test_checksum_ignores_key_order(self, archiver):
+        assert archiver._calculate_checksum({"a": 1, "b": 2}) == \
+               archiver._calculate_checksum({"b": 2, "a": 1})
+
+    def test_blob_is_compressed_and_roundtrips(self, archiver):
+        data = {"metrics": [[1, 2.5, None]] * 500}
+        checksum, path, dedup = archiver.store_blob(data)
+        assert not dedup
+        assert path.endswith(checksum + ".json.gz")
+        with open(path, "rb") as f:
+            assert json.loads(gzip.decompress(f.read())) == data
+        assert archiver.load_blob(checksum) == data
+
+    def test_identical_payload_is_deduplicated(self, archiver):
+        data = {"metrics": [1, 2, 3]}
+        first = archiver.store_blob(data)
+        second = archiver.store_blob({"metrics": [1, 2, 3]})
+        assert second[0] == first[0]
+        assert second[2] is True
+        assert archiver.storage_stats()["blobs"] == 1
+
+    def test_unknown_checksum_returns_none(self, archiver):
+        assert archiver.load_blob("0" * 64) is None
+
+    def test_zstd_requires_package(self, archiver_module, tmp_path, monkeypatch):
+        monkeypatch.setattr(archiver_module, "zstandard", None)
+        with pytest.raises(ValueError):
+            archiver_module.WorkoutArchiver(str(tmp_path / "z"), codec="zstd")
+
+
+class TestCatalog:
+    def test_redownload_links_same_blob(self, archiver, activity):
+        p1 = archiver.save_activity(activity)
+        p2 = archiver.save_activity(dict(activity))
+        assert p1 == p2
+        assert len(os.listdir(os.path.dirname(p1))) == 1
+
+    def test_catalog_entry_lookup(self, archiver, activity):
+        path = archiver.save_activity(activity)
+        archiver.save_catalog_entry(activity["activityId"], {"activity": path}, {"activity_name": "Morning Run"})
+
+        entry = archiver.get_catalog_entry(activity["activityId"])
+        assert entry["files"] == {"activity": path}
+        assert entry["summary"]["activity_name"] == "Morning Run"
+        assert archiver.is_archived(activity["activityId"])
+        assert not archiver.is_archived(1)
+        assert archiver.get_catalog_entry(1) is None
+
+    def test_archived_ids_and_load_catalog(self, archiver, activity):
+        archiver.save_activity(activity)
+        archiver.save_catalog_entry(activity["activityId"], {}, {})
+        archiver.save_catalog_entry(42, {}, {})
+        assert archiver.get_archived_activity_ids() == {activity["activityId"], 42}
+        assert len(archiver.load_catalog()) == 2
+
+    def test_load_payload(self, archiver, activity):
+        archiver.save_activity_details(activity["activityId"], {"metricDescriptors": []})
+        assert archiver.load_payload(activity["activityId"], "details") == {"metricDescriptors": []}
+        assert archiver.load_payload(activity["activityId"], "hr_zones") is None
+
+    def test_archive_activity_complete(self, archiver, activity, mock_garmin_client):
+        mock_garmin_client.get_activity_details.return_value = {"metricDescriptors": [1]}
+        mock_garmin_client.get_activity_hr_in_timezones.return_value = [{"zone": 1}]
+        saved = archiver.archive_activity_complete(mock_garmin_client, activity)
+        assert set(saved) == {"activity", "details", "hr_zones"}
+        entry = archiver.get_catalog_entry(activity["activityId"])
+        assert entry["summary"]["activity_type"] == "running"
+        assert entry["files"] == saved
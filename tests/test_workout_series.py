@@ -0,0 +1,52 @@
+"""Tests for the bulk workout_metrics series loader (analytics/workout_series.py)."""
+
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def series_mod():
+    from analytics import workout_series
+    return workout_series
+
+
+def fake_conn(*chunks):
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchmany.side_effect = [list(c) for c in chunks] + [[]]
+    return conn, cur
+
+
+class TestIterWorkoutSeries:
+    def test_one_query_split_by_workout(self, series_mod):
+        conn, cur = fake_conn([(1, 5.0, 150), (1, 5.1, None), (2, 6.0, 140)])
+        out = list(series_mod.iter_workout_series([1, 2, 3], ("pace", "heart_rate"), conn))
+
+        cur.execute.assert_called_once()
+        assert cur.execute.call_args.args[1] == ([1, 2, 3],)
+        assert [wid for wid, _ in out] == [1, 2]
+        assert out[0][1]["pace"].tolist() == [5.0, 5.1]
+        assert np.isnan(out[0][1]["heart_rate"][1])
+
+    def test_workout_spanning_chunks(self, series_mod):
+        conn, _ = fake_conn([(1, 5.0), (2, 6.0)], [(2, 6.1), (2, 6.2)], [(3, 7.0)])
+        out = dict(series_mod.iter_workout_series([1, 2, 3], ("pace",), conn))
+        assert out[2]["pace"].tolist() == [6.0, 6.1, 6.2]
+        assert list(out) == [1, 2, 3]
+
+    def test_no_workouts_no_query(self, series_mod):
+        conn, cur = fake_conn()
+        assert list(series_mod.iter_workout_series([], ("pace",), conn)) == []
+        cur.execute.assert_not_called()
+
+    def test_rejects_unknown_columns(self, series_mod):
+        conn, _ = fake_conn()
+        with pytest.raises(ValueError):
+            list(series_mod.iter_workout_series([1], ("pace; DROP TABLE workouts",), conn))
+
+    def test_full_series_skips_pace_filter(self, series_mod):
+        conn, cur = fake_conn([])
+        list(series_mod.iter_workout_series([1], ("pace", "metric_id"), conn, moving_only=False))
+        assert "pace > 0" not in cur.execute.call_args.args[0]
@@ -48,13 +48,12 @@ def _trimp_for_date(cur, d, user_id=1):
                 trimp += (seconds / 60.0) * _ZONE_WEIGHTS[i]
 
     if trimp == 0:
-        # Garmin didn't record it — estimate from strength_sessions set counts
+        # Garmin didn't record it — estimate from strength set counts
+        # (per-exercise rows kept by strength_stats.py)
         cur.execute("""
-            SELECT COUNT(st.set_id)
-            FROM strength_sessions ss
-            JOIN strength_exercises se ON se.session_id = ss.session_id
-            JOIN strength_sets st ON st.exercise_id = se.exercise_id
-            WHERE ss.user_id = %s AND ss.session_date = %s
+            SELECT COALESCE(SUM(sets), 0)
+            FROM strength_exercise_stats
+            WHERE user_id = %s AND session_date = %s
         """, (user_id, d,))
         row = cur.fetchone()
         sets = row[0] if row else 0
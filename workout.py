@@ -2,7 +2,7 @@ from datetime import datetime, timedelta
 
 import garminconnect
 
-from config import GARMIN_EMAIL, GARMIN_PASSWORD
+from config import GARMIN_EMAIL, GARMIN_PASSWORD, USER_ID
 from db import get_connection
 
 # 1) Connect to Garmin
@@ -70,7 +70,7 @@ RETURNING workout_id;
 """
 
 for activity in activities:
-    user_id = 1
+    user_id = USER_ID
 
     sport = activity.get("activityType", {}).get("typeKey", "Unknown")
     workout_type = activity.get("activityName", "Unknown")
@@ -5,78 +5,210 @@ Save this file as: workout_data_archiver.py in your project root directory
 
 This module handles archiving raw JSON workout data from Garmin Connect
 for future ML model training and analysis.
+
+Storage layout (content-addressed):
+    raw/blobs/<ab>/<sha256>.json.zst   compressed canonical JSON (zstd when the
+                                        `zstandard` package is installed,
+                                        gzip otherwise)
+    metadata/catalog.sqlite            index: activity → data_type → blob
+
+Identical payloads hash to the same blob, so re-downloading an activity
+never writes a second copy. The catalog is an indexed SQLite file, so
+looking up an activity is a primary-key read instead of a scan of the
+whole catalog. Archives written in the old pretty-JSON layout can be
+converted with migrate_archive.py.
 """
 
-from datetime import datetime, timedelta
+from datetime import datetime
+import gzip
 import json
 import os
 import hashlib
 import logging
+import sqlite3
 import garminconnect
 import config
 
+try:
+    import zstandard
+except ImportError:          # optional — falls back to gzip
+    zstandard = None
+
 logging.basicConfig(level=logging.INFO, format=config.LOG_FORMAT)
 logger = logging.getLogger("workout_archiver")
 
+CODEC_EXTENSIONS = {"zstd": ".json.zst", "gzip": ".json.gz"}
+
+CATALOG_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    checksum      TEXT PRIMARY KEY,
+    codec         TEXT NOT NULL,
+    raw_bytes     INTEGER NOT NULL,
+    stored_bytes  INTEGER NOT NULL,
+    created_at    TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS activities (
+    activity_id   INTEGER PRIMARY KEY,
+    cataloged_at  TEXT NOT NULL,
+    summary       TEXT
+);
+CREATE TABLE IF NOT EXISTS activity_files (
+    activity_id   INTEGER NOT NULL,
+    data_type     TEXT NOT NULL,
+    checksum      TEXT NOT NULL REFERENCES blobs(checksum),
+    archived_at   TEXT NOT NULL,
+    PRIMARY KEY (activity_id, data_type)
+);
+CREATE INDEX IF NOT EXISTS activity_files_checksum ON activity_files(checksum);
+"""
+
 
 class WorkoutArchiver:
-    """Handles archiving of workout data in JSON format"""
+    """Handles archiving of workout data as compressed, content-addressed blobs"""
 
-    def __init__(self, base_path="data/workouts"):
+    def __init__(self, base_path="data/workouts", codec=None):
         """
         Initialize the archiver
 
         Args:
             base_path: Base directory for storing workout data
+            codec: "zstd" or "gzip" (default: zstd if available, else gzip)
         """
         self.base_path = base_path
         self.raw_path = os.path.join(base_path, "raw")
+        self.blob_path = os.path.join(self.raw_path, "blobs")
         self.processed_path = os.path.join(base_path, "processed")
         self.metadata_path = os.path.join(base_path, "metadata")
+        self.catalog_db = os.path.join(self.metadata_path, "catalog.sqlite")
+
+        if codec is None:
+            codec = "zstd" if zstandard is not None else "gzip"
+        if codec == "zstd" and zstandard is None:
+            raise ValueError("codec='zstd' requires the zstandard package")
+        if codec not in CODEC_EXTENSIONS:
+            raise ValueError(f"Unknown codec: {codec}")
+        self.codec = codec
 
         # Create directory structure
         self._setup_directories()
+        self._conn = sqlite3.connect(self.catalog_db)
+        self._conn.executescript(CATALOG_SCHEMA)
 
     def _setup_directories(self):
         """Create necessary directory structure"""
         directories = [
             self.raw_path,
+            self.blob_path,
             self.processed_path,
             self.metadata_path,
-            os.path.join(self.raw_path, "activities"),
-            os.path.join(self.raw_path, "details"),
-            os.path.join(self.raw_path, "metrics"),
-            os.path.join(self.raw_path, "hr_zones")
         ]
 
         for directory in directories:
             os.makedirs(directory, exist_ok=True)
             logger.info(f"Ensured directory exists: {directory}")
 
-    def _generate_file_id(self, activity_id, data_type, timestamp=None):
-        """
-        Generate a unique file ID
+    def close(self):
+        """Close the catalog index"""
+        self._conn.close()
 
-        Args:
-            activity_id: Garmin activity ID
-            data_type: Type of data (activity, details, metrics, hr_zones)
-            timestamp: Optional timestamp for versioning
+    # ------------------------------------------------------------------
+    # Blob store
+    # ------------------------------------------------------------------
 
-        Returns:
-            Unique file identifier
+    @staticmethod
+    def _canonical_bytes(data):
+        """Serialise data to canonical compact JSON (stable across re-downloads)"""
+        return json.dumps(
+            data, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+        ).encode("utf-8")
+
+    def _calculate_checksum(self, data):
+        """Calculate the SHA-256 content address of data"""
+        return hashlib.sha256(self._canonical_bytes(data)).hexdigest()
+
+    def _compress(self, raw, codec):
+        if codec == "zstd":
+            return zstandard.ZstdCompressor(level=10).compress(raw)
+        return gzip.compress(raw, compresslevel=6, mtime=0)
+
+    @staticmethod
+    def _decompress(stored, codec):
+        if codec == "zstd":
+            if zstandard is None:
+                raise RuntimeError("Blob is zstd-compressed but zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(stored)
+        return gzip.decompress(stored)
+
+    def _blob_file(self, checksum, codec):
+        return os.path.join(self.blob_path, checksum[:2], checksum + CODEC_EXTENSIONS[codec])
+
+    def store_blob(self, data):
         """
-        if timestamp is None:
-            timestamp = datetime.now()
+        Store data as a compressed, content-addressed blob.
 
-        date_str = timestamp.strftime("%Y%m%d")
-        time_str = timestamp.strftime("%H%M%S")
+        Returns:
+            (checksum, path, deduplicated) — deduplicated is True when an
+            identical payload was already archived and nothing was written.
+        """
+        raw = self._canonical_bytes(data)
+        checksum = hashlib.sha256(raw).hexdigest()
+
+        row = self._conn.execute(
+            "SELECT codec FROM blobs WHERE checksum = ?", (checksum,)
+        ).fetchone()
+        if row:
+            return checksum, self._blob_file(checksum, row[0]), True
+
+        path = self._blob_file(checksum, self.codec)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        stored = self._compress(raw, self.codec)
+
+        # Write-then-rename so a crash never leaves a truncated blob behind
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(stored)
+        os.replace(tmp_path, path)
+
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO blobs (checksum, codec, raw_bytes, stored_bytes, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (checksum, self.codec, len(raw), len(stored), datetime.now().isoformat()),
+            )
+        return checksum, path, False
+
+    def load_blob(self, checksum):
+        """Load and decompress a blob by checksum. Returns None if unknown."""
+        row = self._conn.execute(
+            "SELECT codec FROM blobs WHERE checksum = ?", (checksum,)
+        ).fetchone()
+        if not row:
+            return None
+        with open(self._blob_file(checksum, row[0]), "rb") as f:
+            return json.loads(self._decompress(f.read(), row[0]))
 
-        return f"{date_str}_{activity_id}_{data_type}_{time_str}"
+    # ------------------------------------------------------------------
+    # Saving
+    # ------------------------------------------------------------------
 
-    def _calculate_checksum(self, data):
-        """Calculate MD5 checksum of data"""
-        data_str = json.dumps(data, sort_keys=True)
-        return hashlib.md5(data_str.encode()).hexdigest()
+    def _save_payload(self, activity_id, data_type, data, timestamp):
+        """Store a payload blob and link it to (activity_id, data_type)"""
+        try:
+            checksum, path, deduplicated = self.store_blob(data)
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO activity_files "
+                    "(activity_id, data_type, checksum, archived_at) VALUES (?, ?, ?, ?)",
+                    (int(activity_id), data_type, checksum, timestamp.isoformat()),
+                )
+            if deduplicated:
+                logger.info(f"{data_type} for activity {activity_id} unchanged — reused blob {checksum[:12]}")
+            else:
+                logger.info(f"Saved {data_type} for activity {activity_id} to {path}")
+            return path
+        except Exception as e:
+            logger.error(f"Error saving {data_type} for {activity_id}: {e}")
+            return None
 
     def save_activity(self, activity, timestamp=None):
         """
@@ -84,10 +216,10 @@ class WorkoutArchiver:
 
         Args:
             activity: Activity dictionary from Garmin
-            timestamp: Optional timestamp for file naming
+            timestamp: Optional timestamp for the archive record
 
         Returns:
-            Path to saved file
+            Path to the blob holding the activity
         """
         if timestamp is None:
             timestamp = datetime.now()
@@ -97,105 +229,42 @@ class WorkoutArchiver:
             logger.error("Activity missing activityId, cannot save")
             return None
 
-        # Generate file path
-        file_id = self._generate_file_id(activity_id, "activity", timestamp)
-        file_path = os.path.join(self.raw_path, "activities", f"{file_id}.json")
-
-        # Add metadata
-        activity_with_meta = {
-            "archived_at": timestamp.isoformat(),
-            "activity_id": activity_id,
-            "data_type": "activity",
-            "checksum": self._calculate_checksum(activity),
-            "data": activity
-        }
-
-        # Save to file
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(activity_with_meta, f, indent=2, ensure_ascii=False, default=str)
-
-            logger.info(f"Saved activity {activity_id} to {file_path}")
-            return file_path
-        except Exception as e:
-            logger.error(f"Error saving activity {activity_id}: {e}")
-            return None
+        return self._save_payload(activity_id, "activity", activity, timestamp)
 
     def save_activity_details(self, activity_id, details, timestamp=None):
         """Save detailed activity metrics"""
         if timestamp is None:
             timestamp = datetime.now()
-
-        file_id = self._generate_file_id(activity_id, "details", timestamp)
-        file_path = os.path.join(self.raw_path, "details", f"{file_id}.json")
-
-        details_with_meta = {
-            "archived_at": timestamp.isoformat(),
-            "activity_id": activity_id,
-            "data_type": "details",
-            "checksum": self._calculate_checksum(details),
-            "data": details
-        }
-
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(details_with_meta, f, indent=2, ensure_ascii=False, default=str)
-
-            logger.info(f"Saved details for activity {activity_id} to {file_path}")
-            return file_path
-        except Exception as e:
-            logger.error(f"Error saving details for {activity_id}: {e}")
-            return None
+        return self._save_payload(activity_id, "details", details, timestamp)
 
     def save_hr_zones(self, activity_id, hr_data, timestamp=None):
         """Save heart rate zone data"""
         if timestamp is None:
             timestamp = datetime.now()
+        return self._save_payload(activity_id, "hr_zones", hr_data, timestamp)
 
-        file_id = self._generate_file_id(activity_id, "hr_zones", timestamp)
-        file_path = os.path.join(self.raw_path, "hr_zones", f"{file_id}.json")
-
-        hr_with_meta = {
-            "archived_at": timestamp.isoformat(),
-            "activity_id": activity_id,
-            "data_type": "hr_zones",
-            "checksum": self._calculate_checksum(hr_data),
-            "data": hr_data
-        }
-
-        try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(hr_with_meta, f, indent=2, ensure_ascii=False, default=str)
-
-            logger.info(f"Saved HR zones for activity {activity_id} to {file_path}")
-            return file_path
-        except Exception as e:
-            logger.error(f"Error saving HR zones for {activity_id}: {e}")
-            return None
-
-    def save_catalog_entry(self, activity_id, file_paths, activity_summary):
+    def save_catalog_entry(self, activity_id, file_paths, activity_summary, cataloged_at=None):
         """
-        Save a catalog entry linking all files for an activity
+        Save a catalog entry for an activity
 
         Args:
             activity_id: Garmin activity ID
-            file_paths: Dictionary of file paths for this activity
+            file_paths: Dictionary of file paths for this activity (kept for
+                        API compatibility — the file links live in activity_files)
             activity_summary: Summary info about the activity
+            cataloged_at: Optional ISO timestamp (defaults to now)
         """
-        catalog_file = os.path.join(self.metadata_path, "catalog.jsonl")
-
-        entry = {
-            "activity_id": activity_id,
-            "cataloged_at": datetime.now().isoformat(),
-            "files": file_paths,
-            "summary": activity_summary
-        }
-
         try:
-            # Append to catalog (JSONL format - one JSON object per line)
-            with open(catalog_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(entry, default=str) + '\n')
-
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO activities (activity_id, cataloged_at, summary) "
+                    "VALUES (?, ?, ?)",
+                    (
+                        int(activity_id),
+                        cataloged_at or datetime.now().isoformat(),
+                        json.dumps(activity_summary, default=str),
+                    ),
+                )
             logger.info(f"Added catalog entry for activity {activity_id}")
         except Exception as e:
             logger.error(f"Error adding catalog entry: {e}")
@@ -209,7 +278,7 @@ class WorkoutArchiver:
             activity: Activity dictionary
 
         Returns:
-            Dictionary with paths to all saved files
+            Dictionary with paths to all saved blobs
         """
         activity_id = activity.get("activityId")
         if not activity_id:
@@ -261,20 +330,58 @@ class WorkoutArchiver:
 
         return saved_files
 
-    def load_catalog(self):
-        """Load the complete catalog of archived activities"""
-        catalog_file = os.path.join(self.metadata_path, "catalog.jsonl")
+    # ------------------------------------------------------------------
+    # Catalog lookups
+    # ------------------------------------------------------------------
+
+    def _entry(self, activity_id, cataloged_at, summary):
+        files = {
+            data_type: self._blob_file(checksum, codec)
+            for data_type, checksum, codec in self._conn.execute(
+                "SELECT f.data_type, f.checksum, b.codec "
+                "FROM activity_files f JOIN blobs b ON b.checksum = f.checksum "
+                "WHERE f.activity_id = ?",
+                (activity_id,),
+            )
+        }
+        return {
+            "activity_id": activity_id,
+            "cataloged_at": cataloged_at,
+            "files": files,
+            "summary": json.loads(summary) if summary else None,
+        }
 
-        if not os.path.exists(catalog_file):
-            return []
+    def get_catalog_entry(self, activity_id):
+        """Return the catalog entry for one activity, or None (primary-key lookup)"""
+        row = self._conn.execute(
+            "SELECT activity_id, cataloged_at, summary FROM activities WHERE activity_id = ?",
+            (int(activity_id),),
+        ).fetchone()
+        return self._entry(*row) if row else None
+
+    def is_archived(self, activity_id):
+        """True if the activity has a catalog entry"""
+        return self._conn.execute(
+            "SELECT 1 FROM activities WHERE activity_id = ?", (int(activity_id),)
+        ).fetchone() is not None
+
+    def load_payload(self, activity_id, data_type):
+        """Load the archived payload for (activity_id, data_type), or None"""
+        row = self._conn.execute(
+            "SELECT checksum FROM activity_files WHERE activity_id = ? AND data_type = ?",
+            (int(activity_id), data_type),
+        ).fetchone()
+        return self.load_blob(row[0]) if row else None
 
-        catalog = []
+    def load_catalog(self):
+        """Load the complete catalog of archived activities"""
         try:
-            with open(catalog_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip():
-                        catalog.append(json.loads(line))
-
+            catalog = [
+                self._entry(*row)
+                for row in self._conn.execute(
+                    "SELECT activity_id, cataloged_at, summary FROM activities ORDER BY cataloged_at"
+                ).fetchall()
+            ]
             logger.info(f"Loaded catalog with {len(catalog)} entries")
             return catalog
         except Exception as e:
@@ -283,12 +390,18 @@ class WorkoutArchiver:
 
     def get_archived_activity_ids(self):
         """Get set of all archived activity IDs"""
-        catalog = self.load_catalog()
-        return set(entry['activity_id'] for entry in catalog)
+        return {row[0] for row in self._conn.execute("SELECT activity_id FROM activities")}
+
+    def storage_stats(self):
+        """Return blob count and raw vs stored byte totals"""
+        n, raw, stored = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(raw_bytes), 0), COALESCE(SUM(stored_bytes), 0) FROM blobs"
+        ).fetchone()
+        return {"blobs": n, "raw_bytes": raw, "stored_bytes": stored}
 
 
 if __name__ == "__main__":
     print("This module should be imported, not run directly.")
     print("Example usage:")
     print("  from workout_data_archiver import WorkoutArchiver")
-    print("  archiver = WorkoutArchiver()")
\ No newline at end of file
+    print("  archiver = WorkoutArchiver()")
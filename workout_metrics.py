@@ -1,73 +1,20 @@
+import argparse
 from datetime import datetime
 
 import garminconnect
 
-from config import GARMIN_EMAIL, GARMIN_PASSWORD
+from config import GARMIN_EMAIL, GARMIN_PASSWORD, USER_ID
 from db import get_connection
-
-# Maps Garmin metric descriptor keys to workout_metrics column names.
-# directDoubleCadence is the full steps/min figure; directCadence is half-cadence.
-# The script prefers directDoubleCadence when available.
-GARMIN_KEY_TO_COLUMN = {
-    "directHeartRate":           "heart_rate",
-    "directSpeed":               "pace",               # converted m/s → min/km
-    "directDoubleCadence":       "cadence",
-    "directCadence":             "cadence",
-    "directVerticalOscillation": "vertical_oscillation",
-    "directVerticalRatio":       "vertical_ratio",
-    "directGroundContactTime":   "ground_contact_time",
-    "directPower":               "power",
-    "directLatitude":            "latitude",
-    "directLongitude":           "longitude",
-    "directAltitude":            "altitude",
-    "directElevation":           "altitude",           # some devices use this key
-    "directDistance":            "distance",
-}
-
-
-def speed_to_pace(speed_ms):
-    """Convert m/s to min/km. Returns None for zero/null speed."""
-    if not speed_ms:
-        return None
-    return (1000 / speed_ms) / 60
-
-
-def build_column_map(descriptors):
-    """
-    Return a dict of {metricsIndex: (column_name, transform_fn)} from the
-    activity's metricDescriptors list.
-
-    When both directCadence and directDoubleCadence are present, only
-    directDoubleCadence is mapped (it's the full steps/min value).
-    """
-    has_double_cadence = any(d["key"] == "directDoubleCadence" for d in descriptors)
-
-    col_map = {}
-    for d in descriptors:
-        key = d["key"]
-        idx = d["metricsIndex"]
-
-        if key == "directCadence" and has_double_cadence:
-            continue
-
-        if key not in GARMIN_KEY_TO_COLUMN:
-            continue
-
-        col_name = GARMIN_KEY_TO_COLUMN[key]
-
-        if col_name == "heart_rate":
-            transform = lambda v: int(v) if v is not None else None
-        elif col_name == "pace":
-            transform = speed_to_pace
-        else:
-            transform = lambda v: float(v) if v is not None else None
-
-        col_map[idx] = (col_name, transform)
-
-    return col_map
+from metrics_ingest import metrics_ingested, replace_workout_metrics, store_workout_series
+from metrics_parser import build_index_map, parse_activity_details
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Ingest workout_metrics for the latest Garmin activity.")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-ingest even if the workout's series is already stored")
+    args = parser.parse_args()
+
     # 1) Connect to Garmin and fetch the latest activity
     client = garminconnect.Garmin(GARMIN_EMAIL, GARMIN_PASSWORD)
     client.login()
@@ -104,8 +51,8 @@ def main():
 
     if not row:
         cursor.execute(
-            "SELECT workout_id FROM workouts WHERE workout_date = %s AND user_id = 1",
-            (workout_date,)
+            "SELECT workout_id FROM workouts WHERE workout_date = %s AND user_id = %s",
+            (workout_date, USER_ID)
         )
         row = cursor.fetchone()
 
@@ -117,12 +64,8 @@ def main():
     workout_id = row[0]
     print(f"Matched workout_id: {workout_id}")
 
-    # 3) Skip if metrics already exist for this workout
-    cursor.execute(
-        "SELECT COUNT(*) FROM workout_metrics WHERE workout_id = %s",
-        (workout_id,)
-    )
-    if cursor.fetchone()[0] > 0:
+    # 3) Skip if a complete series was already ingested for this workout
+    if not args.force and metrics_ingested(cursor, workout_id):
         print(f"workout_metrics already populated for workout_id {workout_id}. Skipping.")
         conn.close()
         return
@@ -131,117 +74,17 @@ def main():
     print("Downloading activity details...")
     details = client.get_activity_details(activity_id, maxchart=2000)
 
-    descriptors = details.get("metricDescriptors", [])
-    data_points = details.get("activityDetailMetrics", [])
-
-    if not descriptors or not data_points:
+    batch = parse_activity_details(details)
+    if batch is None:
         print("No time-series data in activity details.")
-        conn.close()
-        return
-
-    timestamp_index = next(
-        (d["metricsIndex"] for d in descriptors if d["key"] == "directTimestamp"),
-        None
-    )
-    if timestamp_index is None:
-        print("No directTimestamp found in metricDescriptors.")
-        conn.close()
-        return
+    else:
+        print(f"Mapped columns: {sorted(build_index_map(details['metricDescriptors']))}")
 
-    col_map = build_column_map(descriptors)
-    print(f"Mapped columns: {sorted(set(col for col, _ in col_map.values()))}")
-
-    sql_insert = """
-    INSERT INTO workout_metrics (
-        workout_id,
-        metric_timestamp,
-        heart_rate,
-        pace,
-        cadence,
-        vertical_oscillation,
-        vertical_ratio,
-        ground_contact_time,
-        power,
-        latitude,
-        longitude,
-        altitude,
-        distance,
-        gradient_pct
-    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s);
-    """
-
-    rows_inserted = 0
-    prev_altitude = None
-    prev_distance = None
-
-    for point in data_points:
-        metrics = point.get("metrics", [])
-
-        if timestamp_index >= len(metrics) or metrics[timestamp_index] is None:
-            continue
-
-        metric_timestamp = datetime.fromtimestamp(metrics[timestamp_index] / 1000)
-
-        values = {
-            "heart_rate": None,
-            "pace": None,
-            "cadence": None,
-            "vertical_oscillation": None,
-            "vertical_ratio": None,
-            "ground_contact_time": None,
-            "power": None,
-            "latitude": None,
-            "longitude": None,
-            "altitude": None,
-            "distance": None,
-        }
-
-        for idx, (col_name, transform) in col_map.items():
-            if idx < len(metrics) and metrics[idx] is not None:
-                values[col_name] = transform(metrics[idx])
-
-        # Compute gradient_pct = Δaltitude / Δhorizontal_distance × 100
-        # Primary: use cumulative distance if available
-        # Fallback: derive horizontal distance from pace (min/km) × Δt (1s per point)
-        gradient_pct = None
-        alt  = values["altitude"]
-        dist = values["distance"]
-        pace = values["pace"]   # min/km
-
-        if alt is not None and prev_altitude is not None:
-            d_alt = alt - prev_altitude
-            d_dist = None
-            if dist is not None and prev_distance is not None:
-                d_dist = dist - prev_distance
-            elif pace is not None and pace > 0:
-                # pace in min/km → speed in m/s = 1000 / (pace × 60)
-                speed_ms = 1000.0 / (pace * 60.0)
-                d_dist = speed_ms * 1.0   # 1-second intervals
-            if d_dist is not None and d_dist > 0.5:
-                gradient_pct = round(d_alt / d_dist * 100, 2)
-
-        if alt  is not None: prev_altitude = alt
-        if dist is not None: prev_distance = dist
-
-        cursor.execute(sql_insert, (
-            workout_id,
-            metric_timestamp,
-            values["heart_rate"],
-            values["pace"],
-            values["cadence"],
-            values["vertical_oscillation"],
-            values["vertical_ratio"],
-            values["ground_contact_time"],
-            values["power"],
-            values["latitude"],
-            values["longitude"],
-            values["altitude"],
-            values["distance"],
-            gradient_pct,
-        ))
-        rows_inserted += 1
+    # 5) Replace the workout's series in one transaction
+    rows_inserted = replace_workout_metrics(cursor, workout_id, batch)
 
     conn.commit()
+    store_workout_series(workout_id, batch)
     cursor.close()
     conn.close()
     print(f"Inserted {rows_inserted} metric records for workout_id {workout_id}.")
@@ -10,7 +10,9 @@ import json
 import hashlib
 import logging
 import sys
+import numpy as np
 import config
+from metrics_parser import to_matrix
 from workout_data_archiver import WorkoutArchiver
 
 logging.basicConfig(level=logging.INFO, format=config.LOG_FORMAT)
@@ -100,6 +102,45 @@ class GarminMetricsParser:
 
         return parsed
 
+    def parse_columns(self, metrics_data):
+        """
+        Parse every time point at once (vectorized parse_metric_point).
+
+        Args:
+            metrics_data: activityDetailMetrics list from Garmin
+
+        Returns:
+            (columns, valid) — columns maps each raw key and mapped DB column
+            to a float array (NaN = missing, unit factor applied); valid marks
+            the points that carried at least one described value.
+        """
+        n = len(metrics_data)
+        if not self.descriptors or n == 0:
+            return {}, np.zeros(n, dtype=bool)
+
+        matrix = to_matrix(metrics_data, max(self.descriptors) + 1)
+        columns = {}
+        valid = np.zeros(n, dtype=bool)
+
+        for index in sorted(self.descriptors):
+            descriptor = self.descriptors[index]
+            values = matrix[:, index]
+            present = ~np.isnan(values)
+            valid |= present
+
+            factor = descriptor['factor']
+            if factor and factor != 0:
+                values = values / factor
+
+            columns[descriptor['key']] = values
+            db_column = descriptor['db_column']
+            if db_column:
+                # Later indices overwrite earlier ones only where they have a value
+                previous = columns.get(db_column)
+                columns[db_column] = values if previous is None else np.where(present, values, previous)
+
+        return columns, valid
+
 
 def connect_to_garmin():
     """Connect to Garmin API and return client"""
@@ -293,35 +334,26 @@ def insert_metric_descriptors(cursor, workout_id, descriptors):
 def insert_metrics_time_series(cursor, workout_id, parser, metrics_data):
     """Insert parsed time-series metrics"""
     try:
-        values = []
-
-        for metric_point in metrics_data:
-            metrics_array = metric_point.get('metrics', [])
-            parsed = parser.parse_metric_point(metrics_array)
-
-            if not parsed:
-                continue
-
-            # Extract values with None as default
-            values.append((
-                workout_id,
-                parsed.get('TimestampGMT'),
-                parsed.get('ElapsedSeconds'),
-                parsed.get('Latitude'),
-                parsed.get('Longitude'),
-                parsed.get('Elevation'),
-                parsed.get('HeartRate'),
-                parsed.get('Speed'),
-                parsed.get('Distance'),
-                parsed.get('Cadence'),
-                parsed.get('VerticalOscillation'),
-                parsed.get('VerticalRatio'),
-                parsed.get('GroundContactTime'),
-                parsed.get('StrideLength'),
-                parsed.get('Power'),
-                parsed.get('BodyBattery'),
-                parsed.get('PerformanceCondition')
-            ))
+        columns, valid = parser.parse_columns(metrics_data)
+        n_valid = int(valid.sum())
+
+        def column(name):
+            values = columns.get(name)
+            if values is None:
+                return [None] * n_valid
+            values = values[valid]
+            return np.where(np.isnan(values), None, values).tolist()
+
+        names = [
+            'TimestampGMT', 'ElapsedSeconds', 'Latitude', 'Longitude', 'Elevation',
+            'HeartRate', 'Speed', 'Distance', 'Cadence', 'VerticalOscillation',
+            'VerticalRatio', 'GroundContactTime', 'StrideLength', 'Power',
+            'BodyBattery', 'PerformanceCondition',
+        ]
+        values = [
+            (workout_id, *row)
+            for row in zip(*(column(name) for name in names))
+        ]
 
         if not values:
             logger.warning(f"No metric values to insert for workout {workout_id}")